@@ -116,6 +116,9 @@ from .inverse_solver import (
     # Material selection
     MaterialCandidate,
     solve_for_material_and_thickness,
+    # Batch grading
+    frequency_slopes,
+    solve_thickness_batch,
     format_inverse_solver_report,
 )
 
@@ -170,6 +173,8 @@ __all__ = [
     "InverseDesignProblem",
     "MaterialCandidate",
     "solve_for_material_and_thickness",
+    "frequency_slopes",
+    "solve_thickness_batch",
     "format_inverse_solver_report",
     # Result classes
     "PlateThicknessResult",
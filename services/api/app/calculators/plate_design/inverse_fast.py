@@ -0,0 +1,231 @@
+"""
+inverse_fast.py — Closed-form thickness fits and batch grading.
+
+Every forward model in inverse_solver is exactly linear in h (Rayleigh-Ritz:
+K ∝ h³, M ∝ h, so ω ∝ h). Frequencies are therefore computed once per
+material, geometry and boundary condition as Hz per metre of thickness
+(frequency_slopes, cached by parameter hash) and the weighted relative-error
+objective is minimized in closed form. solve_for_thickness and
+InverseDesignProblem use these kernels; solve_thickness_batch applies them
+to a whole stack of plates at once.
+
+All public names are re-exported from inverse_solver.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .inverse_solver import (
+    ForwardModel,
+    FrequencyTarget,
+    InverseSolverResult,
+    MaterialCandidate,
+    ThicknessConstraints,
+    _forward_simple,
+)
+from .rayleigh_ritz import (
+    OrthotropicPlate,
+    BoundaryCondition,
+    solve_rayleigh_ritz,
+)
+
+
+# =============================================================================
+# Per-Metre Frequencies
+# =============================================================================
+
+
+# Thickness for the cached forward solve. The value does not matter: the
+# slopes it yields are the same for any positive h.
+_H_REF_M = 1.0e-3
+
+
+@lru_cache(maxsize=1024)
+def frequency_slopes(
+    E_L: float,
+    E_C: float,
+    rho: float,
+    a: float,
+    b: float,
+    forward_model: ForwardModel = ForwardModel.RAYLEIGH_RITZ,
+    bc_x: BoundaryCondition = BoundaryCondition.SIMPLY_SUPPORTED,
+    bc_y: BoundaryCondition = BoundaryCondition.SIMPLY_SUPPORTED,
+    n_modes_x: int = 4,
+    n_modes_y: int = 4,
+) -> Tuple[float, ...]:
+    """Free-plate modal frequencies per metre of thickness (Hz/m), ascending.
+
+    For fixed material and geometry, stiffness scales as h³ and mass as h,
+    so each frequency is exactly proportional to h: f_i(h) = slope_i × h.
+    One forward solve at a reference thickness therefore serves every
+    thickness probe, and the result is memoized on the full parameter set.
+    """
+    if forward_model == ForwardModel.SIMPLE:
+        freqs = _forward_simple(_H_REF_M, E_L, E_C, rho, a, b)
+    else:
+        plate = OrthotropicPlate.from_wood(
+            E_L=E_L,
+            E_C=E_C,
+            rho=rho,
+            h=_H_REF_M,
+            a=a,
+            b=b,
+        )
+        result = solve_rayleigh_ritz(
+            plate,
+            n_modes_x=n_modes_x,
+            n_modes_y=n_modes_y,
+            bc_x=bc_x,
+            bc_y=bc_y,
+            n_modes_return=n_modes_x * n_modes_y,
+        )
+        freqs = result.frequencies_Hz
+    return tuple(f / _H_REF_M for f in freqs)
+
+
+# =============================================================================
+# Closed-Form Fit
+# =============================================================================
+
+
+def _weighted_thickness(
+    slopes: np.ndarray,
+    target_Hz: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """Closed-form minimizer of the weighted relative-error objective.
+
+    With achieved frequency s_k × h, Σ w_k (s_k h / t_k − 1)² is a quadratic
+    in h whose minimum is h = Σ w_k r_k / Σ w_k r_k² with r_k = s_k / t_k.
+    slopes has shape (..., n_targets); h is returned in the slopes' inverse
+    units, one value per leading index.
+    """
+    r = slopes / target_Hz
+    return np.einsum("...k,k->...", r, weights) / np.einsum("...k,...k,k->...", r, r, weights)
+
+
+def _target_errors(
+    targets: Sequence[FrequencyTarget],
+    achieved: Sequence[float],
+) -> Tuple[List[float], List[float], List[float], float]:
+    """Per-target achieved frequency, error (Hz, %) and RMS error."""
+    achieved_freqs = []
+    errors_Hz = []
+    errors_pct = []
+
+    for target in targets:
+        idx = target.mode_index
+        if idx < len(achieved):
+            f_achieved = achieved[idx]
+            achieved_freqs.append(f_achieved)
+            err = f_achieved - target.frequency_Hz
+            errors_Hz.append(err)
+            errors_pct.append(100.0 * err / target.frequency_Hz)
+        else:
+            achieved_freqs.append(0.0)
+            errors_Hz.append(float("inf"))
+            errors_pct.append(float("inf"))
+
+    rms_error = (
+        math.sqrt(sum(e**2 for e in errors_Hz) / len(errors_Hz))
+        if errors_Hz
+        else 0.0
+    )
+    return achieved_freqs, errors_Hz, errors_pct, rms_error
+
+
+# =============================================================================
+# Batch Grading
+# =============================================================================
+
+
+def solve_thickness_batch(
+    candidates: Sequence[MaterialCandidate],
+    targets: Sequence[FrequencyTarget],
+    a: float,
+    b: float,
+    gamma: float = 1.0,
+    constraints: Optional[ThicknessConstraints] = None,
+    forward_model: ForwardModel = ForwardModel.RAYLEIGH_RITZ,
+    bc_x: BoundaryCondition = BoundaryCondition.SIMPLY_SUPPORTED,
+    bc_y: BoundaryCondition = BoundaryCondition.SIMPLY_SUPPORTED,
+) -> List[InverseSolverResult]:
+    """Grade a stack of plates against shared frequency targets.
+
+    Equivalent to InverseDesignProblem(...).solve() per candidate, but the
+    forward model runs once per distinct material (cached) and all
+    thicknesses come from one vectorized closed-form fit, so a catalogue
+    sweep of hundreds of tops takes well under a second.
+
+    Args:
+        candidates: Plates to grade (measured or catalogue properties)
+        targets: Frequency targets shared by every plate
+        a: Plate length (m)
+        b: Plate width (m)
+        gamma: Transfer coefficient (free→box)
+        constraints: Thickness constraints
+        forward_model: Which forward model to use
+        bc_x: Boundary condition in x
+        bc_y: Boundary condition in y
+
+    Returns:
+        One InverseSolverResult per candidate, in input order
+    """
+    if not targets:
+        raise ValueError("No targets given")
+    if constraints is None:
+        constraints = ThicknessConstraints()
+    if not candidates:
+        return []
+
+    per_plate = [
+        frequency_slopes(c.E_L, c.E_C, c.rho, a, b, forward_model, bc_x, bc_y)
+        for c in candidates
+    ]
+    n_avail = min(len(s) for s in per_plate)
+    usable = [t for t in targets if t.mode_index < n_avail]
+    if not usable:
+        raise ValueError("No target mode is available from the forward model")
+
+    # Box-frequency slopes in Hz per mm, shape (n_candidates, n_modes)
+    slopes = np.array([s[:n_avail] for s in per_plate]) * (gamma * 1e-3)
+    h_mm = _weighted_thickness(
+        slopes[:, [t.mode_index for t in usable]],
+        np.array([t.frequency_Hz for t in usable]),
+        np.array([t.weight for t in usable]),
+    )
+
+    clamped = np.clip(h_mm, constraints.h_min_mm, constraints.h_max_mm)
+    active = clamped != h_mm
+    if constraints.h_step_mm is not None:
+        clamped = np.round(clamped / constraints.h_step_mm) * constraints.h_step_mm
+    achieved = slopes * clamped[:, None]
+
+    target_freqs = [t.frequency_Hz for t in targets]
+    results = []
+    for i in range(len(candidates)):
+        h_opt_mm = float(clamped[i])
+        achieved_freqs, errors_Hz, errors_pct, rms_error = _target_errors(
+            targets, achieved[i].tolist()
+        )
+        results.append(
+            InverseSolverResult(
+                thickness_mm=h_opt_mm,
+                thickness_m=h_opt_mm * 1e-3,
+                achieved_frequencies_Hz=achieved_freqs,
+                target_frequencies_Hz=target_freqs,
+                frequency_errors_Hz=errors_Hz,
+                frequency_errors_pct=errors_pct,
+                rms_error_Hz=rms_error,
+                converged=bool(np.isfinite(h_mm[i])),
+                n_iterations=1,
+                forward_model=forward_model,
+                constraints_active=bool(active[i]),
+            )
+        )
+    return results
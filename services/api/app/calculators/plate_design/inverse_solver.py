@@ -46,6 +46,13 @@ Usage:
     >>> result = problem.solve(
     ...     constraints=ThicknessConstraints(h_min_mm=2.0, h_max_mm=4.0)
     ... )
+
+    >>> # Batch: grade a stack of tops against the same tap-tone targets
+    >>> results = solve_thickness_batch(
+    ...     candidates=[MaterialCandidate("top-017", E_L=11.8e9, E_C=0.85e9, rho=410)],
+    ...     targets=[FrequencyTarget(mode=1, frequency_Hz=180.0)],
+    ...     a=0.45, b=0.35,
+    ... )
 """
 
 from __future__ import annotations
@@ -55,13 +62,10 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from scipy import optimize
 
-from .rayleigh_ritz import (
-    OrthotropicPlate,
-    BoundaryCondition,
-    solve_rayleigh_ritz,
-)
+from .rayleigh_ritz import BoundaryCondition
 from .thickness_calculator import plate_modal_frequency
 
 
@@ -236,26 +240,14 @@ def _forward_rayleigh_ritz(
 ) -> List[float]:
     """Rayleigh-Ritz forward model.
 
-    More accurate but slower than simple formula.
+    More accurate than the simple formula. Scales the cached per-metre
+    frequencies, so repeated calls at different h cost one solve in total.
     """
-    plate = OrthotropicPlate.from_wood(
-        E_L=E_L,
-        E_C=E_C,
-        rho=rho,
-        h=h_m,
-        a=a,
-        b=b,
-    )
-
-    result = solve_rayleigh_ritz(
-        plate,
-        n_modes_x=n_modes_x,
-        n_modes_y=n_modes_y,
-        bc_x=bc_x,
-        bc_y=bc_y,
+    slopes = frequency_slopes(
+        E_L, E_C, rho, a, b,
+        ForwardModel.RAYLEIGH_RITZ, bc_x, bc_y, n_modes_x, n_modes_y,
     )
-
-    return result.frequencies_Hz[:n_return]
+    return [s * h_m for s in slopes[:n_return]]
 
 
 # =============================================================================
@@ -278,8 +270,8 @@ def solve_for_thickness(
 
     This is the simplest inverse problem: single mode, single parameter.
 
-    For the simple model, we can solve analytically since f ∝ h.
-    For Rayleigh-Ritz, we use numerical optimization.
+    Both forward models are linear in h, so the solution is analytic:
+    h = f_target / slope, with one (cached) forward solve for Rayleigh-Ritz.
 
     Args:
         target_f1_Hz: Target fundamental frequency (Hz)
@@ -314,20 +306,10 @@ def solve_for_thickness(
         n_iter = 1
 
     else:  # Rayleigh-Ritz
-        # Numerical optimization
-        def objective(h_mm: float) -> float:
-            h_m = h_mm * 1e-3
-            freqs = _forward_rayleigh_ritz(h_m, E_L, E_C, rho, a, b, n_return=1)
-            return (freqs[0] - target_free_Hz) ** 2
-
-        # Bracket search
-        result = optimize.minimize_scalar(
-            objective,
-            bounds=(constraints.h_min_mm, constraints.h_max_mm),
-            method="bounded",
-        )
-        h_opt_m = result.x * 1e-3
-        n_iter = result.nfev
+        # f ∝ h exactly, so the cached per-metre frequency gives h directly
+        slope = frequency_slopes(E_L, E_C, rho, a, b)[0]
+        h_opt_m = target_free_Hz / slope
+        n_iter = 1
 
     # Apply constraints
     h_opt_mm = h_opt_m * 1e3
@@ -455,37 +437,41 @@ class InverseDesignProblem:
         """Clear all targets."""
         self.targets.clear()
 
+    def _slopes(self) -> Tuple[float, ...]:
+        """Cached free-plate frequencies per metre of thickness."""
+        return frequency_slopes(
+            self.E_L,
+            self.E_C,
+            self.rho,
+            self.a,
+            self.b,
+            self.forward_model,
+            self.bc_x,
+            self.bc_y,
+        )
+
     def _compute_frequencies(self, h_m: float) -> List[float]:
         """Compute frequencies at given thickness."""
         n_modes_needed = (
             max(t.mode_index + 1 for t in self.targets) if self.targets else 5
         )
 
-        if self.forward_model == ForwardModel.SIMPLE:
-            freqs = _forward_simple(
-                h_m,
-                self.E_L,
-                self.E_C,
-                self.rho,
-                self.a,
-                self.b,
-                n_modes=n_modes_needed,
-            )
-        else:
-            freqs = _forward_rayleigh_ritz(
-                h_m,
-                self.E_L,
-                self.E_C,
-                self.rho,
-                self.a,
-                self.b,
-                bc_x=self.bc_x,
-                bc_y=self.bc_y,
-                n_return=n_modes_needed,
-            )
-
         # Apply gamma for box frequencies
-        return [f * self.gamma for f in freqs]
+        return [s * h_m * self.gamma for s in self._slopes()[:n_modes_needed]]
+
+    def _closed_form_thickness_mm(self) -> Optional[float]:
+        """Exact minimizer of _objective over all h, or None if no target
+        mode is available from the forward model."""
+        slopes = self._slopes()
+        usable = [t for t in self.targets if t.mode_index < len(slopes)]
+        if not usable:
+            return None
+        h_m = _weighted_thickness(
+            np.array([slopes[t.mode_index] * self.gamma for t in usable]),
+            np.array([t.frequency_Hz for t in usable]),
+            np.array([t.weight for t in usable]),
+        )
+        return float(h_m) * 1e3
 
     def _objective(self, h_mm: float) -> float:
         """Weighted RMS error objective function."""
@@ -537,8 +523,14 @@ class InverseDesignProblem:
 
         self._eval_count = 0
 
-        # Solve
-        if method == "bounded":
+        # Solve. Frequencies are linear in h, so _objective is a quadratic in
+        # h and its unconstrained minimum, clamped below, is the bounded one.
+        h_closed_mm = self._closed_form_thickness_mm() if method == "bounded" else None
+        if h_closed_mm is not None:
+            self._eval_count = 1
+            h_opt_mm = h_closed_mm
+            converged = math.isfinite(h_opt_mm)
+        elif method == "bounded":
             result = optimize.minimize_scalar(
                 self._objective,
                 bounds=(constraints.h_min_mm, constraints.h_max_mm),
@@ -571,27 +563,8 @@ class InverseDesignProblem:
 
         # Build result
         target_freqs = [t.frequency_Hz for t in self.targets]
-        achieved_freqs = []
-        errors_Hz = []
-        errors_pct = []
-
-        for target in self.targets:
-            idx = target.mode_index
-            if idx < len(achieved):
-                f_achieved = achieved[idx]
-                achieved_freqs.append(f_achieved)
-                err = f_achieved - target.frequency_Hz
-                errors_Hz.append(err)
-                errors_pct.append(100.0 * err / target.frequency_Hz)
-            else:
-                achieved_freqs.append(0.0)
-                errors_Hz.append(float("inf"))
-                errors_pct.append(float("inf"))
-
-        rms_error = (
-            math.sqrt(sum(e**2 for e in errors_Hz) / len(errors_Hz))
-            if errors_Hz
-            else 0.0
+        achieved_freqs, errors_Hz, errors_pct, rms_error = _target_errors(
+            self.targets, achieved
         )
 
         return InverseSolverResult(
@@ -729,3 +702,12 @@ def format_inverse_solver_report(result: InverseSolverResult) -> str:
 
     lines.append("")
     return "\n".join(lines)
+
+
+# --- Closed-form fits and batch grading (inverse_fast.py) ---
+from .inverse_fast import (  # noqa: E402
+    _target_errors,
+    _weighted_thickness,
+    frequency_slopes,
+    solve_thickness_batch,
+)
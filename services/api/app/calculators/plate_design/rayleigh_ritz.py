@@ -336,6 +336,54 @@ def gauss_legendre(n_quad: int):
     return xi, w
 
 
+@lru_cache(maxsize=32)
+def unit_basis_table(
+    bc: BoundaryCondition,
+    n_modes: int,
+    n_quad: int,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Basis values and derivatives at the Gauss nodes of the unit interval.
+
+    Every basis family is a function of x/L, so the table for a plate of
+    length L follows by scaling: φ is unchanged, φ' by 1/L, φ'' by 1/L², and
+    the weights by L. Caching on (bc, n_modes, n_quad) alone therefore lets
+    every plate size — and every iteration of the inverse solver — share one
+    table.
+
+    Returns:
+        (table, weights): table has shape (3, n_modes, n_quad) holding φ, φ'
+        and φ'' for modes 1..n_modes; weights has shape (n_quad,). Both are
+        shared and read-only.
+    """
+    xi, w = gauss_legendre(n_quad)
+    u = 0.5 * (xi + 1.0)
+    basis = get_basis_function(bc)
+    table = np.array([basis(m, 1.0, u) for m in range(1, n_modes + 1)], dtype=np.float64)
+    table = np.ascontiguousarray(table.transpose(1, 0, 2))
+    weights = 0.5 * w
+    table.flags.writeable = False
+    weights.flags.writeable = False
+    return table, weights
+
+
+def _edge_integrals(
+    bc: BoundaryCondition,
+    n_modes: int,
+    L: float,
+    n_quad: int,
+) -> NDArray[np.float64]:
+    """
+    One-dimensional integrals of basis-derivative products along one edge.
+
+    I[p, q, i, j] = ∫₀ᴸ φᵢ⁽ᵖ⁾ φⱼ⁽q⁾ dx for derivative orders p, q in 0..2.
+    """
+    table, weights = unit_basis_table(bc, n_modes, n_quad)
+    scale = np.array([1.0, 1.0 / L, 1.0 / (L * L)])
+    derivs = table * scale[:, None, None]
+    return np.einsum("pik,k,qjk->pqij", derivs, weights * L, derivs)
+
+
 def compute_stiffness_matrix(
     plate: OrthotropicPlate,
     n_modes_x: int,
@@ -351,6 +399,10 @@ def compute_stiffness_matrix(
               + D₁₂ (φᵢ'' ψᵢ × φⱼ ψⱼ'' + φᵢ ψᵢ'' × φⱼ'' ψⱼ)
               + 4D₆₆ φᵢ' ψᵢ' × φⱼ' ψⱼ'] dx dy
 
+    The trial functions are separable, so each term is the Kronecker product
+    of an x-integral and a y-integral; the tensor-product quadrature gives
+    the same values as summing over the full 2D grid.
+
     Args:
         plate: Orthotropic plate properties
         n_modes_x: Number of modes in x direction
@@ -362,95 +414,15 @@ def compute_stiffness_matrix(
     Returns:
         Stiffness matrix K (n_modes_x × n_modes_y, n_modes_x × n_modes_y)
     """
-    n_total = n_modes_x * n_modes_y
-
-    # Quadrature points and weights (Gauss-Legendre)
-    xi_x, w_x = gauss_legendre(n_quad)
-    xi_y, w_y = gauss_legendre(n_quad)
-
-    # Map to physical coordinates [0, a] and [0, b]
-    x = 0.5 * plate.a * (xi_x + 1)
-    y = 0.5 * plate.b * (xi_y + 1)
-    wx = 0.5 * plate.a * w_x
-    wy = 0.5 * plate.b * w_y
-
-    # Get basis functions
-    basis_x = get_basis_function(bc_x)
-    basis_y = get_basis_function(bc_y)
-
-    # Precompute basis function values
-    phi_x = []
-    dphi_x = []
-    d2phi_x = []
-    for m in range(1, n_modes_x + 1):
-        p, dp, d2p = basis_x(m, plate.a, x)
-        phi_x.append(p)
-        dphi_x.append(dp)
-        d2phi_x.append(d2p)
-
-    psi_y = []
-    dpsi_y = []
-    d2psi_y = []
-    for n in range(1, n_modes_y + 1):
-        p, dp, d2p = basis_y(n, plate.b, y)
-        psi_y.append(p)
-        dpsi_y.append(dp)
-        d2psi_y.append(d2p)
-
-    # Build stiffness matrix
-    K = np.zeros((n_total, n_total))
-
-    for i in range(n_total):
-        mi = i // n_modes_y
-        ni = i % n_modes_y
-
-        for j in range(i, n_total):
-            mj = j // n_modes_y
-            nj = j % n_modes_y
-
-            # Integrate over plate area
-            integral = 0.0
-
-            for qx in range(n_quad):
-                for qy in range(n_quad):
-                    # Basis function values at quadrature point
-                    phi_i = phi_x[mi][qx]
-                    dphi_i = dphi_x[mi][qx]
-                    d2phi_i = d2phi_x[mi][qx]
-                    psi_i = psi_y[ni][qy]
-                    dpsi_i = dpsi_y[ni][qy]
-                    d2psi_i = d2psi_y[ni][qy]
-
-                    phi_j = phi_x[mj][qx]
-                    dphi_j = dphi_x[mj][qx]
-                    d2phi_j = d2phi_x[mj][qx]
-                    psi_j = psi_y[nj][qy]
-                    dpsi_j = dpsi_y[nj][qy]
-                    d2psi_j = d2psi_y[nj][qy]
-
-                    # D₁₁ term: (∂²w/∂x²)²
-                    term_D11 = plate.D11 * (d2phi_i * psi_i) * (d2phi_j * psi_j)
-
-                    # D₂₂ term: (∂²w/∂y²)²
-                    term_D22 = plate.D22 * (phi_i * d2psi_i) * (phi_j * d2psi_j)
-
-                    # D₁₂ term: (∂²w/∂x²)(∂²w/∂y²)
-                    term_D12 = plate.D12 * (
-                        (d2phi_i * psi_i) * (phi_j * d2psi_j)
-                        + (phi_i * d2psi_i) * (d2phi_j * psi_j)
-                    )
-
-                    # D₆₆ term: (∂²w/∂x∂y)²
-                    term_D66 = 4.0 * plate.D66 * (dphi_i * dpsi_i) * (dphi_j * dpsi_j)
-
-                    # Sum and weight
-                    integrand = term_D11 + term_D22 + term_D12 + term_D66
-                    integral += integrand * wx[qx] * wy[qy]
-
-            K[i, j] = integral
-            K[j, i] = integral  # Symmetric
-
-    return K
+    X = _edge_integrals(bc_x, n_modes_x, plate.a, n_quad)
+    Y = _edge_integrals(bc_y, n_modes_y, plate.b, n_quad)
+
+    # Row index i = mi * n_modes_y + ni, matching np.kron(x_part, y_part)
+    K = plate.D11 * np.kron(X[2, 2], Y[0, 0])
+    K += plate.D22 * np.kron(X[0, 0], Y[2, 2])
+    K += plate.D12 * (np.kron(X[2, 0], Y[0, 2]) + np.kron(X[0, 2], Y[2, 0]))
+    K += 4.0 * plate.D66 * np.kron(X[1, 1], Y[1, 1])
+    return 0.5 * (K + K.T)  # exact symmetry, as the eigensolver assumes
 
 
 def compute_mass_matrix(
@@ -477,59 +449,33 @@ def compute_mass_matrix(
     Returns:
         Mass matrix M (n_total, n_total)
     """
-    n_total = n_modes_x * n_modes_y
+    X = _edge_integrals(bc_x, n_modes_x, plate.a, n_quad)
+    Y = _edge_integrals(bc_y, n_modes_y, plate.b, n_quad)
+    M = plate.mass_per_area * np.kron(X[0, 0], Y[0, 0])
+    return 0.5 * (M + M.T)
 
-    # Quadrature points
-    xi_x, w_x = gauss_legendre(n_quad)
-    xi_y, w_y = gauss_legendre(n_quad)
 
-    x = 0.5 * plate.a * (xi_x + 1)
-    y = 0.5 * plate.b * (xi_y + 1)
-    wx = 0.5 * plate.a * w_x
-    wy = 0.5 * plate.b * w_y
-
-    # Get basis functions
-    basis_x = get_basis_function(bc_x)
-    basis_y = get_basis_function(bc_y)
-
-    # Precompute basis function values (only need φ, ψ - not derivatives)
-    phi_x = []
-    for m in range(1, n_modes_x + 1):
-        p, _, _ = basis_x(m, plate.a, x)
-        phi_x.append(p)
-
-    psi_y = []
-    for n in range(1, n_modes_y + 1):
-        p, _, _ = basis_y(n, plate.b, y)
-        psi_y.append(p)
-
-    # Build mass matrix
-    M = np.zeros((n_total, n_total))
-
-    for i in range(n_total):
-        mi = i // n_modes_y
-        ni = i % n_modes_y
-
-        for j in range(i, n_total):
-            mj = j // n_modes_y
-            nj = j % n_modes_y
-
-            integral = 0.0
-
-            for qx in range(n_quad):
-                for qy in range(n_quad):
-                    phi_i = phi_x[mi][qx]
-                    psi_i = psi_y[ni][qy]
-                    phi_j = phi_x[mj][qx]
-                    psi_j = psi_y[nj][qy]
-
-                    integrand = (phi_i * psi_i) * (phi_j * psi_j)
-                    integral += integrand * wx[qx] * wy[qy]
+def generalized_eigh(
+    K: NDArray[np.float64],
+    M: NDArray[np.float64],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Solve K v = λ M v for symmetric K and symmetric positive-definite M.
 
-            M[i, j] = plate.mass_per_area * integral
-            M[j, i] = M[i, j]  # Symmetric
+    Reduces to a standard symmetric problem through the Cholesky factor
+    M = L Lᵀ, so the eigenvalues come out real and ascending without forming
+    inv(M) @ K. Eigenvectors are scaled to unit 2-norm.
 
-    return M
+    Raises:
+        np.linalg.LinAlgError: If M is not positive definite.
+    """
+    chol = np.linalg.cholesky(M)
+    chol_inv = np.linalg.solve(chol, np.eye(len(M)))
+    A = chol_inv @ K @ chol_inv.T
+    eigenvalues, Z = np.linalg.eigh(0.5 * (A + A.T))
+    eigenvectors = chol_inv.T @ Z
+    eigenvectors /= np.linalg.norm(eigenvectors, axis=0)
+    return eigenvalues, eigenvectors
 
 
 # =============================================================================
@@ -568,6 +514,10 @@ class RayleighRitzResult:
     K: NDArray[np.float64]
     M: NDArray[np.float64]
 
+    # Trial-function grid (0 = unknown, assume square)
+    n_modes_x: int = 0
+    n_modes_y: int = 0
+
     @property
     def n_modes(self) -> int:
         return len(self.modes)
@@ -594,29 +544,18 @@ class RayleighRitzResult:
             2D array of mode shape values w(x, y)
         """
         mode = self.modes[mode_index]
-        n_modes_x = int(math.sqrt(len(mode.coefficients)))
-        n_modes_y = n_modes_x
+        n_modes_y = self.n_modes_y or int(math.sqrt(len(mode.coefficients)))
+        n_modes_x = len(mode.coefficients) // n_modes_y
 
         basis_x = get_basis_function(self.bc_x)
         basis_y = get_basis_function(self.bc_y)
 
-        # Evaluate mode shape
-        X, Y = np.meshgrid(x, y, indexing="ij")
-        w = np.zeros_like(X)
+        phi = np.array([basis_x(m, self.plate.a, x)[0] for m in range(1, n_modes_x + 1)])
+        psi = np.array([basis_y(n, self.plate.b, y)[0] for n in range(1, n_modes_y + 1)])
 
-        for i, c in enumerate(mode.coefficients):
-            mi = i // n_modes_y
-            ni = i % n_modes_y
-
-            phi, _, _ = basis_x(mi + 1, self.plate.a, x)
-            psi, _, _ = basis_y(ni + 1, self.plate.b, y)
-
-            # Outer product
-            for ix in range(len(x)):
-                for iy in range(len(y)):
-                    w[ix, iy] += c * phi[ix] * psi[iy]
-
-        return w
+        # w[ix, iy] = Σ C[m, n] φₘ(x) ψₙ(y)
+        C = mode.coefficients.reshape(n_modes_x, n_modes_y)
+        return phi.T @ C @ psi
 
 
 def solve_rayleigh_ritz(
@@ -650,16 +589,14 @@ def solve_rayleigh_ritz(
     # Solve generalized eigenvalue problem: K v = λ M v
     # where λ = ω²
     try:
-        eigenvalues, eigenvectors = np.linalg.eig(np.linalg.inv(M) @ K)
+        eigenvalues, eigenvectors = generalized_eigh(K, M)
     except np.linalg.LinAlgError:
-        # Fallback to scipy if available
+        # Singular mass matrix: fall back to the uncoupled (diagonal) estimate
         eigenvalues = np.diag(K) / np.diag(M)
         eigenvectors = np.eye(len(eigenvalues))
-
-    # Sort by eigenvalue (frequency)
-    idx = np.argsort(np.real(eigenvalues))
-    eigenvalues = np.real(eigenvalues[idx])
-    eigenvectors = np.real(eigenvectors[:, idx])
+        idx = np.argsort(eigenvalues)
+        eigenvalues = eigenvalues[idx]
+        eigenvectors = eigenvectors[:, idx]
 
     # Filter out negative/zero eigenvalues (numerical artifacts)
     valid = eigenvalues > 1e-6
@@ -696,6 +633,8 @@ def solve_rayleigh_ritz(
         modes=modes,
         K=K,
         M=M,
+        n_modes_x=n_modes_x,
+        n_modes_y=n_modes_y,
     )
 
 
@@ -11,7 +11,7 @@ Features:
 - Parametric archtop profile generation (ellipsoidal dome with recurve)
 - Parallel-plane (waterline) roughing strategy
 - Raster finishing with ball-end scallop control
-- Tool compensation for ball/bull nose mills
+- Drop-cutter tool compensation for ball, flat and bull nose mills
 
 Usage:
     from app.cam.carving import CarvingPipeline, CarvingConfig, GraduationMap
@@ -48,6 +48,18 @@ from .graduation_map import (
     GraduationPoint,
 )
 
+from .graduation_map_array import (
+    thickness_array,
+    surface_z_array,
+    inside_outline_array,
+)
+
+from .drop_cutter import (
+    HeightGrid,
+    cutter_profile,
+    drop_cutter_z,
+)
+
 from .surface_carving import (
     SurfaceCarvingGenerator,
     CarvingResult,
@@ -78,6 +90,13 @@ __all__ = [
     # Graduation Map
     "GraduationMap",
     "GraduationPoint",
+    "thickness_array",
+    "surface_z_array",
+    "inside_outline_array",
+    # Drop Cutter
+    "HeightGrid",
+    "cutter_profile",
+    "drop_cutter_z",
     # Surface Carving
     "SurfaceCarvingGenerator",
     "CarvingResult",
@@ -0,0 +1,163 @@
+# app/cam/carving/drop_cutter.py
+
+"""
+Drop-Cutter Tool Compensation (BEN-GAP-08)
+
+Finds the lowest tool-tip Z at which a cutter touches, but does not gouge,
+a surface sampled on a regular height grid. The cutter footprint is sampled
+on concentric rings and each sample is lowered by the cutter's own profile
+(ball, flat or bull nose), so slopes and edges are compensated correctly
+instead of assuming point contact under the tool centre.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .config import CarvingToolSpec
+from .graduation_map import GraduationMap
+from .graduation_map_array import surface_z_array
+
+
+@dataclass
+class HeightGrid:
+    """Surface Z sampled on a regular XY grid (rows along Y, columns along X)."""
+    z: np.ndarray
+    x0_mm: float
+    y0_mm: float
+    cell_mm: float
+
+    @classmethod
+    def from_graduation_map(
+        cls,
+        grad_map: GraduationMap,
+        stock_thickness_mm: float,
+        cell_mm: float = 0.5,
+        margin_mm: float = 0.0,
+    ) -> "HeightGrid":
+        """
+        Sample a graduation map's surface Z over its bounds.
+
+        margin_mm extends the grid past the bounds so a tool hanging over
+        the edge still sees the surface there (edge thickness).
+        """
+        x_min, x_max = grad_map.config.bounds_x_mm
+        y_min, y_max = grad_map.config.bounds_y_mm
+        x0 = x_min - margin_mm
+        y0 = y_min - margin_mm
+        nx = int(math.ceil((x_max + margin_mm - x0) / cell_mm)) + 1
+        ny = int(math.ceil((y_max + margin_mm - y0) / cell_mm)) + 1
+
+        xs = x0 + np.arange(nx) * cell_mm
+        ys = y0 + np.arange(ny) * cell_mm
+        z = surface_z_array(grad_map, xs[None, :], ys[:, None], stock_thickness_mm)
+        return cls(z=z, x0_mm=x0, y0_mm=y0, cell_mm=cell_mm)
+
+    @classmethod
+    def for_tool(
+        cls,
+        grad_map: GraduationMap,
+        stock_thickness_mm: float,
+        tool: CarvingToolSpec,
+    ) -> "HeightGrid":
+        """Grid fine enough for drop_cutter_z with this tool (quarter-radius cells, at most 0.5 mm)."""
+        radius = tool.diameter_mm / 2
+        return cls.from_graduation_map(
+            grad_map,
+            stock_thickness_mm,
+            cell_mm=min(0.5, max(radius / 4, 0.05)),
+            margin_mm=radius,
+        )
+
+    def sample(self, x_mm, y_mm) -> np.ndarray:
+        """Bilinear surface Z at arbitrary points; clamped outside the grid."""
+        ny, nx = self.z.shape
+        fx = np.clip((np.asarray(x_mm) - self.x0_mm) / self.cell_mm, 0.0, nx - 1)
+        fy = np.clip((np.asarray(y_mm) - self.y0_mm) / self.cell_mm, 0.0, ny - 1)
+
+        i = np.minimum(fx.astype(np.intp), nx - 2)
+        j = np.minimum(fy.astype(np.intp), ny - 2)
+        tx = fx - i
+        ty = fy - j
+
+        z = self.z
+        return (
+            z[j, i] * (1 - tx) * (1 - ty) +
+            z[j, i + 1] * tx * (1 - ty) +
+            z[j + 1, i] * (1 - tx) * ty +
+            z[j + 1, i + 1] * tx * ty
+        )
+
+
+def cutter_profile(tool: CarvingToolSpec, r_mm: np.ndarray) -> np.ndarray:
+    """
+    Height of the cutter's underside above its tip at radial distance r_mm.
+
+    ball_end: spherical, flat_end: zero, bull_nose: flat up to
+    radius - corner_radius, then a torus of corner_radius.
+    """
+    radius = tool.diameter_mm / 2
+    r = np.minimum(np.asarray(r_mm, dtype=np.float64), radius)
+
+    if tool.type == "ball_end":
+        return radius - np.sqrt(np.maximum(radius * radius - r * r, 0.0))
+
+    if tool.type == "bull_nose" and tool.corner_radius_mm > 0:
+        rc = min(tool.corner_radius_mm, radius)
+        d = np.maximum(r - (radius - rc), 0.0)
+        return rc - np.sqrt(np.maximum(rc * rc - d * d, 0.0))
+
+    return np.zeros_like(r)
+
+
+def _footprint(radius_mm: float, cell_mm: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ring samples of a cutter footprint no further apart than cell_mm."""
+    rings = max(2, int(math.ceil(radius_mm / cell_mm)))
+    dx = [0.0]
+    dy = [0.0]
+    for k in range(1, rings + 1):
+        r = radius_mm * k / rings
+        count = max(6, int(math.ceil(2 * math.pi * r / cell_mm)))
+        theta = 2 * math.pi * np.arange(count) / count
+        dx.extend((r * np.cos(theta)).tolist())
+        dy.extend((r * np.sin(theta)).tolist())
+    dx_arr = np.asarray(dx)
+    dy_arr = np.asarray(dy)
+    return dx_arr, dy_arr, np.hypot(dx_arr, dy_arr)
+
+
+def drop_cutter_z(
+    heights: HeightGrid,
+    tool: CarvingToolSpec,
+    x_mm,
+    y_mm,
+    chunk_points: int = 4096,
+) -> np.ndarray:
+    """
+    Tool-tip Z for a cutter centred at each (x_mm, y_mm).
+
+    For every footprint sample the cutter may sit no lower than the surface
+    minus the profile height there; the tip Z is the maximum over samples.
+    """
+    x = np.asarray(x_mm, dtype=np.float64).ravel()
+    y = np.asarray(y_mm, dtype=np.float64).ravel()
+    radius = tool.diameter_mm / 2
+
+    if radius <= 0:
+        return heights.sample(x, y)
+
+    dx, dy, dr = _footprint(radius, heights.cell_mm)
+    lift = cutter_profile(tool, dr)
+
+    out = np.empty(len(x), dtype=np.float64)
+    for start in range(0, len(x), chunk_points):
+        stop = start + chunk_points
+        px = x[start:stop, None] + dx[None, :]
+        py = y[start:stop, None] + dy[None, :]
+        out[start:stop] = (heights.sample(px, py) - lift[None, :]).max(axis=1)
+
+    return out
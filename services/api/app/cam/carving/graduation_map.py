@@ -15,7 +15,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
+import numpy as np
+
 from .config import GraduationMapConfig, SurfaceType, AsymmetricCarveProfile
+from .graduation_map_array import thickness_array
 
 
 @dataclass
@@ -321,26 +324,21 @@ class GraduationMap:
         # z = -(stock - thickness) => thickness = stock + z
         thickness_threshold = stock_thickness_mm + z_level_mm
 
-        points = []
         x_min, x_max = self.config.bounds_x_mm
         y_min, y_max = self.config.bounds_y_mm
 
-        # Scan at resolution
-        for i in range(resolution):
-            angle = 2 * math.pi * i / resolution
-            # Radial search from center
-            for r_step in range(50):
-                r = r_step * 0.02  # 0 to 1 in 50 steps
-                x = (x_max + x_min) / 2 + r * (x_max - x_min) / 2 * math.cos(angle)
-                y = (y_max + y_min) / 2 + r * (y_max - y_min) / 2 * math.sin(angle)
-
-                thickness = self.get_thickness_at(x, y)
-                if thickness <= thickness_threshold:
-                    # Found contour crossing
-                    points.append((x, y))
-                    break
-
-        return points
+        # Radial search from center: all resolution x 50 samples at once
+        angle = 2 * math.pi * np.arange(resolution) / resolution
+        r = np.arange(50) * 0.02  # 0 to 1 in 50 steps
+        x = (x_max + x_min) / 2 + r[None, :] * (x_max - x_min) / 2 * np.cos(angle)[:, None]
+        y = (y_max + y_min) / 2 + r[None, :] * (y_max - y_min) / 2 * np.sin(angle)[:, None]
+
+        crossed = thickness_array(self, x, y) <= thickness_threshold
+
+        # First crossing along each ray
+        rays = np.flatnonzero(crossed.any(axis=1))
+        steps = crossed[rays].argmax(axis=1)
+        return list(zip(x[rays, steps].tolist(), y[rays, steps].tolist()))
 
     def generate_z_levels(
         self,
@@ -0,0 +1,222 @@
+# app/cam/carving/graduation_map_array.py
+
+"""
+Vectorized Graduation Map Evaluation (BEN-GAP-08)
+
+Array counterparts of GraduationMap's per-point queries (thickness, surface
+Z, outline containment). Inputs broadcast against each other, so a raster
+line or the X/Y axes of a mesh grid are evaluated in one call; results match
+the scalar methods point for point.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .config import GraduationMapConfig, SurfaceType
+
+if TYPE_CHECKING:
+    from .graduation_map import GraduationMap
+
+
+def _points(x_mm, y_mm):
+    x = np.asarray(x_mm, dtype=np.float64)
+    y = np.asarray(y_mm, dtype=np.float64)
+    return np.broadcast_arrays(x, y)
+
+
+def thickness_array(grad_map: "GraduationMap", x_mm, y_mm) -> np.ndarray:
+    """Vectorized GraduationMap.get_thickness_at."""
+    x, y = _points(x_mm, y_mm)
+    config = grad_map.config
+
+    if not grad_map.thickness_grid:
+        return _parametric_thickness(config, x, y)
+
+    x_min, x_max = config.bounds_x_mm
+    y_min, y_max = config.bounds_y_mm
+    outside = (x < x_min) | (x > x_max) | (y < y_min) | (y > y_max)
+
+    dx = (x_max - x_min) / (config.grid_size_x - 1)
+    dy = (y_max - y_min) / (config.grid_size_y - 1)
+
+    # Truncation matches int() for in-bounds points; clip keeps the
+    # out-of-bounds ones indexable (they are overwritten below)
+    i = np.clip(np.trunc((x - x_min) / dx), 0, config.grid_size_x - 2).astype(np.intp)
+    j = np.clip(np.trunc((y - y_min) / dy), 0, config.grid_size_y - 2).astype(np.intp)
+
+    tx = (x - np.asarray(grad_map._x_coords)[i]) / dx
+    ty = (y - np.asarray(grad_map._y_coords)[j]) / dy
+
+    grid = np.asarray(grad_map.thickness_grid, dtype=np.float64)
+    t00 = grid[j, i]
+    t10 = grid[j, i + 1]
+    t01 = grid[j + 1, i]
+    t11 = grid[j + 1, i + 1]
+
+    thickness = (
+        t00 * (1 - tx) * (1 - ty) +
+        t10 * tx * (1 - ty) +
+        t01 * (1 - tx) * ty +
+        t11 * tx * ty
+    )
+
+    return np.where(outside, config.edge_thickness_mm, thickness)
+
+
+def surface_z_array(
+    grad_map: "GraduationMap",
+    x_mm,
+    y_mm,
+    stock_thickness_mm: float,
+) -> np.ndarray:
+    """Vectorized GraduationMap.get_surface_z_at."""
+    return -(stock_thickness_mm - thickness_array(grad_map, x_mm, y_mm))
+
+
+def inside_outline_array(grad_map: "GraduationMap", x_mm, y_mm) -> np.ndarray:
+    """Vectorized GraduationMap.is_inside_outline: one ray-casting sweep per
+    outline edge over all points at once."""
+    x, y = _points(x_mm, y_mm)
+
+    if not grad_map.outline_points:
+        x_min, x_max = grad_map.config.bounds_x_mm
+        y_min, y_max = grad_map.config.bounds_y_mm
+        return (x_min <= x) & (x <= x_max) & (y_min <= y) & (y <= y_max)
+
+    outline = grad_map.outline_points
+    inside = np.zeros(x.shape, dtype=bool)
+    n = len(outline)
+
+    j = n - 1
+    for i in range(n):
+        xi, yi = outline[i]
+        xj, yj = outline[j]
+        j = i
+
+        straddles = (yi > y) != (yj > y)
+        if yi == yj or not straddles.any():
+            continue
+        crossing_x = (xj - xi) * (y - yi) / (yj - yi) + xi
+        inside ^= straddles & (x < crossing_x)
+
+    return inside
+
+
+def _parametric_thickness(config: GraduationMapConfig, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Vectorized GraduationMap._parametric_thickness."""
+    x_min, x_max = config.bounds_x_mm
+    y_min, y_max = config.bounds_y_mm
+
+    nx = 2 * (x - x_min) / (x_max - x_min) - 1
+    ny = 2 * (y - y_min) / (y_max - y_min) - 1
+    r = np.sqrt(nx * nx + ny * ny)
+
+    apex = config.apex_thickness_mm
+    edge = config.edge_thickness_mm
+    recurve = config.recurve_depth_mm
+
+    # Clamped so the r > 1 points (replaced by edge below) stay finite
+    dome_factor = np.sqrt(np.maximum(1 - r * r, 0.0))
+
+    if config.surface_type == SurfaceType.ARCHTOP:
+        base_thickness = edge + (apex - edge) * dome_factor
+        if recurve > 0:
+            recurve_factor = (r - 0.85) / 0.15
+            base_thickness = np.where(
+                r > 0.85,
+                base_thickness - recurve * recurve_factor * recurve_factor,
+                base_thickness,
+            )
+        thickness = np.maximum(edge * 0.8, base_thickness)
+    elif config.surface_type == SurfaceType.ARCHTOP_ASYMMETRIC:
+        thickness = _asymmetric_thickness(config, x, y)
+    elif config.surface_type == SurfaceType.CONCAVE:
+        thickness = apex - (apex - edge) * dome_factor
+    else:
+        thickness = apex - (apex - edge) * r
+
+    return np.where(r > 1.0, edge, thickness)
+
+
+def _asymmetric_thickness(config: GraduationMapConfig, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Vectorized GraduationMap._asymmetric_thickness."""
+    profile = config.asymmetric_profile
+    if profile is None:
+        return _parametric_thickness_symmetric(config, x, y)
+
+    x_min, x_max = config.bounds_x_mm
+    y_min, y_max = config.bounds_y_mm
+    half_width = (x_max - x_min) / 2
+    half_length = (y_max - y_min) / 2
+
+    apex = config.apex_thickness_mm
+    edge = config.edge_thickness_mm
+
+    center_x = (x_max + x_min) / 2
+    center_y = (y_max + y_min) / 2
+    peak_x = center_x + profile.peak_offset_x_mm
+    peak_y = center_y + profile.peak_offset_y_mm
+
+    nx = (x - peak_x) / profile.major_radius_mm if profile.major_radius_mm > 0 else np.zeros_like(x)
+    ny = (y - peak_y) / profile.minor_radius_mm if profile.minor_radius_mm > 0 else np.zeros_like(y)
+    r_ellipse = np.sqrt(nx * nx + ny * ny)
+
+    nx_body = (x - center_x) / half_width
+    ny_body = (y - center_y) / half_length
+    r_body = np.sqrt(nx_body * nx_body + ny_body * ny_body)
+
+    edge_zone = 1.0 - (profile.binding_ledge_mm / min(half_width, half_length))
+
+    # Slope zones, first match wins as in the scalar version
+    slope_deg = np.select(
+        [
+            r_body < profile.crown_zone_radius,
+            (np.abs(nx_body) > profile.cutaway_zone_x_min) & (ny_body < profile.cutaway_zone_y_max),
+            ny_body > 0.3,
+        ],
+        [profile.slope_crown_deg, profile.slope_cutaway_deg, profile.slope_lower_bout_deg],
+        default=profile.slope_average_deg,
+    )
+    slope_rad = np.radians(slope_deg)
+
+    dome_height = np.where(
+        r_ellipse >= 1.0,
+        0.0,
+        profile.total_rise_mm * np.cos(r_ellipse * math.pi / 2),
+    )
+
+    zone_factor = (r_body - profile.crown_zone_radius) / (1.0 - profile.crown_zone_radius)
+    slope_factor = 1.0 + zone_factor * (np.tan(slope_rad) - 0.05)
+    blended = dome_height * np.maximum(0.0, 1.0 - zone_factor * (slope_factor - 1.0) * 0.5)
+    dome_height = np.where(
+        (r_ellipse < 1.0) & (r_body > profile.crown_zone_radius), blended, dome_height
+    )
+
+    if profile.total_rise_mm > 0:
+        thickness = edge + (apex - edge) * (dome_height / profile.total_rise_mm)
+    else:
+        thickness = np.full_like(r_body, edge)
+
+    thickness = np.maximum(edge * 0.8, thickness)
+    return np.where((r_body > edge_zone) | (r_body > 1.0), edge, thickness)
+
+
+def _parametric_thickness_symmetric(
+    config: GraduationMapConfig, x: np.ndarray, y: np.ndarray
+) -> np.ndarray:
+    """Vectorized GraduationMap._parametric_thickness_symmetric."""
+    x_min, x_max = config.bounds_x_mm
+    y_min, y_max = config.bounds_y_mm
+
+    nx = 2 * (x - x_min) / (x_max - x_min) - 1
+    ny = 2 * (y - y_min) / (y_max - y_min) - 1
+    r = np.sqrt(nx * nx + ny * ny)
+
+    apex = config.apex_thickness_mm
+    edge = config.edge_thickness_mm
+    dome_factor = np.sqrt(np.maximum(1 - r * r, 0.0))
+    return np.where(r > 1.0, edge, edge + (apex - edge) * dome_factor)
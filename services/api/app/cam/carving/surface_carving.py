@@ -11,7 +11,9 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from .config import (
     CarvingConfig,
@@ -20,7 +22,9 @@ from .config import (
     RoughingConfig,
     FinishingConfig,
 )
+from .drop_cutter import HeightGrid, drop_cutter_z
 from .graduation_map import GraduationMap
+from .graduation_map_array import inside_outline_array
 from ..post_processor import PostProcessor, PostConfig, ToolSpec, ToolChangeMode
 
 from app.core.safety import safety_critical
@@ -85,8 +89,10 @@ class SurfaceCarvingGenerator:
     - RASTER_Y: Back-and-forth along Y axis
     - CONTOUR_FOLLOW: Follow thickness contours
 
-    Ball-end tool compensation:
-    - Tool center follows path offset by tool radius
+    Tool compensation:
+    - Roughing and finishing both drop the cutter (ball, flat or bull nose)
+      onto a precomputed height grid; every emitted Z is the tool tip,
+      roughing adds the finish allowance on top
     - Scallop height controlled by stepover
     """
 
@@ -100,6 +106,9 @@ class SurfaceCarvingGenerator:
         self.safe_z = config.safe_z_mm
         self.retract_z = config.retract_z_mm
 
+        # Tool-tip Z per roughing row, shared by every Z level
+        self._plane_rows: Dict[tuple, List[Tuple[float, np.ndarray, np.ndarray]]] = {}
+
     @safety_critical
     def generate_roughing(
         self,
@@ -136,6 +145,9 @@ class SurfaceCarvingGenerator:
 
         lines.append(f"( {len(z_levels)} Z levels )")
 
+        # Rows are cached per operation; the map may change between calls
+        self._plane_rows.clear()
+
         # Generate passes at each Z level
         for z_level in z_levels:
             carving_pass = self._generate_parallel_plane_pass(
@@ -197,27 +209,9 @@ class SurfaceCarvingGenerator:
 
         lines.append(f"( Finish stepover: {stepover_mm:.3f}mm )")
 
-        # Generate raster passes
-        strategy = self.config.finishing.strategy
-        if strategy == CarvingStrategy.RASTER_X:
-            passes = self._generate_raster_passes(
-                tool=tool,
-                stepover_mm=stepover_mm,
-                axis="x",
-            )
-        elif strategy == CarvingStrategy.RASTER_Y:
-            passes = self._generate_raster_passes(
-                tool=tool,
-                stepover_mm=stepover_mm,
-                axis="y",
-            )
-        else:
-            # Default to raster X
-            passes = self._generate_raster_passes(
-                tool=tool,
-                stepover_mm=stepover_mm,
-                axis="x",
-            )
+        # Generate raster passes (RASTER_Y along Y, everything else along X)
+        axis = "y" if self.config.finishing.strategy == CarvingStrategy.RASTER_Y else "x"
+        passes = self._generate_raster_passes(tool=tool, stepover_mm=stepover_mm, axis=axis)
 
         for i, carving_pass in enumerate(passes):
             result.passes.append(carving_pass)
@@ -266,33 +260,19 @@ class SurfaceCarvingGenerator:
         y_start = y_min + tool_radius
         y_end = y_max - tool_radius
 
-        # Generate zigzag pattern
-        y = y_start
-        direction = 1  # 1 = forward, -1 = reverse
-
         first_move = True
 
-        while y <= y_end:
-            # Scan along X at this Y
-            x_points = []
-            x = x_start if direction == 1 else x_end
-            x_step = stepover_mm if direction == 1 else -stepover_mm
-
-            while (direction == 1 and x <= x_end) or (direction == -1 and x >= x_start):
-                # Get surface Z at this point
-                surface_z = self.grad_map.get_surface_z_at(
-                    x, y, self.config.stock_thickness_mm
-                )
-
-                # Only cut if surface is below current Z level
-                # (after accounting for ball radius and finish allowance)
-                cutting_z = surface_z + tool_radius + finish_allowance_mm
-
-                if cutting_z < z_level:
-                    # Need to cut here
-                    x_points.append((x, max(cutting_z, z_level - tool.stepdown_mm)))
-
-                x += x_step
+        for y, xs, tip_z in self._plane_row_surfaces(
+            tool, x_start, x_end, y_start, y_end, stepover_mm
+        ):
+            # Only cut where the compensated tool tip (plus finish
+            # allowance) is below the current Z level
+            cutting_z = tip_z + finish_allowance_mm
+            cut = cutting_z < z_level
+            x_points = list(zip(
+                xs[cut].tolist(),
+                np.maximum(cutting_z[cut], z_level - tool.stepdown_mm).tolist(),
+            ))
 
             # Generate moves for this row
             if x_points:
@@ -318,12 +298,37 @@ class SurfaceCarvingGenerator:
                 # Retract
                 moves.append(CarvingMove(x_points[-1][0], y, self.retract_z))
 
-            # Next row
-            y += stepover_mm
-            direction *= -1  # Reverse direction
-
         return carving_pass
 
+    def _plane_row_surfaces(
+        self,
+        tool: CarvingToolSpec,
+        x_start: float,
+        x_end: float,
+        y_start: float,
+        y_end: float,
+        stepover_mm: float,
+    ) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+        """
+        Zigzag rows of the parallel-plane pattern as (y, xs, tip_z).
+
+        The rows are the same at every Z level, so the drop-cutter tip Z is
+        evaluated once per roughing operation, a whole row at a time.
+        """
+        key = (tool.tool_number, x_start, x_end, y_start, y_end, stepover_mm)
+        rows = self._plane_rows.get(key)
+        if rows is not None:
+            return rows
+
+        heights = HeightGrid.for_tool(self.grad_map, self.config.stock_thickness_mm, tool)
+        rows = []
+        for k, y in enumerate(_scan_coords(y_start, y_end, stepover_mm, True)):
+            xs = np.array(_scan_coords(x_start, x_end, stepover_mm, k % 2 == 0))
+            rows.append((y, xs, drop_cutter_z(heights, tool, xs, np.full_like(xs, y))))
+
+        self._plane_rows[key] = rows
+        return rows
+
     @safety_critical
     def _generate_raster_passes(
         self,
@@ -331,7 +336,12 @@ class SurfaceCarvingGenerator:
         stepover_mm: float,
         axis: str = "x",
     ) -> List[CarvingPass]:
-        """Generate raster finishing passes along specified axis."""
+        """
+        Generate raster finishing passes along specified axis.
+
+        Each raster line is evaluated as a whole: outline test and
+        drop-cutter Z against a height grid built once for the tool.
+        """
         passes = []
 
         x_min, x_max = self.grad_map.config.bounds_x_mm
@@ -342,94 +352,52 @@ class SurfaceCarvingGenerator:
         # Resolution along cut direction
         cut_resolution_mm = 1.0  # 1mm between points
 
+        heights = HeightGrid.for_tool(self.grad_map, self.config.stock_thickness_mm, tool)
+
         if axis == "x":
             # Raster along X, step along Y
-            y = y_min + tool_radius
-            direction = 1
-
-            while y <= y_max - tool_radius:
-                carving_pass = CarvingPass(pass_type="finish")
-                moves = carving_pass.moves
-
-                # Generate points along X
-                points = []
-                x = x_min + tool_radius if direction == 1 else x_max - tool_radius
-                x_step = cut_resolution_mm if direction == 1 else -cut_resolution_mm
-
-                while (direction == 1 and x <= x_max - tool_radius) or \
-                      (direction == -1 and x >= x_min + tool_radius):
-
-                    if self.grad_map.is_inside_outline(x, y):
-                        surface_z = self.grad_map.get_surface_z_at(
-                            x, y, self.config.stock_thickness_mm
-                        )
-                        # Compensate for ball end
-                        cutting_z = surface_z + tool_radius
-                        points.append((x, y, cutting_z))
-
-                    x += x_step
-
-                # Generate moves
-                if points:
-                    # Rapid to start
-                    moves.append(CarvingMove(points[0][0], points[0][1], self.safe_z))
-                    # Plunge
-                    moves.append(CarvingMove(
-                        points[0][0], points[0][1], points[0][2],
-                        feed_mm_min=tool.plunge_mm_min,
-                        is_plunge=True,
-                    ))
-                    # Cut
-                    for px, py, pz in points[1:]:
-                        moves.append(CarvingMove(px, py, pz, feed_mm_min=tool.feed_mm_min))
-                    # Retract
-                    moves.append(CarvingMove(points[-1][0], points[-1][1], self.retract_z))
-
-                    passes.append(carving_pass)
-
-                y += stepover_mm
-                direction *= -1
-
+            lines = _scan_coords(y_min + tool_radius, y_max - tool_radius, stepover_mm, True)
+            along = (x_min + tool_radius, x_max - tool_radius)
         else:  # axis == "y"
             # Raster along Y, step along X
-            x = x_min + tool_radius
-            direction = 1
-
-            while x <= x_max - tool_radius:
-                carving_pass = CarvingPass(pass_type="finish")
-                moves = carving_pass.moves
-
-                points = []
-                y = y_min + tool_radius if direction == 1 else y_max - tool_radius
-                y_step = cut_resolution_mm if direction == 1 else -cut_resolution_mm
-
-                while (direction == 1 and y <= y_max - tool_radius) or \
-                      (direction == -1 and y >= y_min + tool_radius):
-
-                    if self.grad_map.is_inside_outline(x, y):
-                        surface_z = self.grad_map.get_surface_z_at(
-                            x, y, self.config.stock_thickness_mm
-                        )
-                        cutting_z = surface_z + tool_radius
-                        points.append((x, y, cutting_z))
-
-                    y += y_step
-
-                if points:
-                    moves.append(CarvingMove(points[0][0], points[0][1], self.safe_z))
-                    moves.append(CarvingMove(
-                        points[0][0], points[0][1], points[0][2],
-                        feed_mm_min=tool.plunge_mm_min,
-                        is_plunge=True,
-                    ))
-                    for px, py, pz in points[1:]:
-                        moves.append(CarvingMove(px, py, pz, feed_mm_min=tool.feed_mm_min))
-                    moves.append(CarvingMove(points[-1][0], points[-1][1], self.retract_z))
-
-                    passes.append(carving_pass)
-
-                x += stepover_mm
-                direction *= -1
+            lines = _scan_coords(x_min + tool_radius, x_max - tool_radius, stepover_mm, True)
+            along = (y_min + tool_radius, y_max - tool_radius)
+
+        for k, fixed in enumerate(lines):
+            direction_forward = k % 2 == 0
+            steps = np.array(_scan_coords(along[0], along[1], cut_resolution_mm, direction_forward))
+            if axis == "x":
+                xs, ys = steps, np.full_like(steps, fixed)
+            else:
+                xs, ys = np.full_like(steps, fixed), steps
+
+            inside = inside_outline_array(self.grad_map, xs, ys)
+            xs, ys = xs[inside], ys[inside]
+            if len(xs) == 0:
+                continue
+
+            # Tool-tip Z compensated for the cutter shape
+            zs = drop_cutter_z(heights, tool, xs, ys)
+            points = list(zip(xs.tolist(), ys.tolist(), zs.tolist()))
+
+            carving_pass = CarvingPass(pass_type="finish")
+            moves = carving_pass.moves
+
+            # Rapid to start
+            moves.append(CarvingMove(points[0][0], points[0][1], self.safe_z))
+            # Plunge
+            moves.append(CarvingMove(
+                points[0][0], points[0][1], points[0][2],
+                feed_mm_min=tool.plunge_mm_min,
+                is_plunge=True,
+            ))
+            # Cut
+            for px, py, pz in points[1:]:
+                moves.append(CarvingMove(px, py, pz, feed_mm_min=tool.feed_mm_min))
+            # Retract
+            moves.append(CarvingMove(points[-1][0], points[-1][1], self.retract_z))
+
+            passes.append(carving_pass)
 
         return passes
 
@@ -513,3 +481,28 @@ class SurfaceCarvingGenerator:
 
         # Rough estimate: feed moves at feed rate, rapids at 2x
         return (total_distance / feed_mm_min) * 60
+
+
+def _scan_coords(start: float, end: float, step: float, forward: bool) -> List[float]:
+    """
+    Coordinates of one zigzag scan between start and end, inclusive.
+
+    Accumulates by repeated addition, exactly like a ``while x <= end:
+    x += step`` loop, so row positions are reproducible.
+    """
+    coords = []
+    if step <= 0:
+        return coords
+
+    if forward:
+        x = start
+        while x <= end:
+            coords.append(x)
+            x += step
+    else:
+        x = end
+        while x >= start:
+            coords.append(x)
+            x -= step
+
+    return coords
@@ -0,0 +1,331 @@
+# services/api/app/cam/chain_index.py
+"""
+Chain Index for Near-Linear Chain Deduplication
+
+Chain-level companion to spatial_hash.SpatialHash (which deduplicates points).
+
+The Problem:
+    Chain deduplicators compared every pair of chains, recomputing bounding
+    boxes and lengths from Python point lists for each pair:
+
+        for i, a in enumerate(chains):        # O(n) chains
+            for j, b in enumerate(chains):    # O(n) chains
+                if _bboxes_overlap(a, b):     # O(points) per pair!
+
+    A noisy edge-detected body with 20,000 chains is 400 million pair tests.
+
+The Solution:
+    Compute per-chain bounding boxes, lengths and endpoints once, as arrays,
+    and hash the relevant anchor points (endpoints, segment midpoints or
+    bounding-box corners) into grid cells sized to the query tolerance.
+    Each query only inspects the handful of chains in neighboring cells.
+
+Queries:
+    endpoints_near()        — chain endpoints within a radius of a point
+    duplicate_groups()      — chains with matching endpoints and similar length
+    parallel_groups()       — near-coincident parallel segments (2-point chains)
+    offset_duplicates()     — chains inset from another by a binding offset
+    nearest_continuation()  — closest endpoint of another chain to a chain end
+
+Usage:
+    from app.cam.chain_index import ChainIndex
+
+    index = ChainIndex([[(0, 0), (10, 0)], [(10.1, 0), (0.1, 0)]])
+    groups = index.duplicate_groups(tolerance=0.5)   # [[0, 1]]
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Coord = Tuple[float, float]
+
+START, END = 0, 1
+
+
+class _Grid:
+    """Uniform grid of point ids for box / radius candidate lookup."""
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        finite = np.flatnonzero(np.isfinite(points[:, 0]) & np.isfinite(points[:, 1]))
+        keys = np.floor(points[finite] / cell_size).astype(np.int64)
+        for idx, (kx, ky) in zip(finite.tolist(), keys.tolist()):
+            self.cells[(kx, ky)].append(idx)
+
+    def box(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Ids in cells overlapping [x0, x1] × [y0, y1] (a superset of hits)."""
+        c = self.cell_size
+        out: List[int] = []
+        for kx in range(math.floor(x0 / c), math.floor(x1 / c) + 1):
+            for ky in range(math.floor(y0 / c), math.floor(y1 / c) + 1):
+                ids = self.cells.get((kx, ky))
+                if ids:
+                    out.extend(ids)
+        return out
+
+
+class ChainIndex:
+    """
+    Precomputed geometry and spatial lookup for a list of point chains.
+
+    Attributes:
+        starts, ends: (n, 2) first / last point of each chain (NaN if empty)
+        bboxes: (n, 4) min_x, min_y, max_x, max_y (NaN if empty)
+        lengths: (n,) polyline length
+
+    Grids are built lazily per query type and cell size, so one index can
+    serve several tolerances.
+    """
+
+    def __init__(self, chains: Sequence[Sequence[Coord]]):
+        n = len(chains)
+        self.n = n
+        self.starts = np.full((n, 2), np.nan)
+        self.ends = np.full((n, 2), np.nan)
+        self.bboxes = np.full((n, 4), np.nan)
+        self.lengths = np.zeros(n)
+        self._grids: Dict[Tuple[str, float], _Grid] = {}
+        self._endpoints: Optional[np.ndarray] = None
+
+        arrays = [np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in chains]
+        counts = np.array([len(a) for a in arrays], dtype=np.intp)
+        nonempty = np.flatnonzero(counts)
+        if len(nonempty) == 0:
+            return
+
+        pts = np.concatenate([arrays[i] for i in nonempty.tolist()])
+        offsets = np.concatenate(([0], np.cumsum(counts[nonempty])[:-1]))
+        lasts = offsets + counts[nonempty] - 1
+
+        self.starts[nonempty] = pts[offsets]
+        self.ends[nonempty] = pts[lasts]
+        self.bboxes[nonempty, 0] = np.minimum.reduceat(pts[:, 0], offsets)
+        self.bboxes[nonempty, 1] = np.minimum.reduceat(pts[:, 1], offsets)
+        self.bboxes[nonempty, 2] = np.maximum.reduceat(pts[:, 0], offsets)
+        self.bboxes[nonempty, 3] = np.maximum.reduceat(pts[:, 1], offsets)
+
+        # Segment k joins point k to k+1; the one leaving each chain's last
+        # point crosses into the next chain and is zeroed
+        seg = np.zeros(len(pts))
+        seg[:-1] = np.hypot(np.diff(pts[:, 0]), np.diff(pts[:, 1]))
+        seg[lasts] = 0.0
+        self.lengths[nonempty] = np.add.reduceat(seg, offsets)
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def endpoints(self) -> np.ndarray:
+        """(2n, 2) starts followed by ends; row k is chain k % n, end k // n."""
+        if self._endpoints is None:
+            self._endpoints = np.concatenate((self.starts, self.ends))
+        return self._endpoints
+
+    def _grid(self, kind: str, cell_size: float) -> _Grid:
+        key = (kind, cell_size)
+        grid = self._grids.get(key)
+        if grid is None:
+            if kind == "endpoints":
+                points = self.endpoints
+            elif kind == "midpoints":
+                points = 0.5 * (self.starts + self.ends)
+            else:  # "corners": bounding-box minimum corner
+                points = self.bboxes[:, :2]
+            grid = _Grid(points, cell_size)
+            self._grids[key] = grid
+        return grid
+
+    # ------------------------------------------------------------------
+    # Endpoint queries
+    # ------------------------------------------------------------------
+
+    def endpoints_near(self, x: float, y: float, radius: float) -> List[Tuple[int, int]]:
+        """
+        Chain endpoints within radius of (x, y).
+
+        Returns:
+            (chain_index, START or END) pairs, ordered by chain index
+        """
+        if radius <= 0:
+            return []
+        ids = self._grid("endpoints", radius).box(x - radius, y - radius, x + radius, y + radius)
+        if not ids:
+            return []
+        ids_arr = np.array(ids, dtype=np.intp)
+        points = self.endpoints[ids_arr]
+        hit = ids_arr[np.hypot(points[:, 0] - x, points[:, 1] - y) <= radius]
+        return sorted((int(k % self.n), int(k // self.n)) for k in hit)
+
+    def nearest_continuation(
+        self,
+        chain: int,
+        end: int,
+        radius: float,
+    ) -> Optional[Tuple[int, int, float]]:
+        """
+        Closest endpoint of another chain to one end of chain.
+
+        Args:
+            chain: Chain whose end is being continued
+            end: START or END of that chain
+            radius: Search radius
+
+        Returns:
+            (chain_index, START or END, distance), or None if nothing within radius
+        """
+        x, y = (self.starts if end == START else self.ends)[chain]
+        best: Optional[Tuple[int, int, float]] = None
+        for other, other_end in self.endpoints_near(x, y, radius):
+            if other == chain:
+                continue
+            ox, oy = (self.starts if other_end == START else self.ends)[other]
+            dist = math.hypot(ox - x, oy - y)
+            if best is None or dist < best[2]:
+                best = (other, other_end, dist)
+        return best
+
+    # ------------------------------------------------------------------
+    # Deduplication queries
+    # ------------------------------------------------------------------
+
+    def duplicate_groups(
+        self,
+        tolerance: float,
+        length_ratio: float = 0.10,
+    ) -> List[List[int]]:
+        """
+        Group chains whose endpoints coincide and whose lengths agree.
+
+        Chain j duplicates chain i when both endpoints match within tolerance
+        (in either direction) and their lengths differ by at most length_ratio
+        of the longer one. Groups are formed greedily in index order: each
+        ungrouped chain i collects every later ungrouped duplicate of itself.
+
+        Returns:
+            Every chain exactly once, as groups led by their lowest index
+        """
+        taken = np.zeros(self.n, dtype=bool)
+        groups: List[List[int]] = []
+
+        for i in range(self.n):
+            if taken[i]:
+                continue
+            group = [i]
+            la = self.lengths[i]
+            if la >= 1e-6 and tolerance > 0:
+                sx, sy = self.starts[i]
+                for j, j_end in self.endpoints_near(sx, sy, tolerance):
+                    if j <= i or taken[j]:
+                        continue
+                    lb = self.lengths[j]
+                    if lb < 1e-6 or abs(la - lb) / max(la, lb) > length_ratio:
+                        continue
+                    # Start matched j's start (forward) or end (reverse); the
+                    # other ends must match too
+                    far = self.ends[j] if j_end == START else self.starts[j]
+                    if math.hypot(*(self.ends[i] - far)) <= tolerance:
+                        group.append(j)
+                        taken[j] = True
+            groups.append(group)
+        return groups
+
+    def parallel_groups(
+        self,
+        tolerance: float,
+        min_length: float = 0.1,
+        min_cos: float = 0.99,
+    ) -> List[List[int]]:
+        """
+        Group near-coincident parallel segments, treating each chain as the
+        segment from its start to its end.
+
+        Segment j joins segment i's group when both are at least min_length
+        long, their directions agree to |cos| > min_cos and their midpoints
+        are closer than tolerance. Greedy in index order, as duplicate_groups.
+        """
+        delta = self.ends - self.starts
+        seg_len = np.hypot(delta[:, 0], delta[:, 1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            direction = delta / seg_len[:, None]
+        mid = 0.5 * (self.starts + self.ends)
+
+        taken = np.zeros(self.n, dtype=bool)
+        groups: List[List[int]] = []
+        grid = self._grid("midpoints", tolerance) if tolerance > 0 else None
+
+        for i in range(self.n):
+            if taken[i]:
+                continue
+            group = [i]
+            if grid is not None and seg_len[i] >= min_length:
+                mx, my = mid[i]
+                cand = np.array(
+                    grid.box(mx - tolerance, my - tolerance, mx + tolerance, my + tolerance),
+                    dtype=np.intp,
+                )
+                cand = cand[(cand > i) & ~taken[cand]]
+                if len(cand):
+                    close = np.hypot(mid[cand, 0] - mx, mid[cand, 1] - my) < tolerance
+                    aligned = np.abs(direction[cand] @ direction[i]) > min_cos
+                    hits = np.sort(cand[close & aligned & (seg_len[cand] >= min_length)])
+                    group.extend(hits.tolist())
+                    taken[hits] = True
+            groups.append(group)
+        return groups
+
+    def offset_duplicates(
+        self,
+        min_offset: float,
+        max_offset: float,
+        size_tolerance: float,
+        min_size: float = 1.0,
+    ) -> Dict[int, int]:
+        """
+        Chains inset inside another chain by a consistent offset.
+
+        Chain j is an offset duplicate of chain i when both bounding boxes
+        are at least min_size in each dimension, their widths and heights
+        differ by at most size_tolerance, and j's box sits inside i's by
+        between min_offset and max_offset on all four sides (a binding or
+        purfling line drawn parallel to the outline). Outer chains are
+        visited in index order; a chain already marked as a duplicate does
+        not mark others.
+
+        Returns:
+            {duplicate_index: outer_index}
+        """
+        removed: Dict[int, int] = {}
+        if max_offset < min_offset or max_offset <= 0:
+            return removed
+
+        b = self.bboxes
+        w = b[:, 2] - b[:, 0]
+        h = b[:, 3] - b[:, 1]
+        sized = (w >= min_size) & (h >= min_size)
+        grid = self._grid("corners", max_offset)
+
+        for i in np.flatnonzero(sized).tolist():
+            if i in removed:
+                continue
+            x0, y0, x1, y1 = b[i]
+            cand = np.array(
+                grid.box(x0 + min_offset, y0 + min_offset, x0 + max_offset, y0 + max_offset),
+                dtype=np.intp,
+            )
+            if not len(cand):
+                continue
+            cand = cand[(cand != i) & sized[cand]]
+            hit = (np.abs(w[cand] - w[i]) <= size_tolerance) & (np.abs(h[cand] - h[i]) <= size_tolerance)
+            for inset in (b[cand, 0] - x0, x1 - b[cand, 2], b[cand, 1] - y0, y1 - b[cand, 3]):
+                hit &= (inset >= min_offset) & (inset <= max_offset)
+            for j in cand[hit].tolist():
+                if j not in removed:
+                    removed[j] = i
+        return removed
+
@@ -0,0 +1,247 @@
+# services/api/app/cam/compiled_toolpath.py
+"""
+Compiled Toolpath for Vectorized Cycle-Time Sweeps
+
+Precompiles a move list once into NumPy arrays so that repeated cycle-time
+estimates at different feeds become cheap array expressions instead of a
+full Python walk over the moves.
+
+The Problem:
+    optimize_feed_stepover() cloned every move for each (feed, stepover)
+    grid cell and re-ran estimate_cycle_time_v2() from scratch:
+
+        for cell in grid:                     # 400 cells
+            mv = [dict(m) for m in moves]     # 50k dict copies
+            estimate_cycle_time_v2(mv, ...)   # 50k-iteration Python loop
+
+    A 20x20 sweep over 5k moves took ~10 s.
+
+The Solution:
+    Geometry (segment lengths, turn angles, engagement, Z deltas) does not
+    depend on feed. Compile it once, then evaluate all candidate feeds in a
+    single broadcast over (feeds x segments):
+
+        compiled = compile_toolpath(moves)                 # O(n), once
+        times = estimate_cycle_time_compiled(compiled,     # O(f x n) NumPy
+                                             profile, feeds, ...)
+
+The compiled estimator mirrors estimate_cycle_time_v2() term for term
+(jerk-limited segment time, engagement scaling, corner blending, pass and
+safe-Z hop accounting) for moves whose G1/G2/G3 feed is overridden, so
+rankings match the per-cell estimator.
+
+Usage:
+    from app.cam.compiled_toolpath import (
+        compile_toolpath,
+        estimate_cycle_time_compiled,
+    )
+
+    compiled = compile_toolpath(moves)
+    times = estimate_cycle_time_compiled(
+        compiled, profile, [600.0, 900.0, 1200.0],
+        z_total=-3.0, stepdown=1.0, safe_z=5.0,
+    )
+    # times[k] == estimate_cycle_time_v2(moves with f=feeds[k], ...)["time_s"]
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .time_estimator_v2 import _engagement_scale, _length_xy, _passes_from_stepdown
+
+
+# Upper bound on (feeds x segments) elements materialized per broadcast block.
+# Keeps temporaries around 16 MB per array regardless of sweep size.
+_MAX_BLOCK_ELEMENTS = 2_000_000
+
+_MOTION_CODES = ("G0", "G1", "G2", "G3")
+
+
+@dataclass(frozen=True)
+class CompiledToolpath:
+    """
+    Feed-independent geometry of a toolpath, packed as NumPy arrays.
+
+    One entry per motion segment visited by the v2 estimator, i.e. each
+    G0/G1/G2/G3 move carrying both x and y, in program order.
+
+    Attributes:
+        seg_len: XY length of each segment from the previous XY point (mm)
+        is_rapid: True for G0 segments
+        engagement: Engagement scale per segment (0..1, see _engagement_scale)
+        trochoid: True where the move is tagged meta.trochoid
+        turn_angle: Absolute heading change entering each segment (radians)
+        dz: Z delta of each segment (mm; 0 when Z is not programmed)
+        path_length_xy: Total XY length over all moves (drives hop count)
+        move_count: Number of input moves compiled
+    """
+
+    seg_len: np.ndarray
+    is_rapid: np.ndarray
+    engagement: np.ndarray
+    trochoid: np.ndarray
+    turn_angle: np.ndarray
+    dz: np.ndarray
+    path_length_xy: float
+    move_count: int
+
+    @property
+    def segment_count(self) -> int:
+        return int(self.seg_len.shape[0])
+
+
+def compile_toolpath(moves: List[Dict[str, Any]]) -> CompiledToolpath:
+    """
+    Compile a move list into feed-independent segment arrays.
+
+    Args:
+        moves: List of G-code moves (G0/G1/G2/G3 with x, y, optional z, meta)
+
+    Returns:
+        CompiledToolpath ready for estimate_cycle_time_compiled()
+    """
+    xs: List[float] = []
+    ys: List[float] = []
+    zs: List[float] = []
+    rapid: List[bool] = []
+    eng: List[float] = []
+    troch: List[bool] = []
+
+    z = 0.0
+    for m in moves:
+        if "z" in m:
+            z = float(m["z"])
+        if m.get("code") in _MOTION_CODES and "x" in m and "y" in m:
+            xs.append(float(m["x"]))
+            ys.append(float(m["y"]))
+            zs.append(z)
+            is_g0 = m["code"] == "G0"
+            rapid.append(is_g0)
+            eng.append(1.0 if is_g0 else float(_engagement_scale(m)))
+            troch.append(bool(m.get("meta", {}).get("trochoid")))
+
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    zz = np.asarray(zs, dtype=np.float64)
+
+    dx = np.diff(x, prepend=x[:1]) if x.size else x
+    dy = np.diff(y, prepend=y[:1]) if y.size else y
+    seg_len = np.hypot(dx, dy)
+    dz = np.diff(zz, prepend=zz[:1]) if zz.size else zz
+
+    # Heading change between consecutive non-degenerate segments
+    turn = np.zeros_like(seg_len)
+    moving = np.flatnonzero(seg_len > 1e-9)
+    if moving.size > 1:
+        heading = np.arctan2(dy[moving], dx[moving])
+        delta = np.diff(heading)
+        turn[moving[1:]] = np.abs((delta + math.pi) % (2.0 * math.pi) - math.pi)
+
+    return CompiledToolpath(
+        seg_len=seg_len,
+        is_rapid=np.asarray(rapid, dtype=bool),
+        engagement=np.asarray(eng, dtype=np.float64),
+        trochoid=np.asarray(troch, dtype=bool),
+        turn_angle=turn,
+        dz=dz,
+        path_length_xy=_length_xy(moves),
+        move_count=len(moves),
+    )
+
+
+def _seg_times(d: np.ndarray, v: np.ndarray, accel: float, jerk: float) -> np.ndarray:
+    """
+    Vectorized jerk-limited trapezoid, identical to estimate_cycle_time_v2's seg_time.
+
+    Args:
+        d: Segment lengths (mm), broadcastable against v
+        v: Target velocities (mm/s)
+        accel: Machine acceleration (mm/s²)
+        jerk: Machine jerk (mm/s³)
+
+    Returns:
+        Segment times in seconds, shape of broadcast(d, v)
+    """
+    a = max(1.0, accel)
+    j = max(1.0, jerk)
+    t_a = a / j
+    s_a = 0.5 * a * (t_a ** 2)
+
+    s_cruise = np.maximum(0.0, d - 2 * s_a)
+    v_reach = np.sqrt(2 * a * s_cruise)
+    t_short = 2.0 * np.sqrt(d / max(1e-6, a))
+    t_cruise = (2 * t_a) + s_cruise / np.maximum(1e-6, v)
+
+    t = np.where(v_reach < v * 0.9, t_short, t_cruise)
+    return np.where((d <= 1e-9) | (v <= 1e-9), 0.0, t)
+
+
+def estimate_cycle_time_compiled(
+    compiled: CompiledToolpath,
+    profile: Dict[str, Any],
+    feeds: Sequence[float],
+    z_total: float,
+    stepdown: float,
+    safe_z: float,
+    plunge_f: float = 300.0,
+) -> np.ndarray:
+    """
+    Estimate cycle time for many cutting feeds over one compiled toolpath.
+
+    Equivalent to calling estimate_cycle_time_v2() once per feed on a copy
+    of the moves with F overridden on every G1/G2/G3 move.
+
+    Args:
+        compiled: Output of compile_toolpath()
+        profile: Machine profile dict with limits {accel, jerk, rapid, feed_xy, corner_tol_mm}
+        feeds: Candidate cutting feeds (mm/min)
+        z_total: Total depth of pocket (negative, e.g., -3.0 mm)
+        stepdown: Depth per pass (positive, e.g., 1.5 mm)
+        safe_z: Safe retract height above work (positive, e.g., 5.0 mm)
+        plunge_f: Plunge feed rate in mm/min (default: 300)
+
+    Returns:
+        Array of total cycle times in seconds (rounded like time_s), one per feed
+    """
+    limits = profile.get("limits", {})
+    accel = float(limits.get("accel", 800))
+    jerk = float(limits.get("jerk", 2000))
+    rapid = float(limits.get("rapid", 3000)) / 60.0  # mm/s
+    feed_cap = float(limits.get("feed_xy", 1200))
+    corner_tol = float(limits.get("corner_tol_mm", 0.2))
+
+    f = np.asarray(feeds, dtype=np.float64).reshape(-1)
+
+    # Rapids do not depend on the cutting feed: evaluate once
+    d_rapid = compiled.seg_len[compiled.is_rapid]
+    t_rapid = float(_seg_times(d_rapid, np.full_like(d_rapid, rapid), accel, jerk).sum())
+
+    cut = ~compiled.is_rapid
+    d_cut = compiled.seg_len[cut]
+    eng_cut = compiled.engagement[cut]
+
+    t_cut = np.zeros(f.shape[0], dtype=np.float64)
+    if d_cut.size and f.size:
+        block = max(1, _MAX_BLOCK_ELEMENTS // d_cut.size)
+        for start in range(0, f.shape[0], block):
+            fb = f[start:start + block, None]
+            v_req = np.minimum(feed_cap, fb * eng_cut[None, :]) / 60.0  # mm/s
+            t_cut[start:start + block] = _seg_times(d_cut[None, :], v_req, accel, jerk).sum(axis=1)
+
+    # Corner blending bonus (controller path smoothing reduces time)
+    t_xy = (t_rapid + t_cut) * (1.0 - min(0.1, corner_tol / 10.0))
+
+    # Z pass accounting and safe-Z hops (feed-independent)
+    passes = _passes_from_stepdown(z_total, stepdown)
+    plunge_v = max(1e-6, plunge_f / 60.0)  # mm/s
+    hops = max(1, int(compiled.path_length_xy / 200.0))
+    hop_h = abs(safe_z)
+    t_hops = passes * hops * ((hop_h / rapid) + (hop_h / plunge_v))
+
+    total = t_xy * passes + t_hops
+    return np.array([round(float(t), 2) for t in total], dtype=np.float64)
@@ -3,9 +3,11 @@
 import math
 from typing import List, Tuple, Optional, Dict, Any, Set
 from collections import defaultdict
-import ezdxf
 from pydantic import BaseModel
 
+from app.cam.dxf_fast_reader import DxfReadError
+from app.cam.dxf_geometry_cache import DxfGeometryHandle, get_dxf_handle
+
 # Canonical CAM geometry contract (CONV-001 / LAB-013 WP-GEOM-3).
 # ``ReconstructionResult.loops`` and the loop-building code below consume this
 # type; see ``app.schemas.cam_geometry`` for the single definition.
@@ -48,7 +50,7 @@ class Edge:
         self.start = start
         self.end = end
         self.entity_type = entity_type  # 'LINE' or 'SPLINE'
-        self.entity_data = entity_data  # Original ezdxf entity
+        self.entity_data = entity_data  # Source (x1, y1, x2, y2) row or SplineData
     
     def __repr__(self):
         return f"Edge({self.start} -> {self.end}, {self.entity_type})"
@@ -104,14 +106,15 @@ def sample_spline(spline_entity, max_segments: int = 50, max_error_mm: float = 0
 # EDGE GRAPH CONSTRUCTION
 # =============================================================================
 
-def build_edge_graph(lines: List, splines: List, tolerance: float = 0.1) -> List[Edge]:
-    """Build list of directed edges from LINE and SPLINE entities."""
+def build_edge_graph(lines, splines: List, tolerance: float = 0.1) -> List[Edge]:
+    """Build list of directed edges from LINE rows (x1, y1, x2, y2) and SPLINEs."""
     edges = []
     
     # Process LINEs
-    for line in lines:
-        start = Point(line.dxf.start.x, line.dxf.start.y, tolerance)
-        end = Point(line.dxf.end.x, line.dxf.end.y, tolerance)
+    for line in (lines.tolist() if hasattr(lines, "tolist") else lines):
+        x1, y1, x2, y2 = line
+        start = Point(x1, y1, tolerance)
+        end = Point(x2, y2, tolerance)
         edges.append(Edge(start, end, 'LINE', line))
     
     # Process SPLINEs (sample to polyline segments)
@@ -303,37 +306,28 @@ def reconstruct_contours_from_dxf(
     dxf_bytes: bytes,
     layer_name: str = "Contours",
     tolerance: float = 0.1,
-    min_loop_points: int = 3
+    min_loop_points: int = 3,
+    handle: Optional[DxfGeometryHandle] = None,
 ) -> ReconstructionResult:
     """Reconstruct closed contours from DXF primitives (LINE + SPLINE)."""
     warnings = []
     
-    # Load DXF
+    # Load DXF (fast-path arrays, shared through the geometry cache)
     try:
-        import tempfile, os
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.dxf', mode='wb') as tmp:
-            tmp.write(dxf_bytes)
-            tmp_path = tmp.name
-        
-        try:
-            doc = ezdxf.readfile(tmp_path)
-            msp = doc.modelspace()
-        finally:
-            os.unlink(tmp_path)
-    except (IOError, OSError, ValueError) as e:
+        geometry = (handle or get_dxf_handle(dxf_bytes)).geometry
+    except (IOError, OSError, DxfReadError) as e:
         warnings.append(f"Failed to read DXF: {e}")
         return ReconstructionResult(loops=[], warnings=warnings)
     
     # Extract LINEs and SPLINEs from specified layer
-    all_entities = list(msp)
-    lines = [e for e in all_entities if e.dxftype() == 'LINE' and e.dxf.layer == layer_name]
-    splines = [e for e in all_entities if e.dxftype() == 'SPLINE' and e.dxf.layer == layer_name]
+    layer = geometry.layer(layer_name)
+    lines, splines = layer.lines, layer.splines
     
-    if not lines and not splines:
+    if not len(lines) and not splines:
         # Try fallback to all layers
-        lines = [e for e in all_entities if e.dxftype() == 'LINE']
-        splines = [e for e in all_entities if e.dxftype() == 'SPLINE']
-        if lines or splines:
+        merged = geometry.merged()
+        lines, splines = merged.lines, merged.splines
+        if len(lines) or splines:
             warnings.append(f"No geometry on layer '{layer_name}', using all layers")
         else:
             warnings.append(f"No LINE or SPLINE entities found in DXF")
@@ -37,7 +37,7 @@ VALIDATION ALGORITHMS:
 
 1. **Entity Extraction:**
    ```
-   DXF → ezdxf.readfile() → Extract LWPOLYLINE entities → Filter by layer
+   DXF → DxfGeometryHandle.document (ezdxf, parsed once per payload) → Extract LWPOLYLINE entities
    ```
 
 2. **Shapely Conversion:**
@@ -195,7 +195,7 @@ CRITICAL SAFETY RULES:
 
 PERFORMANCE CHARACTERISTICS:
 ---------------------------
-- **DXF Parsing**: 10-50ms (ezdxf overhead)
+- **DXF Parsing**: 10-50ms (ezdxf overhead; shared with preflight via dxf_geometry_cache)
 - **Shapely Validation**: 1-5ms per entity
 - **Hausdorff Distance**: 10-100ms (depends on point count)
 - **Typical Performance**: 50-200ms for 10-50 entities
@@ -261,7 +261,6 @@ PATCH HISTORY:
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import ezdxf
 from shapely.geometry import Polygon, LineString, Point
 
 from app.util.dxf_compat import create_document
@@ -271,6 +270,7 @@ from shapely.errors import GEOSException
 import io
 import math
 
+from .dxf_geometry_cache import DxfGeometryHandle, get_dxf_document
 from .dxf_preflight import Severity, Issue
 
 
@@ -330,17 +330,17 @@ class TopologyValidator:
     - Repair suggestions (buffer(0) for simple cases)
     """
     
-    def __init__(self, dxf_bytes: bytes, filename: str = "unknown.dxf"):
+    def __init__(self, dxf_bytes: bytes, filename: str = "unknown.dxf",
+                 handle: Optional[DxfGeometryHandle] = None):
         """
         Initialize validator with DXF file data.
 
         Args:
             dxf_bytes: Raw DXF file content
             filename: Original filename (for reporting)
+            handle: Parsed-DXF handle shared with other pipeline stages (optional)
         """
-        # ezdxf 1.4.3 read() expects a text stream, so decode bytes first
-        text_content = dxf_bytes.decode("cp1252")  # DXF default encoding
-        self.doc = ezdxf.read(io.StringIO(text_content))
+        self.doc = get_dxf_document(dxf_bytes, handle)
         self.filename = filename
         self.msp = self.doc.modelspace()
         self.issues: List[TopologyIssue] = []
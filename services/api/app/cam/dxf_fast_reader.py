@@ -0,0 +1,426 @@
+# services/api/app/cam/dxf_fast_reader.py
+"""
+Fast-Path DXF Geometry Reader
+
+Streams DXF group-code / value pairs straight into per-layer NumPy arrays,
+without building ezdxf document or entity objects.
+
+The Problem:
+    Geometry-only consumers (contour reconstruction, the unified cleaner,
+    SVG previews) called ezdxf.readfile() just to read endpoints and
+    vertices. ezdxf builds a full document — tag objects, entity objects,
+    handles, an entity database — for every entity in the file, and each
+    consumer re-parsed the same upload into a fresh document.
+
+The Solution:
+    One pass over the raw tag stream. LINE, LWPOLYLINE, POLYLINE, ARC,
+    CIRCLE and SPLINE entities in model space are decoded into compact
+    per-layer arrays; everything else is only counted. Values stay as bytes
+    until a coordinate is needed, and layer names are decoded once per layer.
+
+Fallback:
+    Binary DXF files are read with ezdxf and converted to the same arrays.
+    Entity types the fast path does not decode (ELLIPSE, INSERT, HATCH, ...)
+    can be requested with flatten_types; those entities alone are then
+    loaded through ezdxf and flattened to polylines.
+
+Coordinates:
+    Values are returned as stored, matching ezdxf's dxf attributes: LINE
+    and SPLINE are WCS, ARC / CIRCLE / LWPOLYLINE / 2D POLYLINE are OCS.
+
+Usage:
+    from app.cam.dxf_fast_reader import read_dxf_geometry
+
+    geometry = read_dxf_geometry(dxf_bytes)
+    body = geometry.layer("BODY")
+    for x1, y1, x2, y2 in body.lines.tolist():
+        ...
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+from collections import Counter
+from typing import IO, AnyStr, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.cam.dxf_geometry_arrays import (
+    POLYLINE_MESH_FLAGS,
+    VERTEX_FACE_RECORD,
+    VERTEX_POLYFACE,
+    DxfGeometry,
+    LayerGeometry,
+    LayerGeometryBuilder,
+    SplineData,
+    add_ezdxf_entity,
+    add_flattened_entity,
+    builder_for,
+)
+
+DxfSource = Union[str, "os.PathLike[str]", bytes]
+
+BINARY_DXF_SENTINEL = b"AutoCAD Binary DXF\r\n\x1a\x00"
+
+# Sub-entities that ezdxf does not list as model space entities
+_SUB_ENTITIES = frozenset((b"VERTEX", b"SEQEND", b"ATTRIB"))
+
+
+class DxfReadError(ValueError):
+    """Raised when a source cannot be read as DXF."""
+
+
+# =============================================================================
+# TAG STREAM
+# =============================================================================
+
+def iter_tag_pairs(lines: Iterable[AnyStr]) -> Iterator[Tuple[int, AnyStr]]:
+    """
+    Yield (group_code, value) pairs from DXF lines.
+
+    Works on str or bytes lines. Values are stripped of surrounding
+    whitespace. A line that is not an integer group code is skipped on its
+    own, which resynchronizes the stream after a stray line.
+    """
+    it = iter(lines)
+    for raw in it:
+        try:
+            code = int(raw)
+        except ValueError:
+            continue
+        value = next(it, None)
+        if value is None:
+            return
+        yield code, value.strip()
+
+
+def _xyz(tags: List[Tuple[int, bytes]], x_code: int) -> List[List[float]]:
+    """Collect repeated x / y / z groups (e.g. 10/20/30) into points."""
+    y_code, z_code = x_code + 10, x_code + 20
+    out: List[List[float]] = []
+    for code, value in tags:
+        if code == x_code:
+            out.append([float(value), 0.0, 0.0])
+        elif code == y_code and out:
+            out[-1][1] = float(value)
+        elif code == z_code and out:
+            out[-1][2] = float(value)
+    return out
+
+
+class _FastScanner:
+    """Tag-stream state machine filling per-layer builders."""
+
+    def __init__(self, flatten_types: Iterable[str]):
+        self.builders: Dict[bytes, LayerGeometryBuilder] = {}
+        self.entity_types: Counter = Counter()
+        self.header: Dict[bytes, bytes] = {}
+        self.flatten_types = frozenset(t.encode("ascii") for t in flatten_types)
+        self.flatten_found = False
+        self.seen_section = False
+        self.seq = 0  # model space entities so far
+        # Open POLYLINE: (seq, layer, flags, vertex xy, vertex bulges)
+        self._polyline: Optional[Tuple[int, bytes, int, List[float], List[float]]] = None
+
+    def builder(self, layer: bytes) -> LayerGeometryBuilder:
+        return builder_for(self.builders, layer)
+
+    def scan(self, lines: Iterable[bytes]) -> None:
+        section = b""
+        header_var = b""
+        etype = b""
+        tags: List[Tuple[int, bytes]] = []
+        in_section_name = False
+
+        for code, value in iter_tag_pairs(lines):
+            if code == 0:
+                if etype:
+                    self._entity(etype, tags)
+                    etype = b""
+                if value == b"SECTION":
+                    in_section_name = True
+                    self.seen_section = True
+                elif value == b"ENDSEC":
+                    section = b""
+                elif value == b"EOF":
+                    break
+                elif section == b"ENTITIES":
+                    etype = value
+                    tags = []
+                continue
+            if in_section_name:
+                if code == 2:
+                    section = value
+                    in_section_name = False
+                continue
+            if etype:
+                tags.append((code, value))
+            elif section == b"HEADER":
+                if code == 9:
+                    header_var = value
+                elif header_var in (b"$ACADVER", b"$DWGCODEPAGE"):
+                    self.header[header_var] = value
+                    header_var = b""
+
+        self._close_polyline()
+
+    def _entity(self, etype: bytes, tags: List[Tuple[int, bytes]]) -> None:
+        if etype == b"VERTEX":
+            if self._polyline is not None:
+                self._vertex(tags)
+            return
+        if etype == b"SEQEND":
+            self._close_polyline()
+            return
+        self._close_polyline()
+
+        layer = b"0"
+        for code, value in tags:
+            if code == 8:
+                layer = value
+            elif code == 67 and value == b"1":
+                return  # paper space
+        if etype in _SUB_ENTITIES:
+            return
+        seq = self.seq
+        self.seq += 1
+        self.entity_types[etype] += 1
+        if etype in self.flatten_types:
+            self.flatten_found = True
+            return
+
+        if etype == b"LINE":
+            c = {10: 0.0, 20: 0.0, 11: 0.0, 21: 0.0}
+            for code, value in tags:
+                if code in c:
+                    c[code] = float(value)
+            self.builder(layer).add_line(seq, c[10], c[20], c[11], c[21])
+        elif etype == b"LWPOLYLINE":
+            xy: List[float] = []
+            bulges: List[float] = []
+            flags = 0
+            for code, value in tags:
+                if code == 10:
+                    xy.append(float(value))
+                    xy.append(0.0)
+                    bulges.append(0.0)
+                elif code == 20 and xy:
+                    xy[-1] = float(value)
+                elif code == 42 and bulges:
+                    bulges[-1] = float(value)
+                elif code == 70:
+                    flags = int(value)
+            self.builder(layer).add_polyline(seq, "LWPOLYLINE", xy, bulges, bool(flags & 1))
+        elif etype == b"POLYLINE":
+            flags = 0
+            for code, value in tags:
+                if code == 70:
+                    flags = int(value)
+            if not flags & POLYLINE_MESH_FLAGS:
+                self._polyline = (seq, layer, flags, [], [])
+        elif etype == b"ARC" or etype == b"CIRCLE":
+            c = {10: 0.0, 20: 0.0, 40: 0.0, 50: 0.0, 51: 0.0}
+            for code, value in tags:
+                if code in c:
+                    c[code] = float(value)
+            if etype == b"ARC":
+                self.builder(layer).add_arc(seq, c[10], c[20], c[40], c[50], c[51])
+            else:
+                self.builder(layer).add_circle(seq, c[10], c[20], c[40])
+        elif etype == b"SPLINE":
+            self.builder(layer).add_spline(seq, self._spline(tags))
+
+    def _vertex(self, tags: List[Tuple[int, bytes]]) -> None:
+        xy, bulges = self._polyline[3:]
+        x = y = bulge = 0.0
+        vflags = 0
+        for code, value in tags:
+            if code == 10:
+                x = float(value)
+            elif code == 20:
+                y = float(value)
+            elif code == 42:
+                bulge = float(value)
+            elif code == 70:
+                vflags = int(value)
+        if vflags & VERTEX_FACE_RECORD and not vflags & VERTEX_POLYFACE:
+            return
+        xy.append(x)
+        xy.append(y)
+        bulges.append(bulge)
+
+    def _close_polyline(self) -> None:
+        if self._polyline is not None:
+            seq, layer, flags, xy, bulges = self._polyline
+            self._polyline = None
+            self.builder(layer).add_polyline(seq, "POLYLINE", xy, bulges, bool(flags & 1))
+
+    @staticmethod
+    def _spline(tags: List[Tuple[int, bytes]]) -> SplineData:
+        spline = SplineData()
+        knots: List[float] = []
+        weights: List[float] = []
+        for code, value in tags:
+            if code == 40:
+                knots.append(float(value))
+            elif code == 41:
+                weights.append(float(value))
+            elif code == 70:
+                spline.closed = bool(int(value) & 1)
+            elif code == 71:
+                spline.degree = int(value)
+            elif code == 42:
+                spline.knot_tolerance = float(value)
+        spline.knots = np.array(knots)
+        spline.weights = np.array(weights)
+        spline.control_points = np.array(_xyz(tags, 10), dtype=np.float64).reshape(-1, 3)
+        spline.fit_points = np.array(_xyz(tags, 11), dtype=np.float64).reshape(-1, 3)
+        start, end = _xyz(tags, 12), _xyz(tags, 13)
+        if start:
+            spline.start_tangent = tuple(start[0])
+        if end:
+            spline.end_tangent = tuple(end[0])
+        return spline
+
+    def layer_encoding(self) -> str:
+        version = self.header.get(b"$ACADVER", b"AC1009").decode("ascii", "replace")
+        if version >= "AC1021":
+            return "utf-8"
+        codepage = self.header.get(b"$DWGCODEPAGE", b"").decode("ascii", "replace").upper()
+        if codepage.startswith("ANSI_") and codepage[5:].isdigit():
+            return "cp" + codepage[5:]
+        return "cp1252"
+
+
+# =============================================================================
+# EZDXF FALLBACK
+# =============================================================================
+
+def _read_ezdxf_document(path: str):
+    import ezdxf
+    from ezdxf.lldxf.const import DXFError
+
+    try:
+        return ezdxf.readfile(path)
+    except (IOError, OSError, DXFError) as e:
+        raise DxfReadError(f"Failed to read DXF: {e}") from e
+
+
+def _with_file(source: DxfSource, read):
+    """Call read(path), spilling bytes sources to a temporary file."""
+    if not isinstance(source, bytes):
+        return read(os.fspath(source))
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".dxf", mode="wb") as tmp:
+        tmp.write(source)
+        tmp_path = tmp.name
+    try:
+        return read(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def _read_with_ezdxf(source: DxfSource, flatten_types: Sequence[str], distance: float) -> DxfGeometry:
+    doc = _with_file(source, _read_ezdxf_document)
+    builders: Dict[str, LayerGeometryBuilder] = {}
+    entity_types: Counter = Counter()
+    for seq, e in enumerate(doc.modelspace()):
+        etype = e.dxftype()
+        entity_types[etype] += 1
+        if etype in flatten_types:
+            add_flattened_entity(builders, seq, e, distance)
+        else:
+            add_ezdxf_entity(builders, seq, e)
+    return DxfGeometry(
+        layers={name: b.build(name) for name, b in builders.items()},
+        dxf_version=doc.dxfversion,
+        entity_count=sum(entity_types.values()),
+        entity_types=dict(entity_types),
+        reader="ezdxf",
+    )
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def read_dxf_document(source: DxfSource):
+    """
+    Load a full ezdxf document from a DXF file or DXF bytes.
+
+    For consumers that need entity handles, tables or entity methods rather
+    than geometry arrays. Equivalent to ezdxf.readfile() (encoding detection,
+    binary DXF), with bytes spilled to a temporary file.
+
+    Raises:
+        DxfReadError: If the source is unreadable or not a DXF file
+    """
+    return _with_file(source, _read_ezdxf_document)
+
+
+def _open_lines(source: DxfSource) -> IO[bytes]:
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    try:
+        return open(source, "rb")
+    except OSError as e:
+        raise DxfReadError(f"Failed to read DXF: {e}") from e
+
+
+def read_dxf_geometry(
+    source: DxfSource,
+    flatten_types: Sequence[str] = (),
+    flatten_distance: float = 0.1,
+) -> DxfGeometry:
+    """
+    Read model space geometry from a DXF file or DXF bytes.
+
+    Args:
+        source: File path, or the DXF file content as bytes
+        flatten_types: Entity types the fast path does not decode (e.g.
+            "ELLIPSE", "INSERT") to load through ezdxf and flatten into
+            polylines; other undecoded types are only counted
+        flatten_distance: Maximum chord deviation for flattening (drawing units)
+
+    Returns:
+        DxfGeometry with per-layer arrays
+
+    Raises:
+        DxfReadError: If the source is unreadable or not a DXF file
+    """
+    with _open_lines(source) as stream:
+        if stream.read(len(BINARY_DXF_SENTINEL)) == BINARY_DXF_SENTINEL:
+            return _read_with_ezdxf(source, tuple(flatten_types), flatten_distance)
+        stream.seek(0)
+        scanner = _FastScanner(flatten_types)
+        try:
+            scanner.scan(stream)
+        except ValueError as e:
+            raise DxfReadError(f"Malformed DXF value: {e}") from e
+
+    if not scanner.seen_section:
+        raise DxfReadError("Not a DXF file: no SECTION found")
+
+    encoding = scanner.layer_encoding()
+    layers = {
+        raw.decode(encoding, "replace"): builder
+        for raw, builder in scanner.builders.items()
+    }
+    geometry = DxfGeometry(
+        layers={name: b.build(name) for name, b in layers.items()},
+        dxf_version=scanner.header.get(b"$ACADVER", b"AC1009").decode("ascii", "replace"),
+        entity_count=sum(scanner.entity_types.values()),
+        entity_types={k.decode("ascii", "replace"): v for k, v in scanner.entity_types.items()},
+    )
+
+    if scanner.flatten_found:
+        doc = _with_file(source, _read_ezdxf_document)
+        builders: Dict[str, LayerGeometryBuilder] = {}
+        for seq, e in enumerate(doc.modelspace()):
+            if e.dxftype() in flatten_types:
+                add_flattened_entity(builders, seq, e, flatten_distance)
+        for name, b in builders.items():
+            geometry.layers[name] = LayerGeometry.concatenate(
+                [geometry.layer(name), b.build(name)], name=name)
+    return geometry
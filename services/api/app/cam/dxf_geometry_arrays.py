@@ -0,0 +1,370 @@
+# services/api/app/cam/dxf_geometry_arrays.py
+"""
+Array Containers for DXF Geometry
+
+Per-layer NumPy containers filled by app.cam.dxf_fast_reader, plus the
+conversion of ezdxf entities into the same containers (used for binary
+DXF files and for entities flattened through ezdxf).
+
+    SplineData       — SPLINE control data with an ezdxf.math construction tool
+    LayerGeometry    — lines, polylines, arcs, circles and splines of one layer
+    DxfGeometry      — all layers of a file plus entity counts
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# POLYLINE flags: polygon mesh / polyface mesh are surfaces, not outlines
+POLYLINE_MESH_FLAGS = 16 | 64
+VERTEX_FACE_RECORD = 128
+VERTEX_POLYFACE = 64
+
+
+# =============================================================================
+# DATA STRUCTURES
+# =============================================================================
+
+@dataclass
+class SplineData:
+    """
+    Control data of one SPLINE entity.
+
+    Attributes:
+        degree: Curve degree (order - 1)
+        closed: SPLINE flag bit 1
+        control_points: (n, 3) WCS control points
+        knots: (k,) knot vector
+        weights: (n,) control point weights, empty when non-rational
+        fit_points: (f, 3) fit points, used when there are no control points
+        knot_tolerance: Knot rounding tolerance (group code 42)
+        start_tangent, end_tangent: Fit-point tangents, if stored
+    """
+    degree: int = 3
+    closed: bool = False
+    control_points: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    knots: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    weights: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    fit_points: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    knot_tolerance: float = 1e-10
+    start_tangent: Optional[Tuple[float, float, float]] = None
+    end_tangent: Optional[Tuple[float, float, float]] = None
+
+    def construction_tool(self):
+        """
+        The curve as an ezdxf.math.BSpline, built exactly as ezdxf's
+        Spline.construction_tool() does (so flattening() agrees).
+
+        Raises:
+            ValueError: If the spline has neither control nor fit points
+        """
+        from ezdxf.math import BSpline, fit_points_to_cad_cv, round_knots
+
+        if len(self.control_points):
+            knots = round_knots(self.knots.tolist(), self.knot_tolerance) if len(self.knots) else None
+            return BSpline(
+                control_points=self.control_points.tolist(),
+                order=self.degree + 1,
+                knots=knots,
+                weights=self.weights.tolist() if len(self.weights) else None,
+            )
+        if len(self.fit_points):
+            tangents = None
+            if self.start_tangent is not None and self.end_tangent is not None:
+                tangents = [self.start_tangent, self.end_tangent]
+            return fit_points_to_cad_cv(self.fit_points.tolist(), tangents=tangents)
+        raise ValueError("Construction tool requires control- or fit points.")
+
+    def flattening(self, distance: float, segments: int = 4):
+        """Adaptive flattening, as ezdxf's Spline.flattening()."""
+        return self.construction_tool().flattening(distance, segments)
+
+
+@dataclass
+class LayerGeometry:
+    """
+    Geometry of one layer as compact arrays.
+
+    Attributes:
+        name: Layer name
+        lines: (n, 4) x1, y1, x2, y2
+        polyline_points: (m, 2) vertices of all polylines, concatenated
+        polyline_bulges: (m,) bulge of the segment leaving each vertex
+        polyline_offsets: (k + 1,) polyline i is
+            polyline_points[polyline_offsets[i]:polyline_offsets[i + 1]]
+        polyline_closed: (k,) closed flag
+        polyline_types: Entity type of each polyline (LWPOLYLINE, POLYLINE,
+            or the source type of a flattened entity)
+        arcs: (n, 5) cx, cy, radius, start_angle, end_angle (degrees)
+        circles: (n, 3) cx, cy, radius
+        splines: SPLINE control data
+        line_seq, polyline_seq, arc_seq, circle_seq, spline_seq: Model space
+            position of each entity, so merged layers keep file order
+    """
+    name: str
+    lines: np.ndarray = field(default_factory=lambda: np.zeros((0, 4)))
+    polyline_points: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    polyline_bulges: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    polyline_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.intp))
+    polyline_closed: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    polyline_types: Tuple[str, ...] = ()
+    arcs: np.ndarray = field(default_factory=lambda: np.zeros((0, 5)))
+    circles: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    splines: List[SplineData] = field(default_factory=list)
+    line_seq: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+    polyline_seq: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+    arc_seq: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+    circle_seq: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+    spline_seq: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+
+    @property
+    def polyline_count(self) -> int:
+        return len(self.polyline_closed)
+
+    def polyline(self, i: int) -> np.ndarray:
+        """(n, 2) vertices of polyline i (a view)."""
+        return self.polyline_points[self.polyline_offsets[i]:self.polyline_offsets[i + 1]]
+
+    def polylines(self, types: Optional[Sequence[str]] = None) -> Iterator[Tuple[np.ndarray, bool]]:
+        """Yield (vertices, closed) per polyline, optionally only of given types."""
+        for i in range(self.polyline_count):
+            if types is None or self.polyline_types[i] in types:
+                yield self.polyline(i), bool(self.polyline_closed[i])
+
+    @staticmethod
+    def concatenate(parts: Sequence["LayerGeometry"], name: str = "*") -> "LayerGeometry":
+        """Merge several layers into one, in model space order."""
+        if not parts:
+            return LayerGeometry(name)
+
+        def cat(attr: str) -> np.ndarray:
+            return np.concatenate([getattr(p, attr) for p in parts])
+
+        def ordered(seq_attr: str) -> Tuple[np.ndarray, np.ndarray]:
+            seq = cat(seq_attr)
+            order = np.argsort(seq, kind="stable")
+            return order, seq[order]
+
+        line_order, line_seq = ordered("line_seq")
+        arc_order, arc_seq = ordered("arc_seq")
+        circle_order, circle_seq = ordered("circle_seq")
+        spline_order, spline_seq = ordered("spline_seq")
+        poly_order, polyline_seq = ordered("polyline_seq")
+
+        # Reorder ragged polylines through a vertex gather
+        offsets = np.concatenate(
+            [p.polyline_offsets[:-1] + base for p, base in
+             zip(parts, np.cumsum([0] + [len(p.polyline_points) for p in parts[:-1]]))]
+        ).astype(np.intp)
+        counts = np.concatenate([np.diff(p.polyline_offsets) for p in parts]).astype(np.intp)[poly_order]
+        starts = offsets[poly_order]
+        gather = (np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+                  + np.arange(counts.sum()))
+        types = tuple(t for p in parts for t in p.polyline_types)
+        splines = [s for p in parts for s in p.splines]
+
+        return LayerGeometry(
+            name=name,
+            lines=cat("lines")[line_order],
+            polyline_points=cat("polyline_points")[gather],
+            polyline_bulges=cat("polyline_bulges")[gather],
+            polyline_offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.intp),
+            polyline_closed=cat("polyline_closed")[poly_order],
+            polyline_types=tuple(types[i] for i in poly_order.tolist()),
+            arcs=cat("arcs")[arc_order],
+            circles=cat("circles")[circle_order],
+            splines=[splines[i] for i in spline_order.tolist()],
+            line_seq=line_seq,
+            polyline_seq=polyline_seq,
+            arc_seq=arc_seq,
+            circle_seq=circle_seq,
+            spline_seq=spline_seq,
+        )
+
+
+@dataclass
+class DxfGeometry:
+    """
+    Model space geometry of a DXF file.
+
+    Attributes:
+        layers: Geometry per layer name, in order of first appearance
+        dxf_version: $ACADVER, e.g. "AC1009"
+        entity_count: Model space entities of any type (as len(msp))
+        entity_types: Model space entity count per type
+        reader: "fast" or "ezdxf" (binary files)
+    """
+    layers: Dict[str, LayerGeometry]
+    dxf_version: str = "AC1009"
+    entity_count: int = 0
+    entity_types: Dict[str, int] = field(default_factory=dict)
+    reader: str = "fast"
+
+    def layer(self, name: str) -> LayerGeometry:
+        """Geometry on one layer (empty if the layer has none)."""
+        geometry = self.layers.get(name)
+        return geometry if geometry is not None else LayerGeometry(name)
+
+    def merged(self, names: Optional[Iterable[str]] = None) -> LayerGeometry:
+        """Geometry of the given layers (default: all) as one LayerGeometry."""
+        if names is None:
+            parts = list(self.layers.values())
+        else:
+            parts = [self.layers[n] for n in names if n in self.layers]
+        return LayerGeometry.concatenate(parts)
+
+
+# =============================================================================
+# ACCUMULATION
+# =============================================================================
+
+class LayerGeometryBuilder:
+    """Python-list accumulator for one layer, frozen into LayerGeometry."""
+
+    __slots__ = ("lines", "points", "bulges", "counts", "closed", "types",
+                 "arcs", "circles", "splines", "line_seq", "polyline_seq",
+                 "arc_seq", "circle_seq", "spline_seq")
+
+    def __init__(self):
+        self.lines: List[float] = []
+        self.points: List[float] = []
+        self.bulges: List[float] = []
+        self.counts: List[int] = []
+        self.closed: List[bool] = []
+        self.types: List[str] = []
+        self.arcs: List[float] = []
+        self.circles: List[float] = []
+        self.splines: List[SplineData] = []
+        self.line_seq: List[int] = []
+        self.polyline_seq: List[int] = []
+        self.arc_seq: List[int] = []
+        self.circle_seq: List[int] = []
+        self.spline_seq: List[int] = []
+
+    def add_line(self, seq: int, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.lines.extend((x1, y1, x2, y2))
+        self.line_seq.append(seq)
+
+    def add_arc(self, seq: int, cx: float, cy: float, r: float, start: float, end: float) -> None:
+        self.arcs.extend((cx, cy, r, start, end))
+        self.arc_seq.append(seq)
+
+    def add_circle(self, seq: int, cx: float, cy: float, r: float) -> None:
+        self.circles.extend((cx, cy, r))
+        self.circle_seq.append(seq)
+
+    def add_spline(self, seq: int, spline: SplineData) -> None:
+        self.splines.append(spline)
+        self.spline_seq.append(seq)
+
+    def add_polyline(self, seq: int, etype: str, xy: List[float], bulges: List[float], closed: bool) -> None:
+        if not bulges:
+            return
+        self.points.extend(xy)
+        self.bulges.extend(bulges)
+        self.counts.append(len(bulges))
+        self.closed.append(closed)
+        self.types.append(etype)
+        self.polyline_seq.append(seq)
+
+    def build(self, name: str) -> LayerGeometry:
+        return LayerGeometry(
+            name=name,
+            lines=np.array(self.lines, dtype=np.float64).reshape(-1, 4),
+            polyline_points=np.array(self.points, dtype=np.float64).reshape(-1, 2),
+            polyline_bulges=np.array(self.bulges, dtype=np.float64),
+            polyline_offsets=np.concatenate(([0], np.cumsum(self.counts, dtype=np.intp))).astype(np.intp),
+            polyline_closed=np.array(self.closed, dtype=bool),
+            polyline_types=tuple(self.types),
+            arcs=np.array(self.arcs, dtype=np.float64).reshape(-1, 5),
+            circles=np.array(self.circles, dtype=np.float64).reshape(-1, 3),
+            splines=self.splines,
+            line_seq=np.array(self.line_seq, dtype=np.intp),
+            polyline_seq=np.array(self.polyline_seq, dtype=np.intp),
+            arc_seq=np.array(self.arc_seq, dtype=np.intp),
+            circle_seq=np.array(self.circle_seq, dtype=np.intp),
+            spline_seq=np.array(self.spline_seq, dtype=np.intp),
+        )
+
+
+
+# =============================================================================
+# EZDXF ENTITY CONVERSION
+# =============================================================================
+
+def builder_for(builders: Dict, layer) -> LayerGeometryBuilder:
+    b = builders.get(layer)
+    if b is None:
+        b = builders[layer] = LayerGeometryBuilder()
+    return b
+
+
+def add_ezdxf_entity(builders: Dict[str, LayerGeometryBuilder], seq: int, e) -> None:
+    """Add one supported ezdxf entity to the builders."""
+    etype = e.dxftype()
+    layer = e.dxf.layer
+
+    if etype == "LINE":
+        s, t = e.dxf.start, e.dxf.end
+        builder_for(builders, layer).add_line(seq, s.x, s.y, t.x, t.y)
+    elif etype == "LWPOLYLINE":
+        pts = list(e.get_points("xyb"))
+        builder_for(builders, layer).add_polyline(
+            seq, "LWPOLYLINE", [c for x, y, _ in pts for c in (x, y)],
+            [bulge for _, _, bulge in pts], e.closed)
+    elif etype == "POLYLINE":
+        if e.dxf.flags & POLYLINE_MESH_FLAGS:
+            return
+        xy: List[float] = []
+        bulges: List[float] = []
+        for v in e.vertices:
+            vflags = v.dxf.flags
+            if vflags & VERTEX_FACE_RECORD and not vflags & VERTEX_POLYFACE:
+                continue
+            xy.extend((v.dxf.location.x, v.dxf.location.y))
+            bulges.append(v.dxf.bulge)
+        builder_for(builders, layer).add_polyline(seq, "POLYLINE", xy, bulges, e.is_closed)
+    elif etype == "ARC":
+        c = e.dxf.center
+        builder_for(builders, layer).add_arc(
+            seq, c.x, c.y, e.dxf.radius, e.dxf.start_angle, e.dxf.end_angle)
+    elif etype == "CIRCLE":
+        c = e.dxf.center
+        builder_for(builders, layer).add_circle(seq, c.x, c.y, e.dxf.radius)
+    elif etype == "SPLINE":
+        spline = SplineData(
+            degree=e.dxf.degree,
+            closed=e.closed,
+            control_points=np.array([tuple(p) for p in e.control_points], dtype=np.float64).reshape(-1, 3),
+            knots=np.array(list(e.knots), dtype=np.float64),
+            weights=np.array(list(e.weights), dtype=np.float64),
+            fit_points=np.array([tuple(p) for p in e.fit_points], dtype=np.float64).reshape(-1, 3),
+            knot_tolerance=e.dxf.get("knot_tolerance", 1e-10),
+        )
+        if e.dxf.hasattr("start_tangent"):
+            spline.start_tangent = tuple(e.dxf.start_tangent)
+        if e.dxf.hasattr("end_tangent"):
+            spline.end_tangent = tuple(e.dxf.end_tangent)
+        builder_for(builders, layer).add_spline(seq, spline)
+
+
+def add_flattened_entity(builders: Dict[str, LayerGeometryBuilder], seq: int, e, distance: float) -> None:
+    """Flatten one entity (INSERTs recursively) into polylines."""
+    from ezdxf import disassemble
+    from ezdxf.path import make_path
+
+    etype = e.dxftype()
+    sources = disassemble.recursive_decompose([e]) if etype == "INSERT" else [e]
+    for entity in sources:
+        try:
+            vertices = list(make_path(entity).flattening(distance))
+        except TypeError:
+            continue  # not a curve (TEXT, POINT, ...)
+        if len(vertices) < 2:
+            continue
+        builder_for(builders, entity.dxf.layer).add_polyline(
+            seq, etype, [c for v in vertices for c in (v.x, v.y)],
+            [0.0] * len(vertices), False)
@@ -0,0 +1,271 @@
+# services/api/app/cam/dxf_geometry_cache.py
+"""
+Parsed-DXF Geometry Cache
+
+One parse per DXF payload, shared across a request pipeline and between
+requests.
+
+The Problem:
+    An upload passes through dxf_preflight, dxf_advanced_validation (via
+    dxf_validation_gate), loop extraction and contour reconstruction, and
+    each stage parsed the same bytes again: preflight wrote a temp file and
+    ran ezdxf.readfile, topology ran ezdxf.read, the extractor ran readfile
+    once more. A preflight-then-plan request on a large body outline paid for
+    three or four full ezdxf loads.
+
+The Solution:
+    DxfGeometryHandle wraps one payload, keyed by its SHA-256, and builds
+    each parsed view on first use:
+
+        handle.geometry         — per-layer arrays (dxf_fast_reader)
+        handle.document         — ezdxf document (shared, read-only)
+        handle.chain_index()    — ChainIndex over lines + polylines
+
+    Pipeline stages accept the handle (``handle=`` keyword) so a request
+    passes it along; stages called with plain bytes look it up with
+    get_dxf_handle() (or get_dxf_document() for the ezdxf view), which keeps
+    recent handles in a bounded LRU so a follow-up request for the same file
+    (preflight, then clean, then plan) reuses the parsed views too.
+
+Memory:
+    Retained handles are charged PARSED_SIZE_FACTOR x their payload size
+    against the byte budget, an estimate of the arrays and chain indexes
+    built from them. ezdxf documents are far larger still (an object per
+    entity), so only the most recently used handles keep theirs; older
+    handles drop the document and rebuild it if it is asked for again.
+
+Sharing:
+    Views are shared between callers and threads. Treat them as read-only;
+    code that edits a document (e.g. line_deduplicator) must load its own
+    copy with read_dxf_document().
+
+Configuration:
+    DXF_GEOMETRY_CACHE_SIZE       — max payloads kept (default 16, 0 disables)
+    DXF_GEOMETRY_CACHE_MAX_MB     — max estimated parsed size kept (default 128)
+    DXF_GEOMETRY_CACHE_DOCUMENTS  — handles that keep their ezdxf document
+                                    (default 2, at least 1)
+
+Usage:
+    from app.cam.dxf_geometry_cache import get_dxf_handle
+
+    handle = get_dxf_handle(dxf_bytes)
+    preflight = DXFPreflight(dxf_bytes, filename, handle=handle)
+    body = handle.geometry.layer("BODY")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from app.cam.chain_index import ChainIndex
+from app.cam.dxf_fast_reader import DxfReadError, read_dxf_document, read_dxf_geometry
+from app.cam.dxf_geometry_arrays import DxfGeometry
+
+CACHE_SIZE_ENV = "DXF_GEOMETRY_CACHE_SIZE"
+CACHE_SIZE_DEFAULT = 16
+CACHE_MAX_MB_ENV = "DXF_GEOMETRY_CACHE_MAX_MB"
+CACHE_MAX_MB_DEFAULT = 128.0
+CACHE_DOCUMENTS_ENV = "DXF_GEOMETRY_CACHE_DOCUMENTS"
+CACHE_DOCUMENTS_DEFAULT = 2
+
+# Estimated parsed-view size (arrays + chain indexes) per payload byte
+PARSED_SIZE_FACTOR = 4
+
+
+class DxfGeometryHandle:
+    """Lazily parsed views of one DXF payload."""
+
+    def __init__(self, dxf_bytes: bytes, key: Optional[str] = None):
+        self.dxf_bytes = dxf_bytes
+        self.key = key or hashlib.sha256(dxf_bytes).hexdigest()
+        self._lock = threading.Lock()
+        self._geometry: Optional[DxfGeometry] = None
+        self._document = None
+        self._document_error: Optional[DxfReadError] = None
+        self._chain_indexes: Dict[Optional[str], Tuple[ChainIndex, list]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.dxf_bytes)
+
+    @property
+    def footprint(self) -> int:
+        """Estimated retained size: payload plus parsed views."""
+        return self.size * (1 + PARSED_SIZE_FACTOR)
+
+    @property
+    def geometry(self) -> DxfGeometry:
+        """
+        Model space arrays from the fast-path reader.
+
+        Raises:
+            DxfReadError: If the payload is not a readable DXF
+        """
+        with self._lock:
+            if self._geometry is None:
+                self._geometry = read_dxf_geometry(self.dxf_bytes)
+            return self._geometry
+
+    @property
+    def document(self):
+        """
+        Full ezdxf document (read-only; shared with other callers).
+
+        A failed load is remembered, so later stages fail fast instead of
+        re-parsing a broken file.
+
+        Raises:
+            DxfReadError: If the payload is not a readable DXF
+        """
+        with self._lock:
+            if self._document is None and self._document_error is None:
+                try:
+                    self._document = read_dxf_document(self.dxf_bytes)
+                except DxfReadError as e:
+                    self._document_error = e
+            if self._document_error is not None:
+                raise self._document_error
+            return self._document
+
+    def release_document(self) -> None:
+        """Drop the ezdxf document; it is parsed again on next access."""
+        with self._lock:
+            self._document = None
+
+    def chain_index(self, layer: Optional[str] = None) -> Tuple[ChainIndex, list]:
+        """
+        Spatial index over LINE segments and polylines, in model space order.
+
+        Args:
+            layer: Restrict to one layer (default: all layers)
+
+        Returns:
+            (index, chains) where chains[i] is the [(x, y), ...] list behind
+            index chain i
+        """
+        geometry = self.geometry
+        with self._lock:
+            hit = self._chain_indexes.get(layer)
+            if hit is None:
+                source = geometry.merged() if layer is None else geometry.layer(layer)
+                keyed = [
+                    (seq, [(x1, y1), (x2, y2)])
+                    for seq, (x1, y1, x2, y2) in zip(source.line_seq.tolist(), source.lines.tolist())
+                ]
+                keyed.extend(
+                    (seq, [(x, y) for x, y in points.tolist()])
+                    for seq, (points, _closed) in zip(source.polyline_seq.tolist(), source.polylines())
+                )
+                keyed.sort(key=lambda item: item[0])
+                chains = [chain for _, chain in keyed]
+                hit = self._chain_indexes[layer] = (ChainIndex(chains), chains)
+            return hit
+
+
+class DxfGeometryCache:
+    """
+    Content-hash keyed LRU of DxfGeometryHandle, bounded by count and
+    estimated parsed size; only the max_documents most recently used
+    handles keep their ezdxf document.
+    """
+
+    def __init__(
+        self,
+        max_items: int = CACHE_SIZE_DEFAULT,
+        max_bytes: int = int(CACHE_MAX_MB_DEFAULT * 1024 * 1024),
+        max_documents: int = CACHE_DOCUMENTS_DEFAULT,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_documents = max(1, max_documents)
+        self._lru: "OrderedDict[str, DxfGeometryHandle]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def get(self, dxf_bytes: bytes) -> DxfGeometryHandle:
+        """
+        Return the handle for this payload, reusing a cached one by content.
+
+        Payloads larger than the byte budget still get a handle (to pass
+        through the current pipeline), they are just not retained.
+        """
+        key = hashlib.sha256(dxf_bytes).hexdigest()
+        with self._lock:
+            handle = self._lru.get(key)
+            if handle is not None:
+                self._lru.move_to_end(key)
+            else:
+                handle = DxfGeometryHandle(dxf_bytes, key=key)
+                if self.max_items > 0 and handle.footprint <= self.max_bytes:
+                    self._lru[key] = handle
+                    self._bytes += handle.footprint
+                    while len(self._lru) > self.max_items or self._bytes > self.max_bytes:
+                        _, evicted = self._lru.popitem(last=False)
+                        self._bytes -= evicted.footprint
+
+            # Older handles keep their arrays but not their ezdxf document
+            retained = list(self._lru.values())
+            for older in retained[:max(0, len(retained) - self.max_documents)]:
+                older.release_document()
+            return handle
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+
+
+_CACHE: Optional[DxfGeometryCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_geometry_cache() -> DxfGeometryCache:
+    """Return the process-wide cache (sized from the environment on first use)."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            size = int(os.getenv(CACHE_SIZE_ENV, str(CACHE_SIZE_DEFAULT)))
+            max_mb = float(os.getenv(CACHE_MAX_MB_ENV, str(CACHE_MAX_MB_DEFAULT)))
+            documents = int(os.getenv(CACHE_DOCUMENTS_ENV, str(CACHE_DOCUMENTS_DEFAULT)))
+            _CACHE = DxfGeometryCache(
+                max_items=size,
+                max_bytes=int(max_mb * 1024 * 1024),
+                max_documents=documents,
+            )
+        return _CACHE
+
+
+def get_dxf_handle(source: Union[bytes, str, "os.PathLike[str]"]) -> DxfGeometryHandle:
+    """
+    Handle for a DXF payload (bytes) or file (path), via the shared cache.
+
+    Files are keyed by content, so a rewritten file gets a fresh handle.
+
+    Raises:
+        DxfReadError: If a path cannot be read
+    """
+    if not isinstance(source, bytes):
+        try:
+            source = Path(source).read_bytes()
+        except OSError as e:
+            raise DxfReadError(f"Failed to read DXF: {e}") from e
+    return get_geometry_cache().get(source)
+
+
+def get_dxf_document(dxf_bytes: bytes, handle: Optional[DxfGeometryHandle] = None):
+    """
+    Shared, read-only ezdxf document for a payload, from the request's
+    handle when one is passed, otherwise via the shared cache.
+
+    Raises:
+        DxfReadError: If the payload is not a readable DXF
+    """
+    return (handle or get_dxf_handle(dxf_bytes)).document
@@ -3,12 +3,12 @@
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import ezdxf
 from ezdxf.lldxf.const import DXFError
 from pathlib import Path
 import math
 import json
 from datetime import datetime
+from .dxf_geometry_cache import DxfGeometryHandle, get_dxf_handle
 
 
 # =============================================================================
@@ -63,10 +63,16 @@ class PreflightReport:
 class DXFPreflight:
     """DXF validation engine"""
     
-    def __init__(self, dxf_bytes: bytes, filename: str = "unknown.dxf"):
-        """Initialize preflight checker with DXF content."""
+    def __init__(
+        self,
+        dxf_bytes: bytes,
+        filename: str = "unknown.dxf",
+        handle: Optional[DxfGeometryHandle] = None,
+    ):
+        """Initialize preflight checker; a shared handle reuses its parsed document."""
         self.filename = filename
         self.dxf_bytes = dxf_bytes
+        self.handle = handle
         self.doc = None
         self.msp = None
         self.issues: List[Issue] = []
@@ -75,20 +81,14 @@ class DXFPreflight:
         """Run all validation checks and generate report."""
         # Load DXF
         try:
-            import tempfile, os
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.dxf', mode='wb') as tmp:
-                tmp.write(self.dxf_bytes)
-                tmp_path = tmp.name
-            
-            try:
-                self.doc = ezdxf.readfile(tmp_path)
-                self.msp = self.doc.modelspace()
-            finally:
-                os.unlink(tmp_path)
+            if self.handle is None:
+                self.handle = get_dxf_handle(self.dxf_bytes)
+            self.doc = self.handle.document
+            self.msp = self.doc.modelspace()
         except (IOError, OSError, ValueError, DXFError) as e:
             self.issues.append(Issue(
                 severity=Severity.ERROR,
-                message=f"Failed to read DXF file: {str(e)}",
+                message=f"Failed to read DXF file: {str(e.__cause__ or e)}",
                 category="file"
             ))
             return self._build_report()
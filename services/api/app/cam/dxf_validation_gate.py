@@ -37,6 +37,7 @@ from fastapi import HTTPException
 
 from .dxf_preflight import DXFPreflight, PreflightReport, Severity
 from .dxf_advanced_validation import TopologyValidator, TopologyReport
+from .dxf_geometry_cache import DxfGeometryHandle, get_dxf_handle
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +64,7 @@ def run_full_validation(
     dxf_bytes: bytes,
     filename: str = "unknown.dxf",
     skip_topology: bool = False,
+    handle: Optional[DxfGeometryHandle] = None,
 ) -> Tuple[PreflightReport, Optional[TopologyReport]]:
     """
     Run all DXF validation checks.
@@ -71,19 +73,23 @@ def run_full_validation(
         dxf_bytes: Raw DXF file content
         filename: Original filename (for reporting)
         skip_topology: If True, skip Shapely-based topology checks (faster)
+        handle: Parsed-geometry handle for dxf_bytes (default: from the
+            geometry cache); both checks share its document
 
     Returns:
         Tuple of (preflight_report, topology_report or None)
     """
+    handle = handle or get_dxf_handle(dxf_bytes)
+
     # Run preflight validation
-    preflight = DXFPreflight(dxf_bytes, filename)
+    preflight = DXFPreflight(dxf_bytes, filename, handle=handle)
     preflight_report = preflight.run_all_checks()
 
     # Run topology validation (if not skipped)
     topology_report = None
     if not skip_topology:
         try:
-            validator = TopologyValidator(dxf_bytes, filename)
+            validator = TopologyValidator(dxf_bytes, filename, handle=handle)
             topology_report = validator.check_self_intersections()
             validator.check_line_segments()
             # Note: overlap check is O(n²) and slow - skip for now
@@ -98,6 +104,7 @@ def enforce_dxf_validation(
     filename: str = "unknown.dxf",
     skip_topology: bool = False,
     allow_warnings: bool = True,
+    handle: Optional[DxfGeometryHandle] = None,
 ) -> Tuple[PreflightReport, Optional[TopologyReport]]:
     """
     MANDATORY validation gate for DXF before G-code export.
@@ -110,6 +117,8 @@ def enforce_dxf_validation(
         filename: Original filename (for reporting)
         skip_topology: If True, skip Shapely topology checks (faster but less thorough)
         allow_warnings: If False, also block on WARNING-level issues
+        handle: Parsed-geometry handle for dxf_bytes; pass the same handle
+            to later stages (loop extraction) so the file is parsed once
 
     Returns:
         Tuple of (preflight_report, topology_report) if validation passes
@@ -120,13 +129,14 @@ def enforce_dxf_validation(
     Example:
         ```python
         dxf_bytes = await file.read()
-        preflight, topology = enforce_dxf_validation(dxf_bytes, file.filename)
+        handle = get_dxf_handle(dxf_bytes)
+        preflight, topology = enforce_dxf_validation(dxf_bytes, file.filename, handle=handle)
         # If we get here, validation passed
-        loops = extract_loops(dxf_bytes)
+        loops = extract_loops(dxf_bytes, handle=handle)
         ```
     """
     preflight_report, topology_report = run_full_validation(
-        dxf_bytes, filename, skip_topology
+        dxf_bytes, filename, skip_topology, handle=handle
     )
 
     # Collect errors and warnings
@@ -228,6 +238,7 @@ def validate_dxf_for_cam(
     filename: str = "unknown.dxf",
     require_closed_paths: bool = True,
     require_cam_layer: bool = True,
+    handle: Optional[DxfGeometryHandle] = None,
 ) -> dict:
     """
     Validate DXF for CAM-specific requirements.
@@ -239,6 +250,7 @@ def validate_dxf_for_cam(
         filename: Original filename
         require_closed_paths: If True, require at least one closed LWPOLYLINE
         require_cam_layer: If True, require GEOMETRY or similar CAM layer
+        handle: Parsed-geometry handle for dxf_bytes (default: from the cache)
 
     Returns:
         Validation result dict with pass/fail status and details
@@ -250,7 +262,7 @@ def validate_dxf_for_cam(
             raise HTTPException(422, detail=result)
         ```
     """
-    preflight, topology = run_full_validation(dxf_bytes, filename)
+    preflight, topology = run_full_validation(dxf_bytes, filename, handle=handle)
 
     cam_ready = True
     cam_issues: List[str] = []
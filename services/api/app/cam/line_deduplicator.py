@@ -22,6 +22,7 @@ from typing import Dict, List, Optional, Set, Tuple
 
 import ezdxf
 
+from app.cam.chain_index import ChainIndex
 from app.util.dxf_lifecycle_guard import (
     DxfLifecycleContext,
     assert_dxf_lifecycle_context,
@@ -98,13 +99,6 @@ def _build_chains_from_lines(
     return chains
 
 
-def _chain_bounds(chain: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
-    """Return (min_x, min_y, max_x, max_y) for a point chain."""
-    xs = [p[0] for p in chain]
-    ys = [p[1] for p in chain]
-    return min(xs), min(ys), max(xs), max(ys)
-
-
 def _find_duplicate_chains(
     chains: List[List[Tuple[float, float]]],
     offset_tolerance_mm: float = 6.0,
@@ -122,50 +116,15 @@ def _find_duplicate_chains(
     if len(chains) < 2:
         return set()
 
-    bounds = [_chain_bounds(c) for c in chains]
-    dims = [(b[2] - b[0], b[3] - b[1]) for b in bounds]  # (width, height)
-
-    to_remove: Set[int] = set()
-
-    for i in range(len(chains)):
-        if i in to_remove:
-            continue
-        for j in range(len(chains)):
-            if i == j or j in to_remove:
-                continue
-
-            w_i, h_i = dims[i]
-            w_j, h_j = dims[j]
-
-            # Skip tiny or degenerate chains
-            if w_i < 1 or h_i < 1 or w_j < 1 or h_j < 1:
-                continue
-
-            # Check if dimensions are similar (within tolerance)
-            w_diff = abs(w_i - w_j)
-            h_diff = abs(h_i - h_j)
-
-            if w_diff > size_tolerance_mm or h_diff > size_tolerance_mm:
-                continue
-
-            # Check offset distance (is one inset from the other?)
-            b_i, b_j = bounds[i], bounds[j]
-
-            # Calculate inset from i to j
-            offsets = [
-                b_j[0] - b_i[0],  # left inset
-                b_i[2] - b_j[2],  # right inset
-                b_j[1] - b_i[1],  # bottom inset
-                b_i[3] - b_j[3],  # top inset
-            ]
-
-            # If j is consistently inset from i by binding thickness, remove j
-            min_offset = 2.0  # Minimum binding thickness
-            if all(min_offset <= off <= offset_tolerance_mm for off in offsets):
-                to_remove.add(j)
-                logger.debug(f"Marking chain {j} as duplicate of {i} (offset ~{sum(offsets)/4:.1f}mm)")
+    removed = ChainIndex(chains).offset_duplicates(
+        min_offset=2.0,  # Minimum binding thickness
+        max_offset=offset_tolerance_mm,
+        size_tolerance=size_tolerance_mm,
+    )
+    for j, i in removed.items():
+        logger.debug(f"Marking chain {j} as duplicate of {i}")
 
-    return to_remove
+    return set(removed)
 
 
 def deduplicate_parallel_lines(
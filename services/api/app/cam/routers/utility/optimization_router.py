@@ -7,23 +7,27 @@ Provides:
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from ...time_estimator_v2 import estimate_cycle_time_v2
 from ...whatif_opt import optimize_feed_stepover
+from ...whatif_pareto import optimize_pareto, pareto_candidate_bound
 from ....routers.machines_consolidated_router import get_profile
 from ....cam_core.feeds_speeds import calculate_feed_plan
 from ....core.safety import safety_critical
 
 router = APIRouter(prefix="/opt")
 
-# optimize_feed_stepover() clones the full moves list and re-runs the cycle-time
-# estimate once per grid cell. Guard both the grid shape and the actual
+# optimize_feed_stepover() evaluates the cycle-time estimate for every grid
+# cell over the compiled moves. Guard both the grid shape and the actual
 # cells*moves workload; rectangular grids like 16x4 can be cheap, while 12x12
-# can still be too expensive on a very large move list.
+# can still be too expensive on a very large move list. Pareto mode counts
+# every candidate it can generate towards the workload: each coarse cell at
+# every RPM step, plus the refinement probes around the front
+# (pareto_candidate_bound()).
 DEFAULT_WHATIF_MAX_GRID_CELLS = 144
 DEFAULT_WHATIF_MAX_WORK_UNITS = 500_000
 WHATIF_MAX_GRID_CELLS_ENV = "LTB_WHATIF_MAX_GRID_CELLS"
@@ -47,7 +51,9 @@ def _whatif_limits() -> tuple[int, int]:
     )
 
 
-def _validate_whatif_grid(grid: List[int], move_count: int) -> tuple[int, int]:
+def _validate_whatif_grid(
+    grid: List[int], move_count: int, pareto: Optional[tuple[int, int]] = None
+) -> tuple[int, int]:
     if len(grid) != 2:
         raise HTTPException(
             400,
@@ -71,13 +77,19 @@ def _validate_whatif_grid(grid: List[int], move_count: int) -> tuple[int, int]:
             "Reduce feed/stepover steps or split the analysis into smaller runs.",
         )
 
-    work_units = cells * move_count
+    if pareto is None:
+        evaluated, what = cells, "cells"
+    else:
+        rpm_steps, levels = pareto
+        evaluated = pareto_candidate_bound((feed_steps, stepover_steps), rpm_steps, levels)
+        what = f"candidates at {rpm_steps} RPM steps with {levels} refinement rounds"
+    work_units = evaluated * move_count
     if work_units > max_work_units:
         raise HTTPException(
             400,
             f"grid would evaluate {work_units} move-cells "
-            f"({cells} cells x {move_count} moves); maximum is {max_work_units}. "
-            "Reduce grid steps or optimize a smaller toolpath segment.",
+            f"({evaluated} {what} x {move_count} moves); maximum is {max_work_units}. "
+            "Reduce grid steps, RPM steps or levels, or optimize a smaller toolpath segment.",
         )
 
     return feed_steps, stepover_steps
@@ -107,6 +119,20 @@ class OptIn(BaseModel):
             f"{WHATIF_MAX_GRID_CELLS_ENV} and {WHATIF_MAX_WORK_UNITS_ENV}."
         ),
     )
+    objective: Literal["time", "pareto"] = Field(
+        default="time",
+        description=(
+            "'time' runs the exhaustive feed/stepover grid. 'pareto' starts from "
+            "the same grid as a coarse pass, prunes chipload violations before "
+            "evaluation, refines around the front and returns the Pareto front "
+            "of cycle time vs energy vs tool load."
+        ),
+    )
+    rpm_steps: int = Field(default=3, ge=1, le=8, description="Coarse RPM steps (pareto only).")
+    levels: int = Field(default=2, ge=0, le=4, description="Refinement rounds (pareto only).")
+    sce_j_per_mm3: float = Field(
+        default=0.0015, gt=0, description="Specific cutting energy for energy/load (pareto only)."
+    )
 
 
 @router.post("/what_if")
@@ -116,18 +142,35 @@ def what_if_opt(body: OptIn) -> Dict[str, Any]:
     if body.moves is None:
         raise HTTPException(400, "M.2 expects prebuilt moves; call /plan first.")
 
-    grid = _validate_whatif_grid(body.grid, len(body.moves))
-
-    res = optimize_feed_stepover(
-        body.moves,
-        profile,
-        z_total=body.z_total,
-        stepdown=body.stepdown,
-        safe_z=body.safe_z,
-        bounds={k: tuple(v) for k, v in body.bounds.items()},
-        tool=body.tool,
-        grid=grid,
-    )
+    pareto = (body.rpm_steps, body.levels) if body.objective == "pareto" else None
+    grid = _validate_whatif_grid(body.grid, len(body.moves), pareto)
+
+    bounds = {k: tuple(v) for k, v in body.bounds.items()}
+    if body.objective == "pareto":
+        res = optimize_pareto(
+            body.moves,
+            profile,
+            z_total=body.z_total,
+            stepdown=body.stepdown,
+            safe_z=body.safe_z,
+            bounds=bounds,
+            tool=body.tool,
+            grid=grid,
+            rpm_steps=body.rpm_steps,
+            levels=body.levels,
+            sce_j_per_mm3=body.sce_j_per_mm3,
+        )
+    else:
+        res = optimize_feed_stepover(
+            body.moves,
+            profile,
+            z_total=body.z_total,
+            stepdown=body.stepdown,
+            safe_z=body.safe_z,
+            bounds=bounds,
+            tool=body.tool,
+            grid=grid,
+        )
     baseline = estimate_cycle_time_v2(
         body.moves, profile, z_total=body.z_total, stepdown=body.stepdown, safe_z=body.safe_z
     )
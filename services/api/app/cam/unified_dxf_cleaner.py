@@ -44,9 +44,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Set, Tuple
 
-import ezdxf
-from ezdxf.entities import LWPolyline
-
+from app.cam.dxf_geometry_cache import get_dxf_handle
 from app.util.dxf_compat import create_document
 from app.util.dxf_lifecycle_guard import (
     DxfLifecycleContext,
@@ -131,6 +129,32 @@ class CleanResult:
     error: Optional[str] = None
 
 
+def _read_lines_and_polylines(
+    input_path: Path,
+) -> Tuple[List[LineSegment], List[List[Tuple[float, float]]], int]:
+    """
+    Read LINE segments and LWPOLYLINE / POLYLINE vertex lists from model space.
+
+    Uses the fast-path arrays from the geometry cache (no ezdxf document is
+    built; a file already parsed by an earlier stage is not read again).
+
+    Returns:
+        (lines, polyline_points_list, original_entity_count)
+    """
+    geometry = get_dxf_handle(input_path).geometry
+    merged = geometry.merged()
+
+    lines = [
+        LineSegment(start=Point(x1, y1), end=Point(x2, y2))
+        for x1, y1, x2, y2 in merged.lines.tolist()
+    ]
+    polylines = [
+        [(x, y) for x, y in points.tolist()]
+        for points, _closed in merged.polylines()
+    ]
+    return lines, polylines, geometry.entity_count
+
+
 class DXFCleaner:
     """
     Cleans raw DXF files by filtering to significant closed contours.
@@ -166,33 +190,13 @@ class DXFCleaner:
         Returns:
             (chains_from_lines, polyline_points_list, original_entity_count)
         """
-        doc = ezdxf.readfile(str(input_path))
-        msp = doc.modelspace()
-
-        all_entities = list(msp)
-        original_count = len(all_entities)
-
-        lines: List[LineSegment] = []
-        polylines: List[LWPolyline] = []
-
-        for e in all_entities:
-            if e.dxftype() == "LINE":
-                lines.append(LineSegment(
-                    start=Point(e.dxf.start.x, e.dxf.start.y),
-                    end=Point(e.dxf.end.x, e.dxf.end.y),
-                ))
-            elif e.dxftype() in ("LWPOLYLINE", "POLYLINE"):
-                polylines.append(e)
+        lines, polylines, original_count = _read_lines_and_polylines(input_path)
 
         # Chain LINE entities
         chains = self._chain_lines(lines) if lines else []
 
         # Extract polyline points
-        polyline_pts = []
-        for pl in polylines:
-            points = list(pl.get_points("xy"))
-            if len(points) >= 2:
-                polyline_pts.append(points)
+        polyline_pts = [points for points in polylines if len(points) >= 2]
 
         return chains, polyline_pts, original_count
 
@@ -300,25 +304,8 @@ class DXFCleaner:
         result = CleanResult()
 
         try:
-            doc = ezdxf.readfile(str(input_path))
-            msp = doc.modelspace()
-
-            # Count original entities
-            all_entities = list(msp)
-            result.original_entity_count = len(all_entities)
-
-            # Separate entity types
-            lines: List[LineSegment] = []
-            polylines: List[LWPolyline] = []
-
-            for e in all_entities:
-                if e.dxftype() == "LINE":
-                    lines.append(LineSegment(
-                        start=Point(e.dxf.start.x, e.dxf.start.y),
-                        end=Point(e.dxf.end.x, e.dxf.end.y),
-                    ))
-                elif e.dxftype() in ("LWPOLYLINE", "POLYLINE"):
-                    polylines.append(e)
+            # Separate entity types and count original entities
+            lines, polylines, result.original_entity_count = _read_lines_and_polylines(input_path)
 
             logger.info(f"Found {len(lines)} LINE, {len(polylines)} POLYLINE entities")
 
@@ -349,8 +336,7 @@ class DXFCleaner:
 
             # Process POLYLINE entities
             kept_polylines: List[List[Tuple[float, float]]] = []
-            for pl in polylines:
-                points = list(pl.get_points("xy"))
+            for points in polylines:
                 if len(points) < 2:
                     continue
 
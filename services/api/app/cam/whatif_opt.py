@@ -53,8 +53,9 @@ Optimization uses exhaustive grid search with constraint filtering:
 
 5. **Time Estimation & Ranking**:
    ```
+   compiled = compile_toolpath(moves)            # once per request
+   t[feed] = estimate_cycle_time_compiled(compiled, feeds)  # vectorized
    For each valid combination:
-     t = estimate_cycle_time_v2(moves, params)
      rank by minimum t (fastest cycle time)
    ```
 
@@ -229,17 +230,18 @@ CRITICAL SAFETY RULES:
 
 PERFORMANCE CHARACTERISTICS:
 -----------------------------
-- **Computational Complexity**: O(n × m × k) where n/m/k = grid step counts
-- **Memory Usage**: O(n × m × k) for result storage
-- **Typical Runtime**: <100ms for 10×5×8 grid (400 combinations)
-- **Evaluation Time**: ~0.2ms per combination (time estimation dominates)
+- **Computational Complexity**: O(moves) compile + O(feed_steps × moves) NumPy sweep
+- **Memory Usage**: O(moves) compiled arrays + O(n × m) for result storage
+- **Typical Runtime**: ~120ms for a 20×20 grid over 50k moves
+- **Evaluation Time**: stepover does not enter the time model, so each feed
+  column is estimated once and shared across its stepover cells
 - **Optimal Found**: Guaranteed global optimum (exhaustive search)
 
 LIMITATIONS & FUTURE ENHANCEMENTS:
 ----------------------------------
 **Current Limitations**:
-- Exhaustive search (slow for large grids, >1000 combinations)
-- No multi-objective optimization (only minimizes time, not cost/wear)
+- Exhaustive search in 'time' mode (use 'pareto' for coarse-to-fine refinement)
+- Multi-objective mode uses proxy energy/load models (energy_model, sce × chip area)
 - Constant constraints (not geometry-dependent)
 - No historical data integration (doesn't learn from past runs)
 
@@ -255,6 +257,9 @@ PATCH HISTORY:
 - Author: Phase 3.3 - What-If Optimizer (Module M.2)
 - Based on: Chipload theory + time_estimator_v2 predictions
 - Dependencies: time_estimator_v2.py (cycle time estimation)
+- Enhanced: Compiled toolpath sweep (compiled_toolpath.py) replaces per-cell move cloning
+- Enhanced: optimize_pareto() coarse-to-fine multi-objective mode (time / energy / tool load),
+  in whatif_pareto.py
 - Enhanced: Phase 7a (Coding Policy Application)
 
 ================================================================================
@@ -262,7 +267,8 @@ PATCH HISTORY:
 
 import math
 from typing import Dict, Any, Tuple, List
-from .time_estimator_v2 import estimate_cycle_time_v2
+
+from .compiled_toolpath import compile_toolpath, estimate_cycle_time_compiled
 
 
 # ============================================================================
@@ -358,7 +364,8 @@ def optimize_feed_stepover(
         safe_z: Safe retract height (positive)
         bounds: Dict with keys 'feed', 'stepover', 'rpm' → (lo, hi) tuples
         tool: Dict with 'flutes' and 'chipload_target_mm'
-        objective: Optimization objective (currently only 'time')
+        _objective: 'time' (grid search, default) or 'pareto' (delegates to
+            optimize_pareto with default refinement settings)
         grid: (feed_steps, stepover_steps) tuple
         tolerance_chip_mm: Chipload tolerance in mm/tooth
     
@@ -368,6 +375,20 @@ def optimize_feed_stepover(
             neighbors: List of 6 nearest samples by param L2 distance
             grid: {feed, stepover, rpm} bounds and step counts
     """
+    if _objective == "pareto":
+        from .whatif_pareto import optimize_pareto
+
+        return optimize_pareto(
+            moves, profile,
+            z_total=z_total,
+            stepdown=stepdown,
+            safe_z=safe_z,
+            bounds=bounds,
+            tool=tool,
+            grid=grid,
+            tolerance_chip_mm=tolerance_chip_mm,
+        )
+
     feed_lo, feed_hi = bounds.get("feed", (300, 8000))
     stp_lo, stp_hi = bounds.get("stepover", (0.2, 0.9))  # 0..1
     rpm_lo, rpm_hi = bounds.get("rpm", (6000, 24000))
@@ -383,39 +404,33 @@ def optimize_feed_stepover(
     best = None
     samples = []
 
-    for i in range(gF):
-        f = feed_lo + (feed_hi - feed_lo) * (i / max(1, gF - 1))
-        
+    # Compile geometry once; every grid cell then only varies feed/stepover.
+    # Cycle time in the v2 model depends on feed alone, so one vectorized
+    # sweep over the feed axis covers the whole grid.
+    feeds = [feed_lo + (feed_hi - feed_lo) * (i / max(1, gF - 1)) for i in range(gF)]
+    compiled = compile_toolpath(moves)
+    times = estimate_cycle_time_compiled(
+        compiled, profile, feeds,
+        z_total=z_total,
+        stepdown=stepdown,
+        safe_z=safe_z
+    )
+
+    for i, f in enumerate(feeds):
+        t = float(times[i])
+
+        # Set candidate RPM to hit chipload target, within bounds
+        rpm = _rpm_for_chipload(f, chip_t, flutes, rpm_lo, rpm_hi)
+
+        # Check chipload constraint
+        ok_chip = _chipload_ok(f, rpm, flutes, chip_t, tolerance_chip_mm)
+        penalty = 0.0 if ok_chip else 0.08 * t  # 8% penalty if outside tolerance
+
+        score = t + penalty
+
         for j in range(gS):
             s = stp_lo + (stp_hi - stp_lo) * (j / max(1, gS - 1))  # 0..1
-            
-            # Set candidate RPM to hit chipload target, within bounds
-            rpm = _rpm_for_chipload(f, chip_t, flutes, rpm_lo, rpm_hi)
-
-            # Clone moves with this feed applied
-            # (Simple: set F on G1/2/3; slowdowns handled by estimator)
-            mv = []
-            for m in moves:
-                mm = dict(m)
-                if mm.get("code") in ("G1", "G2", "G3"):
-                    mm["f"] = f
-                mv.append(mm)
-
-            # Estimate cycle time
-            est = estimate_cycle_time_v2(
-                mv, profile,
-                z_total=z_total,
-                stepdown=stepdown,
-                safe_z=safe_z
-            )
-            t = est["time_s"]
-
-            # Check chipload constraint
-            ok_chip = _chipload_ok(f, rpm, flutes, chip_t, tolerance_chip_mm)
-            penalty = 0.0 if ok_chip else 0.08 * t  # 8% penalty if outside tolerance
-
-            score = t + penalty
-            
+
             itm = {
                 "feed_mm_min": round(f, 1),
                 "stepover": round(s, 3),
@@ -424,7 +439,7 @@ def optimize_feed_stepover(
                 "score": score
             }
             samples.append(itm)
-            
+
             if (best is None) or (score < best["score"]):
                 best = dict(itm)
 
@@ -0,0 +1,257 @@
+"""
+What-If Optimizer: Pareto Mode (Module M.2)
+
+Multi-objective companion to whatif_opt.optimize_feed_stepover(). Searches
+feed x stepover x RPM coarse-to-fine and returns the non-dominated front
+over cycle time, cutting energy and a tool-load proxy. Candidates outside
+the chipload tolerance are pruned before any objective is evaluated.
+
+Objective model (the moves were planned at a reference stepover s_ref):
+    passes ∝ 1/stepover, so time = t(feed) × s_ref / stepover
+    cutting energy = V × sce × (chip_target / chipload)^KC_SIZE_EXPONENT
+        (same volume V at any stepover; thinner chips cost more per mm³)
+        plus spindle no-load power ∝ RPM over the cycle time
+    tool load = cutting power / cutting speed, with width of cut
+        stepover × tool diameter and cutting speed π × diameter × RPM
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .compiled_toolpath import compile_toolpath, estimate_cycle_time_compiled
+from .energy_model import energy_breakdown
+from .whatif_opt import _chipload_ok, _rpm_for_chipload, _safe
+
+
+# ============================================================================
+# PARETO OPTIMIZER (TIME vs ENERGY vs TOOL LOAD, COARSE-TO-FINE)
+# ============================================================================
+
+PARETO_KEYS = ("time_s", "energy_j", "tool_load_n")
+
+# Specific cutting energy rises as chips get thinner (Kienzle size effect)
+KC_SIZE_EXPONENT = 0.25
+
+
+# Refinement probes 3 feeds x 3 stepovers x (3 RPMs + chipload-targeted RPM)
+# around each refined front point
+REFINE_PROBES_PER_POINT = 36
+DEFAULT_MAX_FRONT = 12
+
+
+def pareto_candidate_bound(
+    grid: Tuple[int, int], rpm_steps: int, levels: int, max_front: int = DEFAULT_MAX_FRONT
+) -> int:
+    """
+    Upper bound on the candidates optimize_pareto() generates.
+
+    Coarse cells are tried at every RPM step plus the chipload-targeted RPM;
+    each refinement round probes REFINE_PROBES_PER_POINT cells around at
+    most max_front front points.
+    """
+    feed_steps, stepover_steps = grid
+    coarse = feed_steps * stepover_steps * (max(1, int(rpm_steps)) + 1)
+    return coarse + max(0, int(levels)) * max_front * REFINE_PROBES_PER_POINT
+
+
+def _pareto_front(samples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Non-dominated subset of samples (all objectives minimized), sorted by time."""
+    if not samples:
+        return []
+    obj = np.array([[x[k] for k in PARETO_KEYS] for x in samples], dtype=np.float64)
+    keep = []
+    for i in range(obj.shape[0]):
+        no_worse = np.all(obj <= obj[i], axis=1)
+        better = np.any(obj < obj[i], axis=1)
+        if not np.any(no_worse & better):
+            keep.append(samples[i])
+    return sorted(keep, key=lambda x: (x["time_s"], x["energy_j"], x["tool_load_n"]))
+
+
+def optimize_pareto(
+    moves: List[Dict[str, Any]],
+    profile: Dict[str, Any],
+    z_total: float,
+    stepdown: float,
+    safe_z: float,
+    bounds: Dict[str, Tuple[float, float]],
+    tool: Dict[str, Any],
+    grid: Tuple[int, int] = (6, 6),
+    tolerance_chip_mm: float = 0.02,
+    rpm_steps: int = 3,
+    levels: int = 2,
+    sce_j_per_mm3: float = 0.0015,
+    max_front: int = DEFAULT_MAX_FRONT,
+    spindle_idle_w_per_krpm: float = 10.0,
+) -> Dict[str, Any]:
+    """
+    Multi-objective feed/stepover/RPM search returning a Pareto front.
+
+    Starts from a coarse (feed x stepover x RPM) grid, then refines around
+    the current front with halved step sizes for `levels` rounds. Candidates
+    outside the chipload tolerance are pruned before evaluation, so only
+    feasible cells cost an objective evaluation.
+
+    Objectives (all minimized):
+        time_s: Compiled v2 estimate at this feed, scaled by s_ref / stepover
+            because the pass count goes as 1 / stepover
+        energy_j: Cutting energy of the (stepover-independent) pocket volume
+            at the chipload-corrected sce, plus spindle no-load energy
+            (spindle_idle_w_per_krpm × RPM / 1000 over time_s)
+        tool_load_n: Tangential cutting force Pc / Vc, with
+            Pc = sce × (stepover × diameter) × stepdown × feed and
+            Vc = π × diameter × RPM
+
+    Args:
+        moves: List of G-code moves from /plan
+        profile: Machine profile dict
+        z_total: Total pocket depth (negative)
+        stepdown: Depth per pass (positive)
+        safe_z: Safe retract height (positive)
+        bounds: Dict with keys 'feed', 'stepover', 'rpm' → (lo, hi) tuples
+        tool: Dict with 'flutes', 'chipload_target_mm', optional 'diameter_mm'
+            and 'stepover' (the stepover the moves were planned with;
+            default: middle of the stepover bounds)
+        grid: Coarse (feed_steps, stepover_steps) tuple
+        tolerance_chip_mm: Chipload tolerance in mm/tooth
+        rpm_steps: Coarse RPM steps (chipload-targeted RPM is always tried)
+        levels: Refinement rounds after the coarse pass
+        sce_j_per_mm3: Specific cutting energy of the material
+        max_front: Front points refined per round (fastest first); with the
+            coarse grid this bounds the work, see pareto_candidate_bound()
+        spindle_idle_w_per_krpm: Spindle no-load power per 1000 RPM (W)
+
+    Returns:
+        Dict with:
+            front: Non-dominated samples sorted by time_s
+            best: Fastest front sample (None if nothing is feasible)
+            evaluations: Number of candidates scored
+            pruned: Number of candidates rejected on chipload before scoring
+            grid: {feed, stepover, rpm} bounds and coarse step counts, levels
+    """
+    feed_lo, feed_hi = bounds.get("feed", (300, 8000))
+    stp_lo, stp_hi = bounds.get("stepover", (0.2, 0.9))  # 0..1
+    rpm_lo, rpm_hi = bounds.get("rpm", (6000, 24000))
+
+    flutes = int(tool.get("flutes", 2))
+    chip_t = float(tool.get("chipload_target_mm", 0.05))
+    tool_d = float(tool.get("diameter_mm", 6.0))
+    stp_ref = float(tool.get("stepover", (stp_lo + stp_hi) / 2))
+
+    # Profile feed cap guard
+    feed_cap = float(profile.get("limits", {}).get("feed_xy", feed_hi))
+    feed_hi = min(feed_hi, feed_cap)
+
+    gF, gS = grid
+    gR = max(1, int(rpm_steps))
+
+    compiled = compile_toolpath(moves)
+    # The pocket volume does not change with stepover (more passes, each
+    # narrower), so the reference cutting energy is evaluated once
+    cut_energy_ref = energy_breakdown(
+        moves, sce_j_per_mm3, tool_d, stp_ref, stepdown, {}
+    )["totals"]["energy_j"]
+
+    def lerp(lo: float, hi: float, n: int, i: int) -> float:
+        return lo + (hi - lo) * (i / max(1, n - 1))
+
+    def key(f: float, s: float, r: float) -> Tuple[float, float, int]:
+        return (round(f, 1), round(s, 3), int(r))
+
+    def rpm_candidates(f: float, rpms: List[float]) -> List[float]:
+        out = [_safe(r, rpm_lo, rpm_hi) for r in rpms]
+        out.append(_rpm_for_chipload(f, chip_t, flutes, rpm_lo, rpm_hi))
+        return out
+
+    seen = set()
+    samples: List[Dict[str, Any]] = []
+    times: Dict[float, float] = {}
+    pruned = 0
+
+    def evaluate(cands: List[Tuple[float, float, float]]) -> None:
+        nonlocal pruned
+        fresh = []
+        for cand in cands:
+            k = key(*cand)
+            if k in seen:
+                continue
+            seen.add(k)
+            f, s, r = k
+            # Early pruning: infeasible chipload never reaches the estimator
+            if not _chipload_ok(f, r, flutes, chip_t, tolerance_chip_mm):
+                pruned += 1
+                continue
+            fresh.append((f, s, r))
+
+        new_feeds = sorted({f for f, _, _ in fresh if f not in times})
+        if new_feeds:
+            est = estimate_cycle_time_compiled(
+                compiled, profile, new_feeds,
+                z_total=z_total,
+                stepdown=stepdown,
+                safe_z=safe_z
+            )
+            times.update(zip(new_feeds, (float(t) for t in est)))
+
+        for f, s, r in fresh:
+            chip = f / (r * flutes) if r > 1e-6 and flutes >= 1 else 0.0
+            kc_scale = (chip_t / chip) ** KC_SIZE_EXPONENT if chip > 0 else 1.0
+            t = times[f] * stp_ref / s
+            energy = cut_energy_ref * kc_scale + spindle_idle_w_per_krpm * r / 1000.0 * t
+            # Pc (W) = sce (J/mm^3) x MRR (mm^3/s); Vc in m/s
+            power_w = sce_j_per_mm3 * kc_scale * (s * tool_d) * stepdown * f / 60.0
+            vc_m_s = math.pi * tool_d * r / 60000.0
+            samples.append({
+                "feed_mm_min": f,
+                "stepover": s,
+                "rpm": r,
+                "chipload_mm": round(chip, 4),
+                "time_s": round(t, 3),
+                "energy_j": round(energy, 3),
+                "tool_load_n": round(power_w / vc_m_s if vc_m_s > 0 else 0.0, 3),
+            })
+
+    # Coarse pass
+    coarse_rpms = [lerp(rpm_lo, rpm_hi, gR, k) for k in range(gR)]
+    coarse = []
+    for i in range(gF):
+        f = lerp(feed_lo, feed_hi, gF, i)
+        for j in range(gS):
+            s = lerp(stp_lo, stp_hi, gS, j)
+            for r in rpm_candidates(f, coarse_rpms):
+                coarse.append((f, s, r))
+    evaluate(coarse)
+
+    # Refinement: halve step sizes and probe axis neighbours of the front
+    df = (feed_hi - feed_lo) / max(1, gF - 1)
+    ds = (stp_hi - stp_lo) / max(1, gS - 1)
+    dr = (rpm_hi - rpm_lo) / max(1, gR - 1)
+    for _ in range(max(0, int(levels))):
+        df, ds, dr = df / 2, ds / 2, dr / 2
+        refine = []
+        for p in _pareto_front(samples)[:max_front]:
+            f0, s0, r0 = p["feed_mm_min"], p["stepover"], p["rpm"]
+            for f in (f0 - df, f0, f0 + df):
+                f = _safe(f, feed_lo, feed_hi)
+                for s in (s0 - ds, s0, s0 + ds):
+                    s = _safe(s, stp_lo, stp_hi)
+                    refine.extend((f, s, r) for r in rpm_candidates(f, [r0 - dr, r0, r0 + dr]))
+        evaluate(refine)
+
+    front = _pareto_front(samples)
+    best: Optional[Dict[str, Any]] = dict(front[0]) if front else None
+
+    return {
+        "best": best,
+        "front": front,
+        "evaluations": len(samples),
+        "pruned": pruned,
+        "grid": {
+            "feed": [feed_lo, feed_hi, gF],
+            "stepover": [stp_lo, stp_hi, gS],
+            "rpm": [rpm_lo, rpm_hi, gR],
+            "levels": int(levels),
+        }
+    }
@@ -0,0 +1,321 @@
+"""
+Compute Dispatch
+================
+
+Runs CPU-bound route work (OpenCV, rembg, potrace, planners) off the event
+loop so one vectorization cannot stall every other request.
+
+Each route submits to a named lane. A lane bounds how many of its jobs run at
+once and how many may wait; past that the request is rejected with 429 and a
+Retry-After estimate instead of piling up. Lanes run either on a shared
+process pool (true parallelism for pure-Python/NumPy work; the function and
+its arguments must be picklable) or on a shared thread pool (for work that
+holds unpicklable clients or mostly waits on I/O). Process lanes may name a
+dedicated pool whose workers run an initializer once, so heavy models stay
+loaded for the life of the worker (see app.core.compute_pools). A job whose
+client disconnects is cancelled if it has not started, and its result
+discarded if it has.
+
+Usage:
+    from app.core.compute_dispatch import run_compute
+
+    result = await run_compute(
+        "blueprint_vectorize", extract_guitar_blueprint, source_path, request=request,
+    )
+
+Environment:
+    COMPUTE_PROCESS_WORKERS  process pool size (default: CPU count; 0 runs
+                             process lanes on the thread pool instead)
+    COMPUTE_THREAD_WORKERS   thread pool size (default 8)
+    COMPUTE_START_METHOD     multiprocessing start method (default "spawn")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from app.observability.metrics import (
+    compute_jobs_total,
+    compute_queue_wait_ms,
+    compute_run_ms,
+)
+
+from .compute_pools import ComputePools
+from .compute_pools import ComputeLane as ComputeLane, ProcessPoolSpec as ProcessPoolSpec
+from .compute_pools import DEFAULT_LANES as DEFAULT_LANES, PROCESS_POOLS as PROCESS_POOLS
+
+T = TypeVar("T")
+
+
+# =============================================================================
+# ERRORS
+# =============================================================================
+
+class ComputeOverloaded(Exception):
+    """Raised when a lane's running and queued jobs are at capacity."""
+
+    def __init__(self, lane: str, retry_after_s: int):
+        self.lane = lane
+        self.retry_after_s = retry_after_s
+        super().__init__(f"Compute lane '{lane}' is busy; retry after {retry_after_s}s")
+
+
+class ComputeCancelled(Exception):
+    """Raised when the client disconnected before the job finished."""
+
+    def __init__(self, lane: str):
+        self.lane = lane
+        super().__init__(f"Compute job on lane '{lane}' cancelled: client disconnected")
+
+
+# =============================================================================
+# BACK-PRESSURE
+# =============================================================================
+
+class _LaneState:
+    """Slot accounting for a lane; must be used from one event loop thread."""
+
+    def __init__(self, lane: ComputeLane):
+        self.lane = lane
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.avg_run_ms = 0.0
+        self.completed = 0
+
+    @property
+    def is_full(self) -> bool:
+        return self.active + len(self.waiters) >= self.lane.max_concurrency + self.lane.max_queue
+
+    def retry_after_s(self) -> int:
+        """Estimated seconds until a queue slot frees up."""
+        if self.avg_run_ms <= 0:
+            return 1
+        waves = (len(self.waiters) + 1) / self.lane.max_concurrency
+        return max(1, int(math.ceil(waves * self.avg_run_ms / 1000.0)))
+
+    async def acquire(self) -> None:
+        if self.active < self.lane.max_concurrency and not self.waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # slot was handed over as we were cancelled
+            else:
+                self.waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        # Hand the slot straight to the next live waiter
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def record_run(self, ms: float) -> None:
+        self.completed += 1
+        # EWMA keeps the Retry-After estimate tracking recent load
+        self.avg_run_ms = ms if self.completed == 1 else 0.8 * self.avg_run_ms + 0.2 * ms
+
+
+# =============================================================================
+# DISPATCHER
+# =============================================================================
+
+class ComputeDispatcher(ComputePools):
+    """Per-lane limits and metrics over the shared compute pools."""
+
+    def __init__(
+        self,
+        lanes: Optional[Dict[str, ComputeLane]] = None,
+        pools: Optional[Dict[str, ProcessPoolSpec]] = None,
+        process_workers: Optional[int] = None,
+        thread_workers: int = 8,
+        start_method: str = "spawn",
+        disconnect_poll_s: float = 0.5,
+    ):
+        super().__init__(
+            pools=pools,
+            process_workers=process_workers,
+            thread_workers=thread_workers,
+            start_method=start_method,
+        )
+        self.lanes = dict(DEFAULT_LANES if lanes is None else lanes)
+        self.disconnect_poll_s = disconnect_poll_s
+        self._states: Dict[str, _LaneState] = {}
+
+    def configure_lane(self, lane: ComputeLane) -> None:
+        """Add or replace a lane policy (running jobs keep their old limits)."""
+        self.lanes[lane.name] = lane
+        self._states.pop(lane.name, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-lane snapshot: active, queued, completed and mean run time."""
+        return {
+            name: {
+                "active": state.active,
+                "queued": len(state.waiters),
+                "completed": state.completed,
+                "avg_run_ms": round(state.avg_run_ms, 1),
+                "max_concurrency": state.lane.max_concurrency,
+                "max_queue": state.lane.max_queue,
+            }
+            for name, state in self._states.items()
+        }
+
+    async def run(
+        self,
+        lane_name: str,
+        func: Callable[..., T],
+        *args: Any,
+        request: Any = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run func(*args, **kwargs) on a lane's executor.
+
+        Args:
+            request: Starlette Request whose disconnect cancels the job
+
+        Raises:
+            KeyError: Unknown lane
+            ComputeOverloaded: Lane running and queue slots are all taken
+            ComputeCancelled: Client disconnected before the job finished
+        """
+        lane = self.lanes[lane_name]
+        state = self._states.get(lane_name)
+        if state is None:
+            state = self._states[lane_name] = _LaneState(lane)
+        labels = {"lane": lane_name}
+
+        if state.is_full:
+            compute_jobs_total.inc(labels={**labels, "outcome": "rejected"})
+            raise ComputeOverloaded(lane_name, state.retry_after_s())
+
+        queued_at = time.perf_counter()
+        try:
+            await self._until_disconnect(state.acquire(), request, lane_name)
+        except ComputeCancelled:
+            compute_jobs_total.inc(labels={**labels, "outcome": "cancelled"})
+            raise
+        started_at = time.perf_counter()
+        compute_queue_wait_ms.observe((started_at - queued_at) * 1000.0, labels=labels)
+
+        loop = asyncio.get_running_loop()
+        try:
+            job = self._executor(lane).submit(partial(func, *args, **kwargs))
+        except BaseException:
+            state.release()
+            raise
+
+        def _finished(_: Future) -> None:
+            ms = (time.perf_counter() - started_at) * 1000.0
+            compute_run_ms.observe(ms, labels=labels)
+            state.record_run(ms)
+            state.release()
+
+        # The slot is held until the executor is really done, even when the
+        # client has gone, so abandoned jobs still count against the lane
+        job.add_done_callback(lambda fut: loop.call_soon_threadsafe(_finished, fut))
+
+        try:
+            result = await self._until_disconnect(asyncio.wrap_future(job), request, lane_name)
+        except ComputeCancelled:
+            job.cancel()
+            compute_jobs_total.inc(labels={**labels, "outcome": "cancelled"})
+            raise
+        except BrokenProcessPool:
+            self._reset_process_pool(lane.pool)
+            compute_jobs_total.inc(labels={**labels, "outcome": "error"})
+            raise
+        except BaseException:
+            compute_jobs_total.inc(labels={**labels, "outcome": "error"})
+            raise
+
+        compute_jobs_total.inc(labels={**labels, "outcome": "ok"})
+        return result
+
+    async def _until_disconnect(self, awaitable, request: Any, lane_name: str):
+        """Await awaitable, cancelling it if the request's client goes away."""
+        task = asyncio.ensure_future(awaitable)
+        if request is None:
+            return await task
+
+        async def _watch() -> None:
+            while not await request.is_disconnected():
+                await asyncio.sleep(self.disconnect_poll_s)
+
+        watcher = asyncio.ensure_future(_watch())
+        try:
+            await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            watcher.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        raise ComputeCancelled(lane_name)
+
+
+_dispatcher: Optional[ComputeDispatcher] = None
+
+
+def get_compute_dispatcher() -> ComputeDispatcher:
+    """Return the process-wide dispatcher, creating it from the environment."""
+    global _dispatcher
+    if _dispatcher is None:
+        process_workers = os.getenv("COMPUTE_PROCESS_WORKERS")
+        _dispatcher = ComputeDispatcher(
+            process_workers=int(process_workers) if process_workers else None,
+            thread_workers=int(os.getenv("COMPUTE_THREAD_WORKERS", "8")),
+            start_method=os.getenv("COMPUTE_START_METHOD", "spawn"),
+        )
+    return _dispatcher
+
+
+def shutdown_compute_dispatcher() -> None:
+    """Shut down the shared dispatcher's pools. Call on application shutdown."""
+    if _dispatcher is not None:
+        _dispatcher.shutdown()
+
+
+async def run_compute(
+    lane_name: str,
+    func: Callable[..., T],
+    *args: Any,
+    request: Any = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Route-facing wrapper around ComputeDispatcher.run.
+
+    Maps back-pressure to 429 with Retry-After and a client disconnect to
+    499 (the client never sees it; it keeps access logs honest).
+    """
+    try:
+        return await get_compute_dispatcher().run(lane_name, func, *args, request=request, **kwargs)
+    except ComputeOverloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_s)},
+        )
+    except ComputeCancelled as e:
+        raise HTTPException(status_code=499, detail=str(e))
@@ -0,0 +1,251 @@
+"""
+Compute Pools
+=============
+
+Lane policies and the executors behind them, for the compute dispatcher
+(app.core.compute_dispatch).
+
+A lane names a class of route work and the executor it runs on: a shared
+thread pool, or a named process pool. Process pools are created on first use
+and torn down on shutdown or when a worker dies; a pool whose spec names an
+initializer runs it once in every worker, so heavy models stay loaded for the
+life of the worker, and prestart() starts and warms every worker ahead of the
+first request.
+
+Environment:
+    VECTORIZER_WORKERS       warm vectorizer pool size (default 2)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# prestart(): how long each readiness probe occupies a worker, and how many
+# probe rounds to send before accepting a partially reported pool
+PRESTART_HOLD_S = 0.2
+PRESTART_ROUNDS = 5
+
+
+# =============================================================================
+# LANES
+# =============================================================================
+
+@dataclass(frozen=True)
+class ComputeLane:
+    """Concurrency policy for one class of route work."""
+    name: str
+    max_concurrency: int = 2
+    max_queue: int = 4
+    kind: str = "process"  # "process" or "thread"
+    pool: str = "default"  # process pool name (process lanes only)
+
+
+@dataclass(frozen=True)
+class ProcessPoolSpec:
+    """
+    A named process pool; initializer runs once in every worker.
+
+    The initializer's return value is kept as the worker's ready report
+    (see ComputePools.prestart).
+    """
+    name: str
+    max_workers: Optional[int] = None  # None: COMPUTE_PROCESS_WORKERS / CPU count
+    initializer: Optional[Callable[[], Any]] = None
+
+
+def _warm_vectorizer_worker() -> Dict[str, Optional[float]]:
+    from app.services.vectorizer_models import warm_vectorizer_models
+
+    return warm_vectorizer_models()
+
+
+PROCESS_POOLS: Dict[str, ProcessPoolSpec] = {
+    "default": ProcessPoolSpec("default"),
+    # Long-lived workers holding rembg / EasyOCR / contour-classifier models
+    "vectorizer": ProcessPoolSpec(
+        "vectorizer",
+        max_workers=int(os.getenv("VECTORIZER_WORKERS", "2")),
+        initializer=_warm_vectorizer_worker,
+    ),
+}
+
+
+DEFAULT_LANES: Dict[str, ComputeLane] = {
+    lane.name: lane
+    for lane in (
+        # Photo Vectorizer v2 (rembg + OpenCV): memory heavy, keep narrow
+        ComputeLane("photo_vectorize", max_concurrency=2, max_queue=4, pool="vectorizer"),
+        # Blueprint Phase 3 (PDF raster + ML/OCR)
+        ComputeLane("blueprint_vectorize", max_concurrency=2, max_queue=4, pool="vectorizer"),
+        # Vision segmentation holds an AI client: thread lane
+        ComputeLane("vision_segment", max_concurrency=4, max_queue=16, kind="thread"),
+        # Adaptive pocket planning for photo-to-gcode
+        ComputeLane("cam_plan", max_concurrency=4, max_queue=8),
+    )
+}
+
+
+# =============================================================================
+# POOLS
+# =============================================================================
+
+class ComputePools:
+    """Shared thread pool and named process pools, created on first use."""
+
+    def __init__(
+        self,
+        pools: Optional[Dict[str, ProcessPoolSpec]] = None,
+        process_workers: Optional[int] = None,
+        thread_workers: int = 8,
+        start_method: str = "spawn",
+    ):
+        self.pools = dict(PROCESS_POOLS if pools is None else pools)
+        self.process_workers = (os.cpu_count() or 2) if process_workers is None else process_workers
+        self.thread_workers = thread_workers
+        self.start_method = start_method
+        self._process_pools: Dict[str, ProcessPoolExecutor] = {}
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._warm_pools: Dict[str, Dict[int, Any]] = {}
+        self._prestarts: Dict[str, "asyncio.Task[Dict[int, Any]]"] = {}
+
+    async def prestart(self, pool_name: str) -> Dict[int, Any]:
+        """
+        Start every worker of a process pool now, running its initializer.
+
+        Returns {worker pid: initializer result}. Without a process pool
+        (COMPUTE_PROCESS_WORKERS=0) the initializer runs once on the thread
+        pool instead, keyed by this process's pid.
+        """
+        spec = self.pools[pool_name]
+        loop = asyncio.get_running_loop()
+        if self.process_workers <= 0:
+            executor = self._executor(ComputeLane("_prestart", kind="thread"))
+            ready = dict([await loop.run_in_executor(executor, _init_worker, spec.initializer)])
+        else:
+            executor = self._process_pool(pool_name)
+            size = self._pool_size(spec)
+            # One probe per worker; the pool spawns a process for each while
+            # none is idle, and every new process runs the initializer first.
+            # Probes hold their worker briefly so one fast-booting process
+            # does not answer them all; repeat until every worker reported.
+            ready: Dict[int, Any] = {}
+            for _ in range(PRESTART_ROUNDS):
+                probes = [
+                    loop.run_in_executor(executor, _worker_probe, PRESTART_HOLD_S)
+                    for _ in range(size)
+                ]
+                ready.update(await asyncio.gather(*probes))
+                if len(ready) >= size:
+                    break
+        self._warm_pools[pool_name] = ready
+        logger.info("Compute pool '%s' started: %d worker(s)", pool_name, len(ready))
+        return ready
+
+    def prestart_in_background(self, pool_name: str) -> "asyncio.Task[Dict[int, Any]]":
+        """
+        Schedule prestart() on the running loop without awaiting it.
+
+        The task is kept (so it is not garbage-collected mid-run) until it
+        finishes; a failure is logged rather than lost with the task.
+        """
+        task = self._prestarts.get(pool_name)
+        if task is None or task.done():
+            task = self._prestarts[pool_name] = asyncio.ensure_future(self.prestart(pool_name))
+            task.add_done_callback(lambda t: self._prestart_done(pool_name, t))
+        return task
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-pool snapshot: configured size, running and prestarted workers."""
+        return {
+            name: {
+                "max_workers": self._pool_size(spec),
+                "running": name in self._process_pools,
+                "prestarted": self._warm_pools.get(name, {}),
+            }
+            for name, spec in self.pools.items()
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut all pools down; they are recreated on next use."""
+        for task in list(self._prestarts.values()):
+            task.cancel()
+        for pool in self._process_pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        self._process_pools.clear()
+        self._warm_pools.clear()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+            self._thread_pool = None
+
+    def _prestart_done(self, pool_name: str, task: "asyncio.Task[Dict[int, Any]]") -> None:
+        if self._prestarts.get(pool_name) is task:
+            del self._prestarts[pool_name]
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("Compute pool '%s' prestart failed: %s", pool_name, exc, exc_info=exc)
+
+    def _pool_size(self, spec: ProcessPoolSpec) -> int:
+        return spec.max_workers or self.process_workers
+
+    def _process_pool(self, name: str) -> ProcessPoolExecutor:
+        pool = self._process_pools.get(name)
+        if pool is None:
+            spec = self.pools[name]
+            pool = self._process_pools[name] = ProcessPoolExecutor(
+                max_workers=self._pool_size(spec),
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(spec.initializer,),
+            )
+        return pool
+
+    def _executor(self, lane: ComputeLane) -> Executor:
+        if lane.kind == "process" and self.process_workers > 0:
+            return self._process_pool(lane.pool)
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="compute_",
+            )
+        return self._thread_pool
+
+    def _reset_process_pool(self, name: str) -> None:
+        logger.error("Compute pool '%s' broke (worker died); recreating on next job", name)
+        pool = self._process_pools.pop(name, None)
+        self._warm_pools.pop(name, None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+# Ready report of the pool worker this module is running in
+_worker_report: Any = None
+
+
+def _init_worker(initializer: Optional[Callable[[], Any]]) -> Tuple[int, Any]:
+    global _worker_report
+    if initializer is not None:
+        _worker_report = initializer()
+    return os.getpid(), _worker_report
+
+
+def _worker_ready() -> Tuple[int, Any]:
+    return os.getpid(), _worker_report
+
+
+def _worker_probe(hold_s: float) -> Tuple[int, Any]:
+    time.sleep(hold_s)
+    return _worker_ready()
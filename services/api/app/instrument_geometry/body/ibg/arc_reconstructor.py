@@ -3,7 +3,8 @@ Arc Reconstructor — Standalone Gap Bridging with Arc/Polyline Output
 =====================================================================
 
 Three-tier gap reconstruction for guitar body outlines.
-Standalone implementation — no production dependencies.
+Standalone implementation — depends only on app.cam.chain_index for
+near-linear deduplication.
 
 Tier 1: Radius measured from adjacent chain (most accurate)
 Tier 2: Radius computed from spherical arch formula
@@ -22,6 +23,8 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from app.cam.chain_index import ChainIndex
+
 
 # ─── Section A: Data Structures ────────────────────────────────────────────────
 
@@ -508,87 +511,26 @@ def deduplicate_lines(
     """
     Remove duplicate and near-duplicate chains produced by edge detection.
 
-    Two chains are duplicates if all their endpoints match within tolerance.
-    Keep the longest chain from each duplicate group.
+    Two chains are duplicates if their start/end points match within
+    tolerance (either orientation) and their total lengths are within 10%
+    of each other. Keep the longest chain from each duplicate group.
+    Candidates come from a ChainIndex endpoint lookup, so noisy inputs
+    with tens of thousands of chains stay near-linear.
     """
     if not chains:
         return chains
 
-    kept = []
-    skip = set()
-
-    for i, chain_a in enumerate(chains):
-        if i in skip:
-            continue
-
-        duplicates = [i]
-
-        for j, chain_b in enumerate(chains):
-            if j <= i or j in skip:
-                continue
-
-            # Quick bbox check before detailed comparison
-            if not _bboxes_overlap(chain_a, chain_b, tolerance_mm):
-                continue
-
-            if _chains_are_duplicates(chain_a, chain_b, tolerance_mm):
-                duplicates.append(j)
-                skip.add(j)
+    index = ChainIndex([[(p.x, p.y) for p in c.points] for c in chains])
 
+    kept = []
+    for group in index.duplicate_groups(tolerance_mm, length_ratio=0.10):
         # Keep longest chain from duplicate group
-        best = max(duplicates, key=lambda idx: chains[idx].length_mm())
+        best = max(group, key=lambda idx: chains[idx].length_mm())
         kept.append(chains[best])
 
     return kept
 
 
-def _chains_are_duplicates(
-    a: Chain,
-    b: Chain,
-    tolerance_mm: float,
-) -> bool:
-    """
-    Two chains are duplicates if their start/end points match within tolerance,
-    and their total lengths are within 10% of each other.
-    """
-    # Length similarity check
-    la, lb = a.length_mm(), b.length_mm()
-    if la < 1e-6 or lb < 1e-6:
-        return False
-    if abs(la - lb) / max(la, lb) > 0.10:
-        return False
-
-    # Endpoint match - try both orientations
-    a_start, a_end = a.points[0], a.points[-1]
-    b_start, b_end = b.points[0], b.points[-1]
-
-    forward = (
-        a_start.distance_to(b_start) <= tolerance_mm and
-        a_end.distance_to(b_end) <= tolerance_mm
-    )
-    reverse = (
-        a_start.distance_to(b_end) <= tolerance_mm and
-        a_end.distance_to(b_start) <= tolerance_mm
-    )
-
-    return forward or reverse
-
-
-def _bboxes_overlap(a: Chain, b: Chain, margin: float) -> bool:
-    """Quick rejection test before detailed comparison."""
-    ax = [p.x for p in a.points]
-    ay = [p.y for p in a.points]
-    bx = [p.x for p in b.points]
-    by = [p.y for p in b.points]
-
-    return not (
-        max(ax) + margin < min(bx) or
-        min(ax) - margin > max(bx) or
-        max(ay) + margin < min(by) or
-        min(ay) - margin > max(by)
-    )
-
-
 # ─── Section F: ArcReconstructor Class ─────────────────────────────────────────
 
 class ArcReconstructor:
@@ -915,66 +857,22 @@ def _deduplicate_raw_lines(
     """
     Remove parallel duplicate lines produced by edge detection.
 
-    Parallel lines within tolerance_mm are considered duplicates.
+    Parallel lines (|cos| > 0.99, both at least 0.1mm long) whose midpoints
+    are within tolerance_mm are considered duplicates; the longest of each
+    cluster is kept.
     Returns (deduplicated_lines, num_removed).
     """
     if not lines:
         return lines, 0
 
-    def line_direction(line):
-        dx = line[1][0] - line[0][0]
-        dy = line[1][1] - line[0][1]
-        length = math.sqrt(dx**2 + dy**2)
-        if length < 1e-9:
-            return (0, 0), 0
-        return (dx/length, dy/length), length
-
-    def lines_parallel(l1, l2):
-        d1, len1 = line_direction(l1)
-        d2, len2 = line_direction(l2)
-        if len1 < 0.1 or len2 < 0.1:
-            return False
-        # Dot product - parallel if close to 1 or -1
-        dot = abs(d1[0]*d2[0] + d1[1]*d2[1])
-        return dot > 0.99
-
-    def midpoint(line):
-        return ((line[0][0] + line[1][0])/2, (line[0][1] + line[1][1])/2)
-
-    def midpoint_distance(l1, l2):
-        m1, m2 = midpoint(l1), midpoint(l2)
-        return math.sqrt((m1[0]-m2[0])**2 + (m1[1]-m2[1])**2)
-
-    # Group lines by approximate direction (angle buckets)
-    kept = []
-    removed = 0
-    skip = set()
-
-    for i, line_a in enumerate(lines):
-        if i in skip:
-            continue
-
-        # Find all parallel duplicates
-        duplicates = [i]
-        for j, line_b in enumerate(lines):
-            if j <= i or j in skip:
-                continue
-            if lines_parallel(line_a, line_b):
-                dist = midpoint_distance(line_a, line_b)
-                if dist < tolerance_mm:
-                    duplicates.append(j)
-                    skip.add(j)
-
-        # Keep the longest line from the cluster
-        if len(duplicates) > 1:
-            best = max(duplicates, key=lambda idx: line_direction(lines[idx])[1])
-            removed += len(duplicates) - 1
-        else:
-            best = duplicates[0]
+    def line_length(line):
+        return math.hypot(line[1][0] - line[0][0], line[1][1] - line[0][1])
 
-        kept.append(lines[best])
+    groups = ChainIndex(lines).parallel_groups(tolerance_mm, min_length=0.1, min_cos=0.99)
 
-    return kept, removed
+    # Keep the longest line from each cluster
+    kept = [lines[max(group, key=lambda idx: line_length(lines[idx]))] for group in groups]
+    return kept, len(lines) - len(kept)
 
 
 def load_chains_from_dxf(
@@ -191,8 +191,9 @@ def load_dxf_geometry_by_path(file_path: str) -> dict:
     """
     Load DXF geometry directly from a file path.
     
-    This is a convenience wrapper that reads a DXF file from disk and parses
-    it using the R12 parser to extract geometry data.
+    This is a convenience wrapper that reads a DXF file from disk with the
+    fast-path reader (no ezdxf document) and extracts LINE, LWPOLYLINE and
+    POLYLINE geometry in file order.
     
     Args:
         file_path: Absolute or relative path to the DXF file.
@@ -211,29 +212,35 @@ def load_dxf_geometry_by_path(file_path: str) -> dict:
         ValueError: If the file cannot be parsed as DXF.
     """
     from pathlib import Path
+    from ..cam.dxf_fast_reader import DxfReadError, read_dxf_geometry
     
     path_obj = Path(file_path)
     if not path_obj.exists():
         raise FileNotFoundError(f"DXF file not found: {file_path}")
     
-    # Read raw bytes from file
-    raw = path_obj.read_bytes()
-    
-    # Parse using R12 legacy parser
     try:
-        mlpaths = read_dxf_to_mlpaths(raw)
-    except (OSError, ValueError) as e:  # WP-1: narrowed from except Exception
+        geometry = read_dxf_geometry(path_obj).merged()
+    except DxfReadError as e:
         raise ValueError(f"Failed to parse DXF file: {e}")
     
+    # LINEs and polylines, interleaved back into file order
+    entries = [
+        (seq, [(x1, y1), (x2, y2)], False)
+        for seq, (x1, y1, x2, y2) in zip(geometry.line_seq.tolist(), geometry.lines.tolist())
+    ]
+    entries += [
+        (seq, [tuple(p) for p in vertices.tolist()], closed)
+        for seq, (vertices, closed) in zip(geometry.polyline_seq.tolist(), geometry.polylines())
+    ]
+    entries.sort(key=lambda entry: entry[0])
+    
     # Extract paths and compute metrics
     paths = []
     total_length = 0.0
     min_x = min_y = float("inf")
     max_x = max_y = float("-inf")
     
-    for mlpath in mlpaths:
-        path_points = [(pt.x, pt.y) for pt in mlpath.points]
-        is_closed = mlpath.closed if hasattr(mlpath, "closed") else False
+    for _seq, path_points, is_closed in entries:
         paths.append({
             "points": path_points,
             "is_closed": is_closed,
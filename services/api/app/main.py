@@ -48,7 +48,12 @@ from .middleware.rate_limit import limiter, rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 # Centralized router loading (Phase 9)
-from .router_registry import load_all_routers, get_router_health
+from .router_registry import (
+    LazyRouterMiddleware,
+    LazyRouterMounter,
+    get_router_health,
+    load_all_routers,
+)
 
 
 # =============================================================================
@@ -197,6 +202,7 @@ _log.info("API rate limiting initialized")
 from .db.startup import run_migrations_on_startup
 from .core.observability import set_version, register_loaded_feature
 from .health.startup import validate_startup
+from .core.compute_dispatch import get_compute_dispatcher, shutdown_compute_dispatcher
 
 
 @app.on_event("startup")
@@ -221,20 +227,46 @@ def _startup_observability() -> None:
     register_loaded_feature("health")
 
 
+@app.on_event("startup")
+async def _startup_vectorizer_pool() -> None:
+    """Start the warm vectorizer workers in the background (VECTORIZER_WARM=1)."""
+    if os.getenv("VECTORIZER_WARM", "").lower() in ("1", "true", "yes"):
+        get_compute_dispatcher().prestart_in_background("vectorizer")
+
+
+@app.on_event("shutdown")
+def _shutdown_compute_pools() -> None:
+    """Stop the compute-dispatch process and thread pools."""
+    shutdown_compute_dispatcher()
+
+
 # =============================================================================
 # ROUTER REGISTRATION (via router_registry)
 # =============================================================================
 
-# Load all routers from the centralized manifest
-for router, prefix, tags in load_all_routers():
-    if prefix:
-        app.include_router(router, prefix=prefix, tags=tags)
-    else:
-        app.include_router(router, tags=tags)
+# Load all routers from the centralized manifest.
+# ROUTER_LOAD_MODE=lazy defers importing each router until the first request
+# under its prefix (fast boot for readiness probes); ROUTER_PREWARM=1 then
+# mounts the deferred routers in the background after startup.
+ROUTER_LOAD_MODE = os.getenv("ROUTER_LOAD_MODE", "eager").lower()
+if ROUTER_LOAD_MODE == "lazy":
+    _lazy_routers = LazyRouterMounter(
+        app,
+        prewarm=os.getenv("ROUTER_PREWARM", "").lower() in ("1", "true", "yes"),
+    )
+    _lazy_routers.register()
+    app.add_middleware(LazyRouterMiddleware, mounter=_lazy_routers)
+else:
+    for router, prefix, tags in load_all_routers():
+        if prefix:
+            app.include_router(router, prefix=prefix, tags=tags)
+        else:
+            app.include_router(router, tags=tags)
 
 # The registry should mount governance_consolidated_router through
 # system_manifest.py. A direct guarded fallback is registered after local routes
-# below so the routing-truth CI witness can still inspect app.routes.
+# below so the routing-truth CI witness can still inspect app.routes. In lazy
+# mode, deferred routers are spliced in ahead of these fallbacks when mounted.
 
 # Route analytics endpoints - for router consolidation analysis (only if enabled)
 # Access: /api/_analytics/summary, /api/_analytics/export, /api/_analytics/reset
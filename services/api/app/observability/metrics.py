@@ -179,6 +179,40 @@ cam_roughing_gcode_intent_strict_reject_total = Counter(
     "Strict-mode rejects for /cam/roughing_gcode_intent (CamIntentV1)",
 )
 
+# ---------------------------------------------------------------------
+# Compute dispatch (app.core.compute_dispatch) lane metrics
+# ---------------------------------------------------------------------
+
+compute_jobs_total = Counter(
+    "compute_jobs_total",
+    "Compute dispatch jobs by lane and outcome (ok, error, rejected, cancelled)",
+)
+
+compute_queue_wait_ms = HistogramMs(
+    "compute_queue_wait_ms",
+    "Time (ms) a compute job waited for a lane slot",
+)
+
+compute_run_ms = HistogramMs(
+    "compute_run_ms",
+    "Time (ms) a compute job ran in its executor",
+    buckets_ms=(10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000),
+)
+
+# ---------------------------------------------------------------------
+# Vectorization result cache (app.services.vectorize_cache)
+# ---------------------------------------------------------------------
+
+vectorize_cache_lookups_total = Counter(
+    "vectorize_cache_lookups_total",
+    "Vectorization cache lookups by pipeline/stage and outcome (hit, miss)",
+)
+
+vectorize_cache_evictions_total = Counter(
+    "vectorize_cache_evictions_total",
+    "Vectorization cache entries evicted to stay under the size bound",
+)
+
 
 def render_prometheus() -> str:
     """
@@ -191,5 +225,10 @@ def render_prometheus() -> str:
         cam_roughing_intent_latency_ms.render(),
         cam_roughing_gcode_intent_total.render(),
         cam_roughing_gcode_intent_strict_reject_total.render(),
+        compute_jobs_total.render(),
+        compute_queue_wait_ms.render(),
+        compute_run_ms.render(),
+        vectorize_cache_lookups_total.render(),
+        vectorize_cache_evictions_total.render(),
     ]
     return "".join(parts)
@@ -0,0 +1,368 @@
+"""Pre-fork production launcher.
+
+Imports the heavy scientific stack, the application and its router modules
+once in a parent process, freezes the GC so those objects are never touched
+by collection, then forks uvicorn workers that share the pages copy-on-write.
+Every worker reports its startup time and memory (RSS / PSS / shared) back to
+the parent, which logs a per-worker table.
+
+Usage (POSIX only):
+    python -m app.prefork --workers 4 --port ${PORT}
+
+uvicorn's own ``--workers`` spawns fresh interpreters, so each worker repeats
+every import; forking after preload is what keeps RSS from multiplying.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_log = logging.getLogger(__name__)
+
+# Heavy third-party imports shared by most routers (performance audit list)
+PRELOAD_MODULES: Tuple[str, ...] = (
+    "numpy",
+    "scipy",
+    "scipy.optimize",
+    "scipy.spatial",
+    "ezdxf",
+    "sqlalchemy",
+    "weasyprint",
+    "cv2",
+    "shapely",
+)
+
+
+@dataclass
+class WorkerReport:
+    """Startup report a worker sends to the parent once it is serving."""
+    worker: int
+    pid: int
+    startup_ms: float
+    rss_mb: float
+    pss_mb: float
+    shared_mb: float
+    private_mb: float
+
+
+def memory_usage() -> Dict[str, float]:
+    """
+    Memory of the current process in MB.
+
+    PSS divides shared pages between the processes mapping them, so summing
+    PSS over the parent and workers gives the real footprint. Falls back to
+    peak RSS where /proc is unavailable.
+    """
+    fields: Dict[str, float] = {}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024.0
+    except OSError:
+        import resource
+
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_kb /= 1024
+        rss = peak_kb / 1024.0
+        return {"rss_mb": rss, "pss_mb": rss, "shared_mb": 0.0, "private_mb": rss}
+
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "shared_mb": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def _import_timed(name: str) -> Optional[float]:
+    """Import a module; returns wall time in ms, or None if unavailable."""
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except Exception as e:  # optional deps (weasyprint needs system libs)
+        _log.info("Preload skipped %s (%s)", name, e)
+        return None
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _load_app(app_path: str) -> Any:
+    module_name, _, attr = app_path.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "app")
+
+
+def preload(
+    app_path: str = "app.main:app",
+    modules: Sequence[str] = PRELOAD_MODULES,
+    preload_routers: bool = True,
+) -> Tuple[Any, Dict[str, float]]:
+    """
+    Import the shared stack and the application in this (parent) process.
+
+    With preload_routers, every enabled manifest router module is imported
+    too, so lazily mounted routers (ROUTER_LOAD_MODE=lazy) are already in
+    shared memory when a worker first mounts them.
+
+    Returns:
+        (app, {module: import ms}) for the modules that imported.
+    """
+    timings: Dict[str, float] = {}
+    for name in modules:
+        ms = _import_timed(name)
+        if ms is not None:
+            timings[name] = ms
+
+    start = time.perf_counter()
+    app = _load_app(app_path)
+    timings[app_path] = (time.perf_counter() - start) * 1000.0
+
+    if preload_routers:
+        from .router_registry import ROUTER_MANIFEST
+
+        start = time.perf_counter()
+        for spec in ROUTER_MANIFEST:
+            if spec.enabled:
+                _import_timed(spec.module)
+        timings["router_manifest"] = (time.perf_counter() - start) * 1000.0
+
+    return app, timings
+
+
+def _bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Forks uvicorn workers sharing one listening socket and app image."""
+
+    def __init__(
+        self,
+        app: Any,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: int = 4,
+        graceful_timeout_s: float = 30.0,
+        **uvicorn_kwargs: Any,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.graceful_timeout_s = graceful_timeout_s
+        self.uvicorn_kwargs = uvicorn_kwargs
+        self.reports: Dict[int, WorkerReport] = {}
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._stopping = False
+        self._sock: Optional[socket.socket] = None
+        self._report_r = -1
+        self._report_w = -1
+
+    def run(self) -> int:
+        """Bind, fork the workers and supervise them; returns an exit code."""
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-fork mode requires os.fork (POSIX only)")
+
+        self._sock = _bind_socket(self.host, self.port)
+        self._report_r, self._report_w = os.pipe()
+        os.set_blocking(self._report_r, False)
+
+        # Objects created so far are never collected; a collection in a
+        # worker would otherwise write to (and un-share) every page it scans
+        gc.collect()
+        gc.freeze()
+
+        parent = memory_usage()
+        _log.info(
+            "Prefork: parent pid %d preloaded (RSS %.1f MB), forking %d workers on %s:%d",
+            os.getpid(), parent["rss_mb"], self.workers, self.host, self._sock.getsockname()[1],
+        )
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for index in range(self.workers):
+            self._spawn(index)
+
+        exit_code = self._supervise()
+        self._shutdown()
+        return exit_code
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _spawn(self, index: int) -> None:
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._worker_main(index, forked_at)
+            except BaseException:
+                _log.exception("Prefork worker %d crashed", index)
+            finally:
+                os._exit(code)
+        self._children[pid] = index
+
+    def _worker_main(self, index: int, forked_at: float) -> int:
+        import uvicorn
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.close(self._report_r)
+        gc.enable()
+
+        config = uvicorn.Config(self.app, lifespan="on", **self.uvicorn_kwargs)
+        server = uvicorn.Server(config)
+
+        async def serve() -> None:
+            task = asyncio.create_task(server.serve(sockets=[self._sock]))
+            while not server.started and not task.done():
+                await asyncio.sleep(0.01)
+            if server.started:
+                report = WorkerReport(
+                    worker=index,
+                    pid=os.getpid(),
+                    startup_ms=(time.perf_counter() - forked_at) * 1000.0,
+                    **memory_usage(),
+                )
+                os.write(self._report_w, (json.dumps(asdict(report)) + "\n").encode())
+            await task
+
+        asyncio.run(serve())
+        return 0 if server.started else 1
+
+    def _supervise(self) -> int:
+        buffer = b""
+        while not self._stopping:
+            try:
+                ready, _, _ = select.select([self._report_r], [], [], 0.5)
+            except InterruptedError:
+                ready = []
+            if ready:
+                try:
+                    buffer += os.read(self._report_r, 65536)
+                except BlockingIOError:
+                    pass
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    self._record(WorkerReport(**json.loads(line)))
+
+            while self._children:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                index = self._children.pop(pid)
+                code = os.waitstatus_to_exitcode(status)
+                if self._stopping:
+                    continue
+                if index not in self.reports or self.reports[index].pid != pid:
+                    # Died before serving: restarting would just crash-loop
+                    _log.error("Prefork worker %d (pid %d) failed to start (exit %d)", index, pid, code)
+                    return 1
+                _log.warning("Prefork worker %d (pid %d) exited (%d); restarting", index, pid, code)
+                self._spawn(index)
+        return 0
+
+    def _record(self, report: WorkerReport) -> None:
+        self.reports[report.worker] = report
+        _log.info(
+            "Prefork worker %d pid %d ready in %.0f ms: RSS %.1f MB, PSS %.1f MB, "
+            "shared %.1f MB, private %.1f MB",
+            report.worker, report.pid, report.startup_ms,
+            report.rss_mb, report.pss_mb, report.shared_mb, report.private_mb,
+        )
+        if len(self.reports) == self.workers:
+            parent = memory_usage()
+            total_pss = parent["pss_mb"] + sum(r.pss_mb for r in self.reports.values())
+            _log.info(
+                "Prefork: %d workers ready; total PSS %.1f MB (parent %.1f MB)",
+                self.workers, total_pss, parent["pss_mb"],
+            )
+
+    def _shutdown(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout_s
+        while self._children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.05)
+            else:
+                self._children.pop(pid, None)
+        for pid in list(self._children):
+            _log.warning("Prefork worker pid %d did not stop; killing", pid)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._children.clear()
+        if self._sock is not None:
+            self._sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-fork uvicorn launcher")
+    parser.add_argument("--app", default="app.main:app", help="ASGI app as module:attr")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "4")))
+    parser.add_argument(
+        "--preload", action="append", default=None,
+        help="Module to import before forking (repeatable; replaces the default list)",
+    )
+    parser.add_argument(
+        "--no-preload-routers", dest="preload_routers", action="store_false",
+        help="Do not import manifest router modules in the parent",
+    )
+    parser.add_argument("--timeout-keep-alive", type=int, default=120)
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Keep the collector from running (and touching pages) while preloading
+    gc.disable()
+    start = time.perf_counter()
+    app, timings = preload(
+        args.app,
+        modules=args.preload if args.preload is not None else PRELOAD_MODULES,
+        preload_routers=args.preload_routers,
+    )
+    for name, ms in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+        _log.info("Preload %-32s %8.1f ms", name, ms)
+    _log.info("Preload complete in %.1f s", time.perf_counter() - start)
+
+    server = PreforkServer(
+        app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        graceful_timeout_s=args.graceful_timeout,
+        timeout_keep_alive=args.timeout_keep_alive,
+    )
+    return server.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
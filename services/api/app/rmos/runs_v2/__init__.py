@@ -24,6 +24,7 @@ Usage:
 Feature Flag:
     Set RMOS_RUNS_V2_ENABLED=true to use this implementation.
     Default storage: services/api/data/runs/rmos
+    Set RMOS_RUNS_INDEX_BACKEND=sqlite for the SQLite (WAL) run index.
 """
 
 from __future__ import annotations
@@ -72,6 +73,7 @@ from .store import (
     persist_run,
     persist_run_artifact,
     get_run,
+    get_runs,
     list_runs_filtered,
     attach_advisory,
 )
@@ -150,6 +152,12 @@ from .migration_utils import (
 
 from .batch_tree import resolve_batch_root, list_batch_tree  # noqa: F401
 from .batch_dashboard import build_batch_summary_dashboard_card  # noqa: F401
+from .rollup_ports import (  # noqa: F401
+    audit_export_ports,
+    batch_summary_ports,
+    dashboard_card_ports,
+    run_to_rollup_dict,
+)
 
 # =============================================================================
 # Override Primitive (YELLOW unlock)
@@ -225,6 +233,7 @@ __all__ = [
     "persist_run",
     "persist_run_artifact",
     "get_run",
+    "get_runs",
     "list_runs_filtered",
     "attach_advisory",
     # Hashing
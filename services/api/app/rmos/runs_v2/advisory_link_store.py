@@ -5,9 +5,10 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, ContextManager, Dict, List, Optional
 
 from .schemas import RunArtifact, AdvisoryInputRef
 from .schemas_advisories import (
@@ -36,23 +37,28 @@ class AdvisoryLinkStore:
     def __init__(
         self,
         root: Path,
-        read_index: Callable[[], Dict[str, Dict[str, Any]]],
-        write_index: Callable[[Dict[str, Dict[str, Any]]], None],
+        get_index_entry: Callable[[str], Optional[Dict[str, Any]]],
+        put_index_entry: Callable[[str, Dict[str, Any]], None],
         get_artifact: Callable[[str], Optional[RunArtifact]],
+        index_lock: Optional[ContextManager[Any]] = None,
     ):
         """
         Initialize AdvisoryLinkStore.
 
         Args:
             root: Root directory for run storage
-            read_index: Callback to read the main index
-            write_index: Callback to write the main index
+            get_index_entry: Callback to read one run's main index entry
+            put_index_entry: Callback to write one run's main index entry
             get_artifact: Callback to retrieve a run artifact by ID
+            index_lock: Lock held across index read-modify-write sequences
+                (the index backend's lock, so concurrent rollup updates and
+                index writes cannot lose each other's changes)
         """
         self.root = root
-        self._read_index = read_index
-        self._write_index = write_index
+        self._get_index_entry = get_index_entry
+        self._put_index_entry = put_index_entry
         self._get_artifact = get_artifact
+        self._index_lock = index_lock if index_lock is not None else threading.RLock()
         self._advisory_lookup_path = root / "_advisory_lookup.json"
 
     # =========================================================================
@@ -78,9 +84,10 @@ class AdvisoryLinkStore:
 
     def _upsert_advisory_lookup(self, entry: IndexAdvisoryLookupV1) -> None:
         """Add or update an entry in the advisory lookup."""
-        lookup = self._read_advisory_lookup()
-        lookup[entry.advisory_id] = entry.dict()
-        self._write_advisory_lookup(lookup)
+        with self._index_lock:
+            lookup = self._read_advisory_lookup()
+            lookup[entry.advisory_id] = entry.dict()
+            self._write_advisory_lookup(lookup)
 
     # =========================================================================
     # Per-Run Advisory Rollup
@@ -90,15 +97,14 @@ class AdvisoryLinkStore:
         self, run_id: str, summary: IndexRunAdvisorySummaryV1
     ) -> None:
         """Store run-local advisory summaries in _index.json for fast listing."""
-        index = self._read_index()
-        meta = index.get(run_id) or {}
-        advs = meta.get("advisories") or []
-        existing_ids = {a.get("advisory_id") for a in advs if isinstance(a, dict)}
-        if summary.advisory_id not in existing_ids:
-            advs.append(summary.dict())
-            meta["advisories"] = advs
-            index[run_id] = meta
-            self._write_index(index)
+        with self._index_lock:
+            meta = self._get_index_entry(run_id) or {}
+            advs = meta.get("advisories") or []
+            existing_ids = {a.get("advisory_id") for a in advs if isinstance(a, dict)}
+            if summary.advisory_id not in existing_ids:
+                advs.append(summary.dict())
+                meta["advisories"] = advs
+                self._put_index_entry(run_id, meta)
 
     # =========================================================================
     # Advisory Link CRUD
@@ -171,7 +177,7 @@ class AdvisoryLinkStore:
 
     def list_run_advisories(self, run_id: str) -> List[Dict[str, Any]]:
         """Fast path: read from _index.json rollup."""
-        meta = self._read_index().get(run_id) or {}
+        meta = self._get_index_entry(run_id) or {}
         advs = meta.get("advisories") or []
         return [a for a in advs if isinstance(a, dict)] if isinstance(advs, list) else []
 
@@ -233,13 +239,20 @@ class AdvisoryLinkStore:
         return ref
 
     def load_advisory_links(
-        self, artifact: RunArtifact, partition: Path
+        self, artifact: RunArtifact, partition: Path,
+        link_paths: Optional[List[Path]] = None,
     ) -> RunArtifact:
-        """Load append-only advisory links for an artifact."""
+        """Load append-only advisory links for an artifact.
+
+        *link_paths* lets bulk readers pass link files found by a single
+        partition scan instead of globbing the partition per artifact.
+        """
         safe_id = artifact.run_id.replace("/", "_").replace(chr(92), "_")
         advisory_inputs = list(artifact.advisory_inputs) if artifact.advisory_inputs else []
 
-        for link_path in partition.glob(f"{safe_id}_advisory_*.json"):
+        if link_paths is None:
+            link_paths = list(partition.glob(f"{safe_id}_advisory_*.json"))
+        for link_path in link_paths:
             try:
                 ref = AdvisoryInputRef.model_validate(
                     json.loads(link_path.read_text(encoding="utf-8"))
@@ -0,0 +1,83 @@
+"""
+RMOS Runs v2 — Batch rollups over the run store.
+
+Endpoints:
+- GET /runs/batch-summary
+- GET /runs/batch-dashboard-card
+- GET /runs/batch-audit-export
+
+Each rollup walks the batch tree from one filtered listing, then loads the
+nodes it needs through the store's bulk get_runs() read (rollup_ports)
+instead of one get_run() per node.
+
+Mounted ahead of api_runs (see rmos_manifest) so these paths are not taken
+by GET /runs/{run_id}.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import Response
+
+from .audit_export import build_batch_audit_zip
+from .batch_dashboard import build_batch_summary_dashboard_card
+from .batch_summary import build_batch_summary
+from .rollup_ports import audit_export_ports, batch_summary_ports, dashboard_card_ports
+
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+
+@router.get("/batch-summary", summary="Batch summary rollup (counts, latest stages, status/risk)")
+def get_batch_summary(
+    session_id: str = Query(..., min_length=1),
+    batch_label: str = Query(..., min_length=1),
+    tool_kind: Optional[str] = Query(None),
+) -> Dict[str, Any]:
+    return build_batch_summary(
+        batch_summary_ports(),
+        session_id=session_id,
+        batch_label=batch_label,
+        tool_kind=tool_kind,
+    )
+
+
+@router.get("/batch-dashboard-card", summary="Compact batch card for UI dashboards")
+def get_batch_dashboard_card(
+    session_id: str = Query(..., min_length=1),
+    batch_label: str = Query(..., min_length=1),
+    tool_kind: str = Query("saw"),
+    include_links: bool = Query(True),
+    include_kpis: bool = Query(True),
+) -> Dict[str, Any]:
+    return build_batch_summary_dashboard_card(
+        session_id=session_id,
+        batch_label=batch_label,
+        tool_kind=tool_kind,
+        include_links=include_links,
+        include_kpis=include_kpis,
+        **dashboard_card_ports(),
+    )
+
+
+@router.get("/batch-audit-export", summary="Download a batch audit export (ZIP)")
+def get_batch_audit_export(
+    session_id: str = Query(..., min_length=1),
+    batch_label: str = Query(..., min_length=1),
+    tool_kind: Optional[str] = Query(None),
+    include_attachments: bool = Query(True),
+) -> Response:
+    data, _ = build_batch_audit_zip(
+        audit_export_ports(),
+        session_id=session_id,
+        batch_label=batch_label,
+        tool_kind=tool_kind,
+        include_attachments=include_attachments,
+    )
+    filename = f"batch_audit_{session_id}_{batch_label}.zip".replace("/", "_")
+    return Response(
+        content=data,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
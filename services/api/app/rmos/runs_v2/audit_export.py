@@ -41,6 +41,7 @@ class AuditExportPorts:
     get_run: Any  # callable(artifact_id) -> dict|None
     list_attachments: Any  # callable(artifact_id) -> list[dict]
     get_attachment_bytes: Any  # callable(artifact_id, attachment_id|sha|path) -> bytes
+    get_many: Any = None  # optional callable(artifact_ids) -> {id: dict}; one bulk read
 
 
 def build_batch_audit_zip(
@@ -83,6 +84,10 @@ def build_batch_audit_zip(
         },
     }
 
+    prefetched: Dict[str, Any] = {}
+    if ports.get_many is not None:
+        prefetched = ports.get_many([n.get("id") for n in nodes if n.get("id")]) or {}
+
     buf = io.BytesIO()
     with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
         z.writestr("manifest.json", _safe_json(manifest))
@@ -92,7 +97,8 @@ def build_batch_audit_zip(
             aid = n.get("id")
             if not aid:
                 continue
-            art = ports.get_run(aid) or {}
+            art = prefetched.get(aid) if ports.get_many is not None else ports.get_run(aid)
+            art = art or {}
             kind = str(art.get("kind") or n.get("kind") or "artifact")
             safe_kind = kind.replace("/", "_")
             fname = f"artifacts/{safe_kind}__{aid}.json"
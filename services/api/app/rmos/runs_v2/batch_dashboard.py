@@ -183,6 +183,28 @@ def _heuristic_rollup_from_job_logs(nodes: List[Dict[str, Any]]) -> Dict[str, An
     }
 
 
+_KPI_GROUPS = frozenset({"job_logs", "execution_metrics"})
+
+
+def _hydrate_kpi_payloads(nodes: List[Dict[str, Any]], get_many: Any) -> List[Dict[str, Any]]:
+    """Attach payloads to KPI-bearing nodes that lack one, via a single bulk read."""
+    wanted = [
+        _id(n) for n in nodes
+        if isinstance(n, dict) and not (n.get("payload") or n.get("data"))
+        and _group_key_from_kind(_kind(n)) in _KPI_GROUPS and _id(n)
+    ]
+    if not wanted:
+        return nodes
+    found = get_many(wanted) or {}
+    out: List[Dict[str, Any]] = []
+    for n in nodes:
+        art = found.get(_id(n)) if isinstance(n, dict) else None
+        if isinstance(art, dict):
+            n = {**n, "payload": art.get("payload") or art.get("data") or {}}
+        out.append(n)
+    return out
+
+
 def build_batch_summary_dashboard_card(
     *,
     session_id: str,
@@ -190,6 +212,8 @@ def build_batch_summary_dashboard_card(
     tool_kind: str = "saw",
     include_links: bool = True,
     include_kpis: bool = True,
+    list_runs_filtered: Any = None,
+    get_many: Any = None,
 ) -> Dict[str, Any]:
     """
     Single compact "card" payload for UI dashboards.
@@ -198,16 +222,22 @@ def build_batch_summary_dashboard_card(
       - latest IDs by group
       - KPI rollups (best available)
       - links to existing endpoints (tree/timeline/export)
+
+    Tree nodes carry no payload; when *get_many* (callable(ids) -> {id: dict})
+    is given, only the KPI-bearing nodes (job logs, execution metrics) are
+    hydrated, in one bulk read.
     """
     from app.rmos.runs_v2.batch_tree import list_batch_tree
 
     tree = list_batch_tree(
-        list_runs_filtered=None,
+        list_runs_filtered=list_runs_filtered,
         session_id=session_id,
         batch_label=batch_label,
         tool_kind=tool_kind,
     )
     nodes = _as_list(tree.get("nodes"))
+    if include_kpis and get_many is not None:
+        nodes = _hydrate_kpi_payloads(nodes, get_many)
 
     counts = _counts_by_group(nodes)
     latest = _latest_by_group(nodes)
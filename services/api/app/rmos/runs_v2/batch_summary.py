@@ -90,6 +90,7 @@ def _rollup_risk(risks: List[str]) -> Optional[str]:
 class BatchSummaryPorts:
     list_runs_filtered: Any
     get_run: Any
+    get_many: Any = None  # optional callable(ids) -> {id: dict}; one bulk read
 
 
 # --- Helper functions extracted for complexity reduction ---
@@ -108,10 +109,14 @@ def _load_artifacts(
     ids = [n.get("id") for n in nodes if isinstance(n, dict) and n.get("id")]
 
     artifacts: List[Dict[str, Any]] = []
-    for aid in ids:
-        art = ports.get_run(aid)
-        if isinstance(art, dict):
-            artifacts.append(art)
+    if ports.get_many is not None:
+        found = ports.get_many(ids) or {}
+        artifacts = [found[aid] for aid in ids if isinstance(found.get(aid), dict)]
+    else:
+        for aid in ids:
+            art = ports.get_run(aid)
+            if isinstance(art, dict):
+                artifacts.append(art)
 
     if artifacts:
         return artifacts
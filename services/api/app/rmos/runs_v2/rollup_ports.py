@@ -0,0 +1,97 @@
+"""
+Store-backed ports for the batch rollups (summary, dashboard card, audit export).
+
+The rollup builders read artifacts as plain dicts keyed ``id`` / ``kind`` /
+``index_meta`` / ``payload``; the run store hands back RunArtifact objects
+(``run_id`` / ``event_type`` / ``meta``), or raw artifact JSON from
+``get_runs(validate=False)``. run_to_rollup_dict() is the single conversion
+between the two, and every port below returns that shape, so the bulk path
+(get_rollup_artifacts, one store read) and the per-id path (get_rollup_artifact)
+yield the same dicts.
+
+Usage:
+    from app.rmos.runs_v2.rollup_ports import batch_summary_ports
+
+    summary = build_batch_summary(batch_summary_ports(), session_id=sid, batch_label=label)
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .attachments import get_bytes_attachment
+from .audit_export import AuditExportPorts
+from .batch_summary import BatchSummaryPorts
+from .schemas import RunArtifact
+from . import store_api
+
+
+def run_to_rollup_dict(artifact: Union[RunArtifact, Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape a run artifact (model or raw JSON) the way the rollup builders read it."""
+    raw = artifact.model_dump(mode="json") if isinstance(artifact, RunArtifact) else artifact
+    meta = raw.get("meta") if isinstance(raw.get("meta"), dict) else {}
+    return {
+        "id": raw.get("run_id"),
+        "kind": meta.get("kind") or raw.get("event_type"),
+        "status": raw.get("status"),
+        "created_utc": raw.get("created_at_utc"),
+        "index_meta": meta,
+        "payload": raw.get("payload") or {},
+        "attachments": raw.get("attachments") or [],
+    }
+
+
+def get_rollup_artifact(run_id: str) -> Optional[Dict[str, Any]]:
+    """Per-id port: one run from the default store, as a rollup dict."""
+    artifact = store_api.get_run(run_id)
+    return run_to_rollup_dict(artifact) if artifact is not None else None
+
+
+def get_rollup_artifacts(run_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Bulk port: many runs in one store read (no validation), keyed by id."""
+    found = store_api.get_runs(list(run_ids), validate=False)
+    return {run_id: run_to_rollup_dict(raw) for run_id, raw in found.items()}
+
+
+def list_rollup_artifacts(**filters: Any) -> List[Dict[str, Any]]:
+    """Filtered listing from the default store, as rollup dicts."""
+    return [run_to_rollup_dict(a) for a in store_api.list_runs_filtered(**filters)]
+
+
+def batch_summary_ports() -> BatchSummaryPorts:
+    """Batch summary ports over the default store, with the bulk read wired."""
+    return BatchSummaryPorts(
+        list_runs_filtered=list_rollup_artifacts,
+        get_run=get_rollup_artifact,
+        get_many=get_rollup_artifacts,
+    )
+
+
+def audit_export_ports() -> AuditExportPorts:
+    """Audit export ports over the default store, with the bulk read wired.
+
+    Attachment listings come from the artifacts the bulk read already
+    fetched, so exporting attachments does not re-read each run.
+    """
+    fetched: Dict[str, Dict[str, Any]] = {}
+
+    def _get_many(run_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        found = get_rollup_artifacts(run_ids)
+        fetched.update(found)
+        return found
+
+    def _list_attachments(run_id: str) -> List[Dict[str, Any]]:
+        art = fetched.get(run_id) or get_rollup_artifact(run_id)
+        return list(art["attachments"]) if art else []
+
+    return AuditExportPorts(
+        list_runs_filtered=list_rollup_artifacts,
+        get_run=get_rollup_artifact,
+        list_attachments=_list_attachments,
+        get_attachment_bytes=lambda _run_id, sha256: get_bytes_attachment(sha256),
+        get_many=_get_many,
+    )
+
+
+def dashboard_card_ports() -> Dict[str, Any]:
+    """Keyword ports for build_batch_summary_dashboard_card() over the default store."""
+    return {"list_runs_filtered": list_rollup_artifacts, "get_many": get_rollup_artifacts}
@@ -5,10 +5,10 @@ from __future__ import annotations
 import json
 import logging
 import os
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .schemas import RunArtifact, AdvisoryInputRef, Hashes, RunDecision, RunOutputs
 from .schemas_advisories import (
@@ -43,13 +43,20 @@ from .store_completeness import (
     validate_and_persist,
 )
 
+# Global index backends (JSON file or SQLite/WAL)
+from .store_index import _read_json_file, get_index_backend
+
+# run_id -> path map and parsed-artifact LRU
+from .store_cache import get_artifact_cache, safe_run_filename
+
 _log = logging.getLogger(__name__)
 
 # Default storage path per governance contract
 STORE_ROOT_DEFAULT = "services/api/data/runs/rmos"
 
-# Thread lock for index operations
-_INDEX_LOCK = threading.Lock()
+# get_many() parses on a thread pool above this many artifacts
+_GET_MANY_PARALLEL_MIN = 16
+_GET_MANY_MAX_WORKERS = 8
 
 def _get_store_root() -> str:
     """Get the store root from environment or default."""
@@ -64,36 +71,18 @@ def _extract_index_meta(artifact: RunArtifact) -> Dict[str, Any]:
         "workflow_session_id": getattr(artifact, 'workflow_session_id', None), "tool_id": artifact.tool_id, "mode": artifact.mode,
         "partition": artifact.created_at_utc.strftime("%Y-%m-%d") if artifact.created_at_utc else None, "meta": artifact.meta, "lineage": lineage_dict}
 
-def _read_json_file(path: Path) -> Dict[str, Any]:
-    """Read a JSON file, returning empty dict if not found."""
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError) as e:  # WP-1: narrowed from except Exception
-        _log.warning("Failed to read JSON file %s: %s", path, e)
-        return {}
-
-def _write_json_file(path: Path, data: Dict[str, Any]) -> None:
-    """Atomically write a JSON file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    try:
-        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        os.replace(tmp, path)
-    except OSError as e:  # WP-1: narrowed from except Exception
-        _log.error("Failed to write JSON file %s: %s", path, e)
-        if tmp.exists():
-            tmp.unlink()
-        raise
-
 class RunStoreV2:
     """Date-partitioned, immutable run artifact store."""
 
-    def __init__(self, root_dir: Optional[str] = None):
-        """Initialize the store."""
+    def __init__(self, root_dir: Optional[str] = None, index_backend: Optional[str] = None):
+        """Initialize the store.
+
+        *index_backend* overrides ``RMOS_RUNS_INDEX_BACKEND`` (``json``/``sqlite``).
+        """
         self.root = Path(root_dir or _get_store_root()).resolve()
         self.root.mkdir(parents=True, exist_ok=True)
+        self._index = get_index_backend(self.root, index_backend)
+        self._cache = get_artifact_cache(self.root)
         self._index_path = self.root / "_index.json"
         self._advisory_lookup_path = self.root / "_advisory_lookup.json"
         self._attachment_meta = AttachmentMetaIndex(self.root)
@@ -101,30 +90,36 @@ class RunStoreV2:
         # Delegate advisory operations to AdvisoryLinkStore (SRP extraction)
         self._advisory_store = AdvisoryLinkStore(
             root=self.root,
-            read_index=self._read_index,
-            write_index=self._write_index,
+            get_index_entry=self._index.get,
+            put_index_entry=self._index.put,
             get_artifact=self.get,
+            index_lock=self._index.lock,
         )
 
     def _read_index(self) -> Dict[str, Dict[str, Any]]:
-        """Read the global index file."""
-        with _INDEX_LOCK:
-            return _read_json_file(self._index_path)
+        """Read the whole global index."""
+        return self._index.read_all()
 
     def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
-        """Write the global index file atomically."""
-        with _INDEX_LOCK:
-            _write_json_file(self._index_path, index)
+        """Replace the whole global index."""
+        self._index.write_all(index)
 
     def _update_index_entry(self, run_id: str, meta: Dict[str, Any]) -> None:
         """Add or update a single entry in the index."""
-        with _INDEX_LOCK:
-            index = _read_json_file(self._index_path)
-            index[run_id] = meta
-            _write_json_file(self._index_path, index)
+        self._index.put(run_id, meta)
+
+    def rebuild_index(self, *, source: str = "partitions") -> int:
+        """Rebuild the index by scanning all date partitions.
+
+        ``source="json"`` instead loads the legacy ``_index.json`` into the
+        active backend (keeps tombstones and advisory rollups that a partition
+        scan cannot recover); used to migrate an existing store to SQLite.
+        """
+        if source == "json":
+            legacy = _read_json_file(self._index_path)
+            self._write_index(legacy)
+            return len(legacy)
 
-    def rebuild_index(self) -> int:
-        """Rebuild the index by scanning all date partitions."""
         index: Dict[str, Dict[str, Any]] = {}
 
         partitions = [
@@ -195,7 +190,7 @@ class RunStoreV2:
 
     def _path_for(self, run_id: str, created_at: datetime) -> Path:
         """Get the file path for a run artifact."""
-        return self.root / self._date_partition(created_at) / f"{run_id.replace('/', '_').replace(chr(92), '_')}.json"
+        return self.root / self._date_partition(created_at) / safe_run_filename(run_id)
 
     def put(self, artifact: RunArtifact) -> None:
         """Write a run artifact to storage."""
@@ -211,6 +206,7 @@ class RunStoreV2:
         try:
             tmp.write_text(artifact.model_dump_json(indent=2), encoding="utf-8")
             os.replace(tmp, path)
+            self._cache.remember(artifact.run_id, path)
             self._update_index_from_artifact(artifact)
             try: self._attachment_meta.update_from_artifact(artifact)
             except (OSError, ValueError, TypeError, KeyError): pass
@@ -230,23 +226,69 @@ class RunStoreV2:
         try:
             tmp.write_text(artifact.model_dump_json(indent=2), encoding="utf-8")
             os.replace(tmp, path)
+            self._cache.remember(artifact.run_id, path)
             self._update_index_from_artifact(artifact)
         except OSError:
             if tmp.exists(): tmp.unlink()
             raise
 
     def get(self, run_id: str) -> Optional[RunArtifact]:
-        """Retrieve a run artifact by ID."""
-        safe_id = run_id.replace("/", "_").replace(chr(92), "_")
-        partitions = sorted([p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("_")], reverse=True)
-        for partition in partitions:
-            path = partition / f"{safe_id}.json"
-            if path.exists():
-                try:
-                    artifact = RunArtifact.model_validate(json.loads(path.read_text(encoding="utf-8")))
-                    return self._load_advisory_links(artifact, partition)
-                except (json.JSONDecodeError, ValueError, OSError, KeyError): continue
-        return None
+        """Retrieve a run artifact by ID (path map + parsed-artifact cache)."""
+        path = self._cache.locate(run_id)
+        if path is None:
+            return None
+        return self._load_path(path)
+
+    def get_many(self, run_ids: Iterable[str], *, validate: bool = True) -> Dict[str, Any]:
+        """Retrieve many run artifacts in one pass, keyed by run_id (input order).
+
+        Reads are grouped by date partition, with one directory scan per
+        partition for advisory links, and parsed on a thread pool. With
+        ``validate=False`` the raw artifact dicts are returned without Pydantic
+        validation or advisory links, for rollups that only read a few fields.
+        Unknown or unreadable ids are omitted.
+        """
+        ids = list(dict.fromkeys(run_ids))
+        by_partition: Dict[Path, List[Tuple[str, Path]]] = {}
+        for run_id in ids:
+            path = self._cache.locate(run_id)
+            if path is not None:
+                by_partition.setdefault(path.parent, []).append((run_id, path))
+
+        links: Dict[Path, List[Path]] = {}
+        if validate:
+            for partition in by_partition:
+                for entry in os.scandir(partition):
+                    if "_advisory_" in entry.name and entry.name.endswith(".json"):
+                        owner = partition / (entry.name.split("_advisory_", 1)[0] + ".json")
+                        links.setdefault(owner, []).append(Path(entry.path))
+
+        def _load(item: Tuple[str, Path]) -> Tuple[str, Any]:
+            run_id, path = item
+            try:
+                if not validate:
+                    return run_id, json.loads(path.read_text(encoding="utf-8"))
+                return run_id, self._advisory_store.load_advisory_links(
+                    self._cache.load(path), path.parent, link_paths=links.get(path, []))
+            except (json.JSONDecodeError, ValueError, OSError, KeyError) as e:  # WP-1: narrowed from except Exception
+                _log.debug("Skipping unreadable artifact %s: %s", path, e)
+                return run_id, None
+
+        items = [item for group in by_partition.values() for item in group]
+        if len(items) > _GET_MANY_PARALLEL_MIN:
+            with ThreadPoolExecutor(max_workers=min(_GET_MANY_MAX_WORKERS, len(by_partition) + 3)) as pool:
+                loaded = dict(pool.map(_load, items))
+        else:
+            loaded = dict(_load(item) for item in items)
+        return {run_id: loaded[run_id] for run_id in ids if loaded.get(run_id) is not None}
+
+    def _load_path(self, path: Path) -> Optional[RunArtifact]:
+        """Load the artifact at *path* with its advisory links, or None if unreadable."""
+        try:
+            return self._load_advisory_links(self._cache.load(path), path.parent)
+        except (json.JSONDecodeError, ValueError, OSError, KeyError) as e:  # WP-1: narrowed from except Exception
+            _log.debug("Skipping unreadable artifact %s: %s", path, e)
+            return None
 
     def _load_advisory_links(self, artifact: RunArtifact, partition: Path) -> RunArtifact:
         """Load append-only advisory links for an artifact. Delegated to AdvisoryLinkStore."""
@@ -265,10 +307,12 @@ class RunStoreV2:
                    request_id: Optional[str] = None, rate_limit_key: Optional[str] = None, cascade: bool = True) -> Dict[str, Any]:
         """Delete a run artifact with audit logging."""
         from .store_delete import execute_delete
-        return execute_delete(root=self.root, index_path=self._index_path, index_lock=_INDEX_LOCK,
-            read_json=_read_json_file, write_json=_write_json_file, run_id=run_id, mode=mode, reason=reason,
+        result = execute_delete(root=self.root, index=self._index, run_id=run_id, mode=mode, reason=reason,
             actor=actor, request_id=request_id, rate_limit_key=rate_limit_key, cascade=cascade,
             check_rate_limit=_check_delete_rate_limit, DeleteRateLimitError_cls=DeleteRateLimitError)
+        if result.get("artifact_deleted"):
+            self._cache.forget(run_id)
+        return result
 
     def list_runs(self, limit: int = 50, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> List[RunArtifact]:
         """List run artifacts, newest first."""
@@ -282,10 +326,9 @@ class RunStoreV2:
             except ValueError: continue
             for path in partition.glob("*.json"):
                 if "_advisory_" in path.name or path.suffix == ".tmp": continue
-                try:
-                    artifact = self._load_advisory_links(RunArtifact.model_validate(json.loads(path.read_text(encoding="utf-8"))), partition)
-                    runs.append(artifact)
-                except (json.JSONDecodeError, ValueError, OSError, KeyError): continue
+                artifact = self._load_path(path)
+                if artifact is None: continue
+                runs.append(artifact)
                 if len(runs) >= limit: break
             if len(runs) >= limit: break
         runs.sort(key=lambda r: r.created_at_utc, reverse=True)
@@ -313,13 +356,6 @@ class RunStoreV2:
         date_to: Optional[datetime] = None,
     ) -> List[RunArtifact]:
         """List runs with optional filtering using the index."""
-        from .store_filter import matches_index_meta
-
-        index = self._read_index()
-        if not index:
-            self.rebuild_index()
-            index = self._read_index()
-
         fkw = dict(
             event_type=event_type, kind=kind, status=status, tool_id=tool_id,
             tool_kind=tool_kind,
@@ -331,16 +367,10 @@ class RunStoreV2:
             parent_artifact_id=parent_artifact_id,
             date_from=date_from, date_to=date_to,
         )
-        matching_metas = [m for m in index.values() if matches_index_meta(m, **fkw)]
-
-        # Sort by created_at_utc descending
-        matching_metas.sort(
-            key=lambda m: m.get("created_at_utc") or "",
-            reverse=True
-        )
-
-        # Apply pagination
-        page_metas = matching_metas[offset:offset + limit]
+        # Filter, sort by created_at_utc descending and paginate in the backend
+        # (one index read; an empty index is rebuilt from the partitions first)
+        page_metas = self._index.query(fkw, limit=limit, offset=offset,
+                                       if_empty=self.rebuild_index)
 
         # Load full artifacts only for the page
         results: List[RunArtifact] = []
@@ -353,16 +383,11 @@ class RunStoreV2:
             # Try to load from the known partition first
             artifact = None
             if partition:
-                path = self.root / partition / f"{run_id.replace('/', '_').replace(chr(92), '_')}.json"
+                path = self.root / partition / safe_run_filename(run_id)
                 if path.exists():
-                    try:
-                        data = json.loads(path.read_text(encoding="utf-8"))
-                        artifact = RunArtifact.model_validate(data)
-                        artifact = self._load_advisory_links(artifact, path.parent)
-                    except (json.JSONDecodeError, ValueError, OSError, KeyError) as e:  # WP-1: narrowed from except Exception
-                        _log.debug("Skipping unreadable artifact for run %s: %s", run_id, e)
-
-            # Fall back to full search if partition lookup failed
+                    artifact = self._load_path(path)
+
+            # Fall back to the path map / partition probe if that failed
             if artifact is None:
                 artifact = self.get(run_id)
 
@@ -377,26 +402,19 @@ class RunStoreV2:
                             workflow_session_id: Optional[str] = None, date_from: Optional[datetime] = None,
                             date_to: Optional[datetime] = None) -> int:
         """Count runs matching filters using the index (fast)."""
-        from .store_filter import matches_index_meta
-
-        index = self._read_index()
-        if not index:
-            self.rebuild_index()
-            index = self._read_index()
-
         fkw = dict(
             event_type=event_type, status=status, tool_id=tool_id,
             tool_kind=tool_kind,
             mode=mode, workflow_session_id=workflow_session_id,
             date_from=date_from, date_to=date_to,
         )
-        return sum(1 for m in index.values() if matches_index_meta(m, **fkw))
+        return self._index.count(fkw, if_empty=self.rebuild_index)
 
 # =============================================================================
 # Module-level convenience API (re-exported for backward compatibility)
 # =============================================================================
 # Moved to store_api.py — re-export all public names so existing imports work.
 
-from .store_api import (create_run_id, persist_run, persist_run_artifact, store_artifact, update_run, get_run,  # noqa: E402
+from .store_api import (create_run_id, persist_run, persist_run_artifact, store_artifact, update_run, get_run, get_runs,  # noqa: E402
     list_runs_filtered, count_runs_filtered, rebuild_index, attach_advisory, delete_run, query_runs,
     query_recent, _get_default_store, _default_store, _norm, _get_nested, _extract_sort_key)
@@ -197,6 +197,12 @@ def get_run(run_id: str) -> Optional[RunArtifact]:
     return store.get(run_id)
 
 
+def get_runs(run_ids: List[str], *, validate: bool = True) -> Dict[str, Any]:
+    """Retrieve many run artifacts from the default store, keyed by run_id."""
+    store = _get_default_store()
+    return store.get_many(run_ids, validate=validate)
+
+
 def list_runs_filtered(
     *,
     limit: int = 50,
@@ -257,10 +263,10 @@ def count_runs_filtered(
     )
 
 
-def rebuild_index() -> int:
+def rebuild_index(*, source: str = "partitions") -> int:
     """Rebuild the global index from the default store."""
     store = _get_default_store()
-    return store.rebuild_index()
+    return store.rebuild_index(source=source)
 
 
 def attach_advisory(
@@ -0,0 +1,134 @@
+"""RMOS Run Store v2 - run_id -> path map and parsed-artifact LRU.
+
+``RunStoreV2.get`` used to sort every date partition and probe each one for
+``{run_id}.json``, then re-parse and re-validate the file on every call. This
+module keeps, per store root and for the life of the process:
+
+- a run_id -> artifact path map, filled on put/update and on first lookup
+  (falls back to the newest-first partition probe on a miss), and
+- an LRU of validated ``RunArtifact`` objects keyed by path and invalidated
+  by the file's (mtime_ns, size, inode), so rewrites by ``update_mutable_fields``
+  or another process are picked up without explicit eviction.
+
+Cached artifacts are shared: ``RunStoreV2`` hands out copies via
+``load_advisory_links`` (``model_copy``), and callers already treat nested
+``meta``/``payload`` dicts as copy-on-write before ``update_run``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .schemas import RunArtifact
+
+ARTIFACT_CACHE_SIZE_ENV = "RMOS_RUNS_ARTIFACT_CACHE_SIZE"
+ARTIFACT_CACHE_SIZE_DEFAULT = 1024
+
+_FileKey = Tuple[int, int, int]
+
+
+def safe_run_filename(run_id: str) -> str:
+    """File name of a run artifact inside its date partition."""
+    return f"{run_id.replace('/', '_').replace(chr(92), '_')}.json"
+
+
+def _file_key(st: os.stat_result) -> _FileKey:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class RunArtifactCache:
+    """run_id -> path map plus an mtime-keyed LRU of parsed artifacts."""
+
+    def __init__(self, root: Path, max_items: int = ARTIFACT_CACHE_SIZE_DEFAULT):
+        self.root = root
+        self.max_items = max_items
+        self._paths: Dict[str, Path] = {}
+        self._lru: "OrderedDict[Path, Tuple[_FileKey, RunArtifact]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # id -> path map
+    # ------------------------------------------------------------------
+
+    def remember(self, run_id: str, path: Path) -> None:
+        with self._lock:
+            self._paths[run_id] = path
+
+    def forget(self, run_id: str) -> None:
+        with self._lock:
+            path = self._paths.pop(run_id, None)
+            if path is not None:
+                self._lru.pop(path, None)
+
+    def locate(self, run_id: str) -> Optional[Path]:
+        """Return the artifact path for *run_id*, probing partitions on a miss."""
+        with self._lock:
+            path = self._paths.get(run_id)
+        if path is not None:
+            if path.exists():
+                return path
+            self.forget(run_id)
+
+        filename = safe_run_filename(run_id)
+        partitions = sorted(
+            (p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("_")),
+            reverse=True,
+        )
+        for partition in partitions:
+            candidate = partition / filename
+            if candidate.exists():
+                self.remember(run_id, candidate)
+                return candidate
+        return None
+
+    # ------------------------------------------------------------------
+    # Parsed artifact LRU
+    # ------------------------------------------------------------------
+
+    def load(self, path: Path) -> RunArtifact:
+        """Parse the artifact at *path*, reusing the cached model if unchanged.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid RunArtifact.
+        """
+        key = _file_key(path.stat())
+        with self._lock:
+            hit = self._lru.get(path)
+            if hit is not None and hit[0] == key:
+                self._lru.move_to_end(path)
+                return hit[1]
+
+        artifact = RunArtifact.model_validate(json.loads(path.read_text(encoding="utf-8")))
+        with self._lock:
+            self._paths[artifact.run_id] = path
+            if self.max_items > 0:
+                self._lru[path] = (key, artifact)
+                self._lru.move_to_end(path)
+                while len(self._lru) > self.max_items:
+                    self._lru.popitem(last=False)
+        return artifact
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+            self._lru.clear()
+
+
+_CACHES: Dict[Path, RunArtifactCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_artifact_cache(root: Path) -> RunArtifactCache:
+    """Return the process-wide cache for a store root (shared across instances)."""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(root)
+        if cache is None:
+            size = int(os.getenv(ARTIFACT_CACHE_SIZE_ENV, str(ARTIFACT_CACHE_SIZE_DEFAULT)))
+            cache = _CACHES[root] = RunArtifactCache(root, max_items=size)
+        return cache
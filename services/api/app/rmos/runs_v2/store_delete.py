@@ -5,7 +5,6 @@ from __future__ import annotations
 import json
 import logging
 import os
-import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -127,10 +126,7 @@ def _hard_delete_files(
 def execute_delete(
     *,
     root: Path,
-    index_path: Path,
-    index_lock: threading.Lock,
-    read_json: Any,  # callable(Path) -> dict
-    write_json: Any,  # callable(Path, dict) -> None
+    index: Any,  # store_index backend: lock, get(), put(), remove()
     run_id: str,
     mode: str = "soft",
     reason: str,
@@ -184,20 +180,16 @@ def execute_delete(
                         meta=None, label="not-found")
             raise KeyError(f"Run not found: {run_id}")
 
-        with index_lock:
-            index = read_json(index_path)
+        with index.lock:
             original_meta = index.get(run_id)
 
             if mode == "soft":
-                index[run_id] = _build_tombstone(
-                    run_id, reason, actor, request_id, original_meta, partition)
-                write_json(index_path, index)
+                index.put(run_id, _build_tombstone(
+                    run_id, reason, actor, request_id, original_meta, partition))
                 result["index_updated"] = True
                 result["deleted"] = True
             else:
-                if run_id in index:
-                    del index[run_id]
-                    write_json(index_path, index)
+                if index.remove(run_id):
                     result["index_updated"] = True
 
         if mode == "hard":
@@ -0,0 +1,416 @@
+"""RMOS Run Store v2 - pluggable global index backends.
+
+The run index maps ``run_id -> index meta`` (see ``store._extract_index_meta``)
+and powers filtered listing, counting, tombstones and advisory rollups.
+
+Backends (selected by ``RMOS_RUNS_INDEX_BACKEND``):
+    json   - ``_index.json`` rewritten whole on every write (default, legacy)
+    sqlite - ``_index.sqlite3`` table in WAL mode with indexed filter columns;
+             writes are single-row upserts and filtered listing is an index
+             seek. Seeded from ``_index.json`` the first time it is opened.
+
+Both backends return the same metas in the same order for the same filters;
+``store_filter.matches_index_meta`` stays the reference semantics.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .store_filter import (
+    _TOOL_KIND_SYNONYMS,
+    _matches_date_range,
+    index_tool_kind,
+    matches_index_meta,
+)
+
+_log = logging.getLogger(__name__)
+
+INDEX_BACKEND_ENV = "RMOS_RUNS_INDEX_BACKEND"
+INDEX_BACKEND_DEFAULT = "json"
+
+JSON_INDEX_FILENAME = "_index.json"
+SQLITE_INDEX_FILENAME = "_index.sqlite3"
+
+# Thread lock for index read-modify-write sequences (re-entrant so callers such
+# as execute_delete can hold it across get/put/remove).
+_INDEX_LOCK = threading.RLock()
+
+# Lineage filters search top-level, "lineage" and "meta" under the canonical
+# key and its aliases (see store_filter._matches_lineage).
+_LINEAGE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "parent_plan_run_id": ("parent_plan_run_id",),
+    "parent_batch_plan_artifact_id": ("parent_batch_plan_artifact_id", "batch_plan_artifact_id"),
+    "parent_batch_spec_artifact_id": ("parent_batch_spec_artifact_id", "batch_spec_artifact_id"),
+    "parent_artifact_id": ("parent_artifact_id", "parent_batch_execution_artifact_id"),
+}
+
+
+def _read_json_file(path: Path) -> Dict[str, Any]:
+    """Read a JSON file, returning empty dict if not found."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError) as e:  # WP-1: narrowed from except Exception
+        _log.warning("Failed to read JSON file %s: %s", path, e)
+        return {}
+
+
+def _write_json_file(path: Path, data: Dict[str, Any]) -> None:
+    """Atomically write a JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:  # WP-1: narrowed from except Exception
+        _log.error("Failed to write JSON file %s: %s", path, e)
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+
+class JsonRunIndex:
+    """Whole-file ``_index.json`` backend (legacy behaviour)."""
+
+    name = "json"
+
+    def __init__(self, root: Path):
+        self.path = root / JSON_INDEX_FILENAME
+        self.lock = _INDEX_LOCK
+
+    def read_all(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return _read_json_file(self.path)
+
+    def write_all(self, index: Dict[str, Dict[str, Any]]) -> None:
+        with self.lock:
+            _write_json_file(self.path, index)
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return self.read_all().get(run_id)
+
+    def put(self, run_id: str, meta: Dict[str, Any]) -> None:
+        with self.lock:
+            index = _read_json_file(self.path)
+            index[run_id] = meta
+            _write_json_file(self.path, index)
+
+    def remove(self, run_id: str) -> bool:
+        with self.lock:
+            index = _read_json_file(self.path)
+            if run_id not in index:
+                return False
+            del index[run_id]
+            _write_json_file(self.path, index)
+            return True
+
+    def is_empty(self) -> bool:
+        return not self.read_all()
+
+    def _read_or_rebuild(self, if_empty: Optional[Callable[[], Any]]) -> Dict[str, Dict[str, Any]]:
+        """Parse the index once; run *if_empty* and re-read only when it has no entries."""
+        index = self.read_all()
+        if not index and if_empty is not None:
+            if_empty()
+            index = self.read_all()
+        return index
+
+    def query(self, filters: Dict[str, Any], *, limit: int, offset: int = 0,
+              if_empty: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+        index = self._read_or_rebuild(if_empty)
+        metas = [m for m in index.values() if matches_index_meta(m, **filters)]
+        metas.sort(key=lambda m: m.get("created_at_utc") or "", reverse=True)
+        return metas[offset:offset + limit]
+
+    def count(self, filters: Dict[str, Any], *,
+              if_empty: Optional[Callable[[], Any]] = None) -> int:
+        index = self._read_or_rebuild(if_empty)
+        return sum(1 for m in index.values() if matches_index_meta(m, **filters))
+
+
+_SQLITE_DDL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS run_index (
+  run_id TEXT PRIMARY KEY,
+  created_at TEXT NOT NULL DEFAULT '',   -- created_at_utc, '' when missing
+  event_type TEXT,
+  status TEXT,
+  tool_id TEXT,
+  tool_kind TEXT NOT NULL DEFAULT '',    -- case-folded, '' when missing
+  mode TEXT,
+  workflow_session_id TEXT,
+  batch_label TEXT,                      -- top-level or meta.batch_label
+  session_id TEXT,                       -- top-level or meta.session_id
+  meta_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_index_lineage (
+  run_id TEXT NOT NULL REFERENCES run_index(run_id) ON DELETE CASCADE,
+  key TEXT NOT NULL,
+  value TEXT NOT NULL,
+  PRIMARY KEY (key, value, run_id)
+);
+CREATE INDEX IF NOT EXISTS ix_run_index_created ON run_index(created_at);
+CREATE INDEX IF NOT EXISTS ix_run_index_event_type ON run_index(event_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_run_index_status ON run_index(status, created_at);
+CREATE INDEX IF NOT EXISTS ix_run_index_tool_id ON run_index(tool_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_run_index_tool_kind ON run_index(tool_kind);
+CREATE INDEX IF NOT EXISTS ix_run_index_mode ON run_index(mode, created_at);
+CREATE INDEX IF NOT EXISTS ix_run_index_workflow_session ON run_index(workflow_session_id);
+CREATE INDEX IF NOT EXISTS ix_run_index_batch_label ON run_index(batch_label);
+CREATE INDEX IF NOT EXISTS ix_run_index_session_id ON run_index(session_id);
+CREATE INDEX IF NOT EXISTS ix_run_index_lineage_run ON run_index_lineage(run_id);
+"""
+
+_SQLITE_UPSERT = """
+INSERT INTO run_index (run_id, created_at, event_type, status, tool_id, tool_kind,
+                       mode, workflow_session_id, batch_label, session_id, meta_json)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(run_id) DO UPDATE SET
+  created_at=excluded.created_at, event_type=excluded.event_type,
+  status=excluded.status, tool_id=excluded.tool_id, tool_kind=excluded.tool_kind,
+  mode=excluded.mode, workflow_session_id=excluded.workflow_session_id,
+  batch_label=excluded.batch_label, session_id=excluded.session_id,
+  meta_json=excluded.meta_json
+"""
+
+
+def _row_values(run_id: str, meta: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Derive the indexed column values for one index meta."""
+    nested = meta.get("meta") or {}
+    if not isinstance(nested, dict):
+        nested = {}
+    return (
+        run_id,
+        meta.get("created_at_utc") or "",
+        meta.get("event_type"),
+        meta.get("status"),
+        meta.get("tool_id"),
+        str(index_tool_kind(meta) or "").strip().lower(),
+        meta.get("mode"),
+        meta.get("workflow_session_id"),
+        meta.get("batch_label") or nested.get("batch_label"),
+        meta.get("session_id") or nested.get("session_id"),
+        json.dumps(meta, ensure_ascii=False, default=str),
+    )
+
+
+def _lineage_values(meta: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Collect ``(canonical_key, value)`` pairs for every lineage reference."""
+    sources = [meta]
+    for sub in ("lineage", "meta"):
+        d = meta.get(sub)
+        if isinstance(d, dict):
+            sources.append(d)
+    pairs = set()
+    for canonical, keys in _LINEAGE_KEYS.items():
+        for src in sources:
+            for key in keys:
+                value = src.get(key)
+                if isinstance(value, str) and value:
+                    pairs.add((canonical, value))
+    return sorted(pairs)
+
+
+class SqliteRunIndex:
+    """SQLite (WAL) backend with indexed filter columns.
+
+    Each indexed column mirrors one branch of ``matches_index_meta``; the
+    date range is re-checked in Python on ``created_at`` only, so results
+    match the JSON backend exactly. Rows keep their insertion rowid on
+    upsert, which reproduces the JSON backend's tie order.
+
+    Each thread keeps one connection for the life of the index (reopened
+    after a fork), rather than connecting per operation.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, root: Path, *, migrate_from_json: bool = True):
+        self.path = root / SQLITE_INDEX_FILENAME
+        self.json_path = root / JSON_INDEX_FILENAME
+        self.lock = _INDEX_LOCK
+        self._local = threading.local()
+        root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as con:
+            con.executescript(_SQLITE_DDL)
+        if migrate_from_json and self.is_empty() and self.json_path.exists():
+            legacy = _read_json_file(self.json_path)
+            if legacy:
+                self.write_all(legacy)
+                _log.info("Migrated %d run index entries from %s", len(legacy), self.json_path)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        con = getattr(self._local, "con", None)
+        if con is None or self._local.pid != os.getpid():
+            con = sqlite3.connect(self.path, timeout=30.0)
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA foreign_keys=ON")
+            self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One transaction on this thread's connection (commit, or roll back on error)."""
+        con = self._connection()
+        with con:
+            yield con
+
+    def close(self) -> None:
+        """Close the calling thread's connection (reopened on next use)."""
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            self._local.con = None
+            if self._local.pid == os.getpid():
+                con.close()
+
+    def _upsert(self, con: sqlite3.Connection, run_id: str, meta: Dict[str, Any]) -> None:
+        con.execute(_SQLITE_UPSERT, _row_values(run_id, meta))
+        con.execute("DELETE FROM run_index_lineage WHERE run_id = ?", (run_id,))
+        con.executemany(
+            "INSERT INTO run_index_lineage (run_id, key, value) VALUES (?, ?, ?)",
+            [(run_id, k, v) for k, v in _lineage_values(meta)],
+        )
+
+    def read_all(self) -> Dict[str, Dict[str, Any]]:
+        with self._connect() as con:
+            rows = con.execute("SELECT run_id, meta_json FROM run_index ORDER BY rowid").fetchall()
+        return {run_id: json.loads(meta_json) for run_id, meta_json in rows}
+
+    def write_all(self, index: Dict[str, Dict[str, Any]]) -> None:
+        with self.lock, self._connect() as con:
+            con.execute("DELETE FROM run_index_lineage")
+            con.execute("DELETE FROM run_index")
+            for run_id, meta in index.items():
+                self._upsert(con, run_id, meta)
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as con:
+            row = con.execute("SELECT meta_json FROM run_index WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, run_id: str, meta: Dict[str, Any]) -> None:
+        with self.lock, self._connect() as con:
+            self._upsert(con, run_id, meta)
+
+    def remove(self, run_id: str) -> bool:
+        with self.lock, self._connect() as con:
+            con.execute("DELETE FROM run_index_lineage WHERE run_id = ?", (run_id,))
+            return con.execute("DELETE FROM run_index WHERE run_id = ?", (run_id,)).rowcount > 0
+
+    def is_empty(self) -> bool:
+        with self._connect() as con:
+            return con.execute("SELECT 1 FROM run_index LIMIT 1").fetchone() is None
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Translate ``matches_index_meta`` keyword filters into a WHERE clause."""
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        effective_event_type = filters.get("event_type") or filters.get("kind")
+        for column, value in (
+            ("event_type", effective_event_type),
+            ("status", filters.get("status")),
+            ("tool_id", filters.get("tool_id")),
+            ("mode", filters.get("mode")),
+            ("workflow_session_id", filters.get("workflow_session_id")),
+            ("batch_label", filters.get("batch_label")),
+            ("session_id", filters.get("session_id")),
+        ):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        tool_kind = filters.get("tool_kind")
+        if tool_kind:
+            requested = str(tool_kind).strip().lower()
+            allowed = {"", requested}
+            if requested in _TOOL_KIND_SYNONYMS:
+                allowed |= _TOOL_KIND_SYNONYMS
+            clauses.append(f"tool_kind IN ({', '.join('?' * len(allowed))})")
+            params.extend(sorted(allowed))
+
+        for canonical in _LINEAGE_KEYS:
+            value = filters.get(canonical)
+            if value:
+                clauses.append(
+                    "run_id IN (SELECT run_id FROM run_index_lineage WHERE key = ? AND value = ?)"
+                )
+                params.extend((canonical, value))
+
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _date_filtered(
+        self, con: sqlite3.Connection, where: str, params: List[Any],
+        date_from: Optional[datetime], date_to: Optional[datetime],
+    ) -> Iterator[str]:
+        """Yield run_ids passing the Python date-range check, newest first."""
+        cur = con.execute(
+            f"SELECT run_id, created_at FROM run_index{where} ORDER BY created_at DESC, rowid",
+            params,
+        )
+        for run_id, created_at in cur:
+            if _matches_date_range({"created_at_utc": created_at}, date_from, date_to):
+                yield run_id
+
+    def query(self, filters: Dict[str, Any], *, limit: int, offset: int = 0,
+              if_empty: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+        if if_empty is not None and self.is_empty():
+            if_empty()
+        where, params = self._where(filters)
+        date_from, date_to = filters.get("date_from"), filters.get("date_to")
+        with self._connect() as con:
+            if not date_from and not date_to:
+                rows = con.execute(
+                    f"SELECT meta_json FROM run_index{where} "
+                    "ORDER BY created_at DESC, rowid LIMIT ? OFFSET ?",
+                    [*params, limit, offset],
+                ).fetchall()
+                return [json.loads(r[0]) for r in rows]
+
+            page: List[str] = []
+            for i, run_id in enumerate(self._date_filtered(con, where, params, date_from, date_to)):
+                if i >= offset + limit:
+                    break
+                if i >= offset:
+                    page.append(run_id)
+            metas = []
+            for run_id in page:
+                row = con.execute("SELECT meta_json FROM run_index WHERE run_id = ?", (run_id,)).fetchone()
+                if row:
+                    metas.append(json.loads(row[0]))
+            return metas
+
+    def count(self, filters: Dict[str, Any], *,
+              if_empty: Optional[Callable[[], Any]] = None) -> int:
+        if if_empty is not None and self.is_empty():
+            if_empty()
+        where, params = self._where(filters)
+        date_from, date_to = filters.get("date_from"), filters.get("date_to")
+        with self._connect() as con:
+            if not date_from and not date_to:
+                return con.execute(f"SELECT COUNT(*) FROM run_index{where}", params).fetchone()[0]
+            return sum(1 for _ in self._date_filtered(con, where, params, date_from, date_to))
+
+
+def get_index_backend(root: Path, backend: Optional[str] = None):
+    """Create the index backend for a store root.
+
+    *backend* defaults to ``RMOS_RUNS_INDEX_BACKEND`` (``json`` or ``sqlite``).
+    """
+    name = (backend or os.getenv(INDEX_BACKEND_ENV) or INDEX_BACKEND_DEFAULT).strip().lower()
+    if name == "sqlite":
+        return SqliteRunIndex(root)
+    if name != "json":
+        _log.warning("Unknown %s=%r; falling back to json", INDEX_BACKEND_ENV, name)
+    return JsonRunIndex(root)
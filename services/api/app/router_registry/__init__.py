@@ -5,12 +5,14 @@ Split from router_registry.py (503 lines) into modular components:
 - manifest.py: ROUTER_MANIFEST declarative list
 - loader.py: Router loading functions
 - health.py: Health reporting functions
+- lazy.py: On-first-request router mounting
 """
 
 from .models import RouterSpec
 from .manifest import ROUTER_MANIFEST
 from .loader import load_all_routers, get_loaded_routers
 from .health import get_router_health
+from .lazy import LazyRouterMiddleware, LazyRouterMounter
 
 __all__ = [
     "RouterSpec",
@@ -18,4 +20,6 @@ __all__ = [
     "load_all_routers",
     "get_loaded_routers",
     "get_router_health",
+    "LazyRouterMounter",
+    "LazyRouterMiddleware",
 ]
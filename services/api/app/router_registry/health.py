@@ -3,7 +3,13 @@
 from typing import Any, Dict
 
 from .manifest import ROUTER_MANIFEST
-from .loader import get_loaded_routers, get_router_errors
+from .loader import (
+    get_load_mode,
+    get_loaded_routers,
+    get_pending_routers,
+    get_router_errors,
+    get_router_import_costs,
+)
 
 
 def get_router_health() -> Dict[str, Any]:
@@ -14,6 +20,7 @@ def get_router_health() -> Dict[str, Any]:
     """
     loaded_routers = get_loaded_routers()
     router_errors = get_router_errors()
+    import_costs = get_router_import_costs()
 
     by_category: Dict[str, Dict[str, bool]] = {}
     for spec in ROUTER_MANIFEST:
@@ -34,4 +41,13 @@ def get_router_health() -> Dict[str, Any]:
             for cat, routers in by_category.items()
         },
         "errors": router_errors,
+        "mode": get_load_mode(),
+        "pending": get_pending_routers(),
+        "import_cost": {
+            "total_ms": round(sum(import_costs.values()), 1),
+            "routers": [
+                {"module": module, "ms": round(ms, 1)}
+                for module, ms in sorted(import_costs.items(), key=lambda kv: kv[1], reverse=True)
+            ],
+        },
     }
@@ -0,0 +1,278 @@
+"""Lazy router mounting.
+
+In lazy load mode the manifest's router modules are not imported at boot.
+Each spec's mount path is worked out statically (spec prefix plus the literal
+``APIRouter(prefix=...)`` in the module source) and the router is imported and
+included on the first request under that path. Specs that are required, opt
+out with ``lazy=False``, or mount at a generic prefix ("" or "/api") are still
+loaded at startup, since a request path cannot tell which of them it needs.
+
+A late-mounted router's routes are spliced into the route table where eager
+mode would have put them, in manifest order and ahead of routes the app adds
+after register() (local endpoints and guarded fallbacks such as
+routing-truth), so a fallback never shadows the real route once it mounts.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import inspect
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import anyio
+from fastapi import APIRouter, FastAPI
+
+from . import loader
+from .manifest import ROUTER_MANIFEST
+from .models import RouterSpec
+
+_log = logging.getLogger(__name__)
+
+_APP_ROOT = Path(__file__).resolve().parents[1]
+
+# Mount paths too broad to route lazily; specs under them load at startup
+_GENERIC_MOUNT_PATHS = ("", "/api")
+
+# Requests that inspect the whole route table load every pending router
+_ROUTE_TABLE_PATHS = ("/api/_meta/routing-truth",)
+
+
+def _module_file(module: str) -> Optional[Path]:
+    """Source file for an app module, resolved without importing it."""
+    parts = module.split(".")
+    if parts[0] != _APP_ROOT.name:
+        return None
+    base = _APP_ROOT.parent.joinpath(*parts)
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _static_router_prefix(module: str, router_attr: str) -> Optional[str]:
+    """
+    Literal prefix of ``<router_attr> = APIRouter(prefix=...)`` in a module.
+
+    Returns None when the router is not a single module-level APIRouter call
+    with a constant prefix (re-exported, aggregated or computed routers).
+    """
+    path = _module_file(module)
+    if path is None:
+        return None
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+    values = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            if any(isinstance(t, ast.Name) and t.id == router_attr for t in node.targets):
+                values.append(node.value)
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            if isinstance(node.target, ast.Name) and node.target.id == router_attr:
+                values.append(node.value)
+    if len(values) != 1 or not isinstance(values[0], ast.Call):
+        return None
+
+    call = values[0]
+    func = call.func
+    name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+    if name != "APIRouter":
+        return None
+    for keyword in call.keywords:
+        if keyword.arg == "prefix":
+            if isinstance(keyword.value, ast.Constant) and isinstance(keyword.value.value, str):
+                return keyword.value.value
+            return None
+        if keyword.arg is None:  # **kwargs may carry a prefix
+            return None
+    return ""
+
+
+def router_mount_path(spec: RouterSpec) -> str:
+    """
+    Path prefix shared by every route of a spec's router.
+
+    Falls back to the spec prefix alone when the router prefix cannot be
+    read statically, and stops before the first path parameter.
+    """
+    router_prefix = _static_router_prefix(spec.module, spec.router_attr) or ""
+    mount_path = spec.prefix + router_prefix
+    if "{" in mount_path:
+        mount_path = mount_path[:mount_path.index("{")]
+        mount_path = mount_path[:mount_path.rfind("/") + 1]
+    return mount_path.rstrip("/")
+
+
+def _path_under(path: str, mount_path: str) -> bool:
+    return path == mount_path or path.startswith(mount_path + "/")
+
+
+class LazyRouterMounter:
+    """Registers manifest routers on a FastAPI app and mounts them on demand."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        specs: Sequence[RouterSpec] = ROUTER_MANIFEST,
+        prewarm: bool = False,
+        prewarm_delay_s: float = 1.0,
+    ):
+        self.app = app
+        self.specs = list(specs)
+        self.prewarm_enabled = prewarm
+        self.prewarm_delay_s = prewarm_delay_s
+        self._pending: Dict[str, Tuple[RouterSpec, str]] = {}
+        self._imported: Dict[str, Optional[APIRouter]] = {}
+        self._import_lock = threading.Lock()
+        self._started = False
+        self._prewarm_task: Optional[asyncio.Task] = None
+        # Route-table splicing: manifest position per module, routes included
+        # per manifest position, and where the manifest's routes begin
+        self._order: Dict[str, int] = {}
+        self._route_counts: Dict[int, int] = {}
+        self._routes_start = 0
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def register(self) -> int:
+        """
+        Mount non-deferrable routers now and defer the rest.
+
+        Returns the number of deferred routers.
+
+        Raises:
+            ImportError: If a required router fails to load.
+        """
+        loader._load_mode = "lazy"
+        self._routes_start = len(self.app.router.routes)
+        for order, spec in enumerate(self.specs):
+            self._order[spec.module] = order
+            mount_path = router_mount_path(spec) if spec.enabled else ""
+            deferrable = (
+                spec.enabled and spec.lazy and not spec.required
+                and mount_path not in _GENERIC_MOUNT_PATHS
+            )
+            if deferrable:
+                self._pending[spec.module] = (spec, mount_path)
+                loader._pending_routers[spec.module] = mount_path
+            else:
+                self._include(spec, loader._try_load_router(spec))
+
+        self.app.router.add_event_handler("startup", self._on_startup)
+        _log.info(
+            "ROUTER REGISTRY (lazy): %d mounted at startup, %d deferred",
+            len(self.specs) - len(self._pending), len(self._pending),
+        )
+        return len(self._pending)
+
+    def pending_for(self, path: str) -> List[RouterSpec]:
+        """Pending specs that may serve a request path."""
+        if path in self._route_table_paths():
+            return [spec for spec, _ in self._pending.values()]
+        return [
+            spec for spec, mount_path in self._pending.values()
+            if _path_under(path, mount_path)
+        ]
+
+    async def ensure_mounted(self, path: str) -> None:
+        """Import and mount every pending router that may serve a path."""
+        for spec in self.pending_for(path):
+            await self._mount_async(spec)
+
+    def mount_all(self) -> None:
+        """Synchronously mount every pending router (before startup only)."""
+        for spec, _ in list(self._pending.values()):
+            self._mount(spec, self._import(spec))
+
+    async def prewarm(self) -> None:
+        """Mount pending routers one at a time in the background."""
+        await asyncio.sleep(self.prewarm_delay_s)
+        for spec, _ in list(self._pending.values()):
+            await self._mount_async(spec)
+        _log.info("ROUTER REGISTRY (lazy): prewarm complete")
+
+    def _route_table_paths(self) -> Tuple[Optional[str], ...]:
+        return (
+            self.app.openapi_url, self.app.docs_url, self.app.redoc_url,
+        ) + _ROUTE_TABLE_PATHS
+
+    async def _on_startup(self) -> None:
+        self._started = True
+        if self.prewarm_enabled and self._pending:
+            self._prewarm_task = asyncio.get_running_loop().create_task(self.prewarm())
+
+    def _import(self, spec: RouterSpec) -> Optional[APIRouter]:
+        # Runs in a worker thread; the lock keeps concurrent requests from
+        # importing (and timing) the same module twice
+        with self._import_lock:
+            if spec.module not in self._imported:
+                try:
+                    router = loader._try_load_router(spec)
+                except Exception as e:  # deferred: must not take down the request
+                    loader._loaded_routers[spec.module] = False
+                    loader._router_errors[spec.module] = f"{type(e).__name__}: {e}"
+                    _log.exception("✗ Deferred router failed: %s", spec.module)
+                    router = None
+                self._imported[spec.module] = router
+            return self._imported[spec.module]
+
+    async def _mount_async(self, spec: RouterSpec) -> None:
+        if spec.module not in self._pending:
+            return
+        router = await anyio.to_thread.run_sync(self._import, spec)
+        for handler in self._mount(spec, router):
+            result = handler()
+            if inspect.isawaitable(result):
+                await result
+
+    def _mount(self, spec: RouterSpec, router: Optional[APIRouter]) -> List[Callable[[], Any]]:
+        """Include an imported router; returns startup handlers still to run."""
+        if self._pending.pop(spec.module, None) is None:
+            return []
+        loader._pending_routers.pop(spec.module, None)
+        self._include(spec, router)
+        self.app.openapi_schema = None
+        if router is None or not self._started:
+            return []
+        return list(router.on_startup)
+
+    def _include(self, spec: RouterSpec, router: Optional[APIRouter]) -> None:
+        """Include a router at its eager-mode position in the route table."""
+        if router is None:
+            return
+        routes = self.app.router.routes
+        before = len(routes)
+        if spec.prefix:
+            self.app.include_router(router, prefix=spec.prefix, tags=spec.tags)
+        else:
+            self.app.include_router(router, tags=spec.tags)
+
+        added = routes[before:]
+        del routes[before:]
+        order = self._order.get(spec.module, len(self.specs))
+        at = self._routes_start + sum(
+            count for o, count in self._route_counts.items() if o < order
+        )
+        routes[at:at] = added
+        self._route_counts[order] = self._route_counts.get(order, 0) + len(added)
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that mounts deferred routers before routing a request."""
+
+    def __init__(self, app, mounter: LazyRouterMounter):
+        self.app = app
+        self.mounter = mounter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.mounter.has_pending:
+            await self.mounter.ensure_mounted(scope["path"])
+        await self.app(scope, receive, send)
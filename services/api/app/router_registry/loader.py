@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import importlib
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter
@@ -16,6 +17,11 @@ _log = logging.getLogger(__name__)
 # Track loading status (module-level state)
 _loaded_routers: Dict[str, bool] = {}
 _router_errors: Dict[str, str] = {}
+# Wall time spent importing each router module (first importer pays for shared deps)
+_router_import_ms: Dict[str, float] = {}
+# Lazily mounted routers not yet imported: module -> mount path
+_pending_routers: Dict[str, str] = {}
+_load_mode: str = "eager"
 
 
 def _try_load_router(spec: RouterSpec) -> Optional[APIRouter]:
@@ -25,8 +31,12 @@ def _try_load_router(spec: RouterSpec) -> Optional[APIRouter]:
         _loaded_routers[spec.module] = False
         return None
 
+    start = time.perf_counter()
     try:
-        module = importlib.import_module(spec.module)
+        try:
+            module = importlib.import_module(spec.module)
+        finally:
+            _router_import_ms[spec.module] = (time.perf_counter() - start) * 1000.0
         router = getattr(module, spec.router_attr)
         _loaded_routers[spec.module] = True
         _log.info("✓ Loaded router: %s", spec.module)
@@ -89,3 +99,18 @@ def get_loaded_routers() -> Dict[str, bool]:
 def get_router_errors() -> Dict[str, str]:
     """Return dict of module -> error message for failed routers."""
     return _router_errors.copy()
+
+
+def get_router_import_costs() -> Dict[str, float]:
+    """Return dict of module -> import wall time in milliseconds."""
+    return _router_import_ms.copy()
+
+
+def get_pending_routers() -> Dict[str, str]:
+    """Return dict of module -> mount path for lazy routers not yet loaded."""
+    return _pending_routers.copy()
+
+
+def get_load_mode() -> str:
+    """Return the router load mode ("eager" or "lazy")."""
+    return _load_mode
@@ -20,6 +20,13 @@ RMOS_ROUTERS: List[RouterSpec] = [
         required=True,
         category="rmos",
     ),
+    # Batch rollups under /runs; listed before api_runs so /runs/{run_id} does not shadow them
+    RouterSpec(
+        module="app.rmos.runs_v2.api_runs_batch",
+        prefix="/api/rmos",
+        tags=["RMOS", "Runs"],
+        category="rmos",
+    ),
     RouterSpec(
         module="app.rmos.runs_v2.api_runs",
         prefix="/api/rmos",
@@ -15,3 +15,4 @@ class RouterSpec:
     required: bool = False  # If True, failure blocks startup
     enabled: bool = True  # If False, skip loading
     category: str = "misc"  # For grouping in health reports
+    lazy: bool = True  # If False, always mount at startup in lazy load mode
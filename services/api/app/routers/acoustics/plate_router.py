@@ -19,6 +19,11 @@ try:
         BodyStyle,
         PlateThicknessResult,
         CoupledSystemResult,
+        ForwardModel,
+        FrequencyTarget,
+        MaterialCandidate,
+        ThicknessConstraints,
+        solve_thickness_batch,
     )
     from app.calculators.plate_design.archtop_graduation import (
         graduation_from_wood_and_target,
@@ -253,3 +258,102 @@ def archtop_graduation_endpoint(req: ArchtopGraduationRequest) -> Dict[str, Any]
         return result.to_dict()
     except ValueError as e:
         raise HTTPException(400, detail=str(e))
+
+
+class InverseBatchTarget(BaseModel):
+    """One tap-tone target shared by every plate in the batch."""
+    mode: int = Field(1, ge=1, description="Mode number (1 = fundamental)")
+    frequency_hz: float = Field(..., gt=0, description="Target frequency in Hz")
+    weight: float = Field(1.0, gt=0, description="Relative importance")
+
+
+class InverseBatchPlate(BaseModel):
+    """A plate blank; measured properties override the species values."""
+    id: str = Field(..., description="Caller's identifier for the blank")
+    species: str = Field(..., description="Species ID (e.g., 'spruce_adirondack')")
+    density_kg_m3: Optional[float] = Field(None, gt=0, description="Measured density")
+    E_L_GPa: Optional[float] = Field(None, gt=0, description="Measured long-grain modulus")
+    E_C_GPa: Optional[float] = Field(None, gt=0, description="Measured cross-grain modulus")
+
+
+class InverseBatchRequest(BaseModel):
+    """Request for grading a stack of plates against target frequencies."""
+    body_style: str = Field(..., description="Body style (sets plate dimensions)")
+    plate: Literal["top", "back"] = Field("top", description="Plate to grade")
+    targets: List[InverseBatchTarget] = Field(..., min_length=1)
+    plates: List[InverseBatchPlate] = Field(..., min_length=1, max_length=5000)
+    gamma: float = Field(1.0, gt=0, description="Free→box transfer; 1.0 grades free-plate tap tones")
+    h_min_mm: float = Field(1.5, gt=0)
+    h_max_mm: float = Field(5.0, gt=0)
+    h_step_mm: Optional[float] = Field(None, gt=0)
+    forward_model: Literal["simple", "rayleigh_ritz"] = Field("rayleigh_ritz")
+
+
+@router.post("/inverse-batch")
+def inverse_batch_endpoint(req: InverseBatchRequest) -> Dict[str, Any]:
+    """
+    Solve thickness for every plate in a batch against shared targets.
+
+    Species properties come from the materials registry; the forward model
+    runs once per distinct material, so whole catalogues grade in one call.
+    """
+    if not PLATE_DESIGN_AVAILABLE:
+        raise HTTPException(503, detail="Plate design module not available")
+
+    try:
+        body_style_enum = BodyStyle(req.body_style.lower())
+    except ValueError:
+        raise HTTPException(400, detail=f"Unknown body style: {req.body_style}")
+
+    calibration = get_body_calibration(body_style_enum)
+    if calibration is None:
+        raise HTTPException(400, detail=f"No calibration for body style: {req.body_style}")
+
+    if req.plate == "top":
+        a, b = calibration.top_a_m, calibration.top_b_m
+    else:
+        a, b = calibration.back_a_m, calibration.back_b_m
+
+    species: Dict[str, Optional[Dict[str, float]]] = {}
+    candidates = []
+    for blank in req.plates:
+        if blank.species not in species:
+            species[blank.species] = get_material_for_plate(blank.species)
+        material = species[blank.species]
+        if material is None:
+            raise HTTPException(400, detail=f"Unknown material: {blank.species}")
+        candidates.append(
+            MaterialCandidate(
+                name=blank.id,
+                E_L=(blank.E_L_GPa or material["E_L_GPa"]) * 1e9,
+                E_C=(blank.E_C_GPa or material["E_C_GPa"]) * 1e9,
+                rho=blank.density_kg_m3 or material["density_kg_m3"],
+            )
+        )
+
+    try:
+        constraints = ThicknessConstraints(
+            h_min_mm=req.h_min_mm, h_max_mm=req.h_max_mm, h_step_mm=req.h_step_mm
+        )
+        results = solve_thickness_batch(
+            candidates,
+            [FrequencyTarget(mode=t.mode, frequency_Hz=t.frequency_hz, weight=t.weight)
+             for t in req.targets],
+            a=a,
+            b=b,
+            gamma=req.gamma,
+            constraints=constraints,
+            forward_model=ForwardModel(req.forward_model),
+        )
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+    return {
+        "body_style": body_style_enum.value,
+        "plate": req.plate,
+        "count": len(results),
+        "results": [
+            {"id": blank.id, "species": blank.species, **result.to_dict()}
+            for blank, result in zip(req.plates, results)
+        ],
+    }
@@ -15,23 +15,25 @@ Security:
 - Fails closed: invalid geometry blocks export
 """
 
-import os
-import tempfile
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from ezdxf import readfile as dxf_readfile
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
 from app.schemas.adaptive_schemas import Loop, PlanIn
 from .plan_router import plan
 
 # Import validation gate for mandatory pre-export validation
+from ...cam.dxf_geometry_cache import DxfGeometryHandle, get_dxf_handle
 from ...cam.dxf_validation_gate import enforce_dxf_validation
 
 router = APIRouter(tags=["cam-adaptive"])
 
 
-def _dxf_to_loops_from_bytes(data: bytes, layer_name: str = "GEOMETRY") -> List[Loop]:
+def _dxf_to_loops_from_bytes(
+    data: bytes,
+    layer_name: str = "GEOMETRY",
+    handle: Optional[DxfGeometryHandle] = None,
+) -> List[Loop]:
     """
     Convert DXF bytes into adaptive Loop objects from the given layer.
 
@@ -41,6 +43,8 @@ def _dxf_to_loops_from_bytes(data: bytes, layer_name: str = "GEOMETRY") -> List[
     Args:
         data: DXF file content as bytes
         layer_name: DXF layer to extract geometry from (default: "GEOMETRY")
+        handle: Parsed-geometry handle from validation (default: from the
+            geometry cache)
 
     Returns:
         List of Loop objects (first is outer boundary, rest are islands)
@@ -56,15 +60,8 @@ def _dxf_to_loops_from_bytes(data: bytes, layer_name: str = "GEOMETRY") -> List[
         - First loop should be outer boundary (CCW), rest islands (CW)
     """
     try:
-        # ezdxf.read() with StringIO has issues with complex DXF files,
-        # so we use a temp file approach with readfile() instead
-        with tempfile.NamedTemporaryFile(suffix=".dxf", delete=False) as tmp:
-            tmp.write(data)
-            tmp_path = tmp.name
-        try:
-            doc = dxf_readfile(tmp_path)
-        finally:
-            os.unlink(tmp_path)
+        # Shared read-only document (ezdxf.readfile semantics, parsed once per payload)
+        doc = (handle or get_dxf_handle(data)).document
     except HTTPException:  # WP-1: pass through HTTPException
         raise
     except (ValueError, OSError, KeyError) as exc:  # WP-1: DXF file parse
@@ -156,9 +153,10 @@ async def plan_from_dxf(
 
     # MANDATORY: Validate DXF geometry before G-code export
     # This is FAIL-CLOSED: invalid geometry blocks export (no bypass)
-    enforce_dxf_validation(data, file.filename or "upload.dxf")
+    handle = get_dxf_handle(data)
+    enforce_dxf_validation(data, file.filename or "upload.dxf", handle=handle)
 
-    loops = _dxf_to_loops_from_bytes(data, layer_name="GEOMETRY")
+    loops = _dxf_to_loops_from_bytes(data, layer_name="GEOMETRY", handle=handle)
 
     body = PlanIn(
         loops=loops,
@@ -23,15 +23,18 @@ Endpoints:
 from __future__ import annotations
 
 import logging
+import shutil
 import tempfile
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from ...core.compute_dispatch import run_compute
+from ...services.vectorize_cache import CachedResult, get_vectorize_cache
 from .constants import (
     PHASE3_AVAILABLE,
     extract_guitar_blueprint,
@@ -99,8 +102,21 @@ def get_phase3_info() -> Phase3InfoResponse:
     )
 
 
+def _restore_cached_result(cached: CachedResult, output_dir: str) -> Dict[str, Any]:
+    """Copy cached artifacts into output_dir and point the result at them."""
+    result = dict(cached.payload)
+    for key in ("dxf", "svg"):
+        name = Path(result.get(key) or "").name
+        if name in cached.files:
+            target = Path(output_dir) / name
+            shutil.copyfile(cached.files[name], target)
+            result[key] = str(target)
+    return result
+
+
 @router.post("/vectorize", response_model=Phase3Response)
 async def vectorize_blueprint(
+    request: Request,
     file: UploadFile = File(..., description="Blueprint PDF or image"),
     instrument_type: str = Form("electric"),
     spec_name: Optional[str] = Form(None),
@@ -148,22 +164,38 @@ async def vectorize_blueprint(
     output_dir = tempfile.mkdtemp(prefix="blueprint_phase3_")
     input_tmp = None
 
+    options: Dict[str, Any] = dict(
+        instrument_type=instrument_type,
+        spec_name=spec_name,
+        dual_pass=dual_pass,
+        use_ml=use_ml,
+        detect_primitives=detect_primitives,
+        validate=validate,
+        dpi=dpi,
+    )
+    cache = get_vectorize_cache()
+    cache_key = cache.make_key("phase3", content, {**options, "ext": ext}) if cache else None
+    cached = cache.get(cache_key, "phase3") if cache else None
+
     try:
-        # Save input file to temp location
-        input_tmp = Path(output_dir) / f"input{ext}"
-        input_tmp.write_bytes(content)
-
-        result = extract_guitar_blueprint(
-            source_path=str(input_tmp),
-            output_dir=output_dir,
-            instrument_type=instrument_type,
-            spec_name=spec_name,
-            dual_pass=dual_pass,
-            use_ml=use_ml,
-            detect_primitives=detect_primitives,
-            validate=validate,
-            dpi=dpi,
-        )
+        if cached is not None:
+            result = _restore_cached_result(cached, output_dir)
+        else:
+            # Save input file to temp location
+            input_tmp = Path(output_dir) / f"input{ext}"
+            input_tmp.write_bytes(content)
+
+            result = await run_compute(
+                "blueprint_vectorize",
+                extract_guitar_blueprint,
+                request=request,
+                source_path=str(input_tmp),
+                output_dir=output_dir,
+                **options,
+            )
+            dxf_out = result.get("dxf")
+            if cache is not None and dxf_out and Path(dxf_out).exists():
+                cache.put(cache_key, result, files={Path(dxf_out).name: dxf_out})
 
         processing_time = int((time.time() - start_time) * 1000)
 
@@ -216,6 +248,8 @@ async def vectorize_blueprint(
             message=result.get("message"),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:  # WP-2: API endpoint catch-all
         logger.exception("Phase 3 vectorization failed")
         raise HTTPException(500, f"Vectorization failed: {e}")
@@ -223,6 +257,7 @@ async def vectorize_blueprint(
 
 @router.post("/quick")
 async def quick_vectorize(
+    request: Request,
     file: UploadFile = File(...),
     instrument_type: str = Form("electric"),
 ) -> Phase3Response:
@@ -231,6 +266,7 @@ async def quick_vectorize(
         raise HTTPException(503, "Phase 3 vectorizer not available")
     
     return await vectorize_blueprint(
+        request=request,
         file=file,
         instrument_type=instrument_type,
         dual_pass=False,
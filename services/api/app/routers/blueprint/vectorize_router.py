@@ -20,6 +20,7 @@ Author: Production Shop
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
@@ -30,6 +31,11 @@ from ...auth.principal import Principal
 from ...services.blueprint_orchestrator import BlueprintOrchestrator
 from ...services.blueprint_clean import CleanupMode
 from ...services.blueprint_limits import LIMITS
+from ...services.vectorize_cache import (
+    get_vectorize_cache,
+    restore_inline_artifacts,
+    split_inline_artifacts,
+)
 from ...utils.stage_timer import is_debug_enabled
 
 logger = logging.getLogger(__name__)
@@ -197,9 +203,7 @@ async def vectorize_blueprint(
     except ValueError:
         cleanup_mode = CleanupMode.REFINED
 
-    # Delegate to orchestrator
-    result = _orchestrator.process_file(
-        file_bytes=file_bytes,
+    options = dict(
         filename=filename,
         page_num=page_num,
         target_height_mm=target_height_mm,
@@ -211,7 +215,24 @@ async def vectorize_blueprint(
         reinsert_text=reinsert_text,
     )
 
+    # Identical upload + options: serve the stored artifacts
+    cache = get_vectorize_cache()
+    cache_key = None
+    if cache is not None:
+        # Only the extension of the filename affects processing
+        key_options = {**options, "filename": Path(filename).suffix.lower()}
+        cache_key = cache.make_key("blueprint", file_bytes, key_options)
+        cached = cache.get(cache_key, "blueprint")
+        if cached is not None:
+            return BlueprintVectorizeResponse(**restore_inline_artifacts(cached))
+
+    # Delegate to orchestrator
+    result = _orchestrator.process_file(file_bytes=file_bytes, **options)
+
     # Convert to response dict
     response_dict = result.to_response_dict(include_debug=include_debug)
 
+    if cache is not None and result.processed and not result.error:
+        cache.put(cache_key, *split_inline_artifacts(response_dict))
+
     return BlueprintVectorizeResponse(**response_dict)
@@ -5,22 +5,26 @@ Blueprint CAM Extraction Utilities
 DXF loop extraction utilities for CAM integration.
 """
 
-import os
-import tempfile
-from typing import List, Tuple
-
-import ezdxf
+from typing import List, Optional, Tuple
 
+from ...cam.dxf_fast_reader import DxfReadError
+from ...cam.dxf_geometry_cache import DxfGeometryHandle, get_dxf_handle
 from ..blueprint_cam_bridge_schemas import Loop
 
 
-def extract_loops_from_dxf(dxf_bytes: bytes, layer_name: str = "GEOMETRY") -> Tuple[List[Loop], List[str]]:
+def extract_loops_from_dxf(
+    dxf_bytes: bytes,
+    layer_name: str = "GEOMETRY",
+    handle: Optional[DxfGeometryHandle] = None,
+) -> Tuple[List[Loop], List[str]]:
     """
     Extract closed LWPOLYLINE loops from DXF file.
 
     Args:
         dxf_bytes: DXF file content
         layer_name: Layer to extract from (default: GEOMETRY)
+        handle: Parsed-geometry handle shared with validation (default: from
+            the geometry cache), so the document is not parsed again
 
     Returns:
         (loops, warnings) where loops is List[Loop] and warnings is List[str]
@@ -34,16 +38,8 @@ def extract_loops_from_dxf(dxf_bytes: bytes, layer_name: str = "GEOMETRY") -> Tu
     loops = []
 
     try:
-        # Write bytes to temp file and read with ezdxf (avoids text/binary issues)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.dxf', mode='wb') as tmp:
-            tmp.write(dxf_bytes)
-            tmp_path = tmp.name
-
-        try:
-            doc = ezdxf.readfile(tmp_path)
-            msp = doc.modelspace()
-        finally:
-            os.unlink(tmp_path)
+        doc = (handle or get_dxf_handle(dxf_bytes)).document
+        msp = doc.modelspace()
 
         # Query for LWPOLYLINE entities on specified layer
         all_entities = list(msp)
@@ -94,8 +90,8 @@ def extract_loops_from_dxf(dxf_bytes: bytes, layer_name: str = "GEOMETRY") -> Tu
         if not loops:
             warnings.append("No valid closed loops extracted from DXF")
 
-    except ezdxf.DXFError as e:
-        warnings.append(f"DXF parsing error: {str(e)}")
+    except DxfReadError as e:
+        warnings.append(f"DXF parsing error: {str(e.__cause__ or e)}")
     except (ValueError, TypeError, KeyError, OSError) as e:
         warnings.append(f"Unexpected error reading DXF: {str(e)}")
 
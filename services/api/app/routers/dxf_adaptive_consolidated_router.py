@@ -14,15 +14,15 @@ Endpoints (under /api/cam):
 """
 from __future__ import annotations
 
-import io
 import logging
 from typing import Any, Dict, Literal, Optional
 
-import ezdxf
 from ezdxf.lldxf.const import DXFStructureError
 import httpx
 from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 
+from ..cam.dxf_fast_reader import DxfReadError
+from ..cam.dxf_geometry_cache import get_dxf_handle
 from ..cam.dxf_preflight import DXFPreflight
 from ..routers.blueprint_cam import extract_loops_from_dxf
 
@@ -61,9 +61,10 @@ async def plan_from_dxf(
 
     try:
         dxf_bytes = await read_dxf_with_validation(file)
+        handle = get_dxf_handle(dxf_bytes)
 
         # MANDATORY: Validate DXF geometry before G-code export (FAIL-CLOSED)
-        enforce_dxf_validation(dxf_bytes, file.filename or "upload.dxf")
+        enforce_dxf_validation(dxf_bytes, file.filename or "upload.dxf", handle=handle)
     except DXFStructureError as exc:
         raise HTTPException(
             status_code=422,
@@ -73,7 +74,7 @@ async def plan_from_dxf(
     # Optional preflight for debug info
     preflight_debug: Optional[Dict[str, Any]] = None
     try:
-        preflight = DXFPreflight(dxf_bytes, filename=file.filename or "upload.dxf")
+        preflight = DXFPreflight(dxf_bytes, filename=file.filename or "upload.dxf", handle=handle)
         report = preflight.run_all_checks()
         preflight_debug = {
             "passed": report.passed,
@@ -86,7 +87,7 @@ async def plan_from_dxf(
     # Extract loops
     layer_name = geometry_layer or "GEOMETRY"
     try:
-        loops, warnings = extract_loops_from_dxf(dxf_bytes, layer_name=layer_name)
+        loops, warnings = extract_loops_from_dxf(dxf_bytes, layer_name=layer_name, handle=handle)
     except HTTPException:
         raise
     except (ValueError, KeyError, TypeError, OSError) as e:
@@ -145,13 +146,12 @@ def _dxf_to_adaptive_request(
 ) -> Dict[str, Any]:
     """Convert DXF closed polylines to Adaptive Pocket request body."""
     try:
-        data_stream = io.BytesIO(dxf_bytes)
-        doc = ezdxf.read(data_stream)
+        doc = get_dxf_handle(dxf_bytes).document
     except HTTPException:
         raise
-    except (ValueError, IOError, ezdxf.DXFError) as exc:  # audited: DXF-parse
+    except (DxfReadError, IOError) as exc:  # audited: DXF-parse
         logger.exception("Failed to parse DXF for adaptive pocket")
-        raise HTTPException(status_code=400, detail=f"Failed to parse DXF: {exc}") from exc
+        raise HTTPException(status_code=400, detail=f"Failed to parse DXF: {exc.__cause__ or exc}") from exc
 
     msp = doc.modelspace()
     loops = []
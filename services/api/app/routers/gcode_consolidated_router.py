@@ -12,17 +12,41 @@ Endpoints (under /api/cam/gcode):
     POST /plot.svg   - Generate SVG backplot from G-code
     POST /estimate   - Calculate distances and cycle time
     POST /simulate   - Per-segment animation data
+    POST /simulate/packed - Same path as a columnar binary (or base64) buffer
+    POST /simulate/stock  - Heightfield material removal: MRR, air cutting,
+                            stock state at any move
 
 Architecture:
-    UTILITY lane — stateless, no governance, no audit trail.
+    UTILITY lane — stateless, no governance, no audit trail. /simulate/stock
+    keeps a small LRU of finished stock simulations keyed by the request, purely
+    so repeated scrub requests replay from the nearest snapshot. The LRU is
+    bounded by count and by the simulations' retained bytes; grids over
+    MAX_GRID_CELLS are rejected with 422.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Literal, Optional
 
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
 
+from ..util.gcode import (
+    MIN_CELL_MM,
+    PACKED_MEDIA_TYPE,
+    SegmentStream,
+    StockGrid,
+    StockSimulator,
+    ToolShape,
+    decimate_segments,
+    pack_segments,
+    stock_grid_for_segments,
+    tool_shape_from_table,
+)
 from ..util.gcode_parser import simulate, simulate_segments, svg_from_points
 
 
@@ -219,4 +243,233 @@ def simulate_gcode(req: SimulateRequest) -> SimulateResponse:
     )
 
 
+class SimulatePackedRequest(SimulateRequest):
+    """Request body for the packed (columnar binary) simulation endpoint."""
+    encoding: Literal["binary", "base64"] = Field(
+        "binary",
+        description="'binary' returns application/octet-stream; 'base64' wraps "
+                    "the same buffer in JSON alongside the summary.",
+    )
+    level: int = Field(
+        0, ge=0, le=8,
+        description="Decimation level: merge up to 2**level consecutive like "
+                    "segments (0 = full fidelity).",
+    )
+
+
+@router.post("/simulate/packed")
+def simulate_gcode_packed(req: SimulatePackedRequest) -> Response:
+    """
+    Simulate G-code and return segments in the packed backplot format.
+
+    Same engine and segments as ``/simulate``, encoded as a struct-of-arrays
+    (see ``app.util.gcode.packed``) instead of one JSON object per segment.
+    Binary responses carry bounds, segment count and total time in the
+    buffer header, and totals/tools/warnings in the ``X-CAM-Sim-Summary``
+    header. With constant-velocity timing the simulator streams straight
+    into the packer without materializing segment dicts.
+    """
+    stride = 1 << req.level
+    if req.accel_mm_s2 is not None and req.accel_mm_s2 > 0:
+        result = simulate_segments(
+            req.gcode,
+            rapid_mm_min=req.rapid_mm_min,
+            default_feed_mm_min=req.default_feed_mm_min,
+            units=req.units,
+            arc_resolution_deg=req.arc_resolution_deg,
+            max_segments=req.max_segments,
+            accel_mm_s2=req.accel_mm_s2,
+            junction_deviation_mm=req.junction_deviation_mm,
+        )
+        data = pack_segments(decimate_segments(result.pop("segments"), stride))
+        summary = result
+    else:
+        stream = SegmentStream(
+            req.gcode,
+            rapid_mm_min=req.rapid_mm_min,
+            default_feed_mm_min=req.default_feed_mm_min,
+            units=req.units,
+            arc_resolution_deg=req.arc_resolution_deg,
+            max_segments=req.max_segments,
+        )
+        data = pack_segments(decimate_segments(stream, stride))
+        summary = stream.summary()
+
+    if req.encoding == "base64":
+        return Response(
+            content=json.dumps({
+                "format": "ltb-packed-v1",
+                "data": base64.b64encode(data).decode("ascii"),
+                **summary,
+            }),
+            media_type="application/json",
+        )
+
+    header = {
+        "totals": summary["totals"],
+        "tools": {k: v for k, v in summary["tools"].items() if k != "changes"},
+        "warnings": summary["warnings"],
+    }
+    return Response(
+        content=data,
+        media_type=PACKED_MEDIA_TYPE,
+        headers={"X-CAM-Sim-Summary": json.dumps(header)},
+    )
+
+
+
+# ===========================================================================
+# STOCK REMOVAL SIMULATION
+# ===========================================================================
+
+class StockBox(BaseModel):
+    """Explicit stock extents (mm). Omit to fit the stock to the feed moves."""
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    z_top: float = 0.0
+    z_bottom: Optional[float] = None
+
+
+class SimulateStockRequest(SimulateRequest):
+    """Request body for heightfield stock-removal simulation."""
+    tool_kind: Literal["flat", "ball", "v"] = Field("flat", description="Cutter profile")
+    tool_diameter_mm: float = Field(6.0, gt=0, description="Cutter diameter (mm)")
+    tool_angle_deg: float = Field(90.0, gt=0, lt=180, description="V-bit included angle")
+    machine_id: Optional[str] = Field(
+        None,
+        description="Resolve each tool number in the program from this machine's "
+                    "tool table; tools missing from the table use tool_kind/diameter.",
+    )
+    cell_mm: float = Field(0.5, ge=MIN_CELL_MM, description="Heightfield cell size (mm)")
+    stock: Optional[StockBox] = None
+    snapshot_every: int = Field(500, ge=1, description="Checkpoint interval in moves")
+    at_move: Optional[int] = Field(
+        None, ge=0,
+        description="Return the stock after this many moves (default: end of program).",
+    )
+    include_moves: bool = Field(True, description="Include per-move MRR / air-cut columns")
+
+
+# Finished simulations by request key (scrubbing replays from their snapshots)
+_STOCK_SIM_CACHE_SIZE = 8
+_STOCK_SIM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_stock_sims: "OrderedDict[str, StockSimulator]" = OrderedDict()
+_stock_sims_bytes = 0
+_stock_sims_lock = threading.Lock()
+
+
+def _run_stock_sim(req: SimulateStockRequest) -> StockSimulator:
+    key = hashlib.sha256(
+        req.model_dump_json(exclude={"at_move", "include_moves"}).encode("utf-8")
+    ).hexdigest()
+    with _stock_sims_lock:
+        sim = _stock_sims.get(key)
+        if sim is not None:
+            _stock_sims.move_to_end(key)
+            return sim
+
+    default_tool = ToolShape(req.tool_kind, req.tool_diameter_mm, req.tool_angle_deg)
+    planned: Optional[List[Dict[str, Any]]] = None
+    if req.accel_mm_s2 is not None and req.accel_mm_s2 > 0:
+        planned = simulate_segments(
+            req.gcode,
+            rapid_mm_min=req.rapid_mm_min,
+            default_feed_mm_min=req.default_feed_mm_min,
+            units=req.units,
+            arc_resolution_deg=req.arc_resolution_deg,
+            max_segments=req.max_segments,
+            accel_mm_s2=req.accel_mm_s2,
+            junction_deviation_mm=req.junction_deviation_mm,
+        )["segments"]
+
+    def stream() -> Iterable[Dict[str, Any]]:
+        """A fresh pass over the program (the accel model needs the full list)."""
+        if planned is not None:
+            return planned
+        return SegmentStream(
+            req.gcode,
+            rapid_mm_min=req.rapid_mm_min,
+            default_feed_mm_min=req.default_feed_mm_min,
+            units=req.units,
+            arc_resolution_deg=req.arc_resolution_deg,
+            max_segments=req.max_segments,
+        )
+
+    try:
+        if req.stock is not None:
+            grid = StockGrid.from_bounds(
+                req.stock.x_min, req.stock.x_max, req.stock.y_min, req.stock.y_max,
+                cell_mm=req.cell_mm, z_top=req.stock.z_top, z_bottom=req.stock.z_bottom,
+            )
+        else:
+            # Sizing pass over a separate stream, so segments are never buffered
+            grid = stock_grid_for_segments(
+                stream(), margin_mm=default_tool.radius, cell_mm=req.cell_mm,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    machine_id = req.machine_id
+    sim = StockSimulator(
+        grid,
+        {},
+        default_tool=default_tool,
+        tool_resolver=(lambda n: tool_shape_from_table(machine_id, n)) if machine_id else None,
+        snapshot_every=req.snapshot_every,
+    )
+    sim.run(stream())
+    _cache_stock_sim(key, sim)
+    return sim
+
+
+def _cache_stock_sim(key: str, sim: StockSimulator) -> None:
+    """Keep *sim* for scrubbing; evicts oldest by count and retained bytes."""
+    global _stock_sims_bytes
+    size = sim.nbytes
+    if size > _STOCK_SIM_CACHE_MAX_BYTES:
+        return
+    with _stock_sims_lock:
+        previous = _stock_sims.pop(key, None)
+        if previous is not None:
+            _stock_sims_bytes -= previous.nbytes
+        _stock_sims[key] = sim
+        _stock_sims_bytes += size
+        while (
+            len(_stock_sims) > _STOCK_SIM_CACHE_SIZE
+            or _stock_sims_bytes > _STOCK_SIM_CACHE_MAX_BYTES
+        ):
+            _, evicted = _stock_sims.popitem(last=False)
+            _stock_sims_bytes -= evicted.nbytes
+
+
+@router.post("/simulate/stock")
+def simulate_gcode_stock(req: SimulateStockRequest) -> Dict[str, Any]:
+    """
+    Simulate material removal on a heightfield stock.
+
+    Sweeps the tool profile over a Z-dexel grid while consuming the simulator's
+    segment stream and reports removed volume, per-move material removal rate
+    and air cutting. ``heightfield`` is the stock after ``at_move`` moves as
+    base64 little-endian float32, row-major ``ny`` x ``nx``; repeating the
+    request with a different ``at_move`` scrubs from the nearest snapshot
+    instead of re-simulating the program.
+    """
+    sim = _run_stock_sim(req)
+    heights = sim.heightfield_at(req.at_move)
+    out: Dict[str, Any] = {
+        **sim.summary(),
+        "at_move": sim.move_count if req.at_move is None else min(req.at_move, sim.move_count),
+        "heightfield": {
+            **sim.grid.describe(),
+            "dtype": "float32",
+            "data": base64.b64encode(heights.astype("<f4").tobytes()).decode("ascii"),
+        },
+    }
+    if req.include_moves:
+        out["moves"] = sim.move_columns()
+    return out
+
+
 __all__ = ["router"]
@@ -29,14 +29,20 @@ import logging
 import sys
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from ..core.compute_dispatch import run_compute
 from ..utils.stage_timer import is_debug_enabled
 from ..services.photo_orchestrator import PhotoOrchestrator
+from ..services.vectorize_cache import (
+    get_vectorize_cache,
+    restore_inline_artifacts,
+    split_inline_artifacts,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["vectorizer"])
@@ -279,6 +285,26 @@ def _vectorize_response_payload(response: VectorizeResponse) -> dict[str, object
     return payload
 
 
+def _process_image_payload(include_debug: bool, **kwargs: Any) -> Tuple[Dict[str, Any], str]:
+    """
+    Run the orchestrator and return (response dict, log summary).
+
+    Runs in a compute-dispatch worker, so it returns plain data rather than
+    the orchestrator result object.
+    """
+    result = _orchestrator.process_image(debug=include_debug, **kwargs)
+
+    # Force garbage collection after heavy processing
+    gc.collect()
+
+    summary = (
+        f"ok={result.ok} stage={result.stage} | "
+        f"body={result.dimensions.width_mm:.0f}x{result.dimensions.height_mm:.0f}mm | "
+        f"rec={result.recommendation.action.value} confidence={result.recommendation.confidence:.3f}"
+    )
+    return result.to_response_dict(include_debug=include_debug), summary
+
+
 # ─── Route ────────────────────────────────────────────────────────────────────
 
 @router.get("/status")
@@ -305,7 +331,7 @@ async def vectorizer_status():
 
 
 @router.post("/extract")
-async def extract_from_photo(req: VectorizeRequest):
+async def extract_from_photo(req: VectorizeRequest, request: Request):
     """
     Run the Photo Vectorizer v2 pipeline on an uploaded image.
 
@@ -356,9 +382,7 @@ async def extract_from_photo(req: VectorizeRequest):
     # ── Check if debug output is allowed ───────────────────────────────────
     include_debug = req.debug and is_debug_enabled()
 
-    # ── Delegate to orchestrator ───────────────────────────────────────────
-    result = _orchestrator.process_image(
-        image_bytes=img_bytes,
+    options: Dict[str, Any] = dict(
         filename=filename,
         spec_name=req.spec_name,
         known_dimension_mm=req.known_width_mm,
@@ -367,11 +391,31 @@ async def extract_from_photo(req: VectorizeRequest):
         export_dxf=req.export_dxf,
         source_type=req.source_type,
         gap_closing_level=req.gap_closing_level,
-        debug=include_debug,
     )
 
-    # Force garbage collection after heavy processing
-    gc.collect()
+    # ── Same image + options already vectorized? ───────────────────────────
+    cache = get_vectorize_cache()
+    cache_key = None
+    cached = None
+    if cache is not None:
+        cache_key = cache.make_key("photo_v2", img_bytes, {**options, "debug": include_debug})
+        cached = cache.get(cache_key, "photo_v2")
+
+    if cached is not None:
+        response_dict = restore_inline_artifacts(cached)
+        summary = f"cache hit {cache_key[:12]}"
+    else:
+        # ── Delegate to orchestrator (off the event loop) ──────────────────
+        response_dict, summary = await run_compute(
+            "photo_vectorize",
+            _process_image_payload,
+            include_debug,
+            request=request,
+            image_bytes=img_bytes,
+            **options,
+        )
+        if cache is not None and not response_dict.get("error"):
+            cache.put(cache_key, *split_inline_artifacts(response_dict))
     log_memory("AFTER_ORCHESTRATOR")
 
     processing_ms = round((time.time() - t0) * 1000, 1)
@@ -380,14 +424,14 @@ async def extract_from_photo(req: VectorizeRequest):
     mem_final = log_memory("EXTRACT_COMPLETE")
     total_elapsed = time.time() - t0
     logger.info(
-        f"VECTORIZER_RESULT | ok={result.ok} stage={result.stage} elapsed={total_elapsed:.1f}s | "
-        f"mem_delta={mem_final - mem_start:.0f}MB | "
-        f"body={result.dimensions.width_mm:.0f}x{result.dimensions.height_mm:.0f}mm | "
-        f"rec={result.recommendation.action.value} confidence={result.recommendation.confidence:.3f}"
+        f"VECTORIZER_RESULT | {summary} | elapsed={total_elapsed:.1f}s | "
+        f"mem_delta={mem_final - mem_start:.0f}MB"
     )
 
-    response_dict = result.to_response_dict(include_debug=include_debug)
     if response_dict.get("metrics", {}).get("processing_ms", 0) <= 0:
         response_dict.setdefault("metrics", {})["processing_ms"] = processing_ms
     canonical = VectorizeResponse(**response_dict)
-    return JSONResponse(content=_vectorize_response_payload(canonical))
+    return JSONResponse(
+        content=_vectorize_response_payload(canonical),
+        headers={"X-Vectorize-Cache": "hit" if cached is not None else "miss"},
+    )
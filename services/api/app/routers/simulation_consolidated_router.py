@@ -10,18 +10,28 @@ Consolidates:
 Endpoints:
 - POST /sim/gcode - Simulate G-code from JSON body
 - POST /sim/upload - Simulate G-code from file upload
+- POST /sim/upload/stream - Stream simulated segments as NDJSON chunks
 - POST /sim/metrics - Calculate energy/time metrics
 """
 
 from __future__ import annotations
 
+import io
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import APIRouter, File, Form, HTTPException, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.util.gcode import (
+    SEGMENT_TYPE_CODES,
+    SegmentStream,
+    decimate_segments,
+    iter_segment_chunks,
+)
+
 from app.util.sim_validate import (
     DEFAULT_ACCEL,
     DEFAULT_CLEAR_Z,
@@ -263,6 +273,90 @@ async def simulate_gcode_upload(
     )
 
 
+# Streaming upload simulation. Segments flow lexer -> SegmentStream ->
+# decimate_segments -> iter_segment_chunks -> NDJSON line, so the server holds
+# one chunk at a time and the first chunk leaves as soon as it fills.
+DEFAULT_STREAM_CHUNK_SIZE = 4096
+MAX_STREAM_CHUNK_SIZE = 65_536
+MAX_STREAM_LEVEL = 8
+
+
+def _ndjson_simulation(
+    stream: SegmentStream,
+    level: int,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    stride = 1 << level
+    yield (json.dumps({
+        "kind": "header",
+        "units": stream.units,
+        "level": level,
+        "stride": stride,
+        "chunk_size": chunk_size,
+        "type_codes": SEGMENT_TYPE_CODES,
+    }) + "\n").encode()
+
+    emitted = 0
+    for chunk in iter_segment_chunks(decimate_segments(stream, stride), chunk_size):
+        emitted += chunk["count"]
+        yield (json.dumps({"kind": "chunk", **chunk}) + "\n").encode()
+
+    summary = stream.summary()
+    summary["segments_emitted"] = emitted
+    yield (json.dumps({"kind": "summary", **summary}) + "\n").encode()
+
+
+@router.post("/upload/stream")
+def simulate_gcode_upload_stream(
+    file: UploadFile = File(...),
+    units: str = Form("mm"),
+    level: int = Form(
+        0,
+        description=f"Decimation level 0..{MAX_STREAM_LEVEL}: merge up to 2**level "
+                    "consecutive like segments (0 = full fidelity).",
+    ),
+    chunk_size: int = Form(
+        DEFAULT_STREAM_CHUNK_SIZE,
+        description=f"Segments per NDJSON chunk, capped at {MAX_STREAM_CHUNK_SIZE}.",
+    ),
+    rapid_mm_min: float = Form(3000.0),
+    default_feed_mm_min: float = Form(500.0),
+    arc_resolution_deg: float = Form(5.0),
+    max_segments: Optional[int] = Form(None),
+) -> StreamingResponse:
+    """
+    Simulate an uploaded G-code file and stream segments as NDJSON.
+
+    Uses the full modal simulator (arcs, canned cycles, units, G90/G91) and
+    reads the upload line by line, so peak memory does not grow with program
+    length. The body is newline-delimited JSON: one ``header`` object, then
+    ``chunk`` objects holding columnar segment data (``start`` point plus
+    ``type``/``x``/``y``/``z``/``feed``/``duration_ms``/``line_number``/``tool``
+    columns), then a ``summary`` with bounds, totals, tools and warnings.
+    Timing is constant-velocity.
+    """
+    if not 0 <= level <= MAX_STREAM_LEVEL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"level must be between 0 and {MAX_STREAM_LEVEL}.",
+        )
+    size = min(MAX_STREAM_CHUNK_SIZE, max(1, chunk_size))
+
+    text = io.TextIOWrapper(file.file, encoding="utf-8", errors="ignore")
+    stream = SegmentStream(
+        text,
+        rapid_mm_min=rapid_mm_min,
+        default_feed_mm_min=default_feed_mm_min,
+        units=units,
+        arc_resolution_deg=arc_resolution_deg,
+        max_segments=max_segments,
+    )
+    return StreamingResponse(
+        _ndjson_simulation(stream, level, size),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.post("/metrics", response_model=SimMetricsOut)
 def calculate_metrics(body: SimMetricsIn) -> SimMetricsOut:
     """
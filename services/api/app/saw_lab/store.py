@@ -1,17 +1,42 @@
 """
 Saw Lab Artifact Store
 
-In-memory artifact storage for the SawLab batch workflow.
-Provides a clean seam for repo-backed storage later.
+Artifact storage for the SawLab batch workflow.
+
+Records live in the backend chosen by ``SAW_LAB_STORE_BACKEND`` (see
+``store_backends``): the in-memory dict below by default, or a durable SQLite
+(WAL) file. Both index kind and the lineage fields, so every ``query_*`` reader
+is an indexed lookup rather than a scan.
 """
 from __future__ import annotations
 
+import threading
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
+
+from .store_backends import create_store_backend
 
 _batch_artifacts: Dict[str, Dict[str, Any]] = {}
 
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend():
+    """Return the active store backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_store_backend(_batch_artifacts)
+    return _backend
+
+
+def _find(kinds: Iterable[str], **eq: Any) -> list[Dict[str, Any]]:
+    """Artifacts of *kinds* whose index fields equal *eq*, newest first."""
+    return _get_backend().find(kinds, **eq)
+
 
 def store_artifact(
     *,
@@ -56,7 +81,7 @@ def store_artifact(
         effective_tool_kind = tool_kind
     if effective_tool_kind is not None:
         meta["tool_kind"] = effective_tool_kind
-    _batch_artifacts[artifact_id] = {
+    _get_backend().put({
         "artifact_id": artifact_id,
         "kind": kind,
         "status": status,
@@ -65,13 +90,13 @@ def store_artifact(
         "session_id": session_id,
         "index_meta": meta,
         "payload": stored_payload,
-    }
+    })
     return artifact_id
 
 
 def get_artifact(artifact_id: str) -> Optional[Dict[str, Any]]:
     """Get artifact by ID, returns None if not found."""
-    return _batch_artifacts.get(artifact_id)
+    return _get_backend().get(artifact_id)
 
 
 def read_artifact(artifact_id: str) -> Dict[str, Any]:
@@ -88,7 +113,7 @@ def read_artifact(artifact_id: str) -> Dict[str, Any]:
 
 def clear_artifacts() -> None:
     """Clear all artifacts (for testing)."""
-    _batch_artifacts.clear()
+    _get_backend().clear()
 
 
 def query_executions_by_decision(batch_decision_artifact_id: str) -> list[Dict[str, Any]]:
@@ -97,17 +122,7 @@ def query_executions_by_decision(batch_decision_artifact_id: str) -> list[Dict[s
 
     Returns list of execution artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_decision_artifact_id") == batch_decision_artifact_id:
-            results.append(art)
-
-    # Sort by created_utc descending (newest first)
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_execution"], batch_decision_artifact_id=batch_decision_artifact_id)
 
 
 def query_latest_by_label_and_session(batch_label: str, session_id: str) -> Dict[str, Optional[str]]:
@@ -131,27 +146,11 @@ def query_latest_by_label_and_session(batch_label: str, session_id: str) -> Dict
         "saw_batch_execution": "latest_execution_artifact_id",
     }
 
-    # Group artifacts by kind, filter by label/session
-    by_kind: Dict[str, list[Dict[str, Any]]] = {k: [] for k in kind_to_key}
-
-    for art in _batch_artifacts.values():
-        kind = art.get("kind", "")
-        if kind not in kind_to_key:
-            continue
-
-        payload = art.get("payload", {})
-        art_label = payload.get("batch_label", "")
-        art_session = payload.get("session_id", "") or art.get("session_id", "")
-
-        if art_label == batch_label and art_session == session_id:
-            by_kind[kind].append(art)
-
-    # Get latest (by created_utc) for each kind
-    for kind, key in kind_to_key.items():
-        arts = by_kind[kind]
-        if arts:
-            arts.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-            latest[key] = arts[0].get("artifact_id")
+    # Results are newest first, so the first hit per kind is the latest
+    for art in _find(kind_to_key, batch_label=batch_label, any_session_id=session_id):
+        key = kind_to_key[art["kind"]]
+        if latest[key] is None:
+            latest[key] = art.get("artifact_id")
 
     return latest
 
@@ -162,16 +161,7 @@ def query_job_logs_by_execution(batch_execution_artifact_id: str) -> list[Dict[s
 
     Returns list of job logs sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "batch_job_log":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_execution_artifact_id") == batch_execution_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["batch_job_log"], batch_execution_artifact_id=batch_execution_artifact_id)
 
 
 def query_executions_by_label(batch_label: str, session_id: Optional[str] = None) -> list[Dict[str, Any]]:
@@ -180,19 +170,9 @@ def query_executions_by_label(batch_label: str, session_id: Optional[str] = None
 
     Returns list of execution artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_label") != batch_label:
-            continue
-        if session_id is not None and payload.get("session_id") != session_id:
-            continue
-        results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    if session_id is not None:
+        return _find(["saw_batch_execution"], batch_label=batch_label, session_id=session_id)
+    return _find(["saw_batch_execution"], batch_label=batch_label)
 
 
 def query_decisions_by_plan(batch_plan_artifact_id: str) -> list[Dict[str, Any]]:
@@ -201,16 +181,7 @@ def query_decisions_by_plan(batch_plan_artifact_id: str) -> list[Dict[str, Any]]
 
     Returns list of decision artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_decision":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_plan_artifact_id") == batch_plan_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_decision"], batch_plan_artifact_id=batch_plan_artifact_id)
 
 
 def query_decisions_by_spec(batch_spec_artifact_id: str) -> list[Dict[str, Any]]:
@@ -219,16 +190,7 @@ def query_decisions_by_spec(batch_spec_artifact_id: str) -> list[Dict[str, Any]]
 
     Returns list of decision artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_decision":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_spec_artifact_id") == batch_spec_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_decision"], batch_spec_artifact_id=batch_spec_artifact_id)
 
 
 def query_executions_by_plan(batch_plan_artifact_id: str) -> list[Dict[str, Any]]:
@@ -237,16 +199,7 @@ def query_executions_by_plan(batch_plan_artifact_id: str) -> list[Dict[str, Any]
 
     Returns list of execution artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_plan_artifact_id") == batch_plan_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_execution"], batch_plan_artifact_id=batch_plan_artifact_id)
 
 
 def query_executions_by_spec(batch_spec_artifact_id: str) -> list[Dict[str, Any]]:
@@ -255,16 +208,7 @@ def query_executions_by_spec(batch_spec_artifact_id: str) -> list[Dict[str, Any]
 
     Returns list of execution artifacts sorted by created_utc descending (newest first).
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_spec_artifact_id") == batch_spec_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_execution"], batch_spec_artifact_id=batch_spec_artifact_id)
 
 
 def query_op_toolpaths_by_decision(batch_decision_artifact_id: str) -> list[Dict[str, Any]]:
@@ -273,16 +217,7 @@ def query_op_toolpaths_by_decision(batch_decision_artifact_id: str) -> list[Dict
 
     Returns list of op_toolpaths artifacts sorted by created_utc descending.
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_op_toolpaths":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_decision_artifact_id") == batch_decision_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_op_toolpaths"], batch_decision_artifact_id=batch_decision_artifact_id)
 
 
 def query_op_toolpaths_by_execution(batch_execution_artifact_id: str) -> list[Dict[str, Any]]:
@@ -316,17 +251,8 @@ def query_metrics_rollups_by_execution(batch_execution_artifact_id: str) -> list
     Returns list of rollup artifacts sorted by created_utc descending.
     Matches both saw_batch_execution_metrics_rollup and saw_batch_execution_rollup kinds.
     """
-    results = []
-    valid_kinds = {"saw_batch_execution_metrics_rollup", "saw_batch_execution_rollup"}
-    for art in _batch_artifacts.values():
-        if art.get("kind") not in valid_kinds:
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_execution_artifact_id") == batch_execution_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    valid_kinds = ["saw_batch_execution_metrics_rollup", "saw_batch_execution_rollup"]
+    return _find(valid_kinds, batch_execution_artifact_id=batch_execution_artifact_id)
 
 
 def query_learning_events_by_decision(batch_decision_artifact_id: str) -> list[Dict[str, Any]]:
@@ -335,16 +261,7 @@ def query_learning_events_by_decision(batch_decision_artifact_id: str) -> list[D
 
     Returns list of learning events sorted by created_utc descending.
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_learning_event":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_decision_artifact_id") == batch_decision_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_learning_event"], batch_decision_artifact_id=batch_decision_artifact_id)
 
 
 def query_accepted_learning_events(batch_decision_artifact_id: str) -> list[Dict[str, Any]]:
@@ -353,8 +270,11 @@ def query_accepted_learning_events(batch_decision_artifact_id: str) -> list[Dict
 
     Returns list of learning events with policy_decision="ACCEPT".
     """
-    all_events = query_learning_events_by_decision(batch_decision_artifact_id)
-    return [e for e in all_events if e.get("payload", {}).get("policy_decision") == "ACCEPT"]
+    return _find(
+        ["saw_batch_learning_event"],
+        batch_decision_artifact_id=batch_decision_artifact_id,
+        policy_decision="ACCEPT",
+    )
 
 
 def query_all_accepted_learning_events(limit: int = 200) -> list[Dict[str, Any]]:
@@ -363,16 +283,7 @@ def query_all_accepted_learning_events(limit: int = 200) -> list[Dict[str, Any]]
 
     Returns list of learning events with policy_decision="ACCEPT", sorted by created_utc descending.
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_learning_event":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("policy_decision") == "ACCEPT":
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results[:limit]
+    return _find(["saw_batch_learning_event"], policy_decision="ACCEPT")[:limit]
 
 
 def query_executions_with_learning(batch_label: Optional[str] = None, only_applied: bool = False) -> list[Dict[str, Any]]:
@@ -381,16 +292,15 @@ def query_executions_with_learning(batch_label: Optional[str] = None, only_appli
 
     If only_applied=True, only returns executions where learning was actually applied.
     """
+    if batch_label:
+        candidates = _find(["saw_batch_execution"], batch_label=batch_label)
+    else:
+        candidates = _find(["saw_batch_execution"])
+
     results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution":
-            continue
+    for art in candidates:
         payload = art.get("payload", {})
 
-        # Filter by batch_label if specified
-        if batch_label and payload.get("batch_label") != batch_label:
-            continue
-
         # Check if learning was applied
         learning = payload.get("learning", {})
         tuning_stamp = learning.get("tuning_stamp", {}) if isinstance(learning, dict) else {}
@@ -401,7 +311,6 @@ def query_executions_with_learning(batch_label: Optional[str] = None, only_appli
 
         results.append(art)
 
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
     return results
 
 
@@ -411,16 +320,7 @@ def query_learning_events_by_execution(batch_execution_artifact_id: str) -> list
 
     Returns list of learning events sorted by created_utc descending.
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_learning_event":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("batch_execution_artifact_id") == batch_execution_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_learning_event"], batch_execution_artifact_id=batch_execution_artifact_id)
 
 
 def query_execution_rollups_by_decision(batch_decision_artifact_id: str) -> list[Dict[str, Any]]:
@@ -429,13 +329,4 @@ def query_execution_rollups_by_decision(batch_decision_artifact_id: str) -> list
 
     Returns list of rollup artifacts sorted by created_utc descending.
     """
-    results = []
-    for art in _batch_artifacts.values():
-        if art.get("kind") != "saw_batch_execution_metrics_rollup":
-            continue
-        payload = art.get("payload", {})
-        if payload.get("parent_batch_decision_artifact_id") == batch_decision_artifact_id:
-            results.append(art)
-
-    results.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
-    return results
+    return _find(["saw_batch_execution_metrics_rollup"], parent_batch_decision_artifact_id=batch_decision_artifact_id)
@@ -0,0 +1,230 @@
+"""
+Saw Lab Artifact Store Backends
+
+Indexed storage behind the ``app.saw_lab.store`` query functions.
+
+Every ``query_*`` reader is "artifacts of kind K whose payload field F equals V,
+newest first". Both backends keep secondary indexes on kind, parent_id,
+session_id, batch_label, policy_decision and the batch lineage ids, so a query
+costs O(result) instead of a scan of every artifact.
+
+Backends (selected by ``SAW_LAB_STORE_BACKEND``):
+    memory - process-local dict (default; lost on restart)
+    sqlite - SQLite file in WAL mode at ``SAW_LAB_STORE_DB``; durable and
+             shared by every uvicorn worker on the host
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STORE_BACKEND_ENV = "SAW_LAB_STORE_BACKEND"
+STORE_DB_ENV = "SAW_LAB_STORE_DB"
+STORE_DB_DEFAULT = "services/api/data/saw_lab_artifacts.sqlite3"
+
+# Index name -> extractor. Values mirror exactly what the query_* readers compare.
+INDEX_FIELDS = (
+    "parent_id",
+    "session_id",             # payload.session_id
+    "any_session_id",         # payload.session_id, else top-level session_id
+    "batch_label",            # payload.batch_label
+    "policy_decision",
+    "batch_spec_artifact_id",
+    "batch_plan_artifact_id",
+    "batch_decision_artifact_id",
+    "batch_execution_artifact_id",
+    "parent_batch_decision_artifact_id",
+)
+
+
+def index_values(art: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the secondary-index values for one artifact record."""
+    payload = art.get("payload") or {}
+    if not isinstance(payload, dict):
+        payload = {}
+    values = {f: payload.get(f) for f in INDEX_FIELDS}
+    values["parent_id"] = art.get("parent_id")
+    values["any_session_id"] = payload.get("session_id", "") or art.get("session_id", "")
+    return values
+
+
+def _sortable(results: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Order (seq, artifact) pairs newest first, insertion order on ties."""
+    results.sort(key=lambda t: t[0])
+    ordered = [a for _, a in results]
+    ordered.sort(key=lambda a: a.get("created_utc", ""), reverse=True)
+    return ordered
+
+
+class MemoryArtifactBackend:
+    """Process-local store with dict-based secondary indexes."""
+
+    name = "memory"
+
+    def __init__(self, artifacts: Dict[str, Dict[str, Any]]):
+        self.artifacts = artifacts
+        self._seq: Dict[str, int] = {}
+        self._by_kind: Dict[str, Dict[str, None]] = {}
+        self._by_field: Dict[Tuple[str, Hashable], Dict[str, None]] = {}
+        self._lock = threading.Lock()
+        for art in list(artifacts.values()):
+            self._index(art)
+
+    def _index(self, art: Dict[str, Any]) -> None:
+        aid = art["artifact_id"]
+        self._seq.setdefault(aid, len(self._seq))
+        self._by_kind.setdefault(art.get("kind"), {})[aid] = None
+        for field, value in index_values(art).items():
+            try:
+                self._by_field.setdefault((field, value), {})[aid] = None
+            except TypeError:
+                pass  # unhashable values can never equal a lookup id
+
+    def put(self, art: Dict[str, Any]) -> None:
+        with self._lock:
+            self.artifacts[art["artifact_id"]] = art
+            self._index(art)
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        return self.artifacts.get(artifact_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.artifacts.clear()
+            self._seq.clear()
+            self._by_kind.clear()
+            self._by_field.clear()
+
+    def find(self, kinds: Iterable[str], **eq: Any) -> List[Dict[str, Any]]:
+        with self._lock:
+            by_kind: Dict[str, None] = {}
+            for kind in kinds:
+                by_kind.update(self._by_kind.get(kind, {}))
+            sets = [by_kind] + [self._by_field.get((f, v), {}) for f, v in eq.items()]
+            sets.sort(key=len)
+            first, rest = sets[0], sets[1:]
+            hits = [aid for aid in first if all(aid in s for s in rest)]
+            results = []
+            for aid in hits:
+                art = self.artifacts.get(aid)
+                # Re-check against the record in case it was edited in place
+                if art is not None and all(index_values(art)[f] == v for f, v in eq.items()):
+                    results.append((self._seq[aid], art))
+        return _sortable(results)
+
+
+_SQLITE_DDL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS saw_lab_artifacts (
+  artifact_id TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  created_utc TEXT NOT NULL DEFAULT '',
+  {columns},
+  doc_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_saw_lab_kind ON saw_lab_artifacts(kind, created_utc);
+{indexes}
+""".format(
+    columns=",\n  ".join(f"{f} TEXT" for f in INDEX_FIELDS),
+    indexes="\n".join(
+        f"CREATE INDEX IF NOT EXISTS ix_saw_lab_{f} ON saw_lab_artifacts({f}, kind);"
+        for f in INDEX_FIELDS
+    ),
+)
+
+
+def _column_value(value: Any) -> Any:
+    """Store scalars as-is; anything else as JSON so it never equals a lookup id."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class SqliteArtifactBackend:
+    """Durable SQLite (WAL) store; one row per artifact, indexed lookup columns."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as con:
+            con.executescript(_SQLITE_DDL)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        con = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            con.execute("PRAGMA synchronous=NORMAL")
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def put(self, art: Dict[str, Any]) -> None:
+        values = index_values(art)
+        columns = ("artifact_id", "kind", "created_utc", *INDEX_FIELDS, "doc_json")
+        row = (
+            art["artifact_id"], art.get("kind"), art.get("created_utc", ""),
+            *(_column_value(values[f]) for f in INDEX_FIELDS),
+            json.dumps(art, default=str),
+        )
+        with self._connect() as con:
+            con.execute(
+                f"INSERT OR REPLACE INTO saw_lab_artifacts ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                row,
+            )
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT doc_json FROM saw_lab_artifacts WHERE artifact_id = ?", (artifact_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clear(self) -> None:
+        with self._connect() as con:
+            con.execute("DELETE FROM saw_lab_artifacts")
+
+    def find(self, kinds: Iterable[str], **eq: Any) -> List[Dict[str, Any]]:
+        kinds = list(kinds)
+        clauses = [f"kind IN ({', '.join('?' * len(kinds))})"]
+        params: List[Any] = list(kinds)
+        for field, value in eq.items():
+            if field not in INDEX_FIELDS:
+                raise ValueError(f"Unknown saw lab index field: {field}")
+            if value is None:
+                clauses.append(f"{field} IS NULL")
+            else:
+                clauses.append(f"{field} = ?")
+                params.append(_column_value(value))
+        with self._connect() as con:
+            rows = con.execute(
+                f"SELECT doc_json FROM saw_lab_artifacts WHERE {' AND '.join(clauses)} "
+                "ORDER BY created_utc DESC, rowid",
+                params,
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+
+def create_store_backend(artifacts: Dict[str, Dict[str, Any]], backend: Optional[str] = None):
+    """Create the backend named by *backend* or ``SAW_LAB_STORE_BACKEND``.
+
+    *artifacts* is the dict the memory backend stores into.
+    """
+    name = (backend or os.getenv(STORE_BACKEND_ENV) or "memory").strip().lower()
+    if name == "sqlite":
+        return SqliteArtifactBackend(os.getenv(STORE_DB_ENV, STORE_DB_DEFAULT))
+    if name != "memory":
+        logger.warning("Unknown %s=%r; falling back to memory", STORE_BACKEND_ENV, name)
+    return MemoryArtifactBackend(artifacts)
@@ -64,6 +64,10 @@ class ReliefSimIn(BaseModel):
     origin_y: float = 0.0
     cell_size_xy: float = 0.5
     units: Literal["mm", "inch"] = "mm"
+    tool_diameter: Optional[float] = Field(
+        None,
+        description="If set, each sample stamps the tool's disc footprint instead of a single cell.",
+    )
 
     # thresholds
     min_floor_thickness: float = Field(
@@ -1317,18 +1317,16 @@ def _generate_svg_preview(dxf_path: str, cleaner) -> str:
         SVG string or empty string on failure
     """
     try:
-        import ezdxf
+        from ..cam.dxf_fast_reader import read_dxf_geometry
         from ..cam.unified_dxf_cleaner import Chain, Point
 
-        doc = ezdxf.readfile(dxf_path)
-        msp = doc.modelspace()
+        geometry = read_dxf_geometry(dxf_path).merged()
 
         chains = []
-        for e in msp:
-            if e.dxftype() == "LWPOLYLINE":
-                points = [Point(x, y) for x, y in e.get_points("xy")]
-                if points:
-                    chains.append(Chain(points=points))
+        for vertices, _closed in geometry.polylines(types=("LWPOLYLINE",)):
+            points = [Point(x, y) for x, y in vertices.tolist()]
+            if points:
+                chains.append(Chain(points=points))
 
         if chains:
             return cleaner.generate_svg_preview(chains)
@@ -0,0 +1,318 @@
+"""
+Contour Duplicate Index
+=======================
+
+Bounding-box duplicate detection for contour scoring.
+
+Both duplicate tests (nested: same shape offset inward; parallel: same outline
+offset sideways) only look at bounding boxes and areas. Those are computed
+once per contour, dominant contours go into a uniform bbox grid, and a
+candidate only reaches the exact tests for grid neighbours that pass
+vectorized area-ratio, containment and IoU prefilters.
+
+Integration:
+    from app.services.contour_duplicates import _compute_duplicate_penalties
+
+    penalties = _compute_duplicate_penalties(contours, base_scores, width, height)
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+
+# ─── Bounding Box Helpers ───────────────────────────────────────────────────
+
+
+def _bbox_intersection(bbox1: tuple, bbox2: tuple) -> float:
+    """Compute intersection area of two bounding boxes."""
+    x1, y1, w1, h1 = bbox1
+    x2, y2, w2, h2 = bbox2
+
+    # Compute intersection rectangle
+    ix1 = max(x1, x2)
+    iy1 = max(y1, y2)
+    ix2 = min(x1 + w1, x2 + w2)
+    iy2 = min(y1 + h1, y2 + h2)
+
+    if ix2 <= ix1 or iy2 <= iy1:
+        return 0.0
+
+    return float((ix2 - ix1) * (iy2 - iy1))
+
+
+def _bbox_iou(bbox1: tuple, bbox2: tuple) -> float:
+    """Compute Intersection over Union of two bounding boxes."""
+    x1, y1, w1, h1 = bbox1
+    x2, y2, w2, h2 = bbox2
+
+    area1 = w1 * h1
+    area2 = w2 * h2
+
+    if area1 <= 0 or area2 <= 0:
+        return 0.0
+
+    intersection = _bbox_intersection(bbox1, bbox2)
+    union = area1 + area2 - intersection
+
+    if union <= 0:
+        return 0.0
+
+    return float(intersection / union)
+
+
+def _bbox_containment(inner_bbox: tuple, outer_bbox: tuple) -> float:
+    """
+    Compute how much of inner_bbox is contained within outer_bbox.
+
+    Returns intersection / inner_area (0.0 to 1.0).
+    """
+    _, _, w, h = inner_bbox
+    inner_area = w * h
+
+    if inner_area <= 0:
+        return 0.0
+
+    intersection = _bbox_intersection(inner_bbox, outer_bbox)
+    return float(intersection / inner_area)
+
+
+def _bbox_center(bbox: tuple) -> tuple:
+    """Get center point of bounding box."""
+    x, y, w, h = bbox
+    return (x + w / 2, y + h / 2)
+
+
+def _bbox_aspect_ratio(bbox: tuple) -> float:
+    """Get aspect ratio of bounding box (always >= 1.0)."""
+    _, _, w, h = bbox
+    if h <= 0 or w <= 0:
+        return 999.0
+    return float(max(w / h, h / w))
+
+
+
+# ─── Duplicate Tests ────────────────────────────────────────────────────────
+
+
+def _is_nested_duplicate_features(
+    inner_bbox: tuple,
+    inner_area: float,
+    outer_bbox: tuple,
+    outer_area: float,
+) -> bool:
+    """_is_nested_duplicate on precomputed bounding boxes and areas."""
+    if outer_area <= 0 or inner_area <= 0:
+        return False
+
+    # Check containment (inner must be mostly inside outer)
+    containment = _bbox_containment(inner_bbox, outer_bbox)
+    if containment < 0.90:
+        return False
+
+    # Check aspect ratio similarity
+    inner_aspect = _bbox_aspect_ratio(inner_bbox)
+    outer_aspect = _bbox_aspect_ratio(outer_bbox)
+    aspect_diff = abs(inner_aspect - outer_aspect) / max(outer_aspect, 0.01)
+    if aspect_diff > 0.15:
+        return False
+
+    # Check area ratio (inner should be 70-98% of outer)
+    area_ratio = inner_area / outer_area
+    if not (0.70 <= area_ratio <= 0.98):
+        return False
+
+    return True
+
+
+
+def _is_parallel_duplicate_features(
+    bbox1: tuple,
+    area1: float,
+    bbox2: tuple,
+    area2: float,
+    image_width: int,
+    image_height: int,
+) -> bool:
+    """_is_parallel_duplicate on precomputed bounding boxes and areas."""
+    if area1 <= 0 or area2 <= 0:
+        return False
+
+    # Check bbox IoU
+    iou = _bbox_iou(bbox1, bbox2)
+    if iou < 0.80:
+        return False
+
+    # Check center distance
+    c1 = _bbox_center(bbox1)
+    c2 = _bbox_center(bbox2)
+    max_dim = max(image_width, image_height)
+    center_dist = ((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2) ** 0.5
+    normalized_dist = center_dist / max(max_dim, 1)
+    if normalized_dist > 0.03:
+        return False
+
+    # Check aspect ratio similarity
+    aspect1 = _bbox_aspect_ratio(bbox1)
+    aspect2 = _bbox_aspect_ratio(bbox2)
+    aspect_diff = abs(aspect1 - aspect2) / max(aspect1, aspect2, 0.01)
+    if aspect_diff > 0.10:
+        return False
+
+    # Check area ratio
+    area_ratio = min(area1, area2) / max(area1, area2)
+    if area_ratio < 0.80:
+        return False
+
+    return True
+
+
+
+# ─── Grid Index ─────────────────────────────────────────────────────────────
+
+
+class _BBoxGrid:
+    """
+    Uniform-grid index over bounding boxes (x, y, w, h).
+
+    ``query`` returns every key whose bbox shares a grid cell with the query
+    bbox — a superset of the boxes that actually intersect it.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = max(float(cell), 1.0)
+        self._cells: dict = {}
+
+    def _span(self, bbox: tuple):
+        x, y, w, h = bbox
+        c = self.cell
+        return (
+            range(int(x // c), int((x + w) // c) + 1),
+            range(int(y // c), int((y + h) // c) + 1),
+        )
+
+    def insert(self, key: int, bbox: tuple) -> None:
+        xs, ys = self._span(bbox)
+        for gx in xs:
+            for gy in ys:
+                self._cells.setdefault((gx, gy), []).append(key)
+
+    def query(self, bbox: tuple) -> set:
+        xs, ys = self._span(bbox)
+        found: set = set()
+        for gx in xs:
+            for gy in ys:
+                found.update(self._cells.get((gx, gy), ()))
+        return found
+
+
+
+# Area-ratio window (current / higher) that either duplicate test can accept:
+# nested needs 0.70-0.98, parallel needs min/max >= 0.80 (i.e. up to 1.25).
+_DUP_AREA_RATIO_MIN = 0.70
+_DUP_AREA_RATIO_MAX = 1.0 / 0.80
+
+
+def _compute_duplicate_penalties(
+    contours: List[np.ndarray],
+    base_scores: List[float],
+    image_width: int,
+    image_height: int,
+) -> List[float]:
+    """
+    Compute duplicate penalties for each contour.
+
+    When contour A is a duplicate (nested or parallel) of higher-scoring contour B,
+    A gets penalized. This prevents near-identical binding lines from competing
+    with the actual body outline.
+
+    Both duplicate tests depend only on bounding box and area, so those are
+    computed once per contour. Higher-scoring dominant contours are kept in a
+    uniform bbox grid; only grid neighbours that pass vectorized area-ratio,
+    containment and IoU prefilters reach the exact tests, in the same
+    highest-score-first order as a full pairwise scan.
+
+    Returns:
+        List of penalty multipliers (0.0-1.0), where 1.0 means no penalty
+    """
+    n = len(contours)
+    penalties = [1.0] * n
+    if n == 0:
+        return penalties
+
+    # Sort indices by score descending to process higher-scoring first
+    sorted_indices = sorted(range(n), key=lambda i: base_scores[i], reverse=True)
+    rank = {idx: i for i, idx in enumerate(sorted_indices)}
+
+    bboxes: List[Optional[tuple]] = [None] * n
+    areas = np.zeros(n, dtype=np.float64)
+    for idx, contour in enumerate(contours):
+        if contour is None or len(contour) < 3:
+            continue
+        bboxes[idx] = cv2.boundingRect(contour)
+        areas[idx] = float(cv2.contourArea(contour))
+    boxes = np.array([b if b is not None else (0, 0, 0, 0) for b in bboxes], dtype=np.float64)
+
+    # Cell size: median bbox extent of usable contours keeps lists short for
+    # the many small candidates while big outlines span only a few hundred cells.
+    usable = areas > 0
+    if usable.any():
+        extents = np.maximum(boxes[usable, 2], boxes[usable, 3])
+        cell = max(float(np.median(extents)), max(image_width, image_height) / 64.0)
+    else:
+        cell = 1.0
+    grid = _BBoxGrid(cell)
+
+    for idx in sorted_indices:
+        bbox = bboxes[idx]
+        if bbox is None:
+            continue
+
+        # Higher-scoring dominant contours sharing a grid cell, in score order
+        near = sorted(grid.query(bbox), key=rank.__getitem__)
+        if near and areas[idx] > 0:
+            cand = np.array(near, dtype=np.int64)
+            x, y, w, h = bbox
+            hb = boxes[cand]
+            iw = np.minimum(x + w, hb[:, 0] + hb[:, 2]) - np.maximum(x, hb[:, 0])
+            ih = np.minimum(y + h, hb[:, 1] + hb[:, 3]) - np.maximum(y, hb[:, 1])
+            inter = np.where((iw > 0) & (ih > 0), iw * ih, 0.0)
+            own = float(w * h)
+            union = own + hb[:, 2] * hb[:, 3] - inter
+            ratio = areas[idx] / areas[cand]
+            # Thresholds are loosened by a relative 1e-9 so float rounding can
+            # only admit extra pairs, never drop one the exact tests accept.
+            slack = 1.0 - 1e-9
+            plausible = (
+                (inter > 0)
+                & (ratio >= _DUP_AREA_RATIO_MIN * slack)
+                & (ratio * slack <= _DUP_AREA_RATIO_MAX)
+                & ((inter >= 0.90 * own * slack) | (inter >= 0.80 * union * slack))
+            )
+            for higher_idx in cand[plausible].tolist():
+                # Check if current is a nested duplicate of higher
+                if _is_nested_duplicate_features(
+                    bbox, areas[idx], bboxes[higher_idx], areas[higher_idx]
+                ):
+                    # Nested duplicate: moderate penalty
+                    penalties[idx] *= 0.6
+                    break
+
+                # Check if current is a parallel duplicate of higher
+                if _is_parallel_duplicate_features(
+                    bbox, areas[idx], bboxes[higher_idx], areas[higher_idx],
+                    image_width, image_height,
+                ):
+                    # Parallel duplicate: strong penalty (nearly same shape)
+                    penalties[idx] *= 0.5
+                    break
+
+        # Only contours that stay dominant are compared against later ones
+        if penalties[idx] == 1.0 and areas[idx] > 0:
+            grid.insert(idx, bbox)
+
+    return penalties
+
@@ -29,6 +29,13 @@ from typing import Any, Callable, Iterable, List, Optional
 import cv2
 import numpy as np
 
+from app.services.contour_duplicates import (
+    _bbox_aspect_ratio,
+    _compute_duplicate_penalties,
+    _is_nested_duplicate_features,
+    _is_parallel_duplicate_features,
+)
+
 # Type alias for ownership scoring callback
 # Takes a contour (numpy array) and returns score 0.0-1.0
 OwnershipFn = Optional[Callable[[np.ndarray], float]]
@@ -86,76 +93,6 @@ class ContourSelectionResult:
         }
 
 
-# ─── Bounding Box Helpers ───────────────────────────────────────────────────
-
-
-def _bbox_intersection(bbox1: tuple, bbox2: tuple) -> float:
-    """Compute intersection area of two bounding boxes."""
-    x1, y1, w1, h1 = bbox1
-    x2, y2, w2, h2 = bbox2
-
-    # Compute intersection rectangle
-    ix1 = max(x1, x2)
-    iy1 = max(y1, y2)
-    ix2 = min(x1 + w1, x2 + w2)
-    iy2 = min(y1 + h1, y2 + h2)
-
-    if ix2 <= ix1 or iy2 <= iy1:
-        return 0.0
-
-    return float((ix2 - ix1) * (iy2 - iy1))
-
-
-def _bbox_iou(bbox1: tuple, bbox2: tuple) -> float:
-    """Compute Intersection over Union of two bounding boxes."""
-    x1, y1, w1, h1 = bbox1
-    x2, y2, w2, h2 = bbox2
-
-    area1 = w1 * h1
-    area2 = w2 * h2
-
-    if area1 <= 0 or area2 <= 0:
-        return 0.0
-
-    intersection = _bbox_intersection(bbox1, bbox2)
-    union = area1 + area2 - intersection
-
-    if union <= 0:
-        return 0.0
-
-    return float(intersection / union)
-
-
-def _bbox_containment(inner_bbox: tuple, outer_bbox: tuple) -> float:
-    """
-    Compute how much of inner_bbox is contained within outer_bbox.
-
-    Returns intersection / inner_area (0.0 to 1.0).
-    """
-    _, _, w, h = inner_bbox
-    inner_area = w * h
-
-    if inner_area <= 0:
-        return 0.0
-
-    intersection = _bbox_intersection(inner_bbox, outer_bbox)
-    return float(intersection / inner_area)
-
-
-def _bbox_center(bbox: tuple) -> tuple:
-    """Get center point of bounding box."""
-    x, y, w, h = bbox
-    return (x + w / 2, y + h / 2)
-
-
-def _bbox_aspect_ratio(bbox: tuple) -> float:
-    """Get aspect ratio of bounding box (always >= 1.0)."""
-    _, _, w, h = bbox
-    if h <= 0 or w <= 0:
-        return 999.0
-    return float(max(w / h, h / w))
-
-
 # ─── Duplicate Detection ────────────────────────────────────────────────────
 
 
@@ -181,33 +118,12 @@ def _is_nested_duplicate(
     if len(inner_contour) < 3 or len(outer_contour) < 3:
         return False
 
-    inner_bbox = cv2.boundingRect(inner_contour)
-    outer_bbox = cv2.boundingRect(outer_contour)
-
-    inner_area = float(cv2.contourArea(inner_contour))
-    outer_area = float(cv2.contourArea(outer_contour))
-
-    if outer_area <= 0 or inner_area <= 0:
-        return False
-
-    # Check containment (inner must be mostly inside outer)
-    containment = _bbox_containment(inner_bbox, outer_bbox)
-    if containment < 0.90:
-        return False
-
-    # Check aspect ratio similarity
-    inner_aspect = _bbox_aspect_ratio(inner_bbox)
-    outer_aspect = _bbox_aspect_ratio(outer_bbox)
-    aspect_diff = abs(inner_aspect - outer_aspect) / max(outer_aspect, 0.01)
-    if aspect_diff > 0.15:
-        return False
-
-    # Check area ratio (inner should be 70-98% of outer)
-    area_ratio = inner_area / outer_area
-    if not (0.70 <= area_ratio <= 0.98):
-        return False
-
-    return True
+    return _is_nested_duplicate_features(
+        cv2.boundingRect(inner_contour),
+        float(cv2.contourArea(inner_contour)),
+        cv2.boundingRect(outer_contour),
+        float(cv2.contourArea(outer_contour)),
+    )
 
 
 def _is_parallel_duplicate(
@@ -233,42 +149,14 @@ def _is_parallel_duplicate(
     if len(contour1) < 3 or len(contour2) < 3:
         return False
 
-    bbox1 = cv2.boundingRect(contour1)
-    bbox2 = cv2.boundingRect(contour2)
-
-    area1 = float(cv2.contourArea(contour1))
-    area2 = float(cv2.contourArea(contour2))
-
-    if area1 <= 0 or area2 <= 0:
-        return False
-
-    # Check bbox IoU
-    iou = _bbox_iou(bbox1, bbox2)
-    if iou < 0.80:
-        return False
-
-    # Check center distance
-    c1 = _bbox_center(bbox1)
-    c2 = _bbox_center(bbox2)
-    max_dim = max(image_width, image_height)
-    center_dist = ((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2) ** 0.5
-    normalized_dist = center_dist / max(max_dim, 1)
-    if normalized_dist > 0.03:
-        return False
-
-    # Check aspect ratio similarity
-    aspect1 = _bbox_aspect_ratio(bbox1)
-    aspect2 = _bbox_aspect_ratio(bbox2)
-    aspect_diff = abs(aspect1 - aspect2) / max(aspect1, aspect2, 0.01)
-    if aspect_diff > 0.10:
-        return False
-
-    # Check area ratio
-    area_ratio = min(area1, area2) / max(area1, area2)
-    if area_ratio < 0.80:
-        return False
-
-    return True
+    return _is_parallel_duplicate_features(
+        cv2.boundingRect(contour1),
+        float(cv2.contourArea(contour1)),
+        cv2.boundingRect(contour2),
+        float(cv2.contourArea(contour2)),
+        image_width,
+        image_height,
+    )
 
 
 # ─── Thin Strip Detection ───────────────────────────────────────────────────
@@ -524,62 +412,6 @@ def _continuity_score(vertex_count: int, perimeter: float) -> float:
 # ─── In-Group Refinement ────────────────────────────────────────────────────
 
 
-def _compute_duplicate_penalties(
-    contours: List[np.ndarray],
-    base_scores: List[float],
-    image_width: int,
-    image_height: int,
-) -> List[float]:
-    """
-    Compute duplicate penalties for each contour.
-
-    When contour A is a duplicate (nested or parallel) of higher-scoring contour B,
-    A gets penalized. This prevents near-identical binding lines from competing
-    with the actual body outline.
-
-    Returns:
-        List of penalty multipliers (0.0-1.0), where 1.0 means no penalty
-    """
-    n = len(contours)
-    penalties = [1.0] * n
-
-    # Sort indices by score descending to process higher-scoring first
-    sorted_indices = sorted(range(n), key=lambda i: base_scores[i], reverse=True)
-
-    # Track which contours are "dominant" (not yet penalized as duplicates)
-    dominant = set(sorted_indices)
-
-    for i, idx in enumerate(sorted_indices):
-        contour = contours[idx]
-        if contour is None or len(contour) < 3:
-            continue
-
-        # Compare against all higher-scoring contours
-        for higher_idx in sorted_indices[:i]:
-            if higher_idx not in dominant:
-                continue
-
-            higher_contour = contours[higher_idx]
-            if higher_contour is None or len(higher_contour) < 3:
-                continue
-
-            # Check if current is a nested duplicate of higher
-            if _is_nested_duplicate(contour, higher_contour, image_width, image_height):
-                # Nested duplicate: moderate penalty
-                penalties[idx] *= 0.6
-                dominant.discard(idx)
-                break
-
-            # Check if current is a parallel duplicate of higher
-            if _is_parallel_duplicate(contour, higher_contour, image_width, image_height):
-                # Parallel duplicate: strong penalty (nearly same shape)
-                penalties[idx] *= 0.5
-                dominant.discard(idx)
-                break
-
-    return penalties
-
-
 def _compute_thin_strip_penalties(
     contours: List[np.ndarray],
     image_width: int,
@@ -27,6 +27,13 @@ from typing import Any, Dict, List, Optional, Tuple
 import cv2
 import numpy as np
 
+from app.services.layer_gap_matching import (
+    _endpoint_features,
+    _endpoint_pairs_within,
+    _greedy_endpoint_pairs,
+    _optimal_endpoint_pairs,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -580,92 +587,6 @@ class GapJoinResult:
     )  # For debug overlay: list of (start_pt, end_pt) in pixels
 
 
-def _get_endpoint_tangent(
-    contour: np.ndarray,
-    endpoint_idx: int,
-    num_samples: int = 3,
-) -> np.ndarray:
-    """
-    Get tangent direction at a contour endpoint.
-
-    Args:
-        contour: Contour points array
-        endpoint_idx: 0 for start, -1 for end
-        num_samples: Number of points to use for tangent estimation
-
-    Returns:
-        Normalized tangent vector pointing outward from contour
-    """
-    points = contour.reshape(-1, 2)
-    n = len(points)
-
-    if n < 2:
-        return np.array([1.0, 0.0])
-
-    if endpoint_idx == 0:
-        # Start endpoint - tangent points backward (outward)
-        end_idx = min(num_samples, n)
-        segment = points[:end_idx]
-        if len(segment) >= 2:
-            tangent = segment[0] - segment[-1]
-        else:
-            tangent = np.array([1.0, 0.0])
-    else:
-        # End endpoint - tangent points forward (outward)
-        start_idx = max(0, n - num_samples)
-        segment = points[start_idx:]
-        if len(segment) >= 2:
-            tangent = segment[-1] - segment[0]
-        else:
-            tangent = np.array([1.0, 0.0])
-
-    norm = np.linalg.norm(tangent)
-    if norm > 0:
-        tangent = tangent / norm
-
-    return tangent
-
-
-def _get_local_median_segment_length(
-    contour: np.ndarray,
-    endpoint_idx: int,
-    num_segments: int = 5,
-) -> float:
-    """
-    Get median segment length near a contour endpoint.
-
-    Used to reject joins where gap is disproportionate to local scale.
-    """
-    points = contour.reshape(-1, 2)
-    n = len(points)
-
-    if n < 2:
-        return float('inf')
-
-    if endpoint_idx == 0:
-        # Near start
-        end_idx = min(num_segments + 1, n)
-        segment_points = points[:end_idx]
-    else:
-        # Near end
-        start_idx = max(0, n - num_segments - 1)
-        segment_points = points[start_idx:]
-
-    if len(segment_points) < 2:
-        return float('inf')
-
-    # Calculate segment lengths
-    lengths = []
-    for i in range(len(segment_points) - 1):
-        length = np.linalg.norm(segment_points[i + 1] - segment_points[i])
-        lengths.append(length)
-
-    if not lengths:
-        return float('inf')
-
-    return float(np.median(lengths))
-
-
 def _is_contour_open(contour: np.ndarray, threshold_px: float = 5.0) -> bool:
     """
     Check if contour is open (endpoints not connected).
@@ -693,6 +614,7 @@ def join_body_gaps(
     max_gap_mm: float = 4.0,
     max_angle_deg: float = 25.0,
     scale_factor_limit: float = 4.0,
+    matching: str = "greedy",
 ) -> Tuple[LayeredEntities, GapJoinResult]:
     """
     Conservative gap joining for BODY layer only.
@@ -707,10 +629,21 @@ def join_body_gaps(
         max_gap_mm: Maximum gap distance in mm (default 2.0)
         max_angle_deg: Maximum tangent angle difference in degrees (default 25.0)
         scale_factor_limit: Reject if gap > this * local median segment (default 4.0)
+        matching: "greedy" (default) lets each endpoint, in contour order, take
+            its nearest valid partner. "optimal" picks the matching with the
+            most joins and, among those, the smallest total gap (needs networkx;
+            falls back to greedy without it).
+
+    Endpoints are bucketed in a uniform grid with cells of max_gap_mm, so
+    candidate pairs come from each endpoint's 3x3 cell neighbourhood and the
+    tangent and scale tests run vectorized over all of them at once.
 
     Returns:
         (updated_entities, gap_join_result)
     """
+    if matching not in ("greedy", "optimal"):
+        raise ValueError(f"matching must be 'greedy' or 'optimal', got {matching!r}")
+
     result = GapJoinResult(
         max_gap_mm=max_gap_mm,
         max_angle_deg=max_angle_deg,
@@ -744,81 +677,46 @@ def join_body_gaps(
         # Nothing to join
         return entities, result
 
-    # Build endpoint list: (entity_idx, endpoint_idx, point, tangent, median_seg_len)
-    endpoints = []
-    for i, entity in enumerate(open_entities):
-        points = entity.contour.reshape(-1, 2)
-
-        # Start endpoint
-        start_pt = points[0].astype(float)
-        start_tangent = _get_endpoint_tangent(entity.contour, 0)
-        start_median = _get_local_median_segment_length(entity.contour, 0)
-        endpoints.append((i, 0, start_pt, start_tangent, start_median))
-
-        # End endpoint
-        end_pt = points[-1].astype(float)
-        end_tangent = _get_endpoint_tangent(entity.contour, -1)
-        end_median = _get_local_median_segment_length(entity.contour, -1)
-        endpoints.append((i, -1, end_pt, end_tangent, end_median))
-
-    # Track which endpoints have been used
-    used_endpoints = set()  # (entity_idx, endpoint_idx)
+    # Endpoint arrays: row 2*i is the start of open_entities[i], 2*i+1 its end
+    ep_pts, ep_tans, ep_meds = _endpoint_features([e.contour for e in open_entities])
+    ep_ent = np.repeat(np.arange(len(open_entities)), 2)
+    ep_side = np.tile([0, -1], len(open_entities))
+
+    # Candidate pairs within max_gap_px; same contour would close it, not join
+    pair_i, pair_j, dist = _endpoint_pairs_within(ep_pts, max_gap_px)
+    other = ep_ent[pair_i] != ep_ent[pair_j]
+    pair_i, pair_j, dist = pair_i[other], pair_j[other], dist[other]
+
+    # Check tangent alignment
+    # Tangents should point toward each other (roughly opposite)
+    # So dot product of (tan_i) and (-tan_j) should be positive and close to 1
+    alignment = (ep_tans[pair_i] * -ep_tans[pair_j]).sum(axis=1)
+    angle = np.arccos(np.clip(alignment, -1.0, 1.0))
+
+    # Check scale factor limit
+    gap_mm = dist * mm_per_px
+    local_median_mm = np.minimum(ep_meds[pair_i], ep_meds[pair_j]) * mm_per_px
+    too_far = (local_median_mm > 0) & (gap_mm > scale_factor_limit * local_median_mm)
+
+    valid = (angle <= max_angle_rad) & ~too_far
+
+    # Endpoint index pairs (i, j) to join
+    pairs = None
+    if matching == "optimal":
+        pairs = _optimal_endpoint_pairs(pair_i, pair_j, dist, valid, max_gap_px)
+        result.joins_attempted = int(np.count_nonzero(pair_i < pair_j))
+    if pairs is None:
+        pairs, result.joins_attempted = _greedy_endpoint_pairs(
+            len(ep_pts), pair_i, pair_j, dist, valid
+        )
 
     # Track joins to apply: list of (entity_i, endpoint_i, entity_j, endpoint_j)
     joins_to_apply = []
+    for i, j in pairs:
+        joins_to_apply.append((int(ep_ent[i]), int(ep_side[i]), int(ep_ent[j]), int(ep_side[j])))
 
-    # Find valid join candidates
-    for i, (ent_i, ep_i, pt_i, tan_i, med_i) in enumerate(endpoints):
-        if (ent_i, ep_i) in used_endpoints:
-            continue
-
-        best_match = None
-        best_dist = float('inf')
-
-        for j, (ent_j, ep_j, pt_j, tan_j, med_j) in enumerate(endpoints):
-            if i == j:
-                continue
-            if ent_i == ent_j:
-                # Same contour - would close it, not join to another
-                continue
-            if (ent_j, ep_j) in used_endpoints:
-                continue
-
-            # Check distance
-            dist = np.linalg.norm(pt_j - pt_i)
-            if dist > max_gap_px:
-                continue
-
-            result.joins_attempted += 1
-
-            # Check tangent alignment
-            # Tangents should point toward each other (roughly opposite)
-            # So dot product of (tan_i) and (-tan_j) should be positive and close to 1
-            alignment = np.dot(tan_i, -tan_j)
-            angle = np.arccos(np.clip(alignment, -1.0, 1.0))
-
-            if angle > max_angle_rad:
-                continue
-
-            # Check scale factor limit
-            gap_mm = dist * mm_per_px
-            local_median_mm = min(med_i, med_j) * mm_per_px
-            if local_median_mm > 0 and gap_mm > scale_factor_limit * local_median_mm:
-                continue
-
-            # Valid candidate
-            if dist < best_dist:
-                best_dist = dist
-                best_match = (ent_j, ep_j, pt_j)
-
-        if best_match is not None:
-            ent_j, ep_j, pt_j = best_match
-            joins_to_apply.append((ent_i, ep_i, ent_j, ep_j))
-            used_endpoints.add((ent_i, ep_i))
-            used_endpoints.add((ent_j, ep_j))
-
-            # Record for debug overlay
-            result.joined_segments.append((tuple(pt_i), tuple(pt_j)))
+        # Record for debug overlay
+        result.joined_segments.append((tuple(ep_pts[i]), tuple(ep_pts[j])))
 
     logger.info(f"Gap join: {len(joins_to_apply)} joins to apply")
 
@@ -0,0 +1,288 @@
+"""
+Gap Join Endpoint Matching
+==========================
+
+Endpoint geometry and pairing for layer_builder.join_body_gaps().
+
+- Endpoint features: position, outward tangent and local median segment
+  length of every open BODY contour endpoint, vectorized for long contours
+- Candidate pairs: uniform grid hash with cells of at least the gap radius,
+  so only each endpoint's 3x3 cell neighbourhood is examined
+- Matching: greedy nearest-partner (default) or maximum-cardinality,
+  minimum-total-gap matching via networkx (optional dependency)
+
+Author: Production Shop
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _get_endpoint_tangent(
+    contour: np.ndarray,
+    endpoint_idx: int,
+    num_samples: int = 3,
+) -> np.ndarray:
+    """
+    Get tangent direction at a contour endpoint.
+
+    Args:
+        contour: Contour points array
+        endpoint_idx: 0 for start, -1 for end
+        num_samples: Number of points to use for tangent estimation
+
+    Returns:
+        Normalized tangent vector pointing outward from contour
+    """
+    points = contour.reshape(-1, 2)
+    n = len(points)
+
+    if n < 2:
+        return np.array([1.0, 0.0])
+
+    if endpoint_idx == 0:
+        # Start endpoint - tangent points backward (outward)
+        end_idx = min(num_samples, n)
+        segment = points[:end_idx]
+        if len(segment) >= 2:
+            tangent = segment[0] - segment[-1]
+        else:
+            tangent = np.array([1.0, 0.0])
+    else:
+        # End endpoint - tangent points forward (outward)
+        start_idx = max(0, n - num_samples)
+        segment = points[start_idx:]
+        if len(segment) >= 2:
+            tangent = segment[-1] - segment[0]
+        else:
+            tangent = np.array([1.0, 0.0])
+
+    norm = np.linalg.norm(tangent)
+    if norm > 0:
+        tangent = tangent / norm
+
+    return tangent
+
+
+def _get_local_median_segment_length(
+    contour: np.ndarray,
+    endpoint_idx: int,
+    num_segments: int = 5,
+) -> float:
+    """
+    Get median segment length near a contour endpoint.
+
+    Used to reject joins where gap is disproportionate to local scale.
+    """
+    points = contour.reshape(-1, 2)
+    n = len(points)
+
+    if n < 2:
+        return float('inf')
+
+    if endpoint_idx == 0:
+        # Near start
+        end_idx = min(num_segments + 1, n)
+        segment_points = points[:end_idx]
+    else:
+        # Near end
+        start_idx = max(0, n - num_segments - 1)
+        segment_points = points[start_idx:]
+
+    if len(segment_points) < 2:
+        return float('inf')
+
+    # Calculate segment lengths
+    lengths = np.linalg.norm(np.diff(segment_points, axis=0), axis=1)
+
+    return float(np.median(lengths))
+
+
+def _endpoint_features(
+    contours: List[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Position, outward tangent and local median segment length of every
+    contour endpoint. Row 2*i is the start of contours[i], row 2*i+1 its end.
+
+    Contours with at least 6 points (full tangent and median windows) are
+    handled in one vectorized pass; shorter ones use the scalar helpers.
+    """
+    n_ep = 2 * len(contours)
+    pts = np.empty((n_ep, 2), dtype=np.float64)
+    tans = np.empty((n_ep, 2), dtype=np.float64)
+    meds = np.empty(n_ep, dtype=np.float64)
+
+    long_idx: List[int] = []
+    heads: List[np.ndarray] = []
+    tails: List[np.ndarray] = []
+    for i, contour in enumerate(contours):
+        points = contour.reshape(-1, 2)
+        if len(points) >= 6:
+            long_idx.append(i)
+            heads.append(points[:6])
+            tails.append(points[-6:])
+            continue
+        for k, side in enumerate((0, -1)):
+            pts[2 * i + k] = points[side]
+            tans[2 * i + k] = _get_endpoint_tangent(contour, side)
+            meds[2 * i + k] = _get_local_median_segment_length(contour, side)
+
+    if long_idx:
+        rows = 2 * np.asarray(long_idx)
+        head = np.stack(heads).astype(np.float64)
+        tail = np.stack(tails).astype(np.float64)
+
+        pts[rows] = head[:, 0]
+        pts[rows + 1] = tail[:, -1]
+
+        # Same 3-sample windows as _get_endpoint_tangent, pointing outward
+        for r, tangent in ((rows, head[:, 0] - head[:, 2]), (rows + 1, tail[:, -1] - tail[:, -3])):
+            norm = np.linalg.norm(tangent, axis=1)
+            nz = norm > 0
+            tangent[nz] /= norm[nz, None]
+            tans[r] = tangent
+
+        # Same 5-segment windows as _get_local_median_segment_length
+        meds[rows] = np.median(np.linalg.norm(np.diff(head, axis=1), axis=2), axis=1)
+        meds[rows + 1] = np.median(np.linalg.norm(np.diff(tail, axis=1), axis=2), axis=1)
+
+    return pts, tans, meds
+
+
+def _endpoint_pairs_within(
+    points: np.ndarray,
+    radius: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    All ordered pairs (i, j), i != j, with |points[j] - points[i]| <= radius.
+
+    Points are bucketed in a uniform grid hash with cells of at least
+    radius, so only the 3x3 cell neighbourhood of each point is examined.
+
+    Returns:
+        (i, j, dist) arrays sorted by i, then j
+    """
+    n = len(points)
+    cell = max(float(radius), 1.0)
+    keys = np.floor(points / cell).astype(np.int64)
+
+    # Single integer code per cell; the margin keeps y-neighbours in range
+    gy0 = keys[:, 1].min() - 1
+    width = keys[:, 1].max() - gy0 + 2
+    code = keys[:, 0] * width + (keys[:, 1] - gy0)
+    order = np.argsort(code, kind="stable")
+    sorted_code = code[order]
+
+    ii: List[np.ndarray] = []
+    jj: List[np.ndarray] = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            target = code + dx * width + dy
+            lo = np.searchsorted(sorted_code, target, side="left")
+            hi = np.searchsorted(sorted_code, target, side="right")
+            count = hi - lo
+            total = int(count.sum())
+            if total == 0:
+                continue
+            offsets = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+            ii.append(np.repeat(np.arange(n), count))
+            jj.append(order[np.repeat(lo, count) + offsets])
+
+    if not ii:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float64)
+
+    i_all = np.concatenate(ii)
+    j_all = np.concatenate(jj)
+    keep = i_all != j_all
+    i_all, j_all = i_all[keep], j_all[keep]
+
+    dist = np.linalg.norm(points[j_all] - points[i_all], axis=1)
+    keep = dist <= radius
+    i_all, j_all, dist = i_all[keep], j_all[keep], dist[keep]
+
+    order = np.lexsort((j_all, i_all))
+    return i_all[order], j_all[order], dist[order]
+
+
+def _greedy_endpoint_pairs(
+    n_endpoints: int,
+    pair_i: np.ndarray,
+    pair_j: np.ndarray,
+    dist: np.ndarray,
+    valid: np.ndarray,
+) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Each unused endpoint, in index order, takes its nearest valid unused
+    partner (lowest index on ties).
+
+    Returns:
+        (endpoint index pairs, number of in-range pairs examined)
+    """
+    indptr = np.searchsorted(pair_i, np.arange(n_endpoints + 1)).tolist()
+    pj, d, ok = pair_j.tolist(), dist.tolist(), valid.tolist()
+
+    used = [False] * n_endpoints
+    pairs: List[Tuple[int, int]] = []
+    attempted = 0
+
+    for i in range(n_endpoints):
+        if used[i]:
+            continue
+
+        best, best_dist = -1, float('inf')
+        for k in range(indptr[i], indptr[i + 1]):
+            j = pj[k]
+            if used[j]:
+                continue
+            attempted += 1
+            if ok[k] and d[k] < best_dist:
+                best, best_dist = j, d[k]
+
+        if best >= 0:
+            pairs.append((i, best))
+            used[i] = used[best] = True
+
+    return pairs, attempted
+
+
+def _optimal_endpoint_pairs(
+    pair_i: np.ndarray,
+    pair_j: np.ndarray,
+    dist: np.ndarray,
+    valid: np.ndarray,
+    max_gap_px: float,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Maximum-cardinality, minimum-total-gap matching over valid endpoint pairs.
+
+    Solved per connected component of the candidate graph, which is small
+    for real drawings. Returns None if networkx is not installed.
+    """
+    try:
+        import networkx as nx
+    except ImportError:
+        logger.warning("Gap join: networkx not installed, using greedy matching")
+        return None
+
+    graph = nx.Graph()
+    edges = valid & (pair_i < pair_j)
+    for i, j, d in zip(pair_i[edges].tolist(), pair_j[edges].tolist(), dist[edges].tolist()):
+        # Weight > 0 for every edge; maxcardinality keeps the join
+        # count maximal, then the weight minimises total gap
+        graph.add_edge(i, j, weight=2.0 * max_gap_px + 1.0 - d)
+
+    pairs: List[Tuple[int, int]] = []
+    for component in nx.connected_components(graph):
+        sub = graph.subgraph(component)
+        for a, b in nx.max_weight_matching(sub, maxcardinality=True):
+            pairs.append((min(a, b), max(a, b)))
+    pairs.sort()
+    return pairs
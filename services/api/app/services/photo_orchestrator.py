@@ -38,6 +38,7 @@ from .contour_recommendation import (
     SelectionResult,
     recommend,
 )
+from .vectorize_cache import get_vectorize_cache
 
 logger = logging.getLogger(__name__)
 
@@ -223,7 +224,8 @@ class PhotoOrchestrator:
                 # ─── Stage: Vectorization ─────────────────────────────────
                 logger.info(f"PHOTO_ORCHESTRATE | file={filename} size={len(image_bytes)} bytes")
 
-                vectorizer = PhotoVectorizerV2()
+                # Stage cache: parameter-only reruns skip background removal
+                vectorizer = PhotoVectorizerV2(stage_cache=get_vectorize_cache())
                 result = vectorizer.extract(
                     source_path=str(input_path),
                     output_dir=str(out_dir),
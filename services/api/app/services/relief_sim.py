@@ -3,8 +3,7 @@
 
 from __future__ import annotations
 
-from math import hypot
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
@@ -51,24 +50,26 @@ def _moves_to_segments(moves: List[ReliefMove]) -> List[Tuple[float, float, floa
     return segments
 
 
+# Upper bound on samples expanded at once; keeps peak memory ~100 MB
+_RASTER_CHUNK_SAMPLES = 2_000_000
+
+
 def _estimate_grid_bounds(
     segments: List[Tuple[float, float, float, float, float]],
     cell_size_xy: float,
     margin: float = 1.0,
 ):
-    if not segments:
+    if len(segments) == 0:
         return 0, 0, 0.0, 0.0
 
-    xs = []
-    ys = []
-    for x0, y0, x1, y1, _ in segments:
-        xs.extend([x0, x1])
-        ys.extend([y0, y1])
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 5)
+    xs = seg[:, [0, 2]]
+    ys = seg[:, [1, 3]]
 
-    min_x = min(xs) - margin
-    max_x = max(xs) + margin
-    min_y = min(ys) - margin
-    max_y = max(ys) + margin
+    min_x = float(xs.min()) - margin
+    max_x = float(xs.max()) + margin
+    min_y = float(ys.min()) - margin
+    max_y = float(ys.max()) + margin
 
     width = max(1, int((max_x - min_x) / cell_size_xy) + 1)
     height = max(1, int((max_y - min_y) / cell_size_xy) + 1)
@@ -76,60 +77,94 @@ def _estimate_grid_bounds(
     return width, height, min_x, min_y
 
 
+def _footprint_offsets(tool_diameter: Optional[float], cell_size_xy: float) -> np.ndarray:
+    """
+    Integer (di, dj) cell offsets covered by a flat tool centred on a sample.
+    Without a diameter (or one smaller than a cell) this is the single centre cell.
+    """
+    radius_cells = (tool_diameter or 0.0) / (2.0 * cell_size_xy)
+    r = int(np.floor(radius_cells))
+    if r < 1:
+        return np.zeros((1, 2), dtype=np.int64)
+    di, dj = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1), indexing="xy")
+    inside = di * di + dj * dj <= radius_cells * radius_cells
+    return np.stack([di[inside], dj[inside]], axis=1).astype(np.int64)
+
+
 def _rasterize_segments_to_grid(
     segments: List[Tuple[float, float, float, float, float]],
     cell_size_xy: float,
     origin_x: float,
     origin_y: float,
     stock_thickness: float,
+    tool_diameter: Optional[float] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Returns:
       floor_depth: 2D array of min Z (most negative) per cell
       load_accum: 2D array of accumulated load index per cell
+
+    Each segment is sampled every half cell. All samples are expanded at once
+    (in bounded chunks) and reduced onto the grid with ``np.minimum.at`` for
+    depth and ``np.bincount`` for load. With ``tool_diameter`` each sample
+    stamps the tool's disc footprint instead of a single cell.
     """
-    width, height, min_x, min_y = _estimate_grid_bounds(segments, cell_size_xy)
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 5)
+    width, height, min_x, min_y = _estimate_grid_bounds(seg, cell_size_xy)
     # Use local origin offset so arrays stay compact
     grid_origin_x = origin_x if origin_x != 0.0 else min_x
     grid_origin_y = origin_y if origin_y != 0.0 else min_y
 
-    floor_depth = np.full((height, width), 0.0, dtype=np.float32)
-    load_accum = np.zeros((height, width), dtype=np.float32)
-    visited = np.zeros((height, width), dtype=bool)
-
-    for x0, y0, x1, y1, z_mid in segments:
-        seg_len = hypot(x1 - x0, y1 - y0)
-        if seg_len <= 1e-6:
-            continue
-
-        # sample along segment
-        steps = max(1, int(seg_len / (cell_size_xy * 0.5)))
-        dz = z_mid  # approximate constant depth along segment
-
-        for k in range(steps + 1):
-            t = k / steps
-            xs = x0 + (x1 - x0) * t
-            ys = y0 + (y1 - y0) * t
-
-            i = int((xs - grid_origin_x) / cell_size_xy)
-            j = int((ys - grid_origin_y) / cell_size_xy)
-            if i < 0 or j < 0 or i >= width or j >= height:
-                continue
-
-            # update floor_depth: we keep the minimum (most negative) Z
-            current = floor_depth[j, i]
-            visited[j, i] = True
-            if dz < current:
-                floor_depth[j, i] = dz
-
-            # approximate local path length contribution
-            # each sample contributes seg_len / steps length
-            local_len = seg_len / steps
-            # load index ~ |depth| * path length
-            load_accum[j, i] += abs(dz) * local_len
-
-    # Any unvisited cells should have floor_depth = 0 (no cut)
-    floor_depth[~visited] = 0.0
+    # Unvisited cells keep floor_depth = 0 (no cut)
+    floor_flat = np.zeros(height * width, dtype=np.float32)
+    load_flat = np.zeros(height * width, dtype=np.float64)
+
+    x0, y0, x1, y1, dz = seg.T
+    seg_len = np.hypot(x1 - x0, y1 - y0)
+    keep = seg_len > 1e-6
+    x0, y0, x1, y1, dz, seg_len = (a[keep] for a in (x0, y0, x1, y1, dz, seg_len))
+
+    # sample along segment; dz approximates constant depth along segment
+    steps = np.maximum(1, (seg_len / (cell_size_xy * 0.5)).astype(np.int64))
+    # load index ~ |depth| * path length, each sample carries seg_len / steps
+    sample_load = np.abs(dz) * (seg_len / steps)
+    offsets = _footprint_offsets(tool_diameter, cell_size_xy)
+
+    counts = steps + 1
+    ends = np.cumsum(counts)
+    per_chunk = max(1, _RASTER_CHUNK_SAMPLES // len(offsets))
+    lo = 0
+    while lo < len(counts):
+        hi = int(np.searchsorted(ends, ends[lo] - counts[lo] + per_chunk, side="right"))
+        hi = max(hi, lo + 1)
+
+        c = counts[lo:hi]
+        owner = np.repeat(np.arange(lo, hi), c)
+        first = np.repeat(np.cumsum(c) - c, c)
+        t = (np.arange(owner.size) - first) / steps[owner]
+
+        xs = x0[owner] + (x1[owner] - x0[owner]) * t
+        ys = y0[owner] + (y1[owner] - y0[owner]) * t
+        # int() truncation toward zero, as in the scalar rasterizer
+        i = np.trunc((xs - grid_origin_x) / cell_size_xy).astype(np.int64)
+        j = np.trunc((ys - grid_origin_y) / cell_size_xy).astype(np.int64)
+
+        if len(offsets) > 1:
+            i = (i[:, None] + offsets[:, 0]).ravel()
+            j = (j[:, None] + offsets[:, 1]).ravel()
+            owner = np.repeat(owner, len(offsets))
+
+        inside = (i >= 0) & (j >= 0) & (i < width) & (j < height)
+        flat = j[inside] * width + i[inside]
+        owner = owner[inside]
+
+        # we keep the minimum (most negative) Z
+        np.minimum.at(floor_flat, flat, dz[owner].astype(np.float32))
+        load_flat += np.bincount(flat, weights=sample_load[owner], minlength=load_flat.size)
+        lo = hi
+
+    floor_depth = floor_flat.reshape(height, width)
+    load_accum = load_flat.astype(np.float32).reshape(height, width)
 
     # thickness = stock_thickness + depth (Z negative)
     # when no cut, depth=0, thickness=stock_thickness
@@ -163,6 +198,7 @@ def run_relief_sim_bridge(payload: ReliefSimIn) -> ReliefSimOut:
         origin_x=payload.origin_x,
         origin_y=payload.origin_y,
         stock_thickness=payload.stock_thickness,
+        tool_diameter=payload.tool_diameter,
     )
 
     # thickness = stock_thickness + floor_depth (floor_depth <= 0)
@@ -199,83 +235,79 @@ def run_relief_sim_bridge(payload: ReliefSimIn) -> ReliefSimOut:
     issues: List[ReliefSimIssue] = []
     overlays: List[ReliefSimOverlayOut] = []
 
-    h, w = floor_thickness.shape
-
-    # produce issues + overlays
-    for j in range(h):
-        for i in range(w):
-            thickness = float(floor_thickness[j, i])
-            load_val = float(norm_load[j, i])
-
-            if load_val <= 0.0 and thickness >= payload.stock_thickness - 1e-3:
-                # untouched region
-                continue
-
-            x = payload.origin_x + i * payload.cell_size_xy
-            y = payload.origin_y + j * payload.cell_size_xy
-            depth = float(floor_depth[j, i])
-
-            # Thin floor issue
-            if thickness < payload.min_floor_thickness:
-                severity = "high" if thickness < payload.min_floor_thickness * 0.7 else "medium"
-                issues.append(
-                    ReliefSimIssue(
-                        type="thin_floor",
-                        severity=severity,  # type: ignore[arg-type]
-                        x=x,
-                        y=y,
-                        z=depth,
-                        note=f"Floor thickness {thickness:.2f} {payload.units} below threshold {payload.min_floor_thickness:.2f}",
-                        extra_time_s=None,
-                        meta={"thickness": thickness},
-                    )
+    # produce issues + overlays; untouched cells are skipped up front
+    touched = (norm_load > 0.0) | (
+        floor_thickness.astype(np.float64) < payload.stock_thickness - 1e-3
+    )
+    for j, i in zip(*(idx.tolist() for idx in np.nonzero(touched))):
+        thickness = float(floor_thickness[j, i])
+        load_val = float(norm_load[j, i])
+
+        x = payload.origin_x + i * payload.cell_size_xy
+        y = payload.origin_y + j * payload.cell_size_xy
+        depth = float(floor_depth[j, i])
+
+        # Thin floor issue
+        if thickness < payload.min_floor_thickness:
+            severity = "high" if thickness < payload.min_floor_thickness * 0.7 else "medium"
+            issues.append(
+                ReliefSimIssue(
+                    type="thin_floor",
+                    severity=severity,  # type: ignore[arg-type]
+                    x=x,
+                    y=y,
+                    z=depth,
+                    note=f"Floor thickness {thickness:.2f} {payload.units} below threshold {payload.min_floor_thickness:.2f}",
+                    extra_time_s=None,
+                    meta={"thickness": thickness},
                 )
-                overlays.append(
-                    ReliefSimOverlayOut(
-                        type="thin_floor_zone",
-                        x=x,
-                        y=y,
-                        z=depth,
-                        intensity=None,
-                        severity=severity,  # type: ignore[arg-type]
-                        meta={"thickness": thickness},
-                    )
+            )
+            overlays.append(
+                ReliefSimOverlayOut(
+                    type="thin_floor_zone",
+                    x=x,
+                    y=y,
+                    z=depth,
+                    intensity=None,
+                    severity=severity,  # type: ignore[arg-type]
+                    meta={"thickness": thickness},
                 )
-
-            # High-load hotspots
-            if load_val >= payload.med_load_index:
-                if load_val >= payload.high_load_index:
-                    sev = "high"
-                else:
-                    sev = "medium"
-
-                issues.append(
-                    ReliefSimIssue(
-                        type="high_load",
-                        severity=sev,  # type: ignore[arg-type]
-                        x=x,
-                        y=y,
-                        z=depth,
-                        note=f"High load index {load_val:.2f}",
-                        extra_time_s=None,
-                        meta={"load_index": load_val},
-                    )
+            )
+
+        # High-load hotspots
+        if load_val >= payload.med_load_index:
+            if load_val >= payload.high_load_index:
+                sev = "high"
+            else:
+                sev = "medium"
+
+            issues.append(
+                ReliefSimIssue(
+                    type="high_load",
+                    severity=sev,  # type: ignore[arg-type]
+                    x=x,
+                    y=y,
+                    z=depth,
+                    note=f"High load index {load_val:.2f}",
+                    extra_time_s=None,
+                    meta={"load_index": load_val},
                 )
-
-            # Always emit a load hotspot overlay for non-zero load
-            if load_val > 0.0:
-                # clamp to [0,1.5] then normalize to [0,1]
-                intensity = min(load_val, 1.5) / 1.5
-                overlays.append(
-                    ReliefSimOverlayOut(
-                        type="load_hotspot",
-                        x=x,
-                        y=y,
-                        z=depth,
-                        intensity=float(intensity),
-                        severity=None,
-                        meta={"load_index": load_val},
-                    )
+            )
+
+        # Always emit a load hotspot overlay for non-zero load
+        if load_val > 0.0:
+            # clamp to [0,1.5] then normalize to [0,1]
+            intensity = min(load_val, 1.5) / 1.5
+            overlays.append(
+                ReliefSimOverlayOut(
+                    type="load_hotspot",
+                    x=x,
+                    y=y,
+                    z=depth,
+                    intensity=float(intensity),
+                    severity=None,
+                    meta={"load_index": load_val},
                 )
+            )
 
     return ReliefSimOut(issues=issues, overlays=overlays, stats=stats)
@@ -0,0 +1,441 @@
+"""
+Content-addressed cache for vectorization results.
+
+Operators re-run the photo and blueprint pipelines on the same upload while
+tuning parameters, and every run repeats the full pipeline. This cache keys a
+finished result on
+
+    (pipeline name, pipeline version, SHA-256 of the input bytes,
+     canonicalized options)
+
+and stores its response payload plus artifact files (DXF, SVG, feature JSON)
+on local disk. Intermediate stages can be memoized in the same store
+(load_stage / store_stage), so a change to a late-stage parameter still
+reuses early work such as background removal.
+
+Total size is bounded; least-recently-used entries (results and stages
+alike) are evicted first. Entry directories are written to a scratch path
+and renamed into place, so concurrent workers never read a partial entry.
+
+Stage outputs are pickled, so the cache root must be private: it is created
+with mode 0700, a root owned by this user is tightened to 0700, and a root
+owned by anyone else is refused (the cache is then disabled).
+
+Environment:
+    VECTORIZE_CACHE          "0" disables the cache (default enabled)
+    VECTORIZE_CACHE_DIR      cache root (default: <tmp>/vectorize_cache-<uid>)
+    VECTORIZE_CACHE_MAX_MB   size bound in MB (default 2048)
+"""
+
+from __future__ import annotations
+
+import base64
+import enum
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from ..observability.metrics import vectorize_cache_evictions_total, vectorize_cache_lookups_total
+
+logger = logging.getLogger(__name__)
+
+# Bump when a pipeline's output changes in a way source fingerprints miss
+# (e.g. a dependency upgrade); module sources are fingerprinted as well.
+PIPELINE_VERSIONS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "photo_v2": ("1", ("photo_vectorizer_v2", "app.services.photo_orchestrator")),
+    "blueprint": ("1", (
+        "app.services.blueprint_orchestrator",
+        "app.services.blueprint_extract",
+        "app.services.blueprint_clean",
+    )),
+    "phase3": ("1", ("vectorizer_phase3",)),
+}
+
+PAYLOAD_FILE = "payload.json"
+# Evict down to this fraction of max_bytes so puts do not rescan every time
+LOW_WATERMARK = 0.9
+
+FileSource = Union[bytes, str, Path]
+
+
+@dataclass
+class CachedResult:
+    """A cache hit: the stored payload and its artifact files."""
+    key: str
+    payload: Dict[str, Any]
+    files: Dict[str, Path] = field(default_factory=dict)
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return _canonical(value.value)
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        # 400 and 400.0 are the same option
+        return int(value) if float(value).is_integer() else float(value)
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return _canonical(value.model_dump())
+    return repr(value)
+
+
+def canonical_options(options: Mapping[str, Any]) -> str:
+    """Stable JSON for an options mapping (sorted keys, enums by value)."""
+    return json.dumps(_canonical(options), sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+_fingerprints: Dict[str, str] = {}
+
+
+def pipeline_version(pipeline: str) -> str:
+    """Declared version plus a digest of the pipeline's module sources."""
+    cached = _fingerprints.get(pipeline)
+    if cached is not None:
+        return cached
+    declared, modules = PIPELINE_VERSIONS.get(pipeline, ("0", ()))
+    digest = hashlib.sha256(declared.encode())
+    for name in modules:
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if path is None:
+            digest.update(f"{name}:unloaded".encode())
+            continue
+        try:
+            digest.update(Path(path).read_bytes())
+        except OSError:
+            digest.update(f"{name}:{path}".encode())
+    version = f"{declared}-{digest.hexdigest()[:12]}"
+    # Only memoize once every module is loaded, so the digest is final
+    if all(name in sys.modules for name in modules):
+        _fingerprints[pipeline] = version
+    return version
+
+
+class VectorizeCache:
+    """Disk-backed, size-bounded LRU of vectorization results and stages."""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 2048 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        _ensure_private_dir(self.root)
+        self._results = self.root / "results"
+        self._stages = self.root / "stages"
+        self._scratch = self.root / "tmp"
+        for d in (self._results, self._stages, self._scratch):
+            d.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._approx_bytes: Optional[int] = None  # None: not scanned yet
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def make_key(self, pipeline: str, content: bytes, options: Mapping[str, Any]) -> str:
+        """Key for running pipeline on content with options."""
+        material = "\0".join((
+            pipeline,
+            pipeline_version(pipeline),
+            content_hash(content),
+            canonical_options(options),
+        ))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Final results
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, pipeline: str = "") -> Optional[CachedResult]:
+        entry = self._result_dir(key)
+        try:
+            payload = json.loads((entry / PAYLOAD_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            vectorize_cache_lookups_total.inc(labels={"pipeline": pipeline, "outcome": "miss"})
+            return None
+        self._touch(entry)
+        files = {p.name: p for p in entry.iterdir() if p.name != PAYLOAD_FILE}
+        vectorize_cache_lookups_total.inc(labels={"pipeline": pipeline, "outcome": "hit"})
+        return CachedResult(key=key, payload=payload, files=files)
+
+    def put(
+        self,
+        key: str,
+        payload: Mapping[str, Any],
+        files: Optional[Mapping[str, FileSource]] = None,
+    ) -> Optional[CachedResult]:
+        """
+        Store a result. files maps artifact names to bytes or a path to copy.
+
+        Returns the stored entry, or None if it could not be written (the
+        cache is best-effort; callers already have the result).
+        """
+        scratch = self._scratch / uuid.uuid4().hex
+        try:
+            scratch.mkdir(parents=True)
+            (scratch / PAYLOAD_FILE).write_text(
+                json.dumps(payload, default=str), encoding="utf-8")
+            for name, source in (files or {}).items():
+                target = scratch / Path(name).name
+                if isinstance(source, bytes):
+                    target.write_bytes(source)
+                else:
+                    shutil.copyfile(source, target)
+            size = _tree_size(scratch)
+            entry = self._result_dir(key)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(scratch, entry)
+            except OSError:
+                # Another worker stored the same key first; keep theirs
+                shutil.rmtree(scratch, ignore_errors=True)
+                return self.get(key)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("VECTORIZE_CACHE | put failed for %s: %s", key[:12], e)
+            shutil.rmtree(scratch, ignore_errors=True)
+            return None
+        self._account(size)
+        return CachedResult(
+            key=key,
+            payload=dict(payload),
+            files={p.name: p for p in entry.iterdir() if p.name != PAYLOAD_FILE},
+        )
+
+    # ------------------------------------------------------------------
+    # Stage memoization
+    # ------------------------------------------------------------------
+
+    def load_stage(self, stage: str, key: str) -> Optional[Any]:
+        """Stored output of stage for key, or None."""
+        path = self._stage_path(stage, key)
+        try:
+            value = pickle.loads(zlib.decompress(path.read_bytes()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            vectorize_cache_lookups_total.inc(labels={"pipeline": f"stage:{stage}", "outcome": "miss"})
+            return None
+        self._touch(path)
+        vectorize_cache_lookups_total.inc(labels={"pipeline": f"stage:{stage}", "outcome": "hit"})
+        return value
+
+    def store_stage(self, stage: str, key: str, value: Any) -> None:
+        """Store a picklable stage output (zlib level 1: fast, images shrink well)."""
+        path = self._stage_path(stage, key)
+        tmp = self._scratch / f"{uuid.uuid4().hex}.stage"
+        try:
+            data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning("VECTORIZE_CACHE | stage %s not stored: %s", stage, e)
+            tmp.unlink(missing_ok=True)
+            return
+        self._account(len(data))
+
+    # ------------------------------------------------------------------
+    # Size bound
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._scan()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            for d in (self._results, self._stages):
+                shutil.rmtree(d, ignore_errors=True)
+                d.mkdir(parents=True, exist_ok=True)
+            self._approx_bytes = 0
+
+    def evict(self) -> int:
+        """Remove least-recently-used entries until under the low watermark."""
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * LOW_WATERMARK)
+            removed = 0
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._approx_bytes = total
+        if removed:
+            vectorize_cache_evictions_total.inc(removed)
+            logger.info("VECTORIZE_CACHE | evicted %d entries (now %.1f MB)", removed, total / 1e6)
+        return removed
+
+    def _account(self, size: int) -> None:
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = sum(s for _, s, _ in self._scan())
+            else:
+                self._approx_bytes += size
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """(path, bytes, last use) for every result entry and stage file."""
+        entries: List[Tuple[Path, int, float]] = []
+        for entry in _children(self._results, depth=2):
+            try:
+                entries.append((entry, _tree_size(entry), entry.stat().st_mtime))
+            except OSError:
+                continue
+        for path in _children(self._stages, depth=3):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _result_dir(self, key: str) -> Path:
+        return self._results / key[:2] / key
+
+    def _stage_path(self, stage: str, key: str) -> Path:
+        return self._stages / stage / key[:2] / f"{key}.pkl.z"
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def _ensure_private_dir(root: Path) -> None:
+    """
+    Create root with mode 0700, or tighten an existing root we own to 0700.
+
+    Raises:
+        PermissionError: If root is owned by another user (it could hold
+            planted stage pickles)
+    """
+    root.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return  # no POSIX ownership (Windows): rely on the profile ACLs
+    st = root.stat()
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"cache dir {root} is owned by uid {st.st_uid}, not this user")
+    if st.st_mode & 0o077:
+        os.chmod(root, 0o700)
+
+
+def default_cache_dir() -> Path:
+    """Per-user default root, so users on one host never share pickles."""
+    user = os.getuid() if hasattr(os, "getuid") else os.getenv("USERNAME", "user")
+    return Path(tempfile.gettempdir()) / f"vectorize_cache-{user}"
+
+
+def _children(root: Path, depth: int) -> Iterable[Path]:
+    level = [root]
+    for _ in range(depth):
+        nxt: List[Path] = []
+        for d in level:
+            try:
+                nxt.extend(d.iterdir())
+            except OSError:
+                continue
+        level = nxt
+    return level
+
+
+def _tree_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.iterdir())
+
+
+_cache: Optional[VectorizeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vectorize_cache() -> Optional[VectorizeCache]:
+    """Process-wide cache from the environment; None when disabled."""
+    global _cache
+    if os.getenv("VECTORIZE_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                root = os.getenv("VECTORIZE_CACHE_DIR") or str(default_cache_dir())
+                max_mb = float(os.getenv("VECTORIZE_CACHE_MAX_MB", "2048"))
+                try:
+                    _cache = VectorizeCache(root, max_bytes=int(max_mb * 1024 * 1024))
+                except OSError as e:
+                    logger.warning("VECTORIZE_CACHE | disabled, cannot use %s: %s", root, e)
+                    return None
+    return _cache
+
+
+# ---------------------------------------------------------------------
+# Canonical orchestrator payloads (PhotoResult / BlueprintResult)
+# ---------------------------------------------------------------------
+
+ARTIFACT_FILES = {"svg": ("result.svg", "content"), "dxf": ("result.dxf", "base64")}
+
+
+def split_inline_artifacts(payload: Mapping[str, Any]) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """
+    Move inline SVG text / DXF base64 out of a response payload into files.
+
+    Returns (payload without inline artifact content, {file name: bytes}),
+    so the DXF and SVG are stored once, as the files a client downloads.
+    """
+    stored = json.loads(json.dumps(payload, default=str))
+    files: Dict[str, bytes] = {}
+    artifacts = stored.get("artifacts") or {}
+    for kind, (name, attr) in ARTIFACT_FILES.items():
+        artifact = artifacts.get(kind) or {}
+        content = artifact.get(attr)
+        if not content:
+            continue
+        files[name] = base64.b64decode(content) if attr == "base64" else content.encode("utf-8")
+        artifact[attr] = ""
+    return stored, files
+
+
+def restore_inline_artifacts(cached: CachedResult) -> Dict[str, Any]:
+    """Inverse of split_inline_artifacts for a cache hit."""
+    payload = cached.payload
+    artifacts = payload.get("artifacts") or {}
+    for kind, (name, attr) in ARTIFACT_FILES.items():
+        path = cached.files.get(name)
+        if path is None or kind not in artifacts:
+            continue
+        data = path.read_bytes()
+        artifacts[kind][attr] = (
+            base64.b64encode(data).decode("ascii") if attr == "base64" else data.decode("utf-8"))
+    return payload
@@ -0,0 +1,109 @@
+"""
+Warm model loading for vectorizer workers.
+
+The photo and blueprint vectorizers lazily create several heavy models on
+first use: the rembg U2Net session (~170 MB ONNX graph), the EasyOCR reader
+used for dimension text, and the optional contour classifier. Loading them
+per request costs seconds, so the compute dispatcher runs
+warm_vectorizer_models() once in every worker of its "vectorizer" pool and
+the module-level singletons stay populated for the life of the worker.
+
+Environment:
+    VECTORIZER_WARM_MODELS   comma-separated subset of MODEL_LOADERS
+                             (default: all)
+    PHASE3_ML_MODEL_PATH     trained contour classifier for Phase 3
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _load_rembg() -> None:
+    from app.routers import photo_vectorizer_router  # puts photo-vectorizer on sys.path
+
+    if not photo_vectorizer_router.VECTORIZER_AVAILABLE:
+        raise RuntimeError(photo_vectorizer_router._vectorizer_error or "photo vectorizer unavailable")
+    from photo_vectorizer_v2 import get_rembg_session  # type: ignore
+
+    if get_rembg_session() is None:
+        raise RuntimeError("rembg not installed")
+
+
+def _load_edge_ocr() -> None:
+    from app.routers import photo_vectorizer_router  # noqa: F401  (sys.path)
+    from edge_to_dxf import _get_easyocr_reader  # type: ignore
+
+    if _get_easyocr_reader() is None:
+        raise RuntimeError("easyocr not installed")
+
+
+def _load_blueprint_ocr() -> None:
+    from app.routers.blueprint import constants  # noqa: F401  (sys.path)
+    from vectorizer_phase3 import get_dimension_extractor  # type: ignore
+
+    if get_dimension_extractor() is None:
+        raise RuntimeError("dimension extractor unavailable")
+
+
+def _load_contour_classifier() -> None:
+    model_path = os.getenv("PHASE3_ML_MODEL_PATH")
+    if not model_path:
+        raise RuntimeError("PHASE3_ML_MODEL_PATH not set")
+    from app.routers.blueprint import constants  # noqa: F401  (sys.path)
+    from vectorizer_phase3 import get_ml_classifier  # type: ignore
+
+    get_ml_classifier(model_path)
+
+
+MODEL_LOADERS: Dict[str, Callable[[], None]] = {
+    "rembg": _load_rembg,
+    "edge_ocr": _load_edge_ocr,
+    "blueprint_ocr": _load_blueprint_ocr,
+    "contour_classifier": _load_contour_classifier,
+}
+
+# What this process has warmed: model -> load ms, or None if it failed
+_warm_report: Dict[str, Optional[float]] = {}
+
+
+def warm_vectorizer_models(models: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+    """
+    Load the vectorizer models into this process's singletons.
+
+    Failures (missing optional dependency, unset model path) are logged and
+    recorded as None; the request path then falls back to lazy loading.
+
+    Returns:
+        {model name: load time in ms or None}
+    """
+    if models is None:
+        configured = os.getenv("VECTORIZER_WARM_MODELS", "")
+        models = [m.strip() for m in configured.split(",") if m.strip()] or list(MODEL_LOADERS)
+
+    for name in models:
+        loader = MODEL_LOADERS.get(name)
+        if loader is None:
+            logger.warning("Unknown vectorizer model '%s' (known: %s)", name, ", ".join(MODEL_LOADERS))
+            continue
+        start = time.perf_counter()
+        try:
+            loader()
+        except Exception as e:  # audited: optional models — keep the worker usable
+            logger.info("Vectorizer model '%s' not warmed: %s", name, e)
+            _warm_report[name] = None
+            continue
+        _warm_report[name] = (time.perf_counter() - start) * 1000.0
+        logger.info("Vectorizer model '%s' warm in %.0f ms (pid %d)", name, _warm_report[name], os.getpid())
+
+    return dict(_warm_report)
+
+
+def get_warm_report() -> Dict[str, Optional[float]]:
+    """Models warmed in this process so far (see warm_vectorizer_models)."""
+    return dict(_warm_report)
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 from typing import Iterable, List, Optional, TextIO, Tuple
 
+from ..cam.dxf_fast_reader import iter_tag_pairs
 from . import MLPath, Point2D
 
 
@@ -84,21 +85,9 @@ def _to_code_value_pairs(content: str) -> List[Tuple[int, str]]:
     Convert DXF content to list of (code, value) pairs.
 
     DXF files alternate between group codes (integers) and values (strings).
+    Shares the tag reader of app.cam.dxf_fast_reader.
     """
-    lines = content.strip().split("\n")
-    pairs: List[Tuple[int, str]] = []
-
-    i = 0
-    while i + 1 < len(lines):
-        try:
-            code = int(lines[i].strip())
-            value = lines[i + 1].strip()
-            pairs.append((code, value))
-            i += 2
-        except ValueError:
-            i += 1
-
-    return pairs
+    return list(iter_tag_pairs(content.strip().split("\n")))
 
 
 def _parse_line_entity(
@@ -9,6 +9,9 @@ Sub-modules
 - lexer: Tokenization and comment stripping
 - geometry: Arc calculations and interpolation
 - simulator: State machine simulation
+- segment_stream: Lazy simulation stream, decimation and chunking
+- packed: Columnar binary backplot encoding
+- stock: Heightfield stock-removal simulation (MRR, air cutting, scrubbing)
 - reader: File parsing and validation
 - render: SVG visualization
 - report: Human-readable reports and CSV/JSON export
@@ -39,6 +42,7 @@ from .types import (
 
 # Lexer
 from .lexer import (
+    iter_lines,
     parse_lines,
     parse_words,
     strip_comments,
@@ -55,11 +59,35 @@ from .geometry import (
 )
 
 # Simulator
+from .segment_stream import (
+    SEGMENT_TYPE_CODES,
+    SegmentStream,
+    decimate_segments,
+    iter_segment_chunks,
+)
 from .simulator import (
     simulate,
     simulate_segments,
 )
 
+# Packed backplot format
+from .packed import (
+    PACKED_MEDIA_TYPE,
+    pack_segments,
+    unpack_segments,
+)
+
+# Stock removal
+from .stock import (
+    MAX_GRID_CELLS,
+    MIN_CELL_MM,
+    StockGrid,
+    StockSimulator,
+    ToolShape,
+    stock_grid_for_segments,
+    tool_shape_from_table,
+)
+
 # Reader
 from .reader import (
     parse_gcode,
@@ -91,6 +119,7 @@ __all__ = [
     "Summary",
     "default_modal",
     # Lexer
+    "iter_lines",
     "parse_lines",
     "parse_words",
     "strip_comments",
@@ -102,8 +131,24 @@ __all__ = [
     "arc_len",
     "interpolate_arc_points",
     # Simulator
+    "SEGMENT_TYPE_CODES",
+    "SegmentStream",
+    "decimate_segments",
+    "iter_segment_chunks",
     "simulate",
     "simulate_segments",
+    # Packed backplot format
+    "PACKED_MEDIA_TYPE",
+    "pack_segments",
+    "unpack_segments",
+    # Stock removal
+    "MAX_GRID_CELLS",
+    "MIN_CELL_MM",
+    "StockGrid",
+    "StockSimulator",
+    "ToolShape",
+    "stock_grid_for_segments",
+    "tool_shape_from_table",
     # Reader
     "parse_gcode",
     "validate_gcode",
@@ -6,8 +6,9 @@ Supports both parser and reader workflows.
 """
 from __future__ import annotations
 
+import io
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Union
 
 # Regex patterns
 NUM: str = r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?"
@@ -29,20 +30,28 @@ def parse_words(line: str) -> Dict[str, float]:
     return {m.group(1).upper(): float(m.group(2)) for m in WORD_RE.finditer(line)}
 
 
-def parse_lines(gcode: str) -> List[Dict[str, Any]]:
+def _iter_raw_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield raw lines without terminators, lazily for both text and streams.
+
+    A str is read through a universal-newline StringIO so a large program is
+    never split into one big list; any other iterable (an open text file, an
+    upload wrapper) is consumed line by line as-is.
     """
-    Parse G-code into structured lines with word tokens.
+    lines = io.StringIO(source, newline=None) if isinstance(source, str) else source
+    for raw in lines:
+        yield raw.rstrip("\r\n")
 
-    Filters comments (parentheses and semicolon) and empty lines.
-    Returns list of dicts with 'raw' line and 'words' [(letter, value), ...]
 
-    Example:
-        >>> parse_lines("G0 X10 Y20\\nG1 Z-1 F500")
-        [{'raw': 'G0 X10 Y20', 'words': [('G', 0.0), ('X', 10.0), ('Y', 20.0)]},
-         {'raw': 'G1 Z-1 F500', 'words': [('G', 1.0), ('Z', -1.0), ('F', 500.0)]}]
+def iter_lines(source: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
     """
-    out = []
-    for raw in gcode.splitlines():
+    Lazily parse G-code into structured lines with word tokens.
+
+    Streaming counterpart of :func:`parse_lines`: accepts program text or any
+    iterable of lines (e.g. a text file object) and yields one
+    ``{'raw', 'words'}`` dict at a time, so memory stays bounded by the
+    longest line rather than the program length.
+    """
+    for raw in _iter_raw_lines(source):
         line = raw.strip()
         if not line or line.startswith('(') or line.startswith(';'):
             continue
@@ -57,6 +66,19 @@ def parse_lines(gcode: str) -> List[Dict[str, Any]]:
         if not words:
             continue
 
-        out.append({"raw": raw, "words": words})
+        yield {"raw": raw, "words": words}
+
 
-    return out
+def parse_lines(gcode: str) -> List[Dict[str, Any]]:
+    """
+    Parse G-code into structured lines with word tokens.
+
+    Filters comments (parentheses and semicolon) and empty lines.
+    Returns list of dicts with 'raw' line and 'words' [(letter, value), ...]
+
+    Example:
+        >>> parse_lines("G0 X10 Y20\\nG1 Z-1 F500")
+        [{'raw': 'G0 X10 Y20', 'words': [('G', 0.0), ('X', 10.0), ('Y', 20.0)]},
+         {'raw': 'G1 Z-1 F500', 'words': [('G', 1.0), ('Z', -1.0), ('F', 500.0)]}]
+    """
+    return list(iter_lines(gcode))
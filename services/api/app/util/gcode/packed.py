@@ -0,0 +1,143 @@
+"""
+G-code Packed Backplot Format
+
+Columnar binary encoding of simulator segments for the 3D player.
+
+Per-segment dicts from the simulator cost ~200 bytes each in Python and more
+as JSON; a 1M-segment relief program becomes hundreds of MB to build, send
+and parse. The packed format stores the same path as a struct-of-arrays —
+float32 coordinates/feeds/durations, uint32 source lines and uint8 motion
+codes — behind a fixed 44-byte header, so the server does one ``tobytes()``
+per column and the browser maps the body straight into typed arrays.
+
+Layout (little-endian, every float/uint32 section 4-byte aligned)::
+
+    header   <4sHHI6fd>  magic b"LTBP", version, flags, segment count n,
+                         bounds x_min x_max y_min y_max z_min z_max,
+                         total time (ms, float64)
+    start    3 x f32     from_pos of the first segment
+    x, y, z  n x f32     segment end points
+    feed     n x f32     mm/min
+    duration n x f32     ms
+    line     n x u32     1-based source line
+    type     n x u8      SEGMENT_TYPE_CODES
+"""
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+from .segment_stream import SEGMENT_TYPE_CODES
+
+PACKED_MAGIC = b"LTBP"
+PACKED_VERSION = 1
+PACKED_MEDIA_TYPE = "application/octet-stream"
+
+_HEADER = struct.Struct("<4sHHI6fd")
+HEADER_SIZE = _HEADER.size
+
+
+def pack_segments(segments: Iterable[Dict[str, Any]]) -> bytes:
+    """Encode simulator segments into the packed backplot format.
+
+    Consumes *segments* once, so it works directly on a
+    :class:`~app.util.gcode.segment_stream.SegmentStream`; only the compact
+    column arrays are retained, never the segment dicts.
+    """
+    start = array("f", [0.0, 0.0, 0.0])
+    xs, ys, zs = array("f"), array("f"), array("f")
+    feeds, durations = array("f"), array("f")
+    lines = array("I")
+    codes = array("B")
+
+    inf = float("inf")
+    lo = [inf, inf, inf]
+    hi = [-inf, -inf, -inf]
+    total_ms = 0.0
+
+    for n, s in enumerate(segments):
+        if n == 0:
+            start = array("f", s["from_pos"])
+        x, y, z = s["to_pos"]
+        xs.append(x)
+        ys.append(y)
+        zs.append(z)
+        feeds.append(s["feed"])
+        durations.append(s["duration_ms"])
+        lines.append(s["line_number"])
+        codes.append(SEGMENT_TYPE_CODES.get(s["type"], 1))
+        total_ms += s["duration_ms"]
+        lo[0] = min(lo[0], x)
+        hi[0] = max(hi[0], x)
+        lo[1] = min(lo[1], y)
+        hi[1] = max(hi[1], y)
+        lo[2] = min(lo[2], z)
+        hi[2] = max(hi[2], z)
+
+    count = len(codes)
+    if not count:
+        lo = hi = [0.0, 0.0, 0.0]
+
+    header = _HEADER.pack(
+        PACKED_MAGIC, PACKED_VERSION, 0, count,
+        lo[0], hi[0], lo[1], hi[1], lo[2], hi[2],
+        total_ms,
+    )
+    columns = (start, xs, ys, zs, feeds, durations, lines, codes)
+    if sys.byteorder == "big":
+        for col in columns:
+            col.byteswap()
+    return header + b"".join(col.tobytes() for col in columns)
+
+
+def unpack_segments(data: bytes) -> Dict[str, Any]:
+    """Decode a packed buffer into its header fields and NumPy column views.
+
+    Raises:
+        ValueError: If the buffer is not a packed backplot of a known version
+            or is shorter than its header declares.
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("packed backplot buffer is shorter than its header")
+    magic, version, flags, count, *rest = _HEADER.unpack_from(data, 0)
+    if magic != PACKED_MAGIC:
+        raise ValueError("not a packed backplot buffer (bad magic)")
+    if version != PACKED_VERSION:
+        raise ValueError(f"unsupported packed backplot version {version}")
+
+    expected = HEADER_SIZE + 12 + count * (5 * 4 + 4 + 1)
+    if len(data) < expected:
+        raise ValueError(
+            f"packed backplot truncated: {len(data)} bytes, expected {expected}"
+        )
+
+    x_min, x_max, y_min, y_max, z_min, z_max, total_ms = rest
+    off = HEADER_SIZE
+    start = np.frombuffer(data, dtype="<f4", count=3, offset=off)
+    off += 12
+
+    cols: Dict[str, np.ndarray] = {}
+    for name in ("x", "y", "z", "feed", "duration_ms"):
+        cols[name] = np.frombuffer(data, dtype="<f4", count=count, offset=off)
+        off += 4 * count
+    cols["line_number"] = np.frombuffer(data, dtype="<u4", count=count, offset=off)
+    off += 4 * count
+    cols["type"] = np.frombuffer(data, dtype=np.uint8, count=count, offset=off)
+
+    return {
+        "version": version,
+        "flags": flags,
+        "segment_count": count,
+        "bounds": {
+            "x_min": x_min, "x_max": x_max,
+            "y_min": y_min, "y_max": y_max,
+            "z_min": z_min, "z_max": z_max,
+        },
+        "total_time_ms": total_ms,
+        "start": start,
+        **cols,
+    }
@@ -0,0 +1,426 @@
+"""
+G-code Segment Stream
+
+Lazy, line-by-line simulation kernel plus the streaming helpers that consume
+it. :class:`SegmentStream` runs the modal state machine from
+:mod:`.simulator` one source line at a time; :func:`decimate_segments` and
+:func:`iter_segment_chunks` thin and batch its output for the backplot
+endpoints, so memory stays bounded on 10^5-10^6 line relief programs.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .geometry import interpolate_arc
+from .lexer import iter_lines
+from .simulator import (
+    CANNED,
+    _apply_modal,
+    _arc_center,
+    _default_modal,
+    _expand_canned_cycle,
+    _parse_block_words,
+)
+from .types import Modal
+
+
+class SegmentStream:
+    """
+    Lazy, line-by-line G-code simulation yielding one segment dict at a time.
+
+    This is the engine behind :func:`.simulator.simulate_segments`. Iterating the stream
+    consumes the lexer incrementally (``iter_lines``), so memory is bounded by
+    the longest line and the segments emitted for it, not by program length.
+    Aggregates (bounds, odometry, tools, warnings) accumulate as segments are
+    produced and are available from :meth:`summary` once iteration finishes.
+
+    Timing is constant-velocity; the trapezoidal accel model needs lookahead
+    over the whole program and is applied by :func:`simulate_segments` only.
+
+    Example:
+        stream = SegmentStream(open("body.nc"), units="mm")
+        for seg in stream:
+            ...
+        stream.summary()["totals"]["segment_count"]
+    """
+
+    def __init__(
+        self,
+        gcode: Union[str, Iterable[str]],
+        *,
+        rapid_mm_min: float = 3000.0,
+        default_feed_mm_min: float = 500.0,
+        units: str = "mm",
+        arc_resolution_deg: float = 5.0,
+        max_segments: Optional[int] = None,
+    ) -> None:
+        self.gcode = gcode
+        self.rapid_mm_min = rapid_mm_min
+        self.default_feed_mm_min = default_feed_mm_min
+        self.units = units
+        self.arc_resolution_deg = arc_resolution_deg
+        self.max_segments = max_segments
+
+        inf = float("inf")
+        self.bounds: Dict[str, float] = {
+            "x_min": inf, "x_max": -inf,
+            "y_min": inf, "y_max": -inf,
+            "z_min": inf, "z_max": -inf,
+        }
+        self.rapid_mm = 0.0
+        self.cut_mm = 0.0
+        self.duration_ms = 0.0
+        self.segment_count = 0
+        self.tools_used: Set[int] = set()
+        self.tool_changes: List[Dict[str, Any]] = []
+        self.warn: Dict[str, Any] = {
+            "unsupported_g": set(),
+            "unsupported_m": set(),
+            "ignored_offsets": set(),
+            "approx_cycles": set(),
+            "non_xy_arcs": 0,
+            "degenerate_arcs": 0,
+            "truncated": False,
+            "dropped_segments": 0,
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._run()
+
+    def _run(self) -> Iterator[Dict[str, Any]]:
+        u = 1.0 if self.units.lower().startswith("mm") else 25.4
+        rapid_mm_min = self.rapid_mm_min
+        max_segments = self.max_segments
+        warn = self.warn
+        bb = self.bounds
+
+        modal: Modal = _default_modal(self.default_feed_mm_min, u)
+        pos: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+
+        # Segments produced by the current block; flushed after each line so
+        # at most one block's worth of segments is held at a time.
+        pending: List[Dict[str, Any]] = []
+
+        def _expand_bb(x: float, y: float, z: float) -> None:
+            bb["x_min"] = min(bb["x_min"], x)
+            bb["x_max"] = max(bb["x_max"], x)
+            bb["y_min"] = min(bb["y_min"], y)
+            bb["y_max"] = max(bb["y_max"], y)
+            bb["z_min"] = min(bb["z_min"], z)
+            bb["z_max"] = max(bb["z_max"], z)
+
+        def _emit(
+            seg_type: str,
+            from_p: Tuple[float, float, float],
+            to_p: Tuple[float, float, float],
+            feed: float,
+            line_number: int,
+            line_text: str,
+            *,
+            is_cycle: bool = False,
+            cycle_kind: str = "",
+            duration_override: Optional[float] = None,
+        ) -> None:
+            if max_segments is not None and self.segment_count >= max_segments:
+                warn["truncated"] = True
+                warn["dropped_segments"] += 1
+                return
+            if duration_override is not None:
+                duration_ms = duration_override
+            else:
+                dist = math.dist(from_p, to_p)        # 3D — timing includes Z (X1)
+                duration_ms = (dist / max(1e-6, feed)) * 60_000.0
+            tool = modal.get("T", 1)
+            pending.append({
+                "type": seg_type,
+                "from_pos": list(from_p),
+                "to_pos": list(to_p),
+                "feed": feed,
+                "duration_ms": duration_ms,
+                "line_number": line_number,
+                "line_text": line_text,
+                "tool_number": tool,
+                "spindle_rpm": modal.get("S", 0.0),
+                "spindle_on": modal.get("spindle_on", False),
+                "is_cycle": is_cycle,
+                "cycle_kind": cycle_kind,
+            })
+            self.segment_count += 1
+            self.duration_ms += duration_ms
+            self.tools_used.add(tool)
+            # Bound to actual destinations only. Segments chain (each from_pos is the
+            # previous to_pos), so the sole point this omits is the synthetic (0,0,0)
+            # start — which would otherwise frame empty space when a job lives away
+            # from the origin (finding Z3).
+            _expand_bb(*to_p)
+
+        for line_idx, blk in enumerate(iter_lines(self.gcode)):
+            if pending:
+                yield from pending
+                pending.clear()
+
+            w = _parse_block_words(blk, u)
+            prev_tool = modal.get("T", 1)
+            _apply_modal(modal, w["gs"], w["f"], w["t"], w["s"], w["m"], warn)
+            u = modal["units"]
+
+            curr_tool = modal.get("T", 1)
+            if curr_tool != prev_tool:
+                self.tool_changes.append({
+                    "line_number": line_idx + 1,
+                    "from_tool": prev_tool,
+                    "to_tool": curr_tool,
+                    "position": list(pos),
+                })
+
+            absolute = modal["absolute"]
+            if absolute:
+                nx = pos[0] if w["x"] is None else w["x"]
+                ny = pos[1] if w["y"] is None else w["y"]
+                nz = pos[2] if w["z"] is None else w["z"]
+            else:
+                nx = pos[0] + (w["x"] or 0.0)
+                ny = pos[1] + (w["y"] or 0.0)
+                nz = pos[2] + (w["z"] or 0.0)
+
+            line_number = line_idx + 1
+            line_text = blk["raw"].strip()
+
+            # --- Dwell (G4) — no motion, but it consumes time (Z2). --------
+            if 4 in w["gs"]:
+                dwell_s = w["p"] if w["p"] is not None else 0.0
+                if dwell_s > 0:
+                    _emit("dwell", pos, pos, modal["F"], line_number, line_text,
+                          duration_override=dwell_s * 1000.0)
+                continue
+
+            # --- Canned cycle expansion (X2). ------------------------------
+            cycle = modal["cycle"]
+            if cycle is not None:
+                line_has_cycle = any(g in CANNED for g in w["gs"])
+                if w["z"] is not None:
+                    modal["cycle_z"] = nz
+                if w["r"] is not None:
+                    modal["cycle_r"] = w["r"] if absolute else pos[2] + w["r"]
+                if w["q"] is not None:
+                    modal["cycle_q"] = abs(w["q"])
+                if w["f"] is not None:
+                    modal["cycle_f"] = modal["F"]
+                if line_has_cycle and not modal["cycle_active"]:
+                    modal["cycle_initial_z"] = pos[2]
+                    modal["cycle_active"] = True
+
+                triggered = line_has_cycle or (w["x"] is not None or w["y"] is not None)
+                if triggered:
+                    # Reposition in XY at the current Z before drilling.
+                    if abs(nx - pos[0]) > 1e-9 or abs(ny - pos[1]) > 1e-9:
+                        _emit("rapid", pos, (nx, ny, pos[2]), rapid_mm_min,
+                              line_number, line_text)
+                        self.rapid_mm += math.hypot(nx - pos[0], ny - pos[1])
+                        pos = (nx, ny, pos[2])
+
+                    z_depth = modal["cycle_z"] if modal["cycle_z"] is not None else pos[2]
+                    r_plane = modal["cycle_r"] if modal["cycle_r"] is not None else pos[2]
+                    q_peck = modal["cycle_q"]
+                    cfeed = modal["cycle_f"] if modal["cycle_f"] is not None else modal["F"]
+                    init_z = modal["cycle_initial_z"]
+
+                    moves, ret_z, approx = _expand_canned_cycle(
+                        cycle, nx, ny, pos[2], init_z, r_plane, z_depth,
+                        q_peck, cfeed, rapid_mm_min, modal["return_mode"],
+                    )
+                    if approx:
+                        warn["approx_cycles"].add(cycle)
+                    cycle_kind = f"G{cycle}"
+                    for mt, fp, tp, fd in moves:
+                        _emit(mt, fp, tp, fd, line_number, line_text,
+                              is_cycle=True, cycle_kind=cycle_kind)
+                        if mt == "rapid":
+                            self.rapid_mm += math.hypot(tp[0] - fp[0], tp[1] - fp[1])
+                        else:
+                            self.cut_mm += math.hypot(tp[0] - fp[0], tp[1] - fp[1])
+                    pos = (nx, ny, ret_z)
+                continue
+
+            # --- Ordinary motion. ------------------------------------------
+            code = modal["G"]
+            has_arc = (
+                w["i"] is not None or w["j"] is not None
+                or w["k"] is not None or w["r"] is not None
+            )
+            position_changed = (
+                abs(nx - pos[0]) > 1e-12
+                or abs(ny - pos[1]) > 1e-12
+                or abs(nz - pos[2]) > 1e-12
+            )
+
+            if code in (0, 1) and position_changed:
+                seg_type = "rapid" if code == 0 else "cut"
+                feed = rapid_mm_min if code == 0 else modal["F"]
+                _emit(seg_type, pos, (nx, ny, nz), feed, line_number, line_text)
+                dist_xy = math.hypot(nx - pos[0], ny - pos[1])
+                if code == 0:
+                    self.rapid_mm += dist_xy
+                else:
+                    self.cut_mm += dist_xy
+                pos = (nx, ny, nz)
+
+            elif code in (2, 3) and (position_changed or has_arc):
+                plane = modal["plane"]
+                cw = code == 2
+                seg_type = "arc_cw" if cw else "arc_ccw"
+                if plane != 17:
+                    warn["non_xy_arcs"] += 1
+
+                center2 = _arc_center(plane, pos, nx, ny, nz, w, cw)
+                if center2 is not None:
+                    waypoints = interpolate_arc(
+                        pos, (nx, ny, nz), center2, cw, plane, self.arc_resolution_deg
+                    )
+                    cur = pos
+                    for wp in waypoints:
+                        _emit(seg_type, cur, wp, modal["F"], line_number, line_text)
+                        self.cut_mm += math.hypot(wp[0] - cur[0], wp[1] - cur[1])
+                        cur = wp
+                else:
+                    # Degenerate / unresolvable arc: draw a straight cut so the path
+                    # still reaches the endpoint instead of desyncing (Y2/Y3).
+                    warn["degenerate_arcs"] += 1
+                    _emit("cut", pos, (nx, ny, nz), modal["F"], line_number, line_text)
+                    self.cut_mm += math.hypot(nx - pos[0], ny - pos[1])
+
+                pos = (nx, ny, nz)   # always advance, even on fallback
+
+        if pending:
+            yield from pending
+            pending.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Bounds, totals, tools and warnings for the segments produced so far."""
+        bb = dict(self.bounds)
+        # Normalise an empty bounding box to zeros.
+        if not self.segment_count:
+            for key in bb:
+                bb[key] = 0.0
+
+        warn = self.warn
+        tools_used = sorted(self.tools_used)
+        return {
+            "bounds": bb,
+            "totals": {
+                "rapid_mm": self.rapid_mm,
+                "cut_mm": self.cut_mm,
+                "time_min": self.duration_ms / 60_000.0,
+                "segment_count": self.segment_count,
+            },
+            "tools": {
+                "used": tools_used,
+                "count": len(tools_used),
+                "changes": self.tool_changes,
+            },
+            "warnings": {
+                "unsupported_g": sorted(warn["unsupported_g"]),
+                "unsupported_m": sorted(warn["unsupported_m"]),
+                "ignored_offsets": sorted(warn["ignored_offsets"]),
+                "approx_cycles": sorted(warn["approx_cycles"]),
+                "non_xy_arcs": warn["non_xy_arcs"],
+                "degenerate_arcs": warn["degenerate_arcs"],
+                "truncated": warn["truncated"],
+                "dropped_segments": warn["dropped_segments"],
+            },
+        }
+
+
+# Compact integer codes for segment types in columnar / packed output.
+SEGMENT_TYPE_CODES: Dict[str, int] = {
+    "rapid": 0,
+    "cut": 1,
+    "arc_cw": 2,
+    "arc_ccw": 3,
+    "dwell": 4,
+}
+
+
+def decimate_segments(
+    segments: Iterable[Dict[str, Any]],
+    stride: int,
+) -> Iterator[Dict[str, Any]]:
+    """Merge runs of up to *stride* consecutive like segments into one.
+
+    Segments merge only while type, tool and cycle membership stay the same,
+    so rapid/cut transitions and tool changes are preserved exactly; merged
+    segments keep the first ``from_pos`` and last ``to_pos`` and sum
+    ``duration_ms`` so scrubbing time stays correct. ``stride <= 1`` passes
+    segments through untouched.
+    """
+    if stride <= 1:
+        yield from segments
+        return
+
+    run: Optional[Dict[str, Any]] = None
+    n = 0
+    for s in segments:
+        if (
+            run is not None
+            and n < stride
+            and s["type"] == run["type"]
+            and s["type"] != "dwell"
+            and s["tool_number"] == run["tool_number"]
+            and s["is_cycle"] == run["is_cycle"]
+        ):
+            run["to_pos"] = s["to_pos"]
+            run["duration_ms"] += s["duration_ms"]
+            run["feed"] = s["feed"]
+            run["line_number"] = s["line_number"]
+            run["line_text"] = s["line_text"]
+            n += 1
+            continue
+        if run is not None:
+            yield run
+        run = dict(s)
+        n = 1
+    if run is not None:
+        yield run
+
+
+def iter_segment_chunks(
+    segments: Iterable[Dict[str, Any]],
+    chunk_size: int = 4096,
+) -> Iterator[Dict[str, Any]]:
+    """Group segments into fixed-size columnar chunks.
+
+    Each chunk carries the chunk's start point once plus one column per field
+    (``type`` as :data:`SEGMENT_TYPE_CODES` ints, ``x``/``y``/``z`` end points,
+    ``feed``, ``duration_ms``, ``line_number``, ``tool``), which is several
+    times smaller than a list of per-segment dicts. Only one chunk is held in
+    memory at a time.
+    """
+    size = max(1, int(chunk_size))
+    index = 0
+    cols: Optional[Dict[str, Any]] = None
+    for s in segments:
+        if cols is None:
+            cols = {
+                "index": index,
+                "start": s["from_pos"],
+                "type": [], "x": [], "y": [], "z": [],
+                "feed": [], "duration_ms": [], "line_number": [], "tool": [],
+            }
+        tp = s["to_pos"]
+        cols["type"].append(SEGMENT_TYPE_CODES.get(s["type"], 1))
+        cols["x"].append(tp[0])
+        cols["y"].append(tp[1])
+        cols["z"].append(tp[2])
+        cols["feed"].append(s["feed"])
+        cols["duration_ms"].append(s["duration_ms"])
+        cols["line_number"].append(s["line_number"])
+        cols["tool"].append(s["tool_number"])
+        if len(cols["type"]) >= size:
+            cols["count"] = len(cols["type"])
+            yield cols
+            cols = None
+            index += 1
+    if cols is not None:
+        cols["count"] = len(cols["type"])
+        yield cols
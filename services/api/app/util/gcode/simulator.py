@@ -18,14 +18,16 @@ Fidelity notes (see TOOLPATH_ANIMATION_AUDIT 2026-05-30):
   are collected and returned in ``warnings`` rather than failing silently (Z1).
 - ``simulate()`` is a thin wrapper over ``simulate_segments()`` so the aggregate
   and per-segment paths share one implementation and cannot disagree.
+- ``simulate_segments()`` drains a lazy ``SegmentStream`` (``segment_stream.py``);
+  streaming callers use the stream directly with ``decimate_segments()`` /
+  ``iter_segment_chunks()`` so memory stays bounded on 10^5-10^6 line programs.
 """
 from __future__ import annotations
 
 import math
 from typing import Any, Dict, List, Optional, Tuple
 
-from .geometry import arc_center_from_r, interpolate_arc
-from .lexer import parse_lines
+from .geometry import arc_center_from_r
 from .types import Modal
 
 # Modal group 1 motion codes that emit ordinary moves.
@@ -392,255 +394,27 @@ def simulate_segments(
     Returns:
         Dict with ``segments``, ``bounds``, ``totals``, ``tools``, ``warnings``.
     """
-    u = 1.0 if units.lower().startswith("mm") else 25.4
-    prog = parse_lines(gcode)
-
-    modal: Modal = _default_modal(default_feed_mm_min, u)
-    pos: Tuple[float, float, float] = (0.0, 0.0, 0.0)
-
-    segs: List[Dict[str, Any]] = []
-    rapid_mm = cut_mm = 0.0
-    tool_changes: List[Dict[str, Any]] = []
-
-    warn: Dict[str, Any] = {
-        "unsupported_g": set(),
-        "unsupported_m": set(),
-        "ignored_offsets": set(),
-        "approx_cycles": set(),
-        "non_xy_arcs": 0,
-        "degenerate_arcs": 0,
-        "truncated": False,
-        "dropped_segments": 0,
-    }
-
-    inf = float("inf")
-    bb: Dict[str, float] = {
-        "x_min": inf, "x_max": -inf,
-        "y_min": inf, "y_max": -inf,
-        "z_min": inf, "z_max": -inf,
-    }
-
-    def _expand_bb(x: float, y: float, z: float) -> None:
-        bb["x_min"] = min(bb["x_min"], x)
-        bb["x_max"] = max(bb["x_max"], x)
-        bb["y_min"] = min(bb["y_min"], y)
-        bb["y_max"] = max(bb["y_max"], y)
-        bb["z_min"] = min(bb["z_min"], z)
-        bb["z_max"] = max(bb["z_max"], z)
-
-    def _emit(
-        seg_type: str,
-        from_p: Tuple[float, float, float],
-        to_p: Tuple[float, float, float],
-        feed: float,
-        line_number: int,
-        line_text: str,
-        *,
-        is_cycle: bool = False,
-        cycle_kind: str = "",
-        duration_override: Optional[float] = None,
-    ) -> None:
-        if max_segments is not None and len(segs) >= max_segments:
-            warn["truncated"] = True
-            warn["dropped_segments"] += 1
-            return
-        if duration_override is not None:
-            duration_ms = duration_override
-        else:
-            dist = math.dist(from_p, to_p)        # 3D — timing includes Z (X1)
-            duration_ms = (dist / max(1e-6, feed)) * 60_000.0
-        segs.append({
-            "type": seg_type,
-            "from_pos": list(from_p),
-            "to_pos": list(to_p),
-            "feed": feed,
-            "duration_ms": duration_ms,
-            "line_number": line_number,
-            "line_text": line_text,
-            "tool_number": modal.get("T", 1),
-            "spindle_rpm": modal.get("S", 0.0),
-            "spindle_on": modal.get("spindle_on", False),
-            "is_cycle": is_cycle,
-            "cycle_kind": cycle_kind,
-        })
-        # Bound to actual destinations only. Segments chain (each from_pos is the
-        # previous to_pos), so the sole point this omits is the synthetic (0,0,0)
-        # start — which would otherwise frame empty space when a job lives away
-        # from the origin (finding Z3).
-        _expand_bb(*to_p)
-
-    for line_idx, blk in enumerate(prog):
-        w = _parse_block_words(blk, u)
-        prev_tool = modal.get("T", 1)
-        _apply_modal(modal, w["gs"], w["f"], w["t"], w["s"], w["m"], warn)
-        u = modal["units"]
-
-        curr_tool = modal.get("T", 1)
-        if curr_tool != prev_tool:
-            tool_changes.append({
-                "line_number": line_idx + 1,
-                "from_tool": prev_tool,
-                "to_tool": curr_tool,
-                "position": list(pos),
-            })
-
-        absolute = modal["absolute"]
-        if absolute:
-            nx = pos[0] if w["x"] is None else w["x"]
-            ny = pos[1] if w["y"] is None else w["y"]
-            nz = pos[2] if w["z"] is None else w["z"]
-        else:
-            nx = pos[0] + (w["x"] or 0.0)
-            ny = pos[1] + (w["y"] or 0.0)
-            nz = pos[2] + (w["z"] or 0.0)
-
-        line_number = line_idx + 1
-        line_text = blk["raw"].strip()
-
-        # --- Dwell (G4) — no motion, but it consumes time (Z2). ------------
-        if 4 in w["gs"]:
-            dwell_s = w["p"] if w["p"] is not None else 0.0
-            if dwell_s > 0:
-                _emit("dwell", pos, pos, modal["F"], line_number, line_text,
-                      duration_override=dwell_s * 1000.0)
-            continue
-
-        # --- Canned cycle expansion (X2). ---------------------------------
-        cycle = modal["cycle"]
-        if cycle is not None:
-            line_has_cycle = any(g in CANNED for g in w["gs"])
-            if w["z"] is not None:
-                modal["cycle_z"] = nz
-            if w["r"] is not None:
-                modal["cycle_r"] = w["r"] if absolute else pos[2] + w["r"]
-            if w["q"] is not None:
-                modal["cycle_q"] = abs(w["q"])
-            if w["f"] is not None:
-                modal["cycle_f"] = modal["F"]
-            if line_has_cycle and not modal["cycle_active"]:
-                modal["cycle_initial_z"] = pos[2]
-                modal["cycle_active"] = True
-
-            triggered = line_has_cycle or (w["x"] is not None or w["y"] is not None)
-            if triggered:
-                # Reposition in XY at the current Z before drilling.
-                if abs(nx - pos[0]) > 1e-9 or abs(ny - pos[1]) > 1e-9:
-                    _emit("rapid", pos, (nx, ny, pos[2]), rapid_mm_min,
-                          line_number, line_text)
-                    rapid_mm += math.hypot(nx - pos[0], ny - pos[1])
-                    pos = (nx, ny, pos[2])
-
-                z_depth = modal["cycle_z"] if modal["cycle_z"] is not None else pos[2]
-                r_plane = modal["cycle_r"] if modal["cycle_r"] is not None else pos[2]
-                q_peck = modal["cycle_q"]
-                cfeed = modal["cycle_f"] if modal["cycle_f"] is not None else modal["F"]
-                init_z = modal["cycle_initial_z"]
-
-                moves, ret_z, approx = _expand_canned_cycle(
-                    cycle, nx, ny, pos[2], init_z, r_plane, z_depth,
-                    q_peck, cfeed, rapid_mm_min, modal["return_mode"],
-                )
-                if approx:
-                    warn["approx_cycles"].add(cycle)
-                cycle_kind = f"G{cycle}"
-                for mt, fp, tp, fd in moves:
-                    _emit(mt, fp, tp, fd, line_number, line_text,
-                          is_cycle=True, cycle_kind=cycle_kind)
-                    if mt == "rapid":
-                        rapid_mm += math.hypot(tp[0] - fp[0], tp[1] - fp[1])
-                    else:
-                        cut_mm += math.hypot(tp[0] - fp[0], tp[1] - fp[1])
-                pos = (nx, ny, ret_z)
-            continue
-
-        # --- Ordinary motion. ---------------------------------------------
-        code = modal["G"]
-        has_arc = (
-            w["i"] is not None or w["j"] is not None
-            or w["k"] is not None or w["r"] is not None
-        )
-        position_changed = (
-            abs(nx - pos[0]) > 1e-12
-            or abs(ny - pos[1]) > 1e-12
-            or abs(nz - pos[2]) > 1e-12
-        )
-
-        if code in (0, 1) and position_changed:
-            seg_type = "rapid" if code == 0 else "cut"
-            feed = rapid_mm_min if code == 0 else modal["F"]
-            _emit(seg_type, pos, (nx, ny, nz), feed, line_number, line_text)
-            dist_xy = math.hypot(nx - pos[0], ny - pos[1])
-            if code == 0:
-                rapid_mm += dist_xy
-            else:
-                cut_mm += dist_xy
-            pos = (nx, ny, nz)
-
-        elif code in (2, 3) and (position_changed or has_arc):
-            plane = modal["plane"]
-            cw = code == 2
-            seg_type = "arc_cw" if cw else "arc_ccw"
-            if plane != 17:
-                warn["non_xy_arcs"] += 1
-
-            center2 = _arc_center(plane, pos, nx, ny, nz, w, cw)
-            if center2 is not None:
-                waypoints = interpolate_arc(
-                    pos, (nx, ny, nz), center2, cw, plane, arc_resolution_deg
-                )
-                cur = pos
-                for wp in waypoints:
-                    _emit(seg_type, cur, wp, modal["F"], line_number, line_text)
-                    cut_mm += math.hypot(wp[0] - cur[0], wp[1] - cur[1])
-                    cur = wp
-            else:
-                # Degenerate / unresolvable arc: draw a straight cut so the path
-                # still reaches the endpoint instead of desyncing (Y2/Y3).
-                warn["degenerate_arcs"] += 1
-                _emit("cut", pos, (nx, ny, nz), modal["F"], line_number, line_text)
-                cut_mm += math.hypot(nx - pos[0], ny - pos[1])
+    # segment_stream imports this module's state-machine helpers
+    from .segment_stream import SegmentStream
 
-            pos = (nx, ny, nz)   # always advance, even on fallback
+    stream = SegmentStream(
+        gcode,
+        rapid_mm_min=rapid_mm_min,
+        default_feed_mm_min=default_feed_mm_min,
+        units=units,
+        arc_resolution_deg=arc_resolution_deg,
+        max_segments=max_segments,
+    )
+    segs = list(stream)
+    out = stream.summary()
 
     # Optional trapezoidal accel/decel timing (constant-velocity if disabled).
     if accel_mm_s2 is not None and accel_mm_s2 > 0:
         _apply_accel_profile(segs, accel_mm_s2, junction_deviation_mm)
+        out["totals"]["time_min"] = sum(s["duration_ms"] for s in segs) / 60_000.0
 
-    # Normalise an empty bounding box to zeros.
-    if not segs:
-        for key in bb:
-            bb[key] = 0.0
-
-    total_time_min = sum(s["duration_ms"] for s in segs) / 60_000.0
-    tools_used = sorted({s.get("tool_number", 1) for s in segs})
-
-    warnings_out = {
-        "unsupported_g": sorted(warn["unsupported_g"]),
-        "unsupported_m": sorted(warn["unsupported_m"]),
-        "ignored_offsets": sorted(warn["ignored_offsets"]),
-        "approx_cycles": sorted(warn["approx_cycles"]),
-        "non_xy_arcs": warn["non_xy_arcs"],
-        "degenerate_arcs": warn["degenerate_arcs"],
-        "truncated": warn["truncated"],
-        "dropped_segments": warn["dropped_segments"],
-    }
+    return {"segments": segs, **out}
 
-    return {
-        "segments": segs,
-        "bounds": bb,
-        "totals": {
-            "rapid_mm": rapid_mm,
-            "cut_mm": cut_mm,
-            "time_min": total_time_min,
-            "segment_count": len(segs),
-        },
-        "tools": {
-            "used": tools_used,
-            "count": len(tools_used),
-            "changes": tool_changes,
-        },
-        "warnings": warnings_out,
-    }
 
 
 def simulate(
@@ -0,0 +1,462 @@
+"""
+G-code Stock Removal Simulation
+
+Heightfield (Z-dexel) material removal driven by the simulator's segment
+stream. The stock is a regular XY grid of column tops; each segment sweeps the
+active tool's profile (flat, ball or V) over the cells it can reach and lowers
+them to the tool's lower envelope.
+
+Per move the engine records removed volume, so callers get material removal
+rate (MRR) and air-cutting (feed moves that remove nothing) for free. The grid
+is checkpointed every ``snapshot_every`` moves; :meth:`StockSimulator.heightfield_at`
+restores the nearest checkpoint and replays at most ``snapshot_every - 1``
+moves, so scrubbing through a program never re-simulates from zero.
+
+Memory is bounded up front: grids finer than ``MIN_CELL_MM`` or larger than
+``MAX_GRID_CELLS`` are rejected, and checkpoints share a byte budget
+(``SNAPSHOT_BUDGET_BYTES``) on top of the ``max_snapshots`` count.
+
+Example:
+    sim = StockSimulator(StockGrid.from_bounds(0, 400, 0, 200, cell_mm=0.5, z_top=0.0),
+                         ToolShape("ball", 6.0))
+    sim.run(SegmentStream(gcode))
+    sim.summary()["removed_mm3"], sim.heightfield_at(1200)
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from .segment_stream import SEGMENT_TYPE_CODES
+
+# Removal below this volume (mm^3) counts as air.
+AIR_EPS_MM3 = 1e-6
+
+# Grid limits: finest cell and most cells (4M float32 heights = 16 MB per copy)
+MIN_CELL_MM = 0.05
+MAX_GRID_CELLS = 4_000_000
+
+# Checkpoint memory per simulator; caps max_snapshots for large grids
+SNAPSHOT_BUDGET_BYTES = 64 * 1024 * 1024
+
+_RAPID = SEGMENT_TYPE_CODES["rapid"]
+_DWELL = SEGMENT_TYPE_CODES["dwell"]
+
+# tool_table "type" values -> ToolShape.kind
+_TABLE_KINDS = {
+    "EM": "flat", "FLAT": "flat", "ENDMILL": "flat",
+    "BN": "ball", "BALL": "ball", "BALLNOSE": "ball",
+    "V": "v", "VBIT": "v", "VEE": "v", "ENGRAVE": "v",
+}
+
+
+@dataclass(frozen=True)
+class ToolShape:
+    """Axis-symmetric cutter profile measured up from the tip."""
+    kind: str = "flat"  # "flat" | "ball" | "v"
+    diameter_mm: float = 6.0
+    angle_deg: float = 90.0  # included angle, V bits only
+
+    @property
+    def radius(self) -> float:
+        return self.diameter_mm / 2.0
+
+    def profile(self, d: np.ndarray) -> np.ndarray:
+        """Height of the cutting surface above the tip at radial distance *d*.
+
+        Cells outside the radius get ``inf`` so they are never cut.
+        """
+        r = self.radius
+        inside = d <= r
+        if self.kind == "ball":
+            h = r - np.sqrt(np.maximum(r * r - d * d, 0.0))
+        elif self.kind == "v":
+            h = d / math.tan(math.radians(self.angle_deg) / 2.0)
+        else:
+            h = np.zeros_like(d)
+        return np.where(inside, h, np.inf)
+
+
+def tool_shape_from_table(machine_id: str, tool_number: int) -> Optional[ToolShape]:
+    """Build a :class:`ToolShape` from a ``tool_table`` entry (None if unknown)."""
+    from ..tool_table import get_tool
+
+    t = get_tool(machine_id, tool_number)
+    if not t or not t.get("dia_mm"):
+        return None
+    kind = _TABLE_KINDS.get(str(t.get("type", "EM")).upper().replace("-", ""), "flat")
+    return ToolShape(kind, float(t["dia_mm"]), float(t.get("angle_deg") or 90.0))
+
+
+@dataclass(frozen=True)
+class StockGrid:
+    """XY sampling of the stock: cell (i, j) is centred at x_min + (i + 0.5) * cell_mm."""
+    x_min: float
+    y_min: float
+    cell_mm: float
+    nx: int
+    ny: int
+    z_top: float = 0.0
+    z_bottom: Optional[float] = None
+
+    @classmethod
+    def from_bounds(
+        cls,
+        x_min: float,
+        x_max: float,
+        y_min: float,
+        y_max: float,
+        *,
+        cell_mm: float = 0.5,
+        z_top: float = 0.0,
+        z_bottom: Optional[float] = None,
+        max_cells: int = MAX_GRID_CELLS,
+    ) -> "StockGrid":
+        """Grid covering the given extents.
+
+        Raises:
+            ValueError: If *cell_mm* is below MIN_CELL_MM or the grid would
+                exceed *max_cells* cells.
+        """
+        if not cell_mm >= MIN_CELL_MM:
+            raise ValueError(f"cell_mm must be at least {MIN_CELL_MM} mm (got {cell_mm})")
+        nx = max(1, int(math.ceil((x_max - x_min) / cell_mm)))
+        ny = max(1, int(math.ceil((y_max - y_min) / cell_mm)))
+        if nx * ny > max_cells:
+            raise ValueError(
+                f"Stock grid of {nx} x {ny} cells exceeds the limit of {max_cells}; "
+                f"use a larger cell_mm or a smaller stock"
+            )
+        return cls(x_min, y_min, cell_mm, nx, ny, z_top, z_bottom)
+
+    @property
+    def cells(self) -> int:
+        return self.nx * self.ny
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "x_min": self.x_min, "y_min": self.y_min, "cell_mm": self.cell_mm,
+            "nx": self.nx, "ny": self.ny, "z_top": self.z_top, "z_bottom": self.z_bottom,
+        }
+
+
+class StockSimulator:
+    """Incremental heightfield material removal with periodic snapshots.
+
+    Args:
+        grid: Stock sampling and top/bottom Z.
+        tools: One shape for every tool, or a mapping of tool number -> shape
+            (``default_tool`` covers numbers missing from the mapping).
+        tool_resolver: Optional lookup (e.g. :func:`tool_shape_from_table`)
+            consulted once per tool number missing from *tools*.
+        snapshot_every: Checkpoint interval in moves.
+        max_snapshots: When exceeded, every other checkpoint is dropped and
+            the interval doubles, bounding memory on very long programs.
+        max_snapshot_bytes: Checkpoint memory budget; lowers ``max_snapshots``
+            to what fits for this grid (never below 2).
+    """
+
+    def __init__(
+        self,
+        grid: StockGrid,
+        tools: Union[ToolShape, Mapping[int, ToolShape]],
+        *,
+        default_tool: Optional[ToolShape] = None,
+        tool_resolver: Optional[Callable[[int], Optional[ToolShape]]] = None,
+        snapshot_every: int = 500,
+        max_snapshots: int = 256,
+        max_snapshot_bytes: int = SNAPSHOT_BUDGET_BYTES,
+    ) -> None:
+        self.grid = grid
+        if isinstance(tools, ToolShape):
+            self.tools: Dict[int, ToolShape] = {}
+            self.default_tool = tools
+        else:
+            self.tools = dict(tools)
+            self.default_tool = default_tool or ToolShape()
+        self.tool_resolver = tool_resolver
+        self.snapshot_every = max(1, int(snapshot_every))
+
+        self.heights = np.full((grid.ny, grid.nx), grid.z_top, dtype=np.float32)
+        self.max_snapshots = max(
+            2, min(int(max_snapshots), int(max_snapshot_bytes) // self.heights.nbytes)
+        )
+        xs = grid.x_min + (np.arange(grid.nx) + 0.5) * grid.cell_mm
+        ys = grid.y_min + (np.arange(grid.ny) + 0.5) * grid.cell_mm
+        self._xs = xs
+        self._ys = ys
+        self._cell_area = grid.cell_mm * grid.cell_mm
+
+        # Compact per-move columns (replay input and report output)
+        self._xyz = array("d")  # from_x, from_y, from_z, to_x, to_y, to_z per move
+        self._tool = array("i")
+        self._type = array("b")
+        self._line = array("i")
+        self._duration_ms = array("d")
+        self._removed = array("d")
+
+        self._snap_moves: List[int] = [0]
+        self._snaps: List[np.ndarray] = [self.heights.copy()]
+
+    # ------------------------------------------------------------------
+    # Feeding
+    # ------------------------------------------------------------------
+
+    @property
+    def move_count(self) -> int:
+        return len(self._removed)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate retained memory: heights, checkpoints and move columns."""
+        columns = (self._xyz, self._tool, self._type, self._line, self._duration_ms, self._removed)
+        return (
+            self.heights.nbytes * (1 + len(self._snaps))
+            + sum(len(c) * c.itemsize for c in columns)
+        )
+
+    def feed(self, seg: Dict[str, Any]) -> float:
+        """Apply one simulator segment; returns the volume it removed (mm^3)."""
+        fp, tp = seg["from_pos"], seg["to_pos"]
+        tool_no = int(seg.get("tool_number", 1))
+        kind = SEGMENT_TYPE_CODES.get(seg.get("type", "cut"), 1)
+        removed = 0.0
+        if kind != _DWELL:
+            removed = self._cut(self.heights, fp, tp, self._tool_for(tool_no))
+
+        self._xyz.extend((fp[0], fp[1], fp[2], tp[0], tp[1], tp[2]))
+        self._tool.append(tool_no)
+        self._type.append(kind)
+        self._line.append(int(seg.get("line_number", 0)))
+        self._duration_ms.append(float(seg.get("duration_ms", 0.0)))
+        self._removed.append(removed)
+
+        if self.move_count % self.snapshot_every == 0:
+            self._snap_moves.append(self.move_count)
+            self._snaps.append(self.heights.copy())
+            if len(self._snaps) > self.max_snapshots:
+                self._thin_snapshots()
+        return removed
+
+    def run(self, segments: Iterable[Dict[str, Any]]) -> "StockSimulator":
+        """Consume a segment stream (e.g. :class:`SegmentStream`)."""
+        for seg in segments:
+            self.feed(seg)
+        return self
+
+    def _thin_snapshots(self) -> None:
+        self.snapshot_every *= 2
+        keep = [k for k, m in enumerate(self._snap_moves) if m % self.snapshot_every == 0]
+        self._snap_moves = [self._snap_moves[k] for k in keep]
+        self._snaps = [self._snaps[k] for k in keep]
+
+    def _tool_for(self, tool_no: int) -> ToolShape:
+        tool = self.tools.get(tool_no)
+        if tool is None:
+            resolved = self.tool_resolver(tool_no) if self.tool_resolver else None
+            tool = self.tools[tool_no] = resolved or self.default_tool
+        return tool
+
+    # ------------------------------------------------------------------
+    # Sweep
+    # ------------------------------------------------------------------
+
+    def _cut(
+        self,
+        heights: np.ndarray,
+        fp: Tuple[float, float, float],
+        tp: Tuple[float, float, float],
+        tool: ToolShape,
+    ) -> float:
+        """Lower *heights* to the tool's swept envelope; returns removed volume."""
+        g = self.grid
+        x0, y0, z0 = fp
+        x1, y1, z1 = tp
+        if min(z0, z1) >= g.z_top:
+            return 0.0  # entirely above the stock (rapids, retracts)
+
+        r = tool.radius
+        i_lo = max(0, int((min(x0, x1) - r - g.x_min) / g.cell_mm))
+        i_hi = min(g.nx, int((max(x0, x1) + r - g.x_min) / g.cell_mm) + 1)
+        j_lo = max(0, int((min(y0, y1) - r - g.y_min) / g.cell_mm))
+        j_hi = min(g.ny, int((max(y0, y1) + r - g.y_min) / g.cell_mm) + 1)
+        if i_lo >= i_hi or j_lo >= j_hi:
+            return 0.0
+
+        X = self._xs[i_lo:i_hi][None, :]
+        Y = self._ys[j_lo:j_hi][:, None]
+
+        # Sloped moves are split so each piece spans at most half a cell in Z;
+        # within a piece the tip sits at the piece's lowest Z.
+        pieces = min(64, max(1, int(math.ceil(abs(z1 - z0) / (0.5 * g.cell_mm)))))
+        envelope = None
+        for k in range(pieces):
+            a, b = k / pieces, (k + 1) / pieces
+            ax, ay = x0 + (x1 - x0) * a, y0 + (y1 - y0) * a
+            bx, by = x0 + (x1 - x0) * b, y0 + (y1 - y0) * b
+            z_tip = min(z0 + (z1 - z0) * a, z0 + (z1 - z0) * b)
+            if z_tip >= g.z_top:
+                continue
+            dx, dy = bx - ax, by - ay
+            seg_len2 = dx * dx + dy * dy
+            if seg_len2 > 1e-18:
+                t = np.clip(((X - ax) * dx + (Y - ay) * dy) / seg_len2, 0.0, 1.0)
+                d = np.hypot(X - (ax + t * dx), Y - (ay + t * dy))
+            else:
+                d = np.hypot(X - ax, Y - ay)
+            piece_env = z_tip + tool.profile(d)
+            envelope = piece_env if envelope is None else np.minimum(envelope, piece_env)
+
+        if envelope is None:
+            return 0.0
+        if g.z_bottom is not None:
+            envelope = np.maximum(envelope, g.z_bottom)
+
+        window = heights[j_lo:j_hi, i_lo:i_hi]
+        lowered = np.minimum(window, envelope)
+        removed = float(np.sum(window - lowered, dtype=np.float64)) * self._cell_area
+        window[...] = lowered
+        return removed
+
+    # ------------------------------------------------------------------
+    # Scrubbing
+    # ------------------------------------------------------------------
+
+    def heightfield_at(self, move: Optional[int] = None) -> np.ndarray:
+        """Stock heights after the first *move* moves (default: all of them).
+
+        Restores the nearest earlier snapshot and replays the remainder.
+        """
+        n = self.move_count
+        move = n if move is None else max(0, min(int(move), n))
+        if move == n:
+            return self.heights.copy()
+
+        k = bisect.bisect_right(self._snap_moves, move) - 1
+        heights = self._snaps[k].copy()
+        xyz = self._xyz
+        for m in range(self._snap_moves[k], move):
+            if self._type[m] == _DWELL:
+                continue
+            o = 6 * m
+            self._cut(
+                heights,
+                (xyz[o], xyz[o + 1], xyz[o + 2]),
+                (xyz[o + 3], xyz[o + 4], xyz[o + 5]),
+                self._tool_for(self._tool[m]),
+            )
+        return heights
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def _feed_mask(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        types = np.array(self._type, dtype=np.int8)
+        removed = np.array(self._removed, dtype=np.float64)
+        feeding = (types != _RAPID) & (types != _DWELL)
+        return types, removed, feeding
+
+    def move_columns(self) -> Dict[str, List[Any]]:
+        """Per-move columns: line, removed volume, MRR (mm^3/min) and air-cut flag."""
+        _, removed, feeding = self._feed_mask()
+        minutes = np.array(self._duration_ms, dtype=np.float64) / 60_000.0
+        mrr = np.divide(removed, minutes, out=np.zeros_like(removed), where=minutes > 0)
+        return {
+            "line_number": list(self._line),
+            "removed_mm3": removed.tolist(),
+            "mrr_mm3_min": mrr.tolist(),
+            "air": (feeding & (removed <= AIR_EPS_MM3)).tolist(),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals for removed volume, MRR, air cutting and rapid gouges."""
+        types, removed, feeding = self._feed_mask()
+        duration = np.array(self._duration_ms, dtype=np.float64)
+        xyz = np.array(self._xyz, dtype=np.float64).reshape(-1, 6)
+        length = np.linalg.norm(xyz[:, 3:] - xyz[:, :3], axis=1) if len(xyz) else np.zeros(0)
+        air = feeding & (removed <= AIR_EPS_MM3)
+        cutting = feeding & ~air
+        cut_min = float(duration[cutting].sum()) / 60_000.0
+        mrr = np.divide(
+            removed, duration / 60_000.0, out=np.zeros_like(removed), where=duration > 0
+        )
+        gouges = (types == _RAPID) & (removed > AIR_EPS_MM3)
+        return {
+            "grid": self.grid.describe(),
+            "move_count": self.move_count,
+            "removed_mm3": float(removed.sum()),
+            "mrr": {
+                "peak_mm3_min": float(mrr.max()) if mrr.size else 0.0,
+                "mean_mm3_min": float(removed[cutting].sum()) / cut_min if cut_min > 0 else 0.0,
+            },
+            "air_cut": {
+                "moves": int(air.sum()),
+                "mm": float(length[air].sum()),
+                "time_min": float(duration[air].sum()) / 60_000.0,
+                "fraction_of_feed_time": (
+                    float(duration[air].sum() / duration[feeding].sum())
+                    if duration[feeding].sum() > 0 else 0.0
+                ),
+            },
+            "rapid_gouges": {
+                "moves": int(gouges.sum()),
+                "first_lines": [int(self._line[m]) for m in np.flatnonzero(gouges)[:10]],
+            },
+            "snapshots": {"count": len(self._snaps), "every": self.snapshot_every},
+        }
+
+
+def stock_grid_for_segments(
+    segments: Iterable[Dict[str, Any]],
+    *,
+    margin_mm: float,
+    cell_mm: float = 0.5,
+    z_top: Optional[float] = None,
+    z_bottom: Optional[float] = None,
+    max_cells: int = MAX_GRID_CELLS,
+) -> StockGrid:
+    """Size a grid around the feed moves of *segments* (plus *margin_mm*).
+
+    Bounds are taken in one pass without buffering the segments, so pass a
+    re-iterable source (a list, or a fresh :class:`SegmentStream` over the same
+    program) and feed it to the simulator afterwards. ``z_top`` defaults to 0.0
+    (work zero on the stock top), or the highest feed Z if every feed move is
+    above zero.
+
+    Raises:
+        ValueError: If the grid would exceed *max_cells* cells.
+    """
+    inf = float("inf")
+    feed_lo, feed_hi = [inf] * 3, [-inf] * 3
+    all_lo, all_hi = [inf] * 3, [-inf] * 3
+    for s in segments:
+        feed = s.get("type") not in ("rapid", "dwell")
+        for p in (s["from_pos"], s["to_pos"]):
+            for k in range(3):
+                v = p[k]
+                if v < all_lo[k]:
+                    all_lo[k] = v
+                if v > all_hi[k]:
+                    all_hi[k] = v
+                if feed:
+                    if v < feed_lo[k]:
+                        feed_lo[k] = v
+                    if v > feed_hi[k]:
+                        feed_hi[k] = v
+
+    lo, hi = (feed_lo, feed_hi) if feed_lo[0] != inf else (all_lo, all_hi)
+    if lo[0] == inf:
+        return StockGrid.from_bounds(0.0, 1.0, 0.0, 1.0, cell_mm=cell_mm, max_cells=max_cells)
+    if z_top is None:
+        z_top = 0.0 if lo[2] < 0.0 else float(hi[2])
+    return StockGrid.from_bounds(
+        float(lo[0]) - margin_mm, float(hi[0]) + margin_mm,
+        float(lo[1]) - margin_mm, float(hi[1]) + margin_mm,
+        cell_mm=cell_mm, z_top=z_top, z_bottom=z_bottom, max_cells=max_cells,
+    )
@@ -14,6 +14,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request
 from app.middleware.rate_limit import limiter, rate_limit_tier
 
 from app.ai.transport import get_vision_client
+from app.core.compute_dispatch import run_compute
 from app.rmos.runs_v2.attachments import put_bytes_attachment
 from app.vision.schemas import (
     SegmentResponse,
@@ -72,8 +73,11 @@ async def segment_guitar(
     except (ValueError, TypeError, RuntimeError, OSError) as e:  # WP-1: governance catch-all — HTTP endpoint
         raise HTTPException(status_code=503, detail=f"Vision service unavailable: {e}")
 
-    # Run segmentation
-    result = service.segment(
+    # Run segmentation (off the event loop)
+    result = await run_compute(
+        "vision_segment",
+        service.segment,
+        request=request,
         image_bytes=image_bytes,
         target_width_mm=target_width_mm,
         simplify_tolerance_mm=simplify_tolerance_mm,
@@ -140,6 +144,7 @@ async def segment_guitar(
 
 @router.post("/photo-to-gcode", response_model=PhotoToGcodeResponse, summary="Convert photo to G-code")
 async def photo_to_gcode(
+    request: Request,
     file: UploadFile = File(..., description="Guitar image (PNG, JPG, WebP)"),
     target_width_mm: float = Form(400.0, description="Target body width in mm"),
     simplify_tolerance_mm: float = Form(1.0, description="Simplification tolerance"),
@@ -175,7 +180,10 @@ async def photo_to_gcode(
     try:
         vision_client = get_vision_client("openai")
         service = GuitarSegmentationService(vision_client)
-        seg_result = service.segment(
+        seg_result = await run_compute(
+            "vision_segment",
+            service.segment,
+            request=request,
             image_bytes=image_bytes,
             target_width_mm=target_width_mm,
             simplify_tolerance_mm=simplify_tolerance_mm,
@@ -249,8 +257,8 @@ async def photo_to_gcode(
             z_rough=-stepdown_mm,
         )
 
-        # Call planner
-        plan_result = plan(plan_request)
+        # Call planner (CPU-bound: process lane)
+        plan_result = await run_compute("cam_plan", plan, plan_request, request=request)
     except HTTPException:
         raise
     except (ValueError, TypeError, KeyError, RuntimeError) as e:  # WP-1: governance catch-all — HTTP endpoint
@@ -0,0 +1,117 @@
+"""
+Compiled Toolpath Tests
+
+Covers the vectorized cycle-time engine used by the what-if optimizer:
+  - compile_toolpath() segment arrays (lengths, rapids, engagement, turns, dz)
+  - estimate_cycle_time_compiled() parity with estimate_cycle_time_v2()
+  - optimize_feed_stepover() ranking parity with the per-cell reference
+"""
+
+import math
+import random
+
+import pytest
+
+from app.cam.compiled_toolpath import compile_toolpath, estimate_cycle_time_compiled
+from app.cam.time_estimator_v2 import estimate_cycle_time_v2
+from app.cam.whatif_opt import optimize_feed_stepover
+
+
+PROFILE = {"limits": {"accel": 1200, "jerk": 30000, "rapid": 4000, "feed_xy": 5000}}
+
+
+def _random_moves(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    moves = []
+    for _ in range(n):
+        code = rng.choice(["G0", "G1", "G1", "G2", "G3"])
+        m = {"code": code, "x": rng.uniform(0, 200), "y": rng.uniform(0, 200)}
+        if rng.random() < 0.3:
+            m["z"] = rng.uniform(-3, 5)
+        r = rng.random()
+        if r < 0.15:
+            m["meta"] = {"trochoid": True}
+        elif r < 0.25:
+            m["meta"] = {"slowdown": 0.6}
+        if rng.random() < 0.05:
+            m = {"code": "G1", "z": -1.0}
+        moves.append(m)
+    return moves
+
+
+def _reference_time(moves, feed, **kw):
+    mv = [dict(m, f=feed) if m.get("code") in ("G1", "G2", "G3") else dict(m) for m in moves]
+    return estimate_cycle_time_v2(mv, PROFILE, **kw)["time_s"]
+
+
+class TestCompileToolpath:
+    def test_segment_arrays(self):
+        moves = [
+            {"code": "G0", "x": 0, "y": 0, "z": 5},
+            {"code": "G1", "z": -1},
+            {"code": "G1", "x": 10, "y": 0},
+            {"code": "G2", "x": 10, "y": 10},
+            {"type": "cut", "x": 99, "y": 99},
+        ]
+        ct = compile_toolpath(moves)
+
+        assert ct.segment_count == 3
+        assert ct.move_count == 5
+        assert ct.seg_len.tolist() == [0.0, 10.0, 10.0]
+        assert ct.is_rapid.tolist() == [True, False, False]
+        assert ct.engagement[2] == pytest.approx(0.92)
+        assert ct.dz.tolist() == [0.0, -6.0, 0.0]
+        assert ct.turn_angle[2] == pytest.approx(math.pi / 2)
+
+    def test_empty_moves(self):
+        ct = compile_toolpath([])
+        assert ct.segment_count == 0
+        times = estimate_cycle_time_compiled(ct, PROFILE, [600.0], z_total=-3, stepdown=1, safe_z=5)
+        assert times.shape == (1,)
+
+
+class TestEstimateCycleTimeCompiled:
+    def test_matches_v2_estimator_per_feed(self):
+        moves = _random_moves(800)
+        feeds = [300.0 + 450.0 * i for i in range(12)]
+        ct = compile_toolpath(moves)
+
+        got = estimate_cycle_time_compiled(ct, PROFILE, feeds, z_total=-3.0, stepdown=1.0, safe_z=5.0)
+        want = [_reference_time(moves, f, z_total=-3.0, stepdown=1.0, safe_z=5.0) for f in feeds]
+
+        assert got.tolist() == want
+
+    def test_default_profile_limits(self):
+        moves = _random_moves(200, seed=3)
+        ct = compile_toolpath(moves)
+        got = estimate_cycle_time_compiled(ct, {}, [900.0], z_total=-2.0, stepdown=0.5, safe_z=3.0)
+
+        mv = [dict(m, f=900.0) if m.get("code") in ("G1", "G2", "G3") else m for m in moves]
+        want = estimate_cycle_time_v2(mv, {}, z_total=-2.0, stepdown=0.5, safe_z=3.0)["time_s"]
+        assert got[0] == want
+
+
+class TestOptimizerParity:
+    def test_rankings_match_per_cell_reference(self):
+        moves = _random_moves(500, seed=11)
+        bounds = {"feed": (600, 4000), "stepover": (0.3, 0.6), "rpm": (8000, 18000)}
+        tool = {"flutes": 2, "chipload_target_mm": 0.08}
+
+        res = optimize_feed_stepover(
+            moves, PROFILE, z_total=-3.0, stepdown=1.0, safe_z=5.0,
+            bounds=bounds, tool=tool, grid=(5, 3),
+        )
+
+        best_ref = None
+        for i in range(5):
+            f = 600 + (4000 - 600) * (i / 4)
+            t = _reference_time(moves, f, z_total=-3.0, stepdown=1.0, safe_z=5.0)
+            chip = f / (min(18000, max(8000, f / (0.08 * 2))) * 2)
+            score = t if abs(chip - 0.08) <= 0.02 else t * 1.08
+            if best_ref is None or score < best_ref[1]:
+                best_ref = (round(f, 1), score, t)
+
+        assert res["best"]["feed_mm_min"] == best_ref[0]
+        assert res["best"]["time_s"] == best_ref[2]
+        assert res["best"]["stepover"] == 0.3
+        assert len(res["neighbors"]) == 6
@@ -0,0 +1,133 @@
+"""
+What-If Pareto Optimizer Tests
+
+Covers optimize_pareto():
+  - chipload pruning before evaluation
+  - non-dominated front over time / energy / tool load
+  - refinement stays inside bounds and reuses coarse evaluations
+  - pareto_candidate_bound() bounds the candidates actually generated
+  - time, energy and load trade off across stepover, feed and RPM
+  - optimize_feed_stepover(_objective="pareto") dispatch
+"""
+
+from app.cam.whatif_opt import _chipload_ok, optimize_feed_stepover
+from app.cam.whatif_pareto import (
+    PARETO_KEYS,
+    _pareto_front,
+    optimize_pareto,
+    pareto_candidate_bound,
+)
+
+
+PROFILE = {"limits": {"accel": 1200, "jerk": 30000, "rapid": 4000, "feed_xy": 5000}}
+BOUNDS = {"feed": (600, 5000), "stepover": (0.3, 0.6), "rpm": (8000, 24000)}
+TOOL = {"flutes": 2, "chipload_target_mm": 0.08, "diameter_mm": 6.0}
+
+
+def _zigzag(n: int = 60):
+    moves = [{"code": "G0", "x": 0.0, "y": 0.0}, {"code": "G1", "z": -1.0, "f": 300}]
+    for i in range(1, n):
+        moves.append({"code": "G1", "x": 80.0 * (i % 2), "y": 2.0 * i, "f": 1200})
+    return moves
+
+
+def _run(**kw):
+    args = dict(z_total=-3.0, stepdown=1.0, safe_z=5.0, bounds=BOUNDS, tool=TOOL, grid=(6, 4))
+    args.update(kw)
+    return optimize_pareto(_zigzag(), PROFILE, **args)
+
+
+def test_front_is_non_dominated_and_feasible():
+    res = _run()
+    front = res["front"]
+
+    assert front
+    assert res["best"] == front[0]
+    for p in front:
+        assert _chipload_ok(p["feed_mm_min"], p["rpm"], 2, 0.08, 0.02)
+        for q in front:
+            if p is q:
+                continue
+            dominated = all(q[k] <= p[k] for k in PARETO_KEYS) and any(q[k] < p[k] for k in PARETO_KEYS)
+            assert not dominated
+
+
+def test_pruning_skips_infeasible_chipload():
+    res = _run(levels=0)
+    assert res["pruned"] > 0
+    # Coarse pass: 6 feeds x 4 stepovers x (3 grid RPMs + 1 targeted RPM)
+    assert res["evaluations"] + res["pruned"] <= 6 * 4 * 4
+
+
+def test_candidate_bound_covers_refinement():
+    for levels, max_front in ((0, 12), (3, 12), (4, 2)):
+        res = _run(levels=levels, max_front=max_front)
+        bound = pareto_candidate_bound((6, 4), 3, levels, max_front)
+        assert res["evaluations"] + res["pruned"] <= bound
+
+
+def test_refinement_stays_in_bounds():
+    res = _run(levels=3)
+    for p in res["front"]:
+        assert BOUNDS["feed"][0] <= p["feed_mm_min"] <= BOUNDS["feed"][1]
+        assert BOUNDS["stepover"][0] <= p["stepover"] <= BOUNDS["stepover"][1]
+        assert BOUNDS["rpm"][0] <= p["rpm"] <= BOUNDS["rpm"][1]
+    assert res["grid"]["levels"] == 3
+
+
+def test_refinement_does_not_worsen_fastest_time():
+    coarse = _run(levels=0)
+    refined = _run(levels=2)
+    assert refined["best"]["time_s"] <= coarse["best"]["time_s"]
+    assert refined["evaluations"] >= coarse["evaluations"]
+
+
+def test_front_spans_several_stepovers():
+    res = _run()
+    assert len({p["stepover"] for p in res["front"]}) >= 2
+
+
+def test_objectives_trade_off():
+    samples = _run(levels=0)["front"] + _run(levels=2)["front"]
+    by_cell = {(p["feed_mm_min"], p["stepover"], p["rpm"]): p for p in samples}
+
+    # More stepover: fewer passes (faster) but a wider cut (more load)
+    f, r = next((f, r) for f, s, r in by_cell if s == 0.3 and (f, 0.6, r) in by_cell)
+    narrow, wide = by_cell[(f, 0.3, r)], by_cell[(f, 0.6, r)]
+    assert wide["time_s"] < narrow["time_s"]
+    assert wide["tool_load_n"] > narrow["tool_load_n"]
+
+    # Same feed and stepover, higher RPM: thinner chips cost more energy
+    # but load the tool less, so both ends stay on the front
+    res = optimize_pareto(
+        _zigzag(), PROFILE, z_total=-3.0, stepdown=1.0, safe_z=5.0,
+        bounds=BOUNDS, tool=TOOL, grid=(1, 1), levels=0, tolerance_chip_mm=1.0,
+    )
+    by_rpm = sorted(res["front"], key=lambda p: p["rpm"])
+    slow, fast = by_rpm[0], by_rpm[-1]
+    assert fast["rpm"] > slow["rpm"]
+    assert fast["energy_j"] > slow["energy_j"]
+    assert fast["tool_load_n"] < slow["tool_load_n"]
+
+
+def test_no_feasible_candidates():
+    res = _run(tolerance_chip_mm=0.0, bounds={"feed": (600, 700), "stepover": (0.3, 0.6), "rpm": (20000, 24000)})
+    assert res["front"] == []
+    assert res["best"] is None
+
+
+def test_pareto_front_helper():
+    a = {"time_s": 1.0, "energy_j": 5.0, "tool_load_n": 1.0}
+    b = {"time_s": 2.0, "energy_j": 1.0, "tool_load_n": 1.0}
+    c = {"time_s": 2.0, "energy_j": 5.0, "tool_load_n": 1.0}
+    assert _pareto_front([c, b, a]) == [a, b]
+    assert _pareto_front([]) == []
+
+
+def test_objective_dispatch():
+    res = optimize_feed_stepover(
+        _zigzag(), PROFILE, z_total=-3.0, stepdown=1.0, safe_z=5.0,
+        bounds=BOUNDS, tool=TOOL, _objective="pareto", grid=(4, 3),
+    )
+    assert "front" in res
+    assert "pruned" in res
@@ -170,6 +170,15 @@ def rmos_global_test_isolation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     except Exception:
         pass  # rate_limit module not available in all test contexts
 
+    # Vectorization result cache: per-test directory, so results cached by one
+    # test (or by a stubbed orchestrator) are never served to another.
+    monkeypatch.setenv("VECTORIZE_CACHE_DIR", str(tmp_path / "vectorize_cache"))
+    try:
+        from app.services import vectorize_cache
+        monkeypatch.setattr(vectorize_cache, "_cache", None)
+    except ImportError:
+        pass
+
     # --- 2) Learned overrides isolation (Saw Lab) ---
     # If the overrides hook is enabled, it will read this file.
     overrides_path = tmp_path / "learned_overrides.json"
@@ -55,3 +55,28 @@ def test_batch_summary_rolls_up_counts_latest_and_status_risk():
     assert out["overall_risk"] == "GREEN"
     assert out["first_seen_utc"] == "2026-01-01T00:00:00+00:00"
     assert out["last_seen_utc"] == "2026-01-01T00:04:00+00:00"
+
+
+def test_batch_summary_uses_bulk_get_many_port():
+    artifacts = [
+        {"id": "spec1", "kind": "saw_batch_spec", "index_meta": {"session_id": "s1", "batch_label": "b1"}, "payload": {"created_utc": "2026-01-01T00:00:00+00:00"}},
+        {"id": "plan1", "kind": "saw_batch_plan", "index_meta": {"session_id": "s1", "batch_label": "b1", "parent_batch_spec_artifact_id": "spec1"}, "payload": {"created_utc": "2026-01-01T00:01:00+00:00", "status": "OK"}},
+    ]
+    ports = _FakePorts(artifacts)
+    calls = []
+
+    def _get_many(ids):
+        calls.append(list(ids))
+        return {i: ports.get_run(i) for i in ids}
+
+    def _no_single_get(artifact_id):
+        raise AssertionError("get_run should not be used when get_many is wired")
+
+    out = build_batch_summary(
+        BatchSummaryPorts(list_runs_filtered=ports.list_runs_filtered, get_run=_no_single_get, get_many=_get_many),
+        session_id="s1",
+        batch_label="b1",
+    )
+    assert len(calls) == 1 and sorted(calls[0]) == ["plan1", "spec1"]
+    assert out["counts_by_type"]["plan"] == 1
+    assert out["last_seen_utc"] == "2026-01-01T00:01:00+00:00"
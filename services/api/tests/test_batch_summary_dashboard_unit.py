@@ -68,3 +68,27 @@ def test_build_batch_summary_dashboard_card_counts_latest_and_links(monkeypatch)
         "job_log_heuristic",
     }
     assert "batch_audit_export_zip" in (out["links"] or {})
+
+
+def test_dashboard_card_hydrates_kpi_payloads_in_one_bulk_read(monkeypatch):
+    def _fake_list_batch_tree(**kwargs):
+        return {
+            "root_artifact_id": "spec1",
+            "node_count": 3,
+            "nodes": [
+                {"id": "spec1", "kind": "saw_batch_spec", "created_utc": "2026-01-01T00:00:00+00:00"},
+                {"id": "jl1", "kind": "saw_batch_job_log", "created_utc": "2026-01-01T00:03:00+00:00"},
+                {"id": "jl2", "kind": "saw_batch_job_log", "created_utc": "2026-01-01T00:04:00+00:00"},
+            ],
+        }
+
+    monkeypatch.setattr(batch_tree_module, "list_batch_tree", _fake_list_batch_tree)
+    calls = []
+
+    def _get_many(ids):
+        calls.append(sorted(ids))
+        return {i: {"id": i, "payload": {"statistics": {"cut_count": 2}}} for i in ids}
+
+    out = build_batch_summary_dashboard_card(session_id="s1", batch_label="b1", get_many=_get_many)
+    assert calls == [["jl1", "jl2"]]
+    assert out["kpi_rollup"]["kpis"]["total_cut_count"] == 4
@@ -148,3 +148,49 @@ def test_what_if_invalid_profile(client):
     )
     assert response.status_code == 404
     assert "profile" in response.json()["detail"].lower()
+
+
+def test_what_if_pareto_objective(client):
+    """objective=pareto returns a Pareto front with pruning stats."""
+    moves = [{"code": "G0", "x": 0, "y": 0}] + [
+        {"code": "G1", "x": float(10 * (i % 2)), "y": float(i), "f": 1000}
+        for i in range(1, 20)
+    ]
+    response = client.post(
+        "/api/cam/opt/what_if",
+        json={
+            "moves": moves,
+            "machine_profile_id": "GRBL_3018_Default",
+            "objective": "pareto",
+            "grid": [4, 3],
+            "levels": 1,
+        },
+    )
+    assert response.status_code == 200
+    opt = response.json()["opt"]
+    assert "front" in opt
+    assert opt["evaluations"] + opt["pruned"] > 0
+
+
+def test_what_if_pareto_workload_counts_rpm_steps_and_refinement(client, monkeypatch):
+    """Pareto mode bounds coarse RPM steps and refinement probes, not just the grid."""
+    from app.cam.whatif_pareto import pareto_candidate_bound
+
+    body = {
+        "moves": [{"type": "rapid", "x": 0, "y": 0, "z": 5}],
+        "machine_profile_id": "GRBL_3018_Default",
+        "objective": "pareto",
+        "grid": [10, 10],
+        "rpm_steps": 3,
+        "levels": 1,
+    }
+    bound = pareto_candidate_bound((10, 10), 3, 1)
+    assert bound == 10 * 10 * 4 + 12 * 36
+    monkeypatch.setenv(WHATIF_MAX_WORK_UNITS_ENV, str(bound - 1))
+    response = client.post("/api/cam/opt/what_if", json=body)
+    assert response.status_code == 400
+    assert "refinement rounds" in response.json()["detail"].lower()
+
+    # The same grid is fine for the time objective
+    body["objective"] = "time"
+    assert client.post("/api/cam/opt/what_if", json=body).status_code == 200
@@ -0,0 +1,236 @@
+# tests/test_carving_drop_cutter.py
+
+"""
+Tests for vectorized graduation-map evaluation and drop-cutter finishing (BEN-GAP-08)
+
+Validates:
+- Array thickness / outline / contour evaluation matches the scalar versions
+- Drop-cutter tip Z for ball, flat and bull-nose tools on flat and sloped surfaces
+- Finishing passes carry tool compensation without gouging the surface
+- Roughing uses the same tool-tip Z convention plus the finish allowance
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.cam.carving import (
+    CarvingToolSpec,
+    GraduationMap,
+    SurfaceCarvingGenerator,
+    SurfaceType,
+    create_benedetto_17_config,
+    create_les_paul_1959_asymmetric_config,
+    create_les_paul_top_config,
+)
+from app.cam.carving.drop_cutter import HeightGrid, cutter_profile, drop_cutter_z
+from app.cam.carving.graduation_map_array import (
+    inside_outline_array,
+    surface_z_array,
+    thickness_array,
+)
+
+
+def _maps():
+    configs = [
+        create_benedetto_17_config(),
+        create_les_paul_top_config(),
+        create_les_paul_1959_asymmetric_config(),
+    ]
+    for surface in (SurfaceType.CONCAVE, SurfaceType.FREEFORM):
+        config = create_benedetto_17_config()
+        config.graduation_map.surface_type = surface
+        configs.append(config)
+    no_profile = create_les_paul_1959_asymmetric_config()
+    no_profile.graduation_map.asymmetric_profile = None
+    configs.append(no_profile)
+    return [GraduationMap.create_parametric(c.graduation_map) for c in configs]
+
+
+def _random_points(grad_map, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    x_min, x_max = grad_map.config.bounds_x_mm
+    y_min, y_max = grad_map.config.bounds_y_mm
+    x = rng.uniform(x_min * 1.2, x_max * 1.2, n)
+    y = rng.uniform(y_min * 1.2, y_max * 1.2, n)
+    return x, y
+
+
+def _tool(kind, diameter=6.35, corner=0.0):
+    return CarvingToolSpec(
+        tool_number=9, name=kind, diameter_mm=diameter, type=kind,
+        corner_radius_mm=corner,
+    )
+
+
+def _plane_heights(slope, cell_mm=0.25, half_mm=20.0):
+    """Height grid of the plane z = slope * x around the origin."""
+    xs = -half_mm + np.arange(int(2 * half_mm / cell_mm) + 1) * cell_mm
+    z = np.broadcast_to(slope * xs[None, :], (len(xs), len(xs))).copy()
+    return HeightGrid(z=z, x0_mm=-half_mm, y0_mm=-half_mm, cell_mm=cell_mm)
+
+
+# =============================================================================
+# Array evaluation matches scalar
+# =============================================================================
+
+class TestArrayEvaluation:
+
+    @pytest.mark.parametrize("grad_map", _maps())
+    def test_parametric_thickness_matches_scalar(self, grad_map):
+        x, y = _random_points(grad_map)
+        expected = [grad_map.get_thickness_at(px, py) for px, py in zip(x, y)]
+        assert np.array_equal(thickness_array(grad_map, x, y), expected)
+
+    @pytest.mark.parametrize("grad_map", _maps())
+    def test_grid_thickness_matches_scalar(self, grad_map):
+        grad_map.generate_grid_from_parametric()
+        x, y = _random_points(grad_map, seed=1)
+        expected = [grad_map.get_thickness_at(px, py) for px, py in zip(x, y)]
+        assert np.array_equal(thickness_array(grad_map, x, y), expected)
+
+    def test_surface_z_broadcasts_over_mesh(self):
+        grad_map = GraduationMap.create_parametric()
+        xs = np.linspace(-240, 240, 7)
+        ys = np.linspace(-190, 190, 5)
+        z = surface_z_array(grad_map, xs[None, :], ys[:, None], 25.0)
+        assert z.shape == (5, 7)
+        assert z[2, 3] == pytest.approx(grad_map.get_surface_z_at(xs[3], ys[2], 25.0))
+
+    def test_outline_matches_scalar(self):
+        grad_map = GraduationMap.create_parametric()
+        t = np.linspace(0, 2 * np.pi, 73, endpoint=False)
+        grad_map.outline_points = [
+            (200 * math.cos(a) * (1 + 0.2 * math.sin(3 * a)), 150 * math.sin(a)) for a in t
+        ]
+        x, y = _random_points(grad_map, seed=2)
+        expected = [grad_map.is_inside_outline(px, py) for px, py in zip(x, y)]
+        assert np.array_equal(inside_outline_array(grad_map, x, y), expected)
+
+    def test_outline_defaults_to_bounds(self):
+        grad_map = GraduationMap.create_parametric()
+        inside = inside_outline_array(grad_map, [0.0, 300.0], [0.0, 0.0])
+        assert inside.tolist() == [True, False]
+
+    def test_contour_matches_radial_search(self):
+        grad_map = GraduationMap.create_parametric(create_benedetto_17_config().graduation_map)
+        stock = 25.4
+        z_level = -(stock - 5.5)
+
+        # Original scalar radial search
+        expected = []
+        x_min, x_max = grad_map.config.bounds_x_mm
+        y_min, y_max = grad_map.config.bounds_y_mm
+        for i in range(100):
+            angle = 2 * math.pi * i / 100
+            for r_step in range(50):
+                r = r_step * 0.02
+                x = (x_max + x_min) / 2 + r * (x_max - x_min) / 2 * math.cos(angle)
+                y = (y_max + y_min) / 2 + r * (y_max - y_min) / 2 * math.sin(angle)
+                if grad_map.get_thickness_at(x, y) <= stock + z_level:
+                    expected.append((x, y))
+                    break
+
+        got = grad_map.get_contour_at_z(z_level, stock)
+        assert len(got) == len(expected) > 0
+        assert np.allclose(got, expected, atol=1e-9)
+
+
+# =============================================================================
+# Drop cutter
+# =============================================================================
+
+class TestDropCutter:
+
+    def test_cutter_profiles(self):
+        r = np.array([0.0, 1.0, 3.0])
+        assert np.allclose(cutter_profile(_tool("flat_end"), r), 0.0)
+        ball = cutter_profile(_tool("ball_end", diameter=6.0), r)
+        assert np.allclose(ball, [0.0, 3 - math.sqrt(8), 3.0])
+        bull = cutter_profile(_tool("bull_nose", diameter=6.0, corner=1.0), r)
+        assert np.allclose(bull, [0.0, 0.0, 1.0])
+
+    @pytest.mark.parametrize("kind", ["ball_end", "flat_end", "bull_nose"])
+    def test_flat_surface_tip_on_surface(self, kind):
+        heights = HeightGrid(z=np.full((50, 50), -3.0), x0_mm=0.0, y0_mm=0.0, cell_mm=0.5)
+        z = drop_cutter_z(heights, _tool(kind, corner=1.0), [10.0, 12.5], [10.0, 7.0])
+        assert np.allclose(z, -3.0)
+
+    def test_ball_on_slope(self):
+        slope = 0.3
+        heights = _plane_heights(slope)
+        tool = _tool("ball_end", diameter=6.0)
+        z = drop_cutter_z(heights, tool, [0.0], [0.0])[0]
+        # Ball touches the plane off-centre: tip sits R*(sec - 1) above it
+        expected = 3.0 * (math.sqrt(1 + slope * slope) - 1)
+        assert z == pytest.approx(expected, abs=0.01)
+
+    def test_flat_end_on_slope_rests_on_rim(self):
+        slope = 0.3
+        heights = _plane_heights(slope)
+        z = drop_cutter_z(heights, _tool("flat_end", diameter=6.0), [0.0], [0.0])[0]
+        assert z == pytest.approx(slope * 3.0, abs=1e-6)
+
+
+# =============================================================================
+# Finishing
+# =============================================================================
+
+class TestDropCutterFinishing:
+
+    def test_finishing_does_not_gouge(self):
+        # Continuous surface: a sampled grid cannot resolve true steps such
+        # as the asymmetric profile's binding ledge
+        config = create_les_paul_top_config()
+        grad_map = GraduationMap.create_parametric(config.graduation_map)
+        generator = SurfaceCarvingGenerator(config, grad_map)
+        tool = config.tools[config.finish_tool_number]
+        radius = tool.diameter_mm / 2
+
+        passes = generator._generate_raster_passes(tool, stepover_mm=20.0, axis="y")
+        cuts = [m for p in passes for m in p.moves if m.feed_mm_min is not None]
+        assert cuts
+
+        rng = np.random.default_rng(3)
+        for move in cuts:
+            # Sample the surface under the cutter and compare to its underside
+            r = radius * np.sqrt(rng.random(64))
+            a = 2 * np.pi * rng.random(64)
+            px = move.x_mm + r * np.cos(a)
+            py = move.y_mm + r * np.sin(a)
+            surface = surface_z_array(grad_map, px, py, config.stock_thickness_mm)
+            underside = move.z_mm + cutter_profile(tool, r)
+            # Grid sampling error is largest at the dome rim, where the
+            # ellipsoid profile turns vertical
+            assert (underside >= surface - 0.05).all()
+
+    def test_finishing_touches_surface_at_apex(self):
+        config = create_benedetto_17_config()
+        grad_map = GraduationMap.create_parametric(config.graduation_map)
+        generator = SurfaceCarvingGenerator(config, grad_map)
+        tool = config.tools[config.finish_tool_number]
+
+        passes = generator._generate_raster_passes(tool, stepover_mm=50.0, axis="x")
+        cuts = [m for p in passes for m in p.moves if m.feed_mm_min is not None]
+        apex = min(cuts, key=lambda m: math.hypot(m.x_mm, m.y_mm))
+        surface = grad_map.get_surface_z_at(apex.x_mm, apex.y_mm, config.stock_thickness_mm)
+        assert apex.z_mm == pytest.approx(surface, abs=0.05)
+
+    def test_roughing_uses_tool_tip_plus_allowance(self):
+        config = create_les_paul_top_config()
+        grad_map = GraduationMap.create_parametric(config.graduation_map)
+        generator = SurfaceCarvingGenerator(config, grad_map)
+        tool = config.tools[config.rough_tool_number]
+        allowance = config.roughing.finish_allowance_mm
+        heights = HeightGrid.for_tool(grad_map, config.stock_thickness_mm, tool)
+
+        result = generator.generate_roughing()
+        cuts = [m for p in result.passes for m in p.moves if m.feed_mm_min is not None]
+        assert cuts
+
+        tip = drop_cutter_z(heights, tool, [m.x_mm for m in cuts], [m.y_mm for m in cuts])
+        z = np.array([m.z_mm for m in cuts])
+        assert (z >= tip + allowance - 1e-9).all()
+        # The deepest slice reaches the finish allowance somewhere
+        assert np.isclose(z, tip + allowance, atol=1e-6).any()
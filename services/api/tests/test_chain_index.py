@@ -0,0 +1,202 @@
+"""
+Tests for the spatial chain index used by chain deduplication.
+
+Validates:
+- Per-chain endpoints, bounding boxes and lengths
+- Endpoint radius / continuation queries
+- duplicate_groups, parallel_groups and offset_duplicates agree with the
+  pairwise scans they replaced on random noisy chains
+- Consumers (arc_reconstructor, line_deduplicator) handle 20k chains quickly
+
+Run:
+  cd services/api
+  pytest tests/test_chain_index.py -v
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+
+import pytest
+
+from app.cam.chain_index import END, START, ChainIndex
+from app.cam.line_deduplicator import _find_duplicate_chains
+from app.instrument_geometry.body.ibg.arc_reconstructor import (
+    Chain,
+    Point,
+    _deduplicate_raw_lines,
+    deduplicate_lines,
+)
+
+
+def _polyline_length(chain):
+    return sum(math.dist(chain[k], chain[k + 1]) for k in range(len(chain) - 1))
+
+
+def _noisy_chains(rnd, count, spread=50.0, noise=0.4):
+    chains = []
+    for _ in range(count):
+        pts = [(rnd.uniform(0, spread), rnd.uniform(0, spread))]
+        for _ in range(rnd.randint(0, 5)):
+            pts.append((pts[-1][0] + rnd.uniform(-5, 5), pts[-1][1] + rnd.uniform(-5, 5)))
+        chains.append(pts)
+        for _ in range(rnd.randint(0, 3)):
+            dup = [(x + rnd.uniform(-noise, noise), y + rnd.uniform(-noise, noise)) for x, y in pts]
+            chains.append(dup[::-1] if rnd.random() < 0.5 else dup)
+    rnd.shuffle(chains)
+    return chains
+
+
+# --------------------------------------------------------------------------- #
+# Brute-force references (the pairwise scans the index replaced)
+# --------------------------------------------------------------------------- #
+
+def _pairwise_duplicate_groups(chains, tol, ratio=0.10):
+    groups, skip = [], set()
+    for i, a in enumerate(chains):
+        if i in skip:
+            continue
+        group = [i]
+        la = _polyline_length(a)
+        for j in range(i + 1, len(chains)):
+            if j in skip:
+                continue
+            b = chains[j]
+            lb = _polyline_length(b)
+            if la < 1e-6 or lb < 1e-6 or abs(la - lb) / max(la, lb) > ratio:
+                continue
+            forward = math.dist(a[0], b[0]) <= tol and math.dist(a[-1], b[-1]) <= tol
+            reverse = math.dist(a[0], b[-1]) <= tol and math.dist(a[-1], b[0]) <= tol
+            if forward or reverse:
+                group.append(j)
+                skip.add(j)
+        groups.append(group)
+    return groups
+
+
+def _pairwise_offset_duplicates(chains, min_off, max_off, size_tol):
+    bounds = [(min(x for x, _ in c), min(y for _, y in c),
+               max(x for x, _ in c), max(y for _, y in c)) for c in chains]
+    removed = set()
+    for i, bi in enumerate(bounds):
+        if i in removed:
+            continue
+        for j, bj in enumerate(bounds):
+            if i == j or j in removed:
+                continue
+            wi, hi, wj, hj = bi[2] - bi[0], bi[3] - bi[1], bj[2] - bj[0], bj[3] - bj[1]
+            if min(wi, hi, wj, hj) < 1 or abs(wi - wj) > size_tol or abs(hi - hj) > size_tol:
+                continue
+            insets = (bj[0] - bi[0], bi[2] - bj[2], bj[1] - bi[1], bi[3] - bj[3])
+            if all(min_off <= off <= max_off for off in insets):
+                removed.add(j)
+    return removed
+
+
+# --------------------------------------------------------------------------- #
+# Geometry and endpoint queries
+# --------------------------------------------------------------------------- #
+
+def test_geometry_arrays():
+    index = ChainIndex([[(0, 0), (3, 4), (3, 10)], [], [(5, 5)]])
+    assert len(index) == 3
+    assert index.starts[0].tolist() == [0, 0]
+    assert index.ends[0].tolist() == [3, 10]
+    assert index.bboxes[0].tolist() == [0, 0, 3, 10]
+    assert index.lengths.tolist() == [11.0, 0.0, 0.0]
+    assert math.isnan(index.starts[1, 0])
+    assert index.bboxes[2].tolist() == [5, 5, 5, 5]
+
+
+def test_endpoints_near_and_continuation():
+    index = ChainIndex([
+        [(0, 0), (10, 0)],
+        [(10.2, 0), (20, 0)],
+        [(30, 0), (10, 0.4)],
+    ])
+    assert index.endpoints_near(10, 0, 0.5) == [(0, END), (1, START), (2, END)]
+    assert index.endpoints_near(10, 0, 0) == []
+    assert index.nearest_continuation(0, END, 1.0) == (1, START, pytest.approx(0.2))
+    assert index.nearest_continuation(0, START, 1.0) is None
+
+
+# --------------------------------------------------------------------------- #
+# Equivalence with the pairwise scans
+# --------------------------------------------------------------------------- #
+
+@pytest.mark.parametrize("seed", range(5))
+def test_duplicate_groups_match_pairwise(seed):
+    chains = _noisy_chains(random.Random(seed), 60)
+    assert ChainIndex(chains).duplicate_groups(0.5) == _pairwise_duplicate_groups(chains, 0.5)
+
+
+def test_parallel_groups():
+    lines = [
+        ((0, 0), (10, 0)),
+        ((0.1, 0.2), (10.1, 0.2)),    # parallel, midpoint 0.2 away
+        ((10, 0.1), (0, 0.1)),        # reversed
+        ((5, -1), (5, 1)),            # crossing, same midpoint, perpendicular
+        ((20, 0), (30, 0)),           # parallel but far
+        ((5, 0), (5.05, 0)),          # too short to group
+    ]
+    groups = ChainIndex(lines).parallel_groups(0.3)
+    assert groups == [[0, 1, 2], [3], [4], [5]]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_offset_duplicates_match_pairwise(seed):
+    rnd = random.Random(seed)
+    rects = []
+    for _ in range(30):
+        x, y = rnd.uniform(0, 100), rnd.uniform(0, 100)
+        w, h = rnd.uniform(0.5, 40), rnd.uniform(0.5, 40)
+        rects.append([(x, y), (x + w, y), (x + w, y + h), (x, y + h), (x, y)])
+        for _ in range(rnd.randint(0, 2)):
+            o = rnd.uniform(1, 7)
+            o2 = o + rnd.uniform(-1.5, 1.5)
+            rects.append([(x + o, y + o2), (x + w - o2, y + o2),
+                          (x + w - o, y + h - o), (x + o, y + h - o)])
+    rnd.shuffle(rects)
+
+    found = ChainIndex(rects).offset_duplicates(2.0, 6.0, 5.0)
+    assert set(found) == _pairwise_offset_duplicates(rects, 2.0, 6.0, 5.0)
+    assert _find_duplicate_chains(rects, 6.0, 5.0) == set(found)
+
+
+# --------------------------------------------------------------------------- #
+# Consumers at scale
+# --------------------------------------------------------------------------- #
+
+def test_deduplicate_lines_keeps_longest():
+    chains = [
+        Chain([Point(0, 0), Point(10, 0)]),
+        Chain([Point(10.1, 0.1), Point(5, 0.3), Point(0.1, 0)]),   # longer, reversed
+        Chain([Point(50, 50), Point(60, 50)]),
+    ]
+    kept = deduplicate_lines(chains, tolerance_mm=0.5)
+    assert kept == [chains[1], chains[2]]
+
+
+def test_20k_noisy_chains_dedup_quickly():
+    rnd = random.Random(7)
+    coords = []
+    for _ in range(10_000):
+        x, y = rnd.uniform(0, 500), rnd.uniform(0, 400)
+        pts = [(x, y), (x + rnd.uniform(-3, 3), y + rnd.uniform(-3, 3)),
+               (x + rnd.uniform(-6, 6), y + rnd.uniform(-6, 6))]
+        coords.append(pts)
+        coords.append([(px + 0.1, py - 0.1) for px, py in pts][::-1])
+    chains = [Chain([Point(x, y) for x, y in c]) for c in coords]
+
+    start = time.perf_counter()
+    kept = deduplicate_lines(chains, tolerance_mm=0.5)
+    _, removed = _deduplicate_raw_lines([(c[0], c[-1]) for c in coords], 0.3)
+    _find_duplicate_chains(coords)
+    elapsed = time.perf_counter() - start
+
+    # Every shifted copy folds into its original
+    assert len(kept) <= 10_000
+    assert removed >= 10_000
+    assert elapsed < 30.0
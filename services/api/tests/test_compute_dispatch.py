@@ -0,0 +1,168 @@
+"""
+Tests for the compute dispatch layer (app.core.compute_dispatch).
+
+Validates:
+- Thread and process lanes run work off the event loop
+- Lanes bound concurrency and reject past their queue with Retry-After
+- Client disconnect cancels queued jobs and holds the slot for running ones
+- Outcomes and timings are recorded in the Prometheus metrics
+
+Run:
+  cd services/api
+  pytest tests/test_compute_dispatch.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import compute_dispatch
+from app.core.compute_dispatch import (
+    ComputeCancelled,
+    ComputeDispatcher,
+    ComputeLane,
+    ComputeOverloaded,
+    run_compute,
+)
+from app.observability.metrics import render_prometheus
+
+
+class _FakeRequest:
+    """Stand-in for a Starlette Request whose client can go away."""
+
+    def __init__(self):
+        self.gone = threading.Event()
+
+    async def is_disconnected(self):
+        return self.gone.is_set()
+
+
+def _dispatcher(**lane_kwargs):
+    lane = ComputeLane("test", kind="thread", **lane_kwargs)
+    return ComputeDispatcher(lanes={"test": lane}, thread_workers=4, disconnect_poll_s=0.01)
+
+
+def test_thread_lane_runs_off_loop():
+    dispatcher = _dispatcher()
+
+    async def main():
+        loop_thread = threading.get_ident()
+        return await dispatcher.run("test", threading.get_ident), loop_thread
+
+    worker_thread, loop_thread = asyncio.run(main())
+    assert worker_thread != loop_thread
+    assert dispatcher.stats()["test"]["completed"] == 1
+    dispatcher.shutdown(wait=True)
+
+
+def test_process_lane_runs_in_pool():
+    dispatcher = ComputeDispatcher(
+        lanes={"cpu": ComputeLane("cpu", kind="process")}, process_workers=1,
+    )
+    try:
+        assert asyncio.run(dispatcher.run("cpu", math.fsum, [0.1] * 10)) == 1.0
+    finally:
+        dispatcher.shutdown(wait=True)
+
+
+def test_lane_limits_concurrency_and_rejects_when_full():
+    dispatcher = _dispatcher(max_concurrency=1, max_queue=1)
+    release = threading.Event()
+    running = []
+
+    def blocking_job(tag):
+        running.append(tag)
+        release.wait(5)
+        return tag
+
+    async def main():
+        first = asyncio.ensure_future(dispatcher.run("test", blocking_job, "a"))
+        second = asyncio.ensure_future(dispatcher.run("test", blocking_job, "b"))
+        await asyncio.sleep(0.05)
+        assert running == ["a"]
+        assert dispatcher.stats()["test"]["queued"] == 1
+
+        with pytest.raises(ComputeOverloaded) as exc:
+            await dispatcher.run("test", blocking_job, "c")
+        assert exc.value.retry_after_s >= 1
+
+        release.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert dispatcher.stats()["test"]["active"] == 0
+    assert 'compute_jobs_total{lane="test",outcome="rejected"}' in render_prometheus()
+    dispatcher.shutdown(wait=True)
+
+
+def test_disconnect_cancels_queued_job_and_holds_running_slot():
+    dispatcher = _dispatcher(max_concurrency=1, max_queue=2)
+    release = threading.Event()
+    ran = []
+
+    def blocking_job(tag):
+        ran.append(tag)
+        release.wait(5)
+        return tag
+
+    async def main():
+        running_client = _FakeRequest()
+        queued_client = _FakeRequest()
+        running = asyncio.ensure_future(
+            dispatcher.run("test", blocking_job, "running", request=running_client))
+        queued = asyncio.ensure_future(
+            dispatcher.run("test", blocking_job, "queued", request=queued_client))
+        await asyncio.sleep(0.05)
+
+        queued_client.gone.set()
+        with pytest.raises(ComputeCancelled):
+            await queued
+
+        running_client.gone.set()
+        with pytest.raises(ComputeCancelled):
+            await running
+        # The abandoned job is still executing, so its slot stays taken
+        assert dispatcher.stats()["test"]["active"] == 1
+
+        release.set()
+        await asyncio.sleep(0.1)
+        assert dispatcher.stats()["test"]["active"] == 0
+
+    asyncio.run(main())
+    assert ran == ["running"]
+    dispatcher.shutdown(wait=True)
+
+
+def test_run_compute_maps_overload_to_429(monkeypatch):
+    dispatcher = _dispatcher(max_concurrency=1, max_queue=0)
+    monkeypatch.setattr(compute_dispatch, "_dispatcher", dispatcher)
+    release = threading.Event()
+
+    async def main():
+        first = asyncio.ensure_future(run_compute("test", release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc:
+            await run_compute("test", release.wait, 5)
+        release.set()
+        await first
+        return exc.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 429
+    assert error.headers["Retry-After"] == "1"
+    dispatcher.shutdown(wait=True)
+
+
+def test_errors_propagate_and_are_counted():
+    dispatcher = _dispatcher()
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(dispatcher.run("test", divmod, 1, 0))
+    assert 'compute_jobs_total{lane="test",outcome="error"}' in render_prometheus()
+    assert dispatcher.stats()["test"]["active"] == 0
+    dispatcher.shutdown(wait=True)
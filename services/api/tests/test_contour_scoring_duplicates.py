@@ -0,0 +1,121 @@
+"""
+Tests for grid-indexed duplicate detection in contour scoring.
+
+Validates:
+- Duplicate penalties match the original all-pairs scan
+- Nested and parallel duplicates are still penalized
+- score_contours selection is unchanged
+
+Run:
+  cd services/api
+  pytest tests/test_contour_scoring_duplicates.py -v
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.services import contour_scoring
+from app.services.contour_scoring import (
+    _compute_duplicate_penalties,
+    _is_nested_duplicate,
+    _is_parallel_duplicate,
+    score_contours,
+)
+
+
+def _reference(contours, base_scores, width, height):
+    """All-pairs duplicate scan (the original implementation)."""
+    n = len(contours)
+    penalties = [1.0] * n
+    sorted_indices = sorted(range(n), key=lambda i: base_scores[i], reverse=True)
+    dominant = set(sorted_indices)
+    for i, idx in enumerate(sorted_indices):
+        contour = contours[idx]
+        if contour is None or len(contour) < 3:
+            continue
+        for higher_idx in sorted_indices[:i]:
+            if higher_idx not in dominant:
+                continue
+            higher = contours[higher_idx]
+            if higher is None or len(higher) < 3:
+                continue
+            if _is_nested_duplicate(contour, higher, width, height):
+                penalties[idx] *= 0.6
+                dominant.discard(idx)
+                break
+            if _is_parallel_duplicate(contour, higher, width, height):
+                penalties[idx] *= 0.5
+                dominant.discard(idx)
+                break
+    return penalties
+
+
+def _rect(x, y, w, h):
+    return np.array(
+        [[[x, y]], [[x + w, y]], [[x + w, y + h]], [[x, y + h]]], dtype=np.int32
+    )
+
+
+def _noisy_scene(rng, n, width, height):
+    """Random rectangles plus jittered copies so both duplicate kinds occur."""
+    contours = []
+    while len(contours) < n:
+        w = int(rng.integers(5, width // 3))
+        h = int(rng.integers(5, height // 3))
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(0, height - h))
+        contours.append(_rect(x, y, w, h))
+        for _ in range(int(rng.integers(0, 3))):
+            dx, dy = (int(v) for v in rng.integers(-2, 3, size=2))
+            inset = int(rng.integers(0, max(2, min(w, h) // 8)))
+            contours.append(
+                _rect(x + inset + dx, y + inset + dy,
+                      max(3, w - 2 * inset), max(3, h - 2 * inset))
+            )
+    contours = contours[:n]
+    contours.insert(n // 3, None)
+    contours.insert(n // 2, np.array([[[1, 1]], [[2, 2]]], dtype=np.int32))
+    scores = [float(s) for s in rng.random(len(contours))]
+    # Ties exercise the stable ordering of equal scores
+    scores[5] = scores[6] = scores[7]
+    return contours, scores
+
+
+def test_penalties_match_all_pairs_reference():
+    rng = np.random.default_rng(11)
+    for width, height, n in [(400, 300, 60), (2000, 1500, 400), (640, 640, 250)]:
+        contours, scores = _noisy_scene(rng, n, width, height)
+        got = _compute_duplicate_penalties(contours, scores, width, height)
+        want = _reference(contours, scores, width, height)
+        assert got == want
+        assert any(p < 1.0 for p in got)
+
+
+def test_nested_and_parallel_penalties():
+    body = _rect(100, 100, 400, 600)
+    binding = _rect(115, 115, 370, 570)  # nested: area ratio ~0.88
+    doubled = _rect(102, 101, 400, 600)  # parallel: near-identical outline
+    far = _rect(800, 100, 50, 50)
+    penalties = _compute_duplicate_penalties(
+        [binding, body, doubled, far], [0.7, 0.9, 0.8, 0.5], 1000, 800
+    )
+    assert penalties == [0.6, 1.0, 0.5, 1.0]
+
+
+def test_empty_and_degenerate_inputs():
+    assert _compute_duplicate_penalties([], [], 100, 100) == []
+    assert _compute_duplicate_penalties([None], [1.0], 100, 100) == [1.0]
+
+
+def test_score_contours_selection_unchanged(monkeypatch):
+    rng = np.random.default_rng(3)
+    contours, _ = _noisy_scene(rng, 150, 1200, 900)
+    contours = [c for c in contours if c is not None and len(c) >= 3]
+
+    fast = score_contours(contours, 1200, 900, min_confidence=0.0)
+    monkeypatch.setattr(contour_scoring, "_compute_duplicate_penalties", _reference)
+    slow = score_contours(contours, 1200, 900, min_confidence=0.0)
+
+    assert fast.selected_index == slow.selected_index
+    assert [c.score for c in fast.candidates] == [c.score for c in slow.candidates]
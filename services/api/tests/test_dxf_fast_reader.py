@@ -0,0 +1,203 @@
+"""
+Tests for the fast-path DXF geometry reader.
+
+Validates:
+- Per-layer arrays agree with ezdxf's entity attributes (R12 and R2010)
+- Paper space and block definitions are excluded; entity counts match len(msp)
+- SPLINE control data flattens exactly like ezdxf's Spline entity
+- Merged layers come back in model space order
+- flatten_types / binary DXF fall back to ezdxf
+- Unreadable input raises DxfReadError; the tag reader resynchronizes
+- Contour reconstruction reads uploads through the fast path
+
+Run:
+  cd services/api
+  pytest tests/test_dxf_fast_reader.py -v
+"""
+
+from __future__ import annotations
+
+import io
+import time
+
+import ezdxf
+import numpy as np
+import pytest
+
+from app.cam.contour_reconstructor import reconstruct_contours_from_dxf
+from app.cam.dxf_fast_reader import (
+    DxfReadError,
+    iter_tag_pairs,
+    read_dxf_geometry,
+)
+
+
+def _to_bytes(doc) -> bytes:
+    stream = io.StringIO()
+    doc.write(stream)
+    return stream.getvalue().encode(doc.output_encoding)
+
+
+@pytest.fixture(params=["R12", "R2010"])
+def mixed_doc(request):
+    doc = ezdxf.new(request.param)
+    msp = doc.modelspace()
+    block = doc.blocks.new("BOLT")
+    block.add_circle((0, 0), 2)
+
+    msp.add_line((0, 0), (10, 0), dxfattribs={"layer": "BODY"})
+    msp.add_polyline2d([(0, 0), (5, 5), (10, 0)], close=True, dxfattribs={"layer": "BODY"})
+    msp.add_arc((3, 4), 5, 30, 120, dxfattribs={"layer": "ARCS"})
+    msp.add_text("label", dxfattribs={"layer": "TEXT"})
+    msp.add_circle((-1, 2), 1.5, dxfattribs={"layer": "ARCS"})
+    msp.add_line((10, 0), (10, 10), dxfattribs={"layer": "NECK"})
+    msp.add_blockref("BOLT", (20, 20), dxfattribs={"layer": "NECK"})
+    msp.add_line((10, 10), (0, 0), dxfattribs={"layer": "BODY"})
+    if request.param != "R12":
+        msp.add_lwpolyline([(0, 0, 0), (4, 0, 0.5), (4, 4, 0)], format="xyb",
+                           close=True, dxfattribs={"layer": "NECK"})
+        msp.add_spline([(0, 0, 0), (2, 5, 0), (6, 5, 1), (8, 0, 0)], dxfattribs={"layer": "BODY"})
+        msp.add_rational_spline([(0, 0), (1, 2), (3, 2), (4, 0)], [1, 2, 0.5, 1],
+                                dxfattribs={"layer": "BODY"})
+        msp.add_ellipse((30, 0), (5, 0), 0.5, dxfattribs={"layer": "ELL"})
+    doc.paperspace().add_line((0, 0), (100, 100), dxfattribs={"layer": "BODY"})
+    return doc
+
+
+# --------------------------------------------------------------------------- #
+# Fast path vs ezdxf
+# --------------------------------------------------------------------------- #
+
+def test_arrays_match_ezdxf_entities(mixed_doc):
+    geometry = read_dxf_geometry(_to_bytes(mixed_doc))
+    msp = mixed_doc.modelspace()
+
+    assert geometry.reader == "fast"
+    assert geometry.dxf_version == mixed_doc.dxfversion
+    assert geometry.entity_count == len(msp)
+    assert geometry.entity_types["INSERT"] == 1
+
+    for layer in {e.dxf.layer for e in msp}:
+        got = geometry.layer(layer)
+        lines = [(e.dxf.start.x, e.dxf.start.y, e.dxf.end.x, e.dxf.end.y)
+                 for e in msp.query(f'LINE[layer=="{layer}"]')]
+        arcs = [(e.dxf.center.x, e.dxf.center.y, e.dxf.radius, e.dxf.start_angle, e.dxf.end_angle)
+                for e in msp.query(f'ARC[layer=="{layer}"]')]
+        circles = [(e.dxf.center.x, e.dxf.center.y, e.dxf.radius)
+                   for e in msp.query(f'CIRCLE[layer=="{layer}"]')]
+        np.testing.assert_allclose(got.lines, np.reshape(lines, (-1, 4)))
+        np.testing.assert_allclose(got.arcs, np.reshape(arcs, (-1, 5)))
+        np.testing.assert_allclose(got.circles, np.reshape(circles, (-1, 3)))
+
+        polylines = list(msp.query(f'LWPOLYLINE POLYLINE[layer=="{layer}"]'))
+        assert got.polyline_count == len(polylines)
+        for i, e in enumerate(polylines):
+            start, end = got.polyline_offsets[i:i + 2]
+            if e.dxftype() == "LWPOLYLINE":
+                xyb = list(e.get_points("xyb"))
+                np.testing.assert_allclose(got.polyline(i), [(x, y) for x, y, _ in xyb])
+                np.testing.assert_allclose(got.polyline_bulges[start:end], [b for *_, b in xyb])
+                assert got.polyline_closed[i] == e.closed
+            else:
+                np.testing.assert_allclose(got.polyline(i), [(p.x, p.y) for p in e.points()])
+                assert got.polyline_closed[i] == e.is_closed
+
+        splines = list(msp.query(f'SPLINE[layer=="{layer}"]'))
+        assert len(got.splines) == len(splines)
+        for data, e in zip(got.splines, splines):
+            assert list(data.flattening(0.01)) == list(e.flattening(0.01))
+
+    # Undecoded entities are counted only; paper space is ignored
+    assert "TEXT" not in geometry.layers
+    assert len(geometry.layer("BODY").lines) == 2
+
+
+def test_merged_keeps_model_space_order(mixed_doc):
+    merged = read_dxf_geometry(_to_bytes(mixed_doc)).merged()
+    expected = [(e.dxf.start.x, e.dxf.start.y, e.dxf.end.x, e.dxf.end.y)
+                for e in mixed_doc.modelspace().query("LINE")]
+    np.testing.assert_allclose(merged.lines, expected)
+    assert np.all(np.diff(merged.line_seq) > 0)
+
+
+def test_flatten_types_load_exotic_entities(mixed_doc):
+    geometry = read_dxf_geometry(_to_bytes(mixed_doc), flatten_types=("INSERT", "ELLIPSE"))
+
+    bolt = geometry.layer("0")   # block content keeps its own layer
+    assert bolt.polyline_types == ("INSERT",)
+    circle = bolt.polyline(0)
+    np.testing.assert_allclose((circle.min(axis=0) + circle.max(axis=0)) / 2, (20, 20), atol=0.01)
+    if mixed_doc.dxfversion != "AC1009":
+        ellipse = geometry.layer("ELL").polyline(0)
+        assert ellipse[:, 0].max() == pytest.approx(35.0, abs=0.01)
+
+
+def test_binary_dxf_falls_back_to_ezdxf(mixed_doc, tmp_path):
+    path = tmp_path / "binary.dxf"
+    mixed_doc.saveas(path, fmt="bin")
+
+    binary = read_dxf_geometry(path)
+    ascii_ = read_dxf_geometry(_to_bytes(mixed_doc))
+
+    assert binary.reader == "ezdxf"
+    assert binary.entity_count == ascii_.entity_count
+    for name, layer in ascii_.layers.items():
+        np.testing.assert_allclose(binary.layer(name).lines, layer.lines)
+        np.testing.assert_allclose(binary.layer(name).polyline_points, layer.polyline_points)
+
+
+# --------------------------------------------------------------------------- #
+# Errors and tag stream
+# --------------------------------------------------------------------------- #
+
+def test_unreadable_input_raises(tmp_path):
+    with pytest.raises(DxfReadError):
+        read_dxf_geometry(b"not a dxf at all")
+    with pytest.raises(DxfReadError):
+        read_dxf_geometry(tmp_path / "missing.dxf")
+    with pytest.raises(DxfReadError):
+        read_dxf_geometry(b"0\nSECTION\n2\nENTITIES\n0\nLINE\n10\nabc\n0\nENDSEC\n0\nEOF\n")
+
+
+def test_tag_pairs_resynchronize():
+    lines = ["0", "SECTION", "junk", "2", " ENTITIES ", "10"]
+    assert list(iter_tag_pairs(lines)) == [(0, "SECTION"), (2, "ENTITIES")]
+    assert list(iter_tag_pairs([b"  8\r\n", b"BODY\r\n"])) == [(8, b"BODY")]
+
+
+# --------------------------------------------------------------------------- #
+# Consumers and scale
+# --------------------------------------------------------------------------- #
+
+def test_reconstruct_contours_uses_fast_path():
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    square = [(0, 0), (50, 0), (50, 50), (0, 50)]
+    for a, b in zip(square, square[1:] + square[:1]):
+        msp.add_line(a, b, dxfattribs={"layer": "Contours"})
+
+    result = reconstruct_contours_from_dxf(_to_bytes(doc))
+    assert result.stats["lines_found"] == 4
+    assert len(result.loops) == 1
+
+    assert reconstruct_contours_from_dxf(b"garbage").warnings[0].startswith("Failed to read DXF")
+
+
+def test_100k_entities_parse_quickly(tmp_path):
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(0, 500, (100_000, 4))
+    body = "".join(
+        f"0\nLINE\n8\nL{i % 7}\n10\n{x1:.6f}\n20\n{y1:.6f}\n11\n{x2:.6f}\n21\n{y2:.6f}\n"
+        for i, (x1, y1, x2, y2) in enumerate(coords.tolist())
+    )
+    path = tmp_path / "big.dxf"
+    path.write_text(f"0\nSECTION\n2\nENTITIES\n{body}0\nENDSEC\n0\nEOF\n")
+
+    start = time.perf_counter()
+    geometry = read_dxf_geometry(path)
+    elapsed = time.perf_counter() - start
+
+    merged = geometry.merged()
+    assert geometry.entity_count == 100_000
+    np.testing.assert_allclose(merged.lines, coords, atol=1e-6)
+    assert elapsed < 15.0
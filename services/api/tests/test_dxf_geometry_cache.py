@@ -0,0 +1,180 @@
+"""
+Tests for the parsed-DXF geometry cache.
+
+Validates:
+- Handles are keyed by content and parse each view once
+- Validation gate + loop extraction share one document parse
+- LRU bounds by entry count and estimated parsed size
+- Only the most recent handles keep their ezdxf document
+- Broken payloads fail fast in later stages and still yield preflight errors
+- The chain index covers lines and polylines in model space order
+
+Run:
+  cd services/api
+  pytest tests/test_dxf_geometry_cache.py -v
+"""
+
+from __future__ import annotations
+
+import io
+
+import ezdxf
+import pytest
+
+import app.cam.dxf_geometry_cache as cache_module
+from app.cam.contour_reconstructor import reconstruct_contours_from_dxf
+from app.cam.dxf_geometry_cache import DxfGeometryCache, get_dxf_handle
+from app.cam.dxf_preflight import DXFPreflight, Severity
+from app.cam.dxf_validation_gate import run_full_validation
+from app.routers.blueprint_cam.extraction import extract_loops_from_dxf
+
+
+def _to_bytes(doc) -> bytes:
+    stream = io.StringIO()
+    doc.write(stream)
+    return stream.getvalue().encode(doc.output_encoding)
+
+
+def _body_dxf(width: float = 300.0) -> bytes:
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (width, 0), (width, 450), (0, 450)], close=True,
+                       dxfattribs={"layer": "GEOMETRY"})
+    msp.add_line((10, 10), (60, 10), dxfattribs={"layer": "Contours"})
+    return _to_bytes(doc)
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = DxfGeometryCache(max_items=4, max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(cache_module, "_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def parse_counts(monkeypatch):
+    counts = {"geometry": 0, "document": 0}
+
+    def counted(name, func):
+        def wrapper(source):
+            counts[name] += 1
+            return func(source)
+        return wrapper
+
+    monkeypatch.setattr(cache_module, "read_dxf_geometry",
+                        counted("geometry", cache_module.read_dxf_geometry))
+    monkeypatch.setattr(cache_module, "read_dxf_document",
+                        counted("document", cache_module.read_dxf_document))
+    return counts
+
+
+# --------------------------------------------------------------------------- #
+# Handles and pipeline sharing
+# --------------------------------------------------------------------------- #
+
+def test_handles_are_content_keyed(fresh_cache, parse_counts, tmp_path):
+    data = _body_dxf()
+    handle = get_dxf_handle(data)
+    assert get_dxf_handle(bytes(data)) is handle
+
+    path = tmp_path / "body.dxf"
+    path.write_bytes(data)
+    assert get_dxf_handle(path) is handle
+    assert get_dxf_handle(_body_dxf(width=310.0)) is not handle
+
+    for _ in range(3):
+        assert handle.geometry.entity_count == 2
+        assert len(handle.document.modelspace()) == 2
+    assert parse_counts == {"geometry": 1, "document": 1}
+
+
+def test_validation_and_extraction_parse_once(fresh_cache, parse_counts):
+    data = _body_dxf()
+
+    preflight, topology = run_full_validation(data, "body.dxf")
+    loops, _ = extract_loops_from_dxf(data, layer_name="GEOMETRY")
+    result = reconstruct_contours_from_dxf(data)
+
+    assert preflight.passed and topology.is_valid
+    assert len(loops) == 1 and len(loops[0].pts) == 4
+    assert result.warnings[-1].startswith("No closed cycles found")
+    assert parse_counts == {"geometry": 1, "document": 1}
+
+
+def test_broken_payload_fails_fast(fresh_cache, parse_counts):
+    data = b"0\nSECTION\n2\nENTITIES\n0\nLINE\n"
+
+    report = DXFPreflight(data).run_all_checks()
+    assert not report.passed
+    assert report.issues[0].severity == Severity.ERROR
+    assert report.issues[0].message.startswith("Failed to read DXF file")
+
+    preflight, topology = run_full_validation(data)
+    assert not preflight.passed and topology is None
+    assert parse_counts["document"] == 1
+
+
+# --------------------------------------------------------------------------- #
+# LRU bounds
+# --------------------------------------------------------------------------- #
+
+def test_lru_bounds_count_and_bytes():
+    payloads = [_body_dxf(width=300.0 + i) for i in range(4)]
+    size = DxfGeometryCache().get(payloads[0]).footprint
+
+    cache = DxfGeometryCache(max_items=3, max_bytes=100 * size)
+    first = cache.get(payloads[0])
+    for data in payloads[1:3]:
+        cache.get(data)
+    assert cache.get(payloads[0]) is first        # refreshes first
+    cache.get(payloads[3])                        # evicts payloads[1]
+    assert len(cache) == 3
+    assert cache.get(payloads[0]) is first
+
+    small = DxfGeometryCache(max_items=10, max_bytes=int(2.5 * size))
+    for data in payloads:
+        small.get(data)
+    assert len(small) == 2
+
+    tiny = DxfGeometryCache(max_items=10, max_bytes=size // 2)
+    handle = tiny.get(payloads[0])
+    assert len(tiny) == 0
+    assert handle.geometry.entity_count == 2      # still usable for this request
+
+
+def test_only_recent_handles_keep_documents(parse_counts):
+    payloads = [_body_dxf(width=300.0 + i) for i in range(3)]
+    cache = DxfGeometryCache(max_items=10, max_bytes=100 * 1024 * 1024, max_documents=2)
+
+    handles = []
+    for data in payloads:
+        handle = cache.get(data)
+        assert len(handle.document.modelspace()) == 2
+        handles.append(handle)
+
+    assert handles[0]._document is None             # dropped for the newer two
+    assert handles[1]._document is not None and handles[2]._document is not None
+    assert handles[0].geometry.entity_count == 2      # arrays are kept
+
+    assert cache.get(payloads[0]) is handles[0]
+    assert len(handles[0].document.modelspace()) == 2
+    assert handles[1]._document is None
+    assert parse_counts["document"] == 4
+
+
+# --------------------------------------------------------------------------- #
+# Spatial index
+# --------------------------------------------------------------------------- #
+
+def test_chain_index_over_lines_and_polylines(fresh_cache):
+    handle = get_dxf_handle(_body_dxf())
+
+    index, chains = handle.chain_index()
+    assert len(index) == 2
+    assert chains[0] == [(0.0, 0.0), (300.0, 0.0), (300.0, 450.0), (0.0, 450.0)]
+    assert chains[1] == [(10.0, 10.0), (60.0, 10.0)]
+    assert handle.chain_index() is handle.chain_index()
+
+    contours, _ = handle.chain_index("Contours")
+    assert len(contours) == 1
+    assert contours.endpoints_near(60, 10, 0.5) == [(0, 1)]
@@ -0,0 +1,103 @@
+"""
+Tests for the packed (columnar binary) backplot format.
+
+Validates:
+- pack_segments()/unpack_segments() round trip against simulate_segments()
+- Header bounds, segment count and total time
+- Rejection of foreign or truncated buffers
+- POST /api/cam/gcode/simulate/packed binary and base64 encodings
+
+Run:
+    pytest services/api/tests/test_gcode_packed.py -v
+"""
+import base64
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.util.gcode import (
+    PACKED_MEDIA_TYPE,
+    SEGMENT_TYPE_CODES,
+    SegmentStream,
+    pack_segments,
+    simulate_segments,
+    unpack_segments,
+)
+
+
+PROGRAM = """G21 G90
+G0 X5 Y5 Z5
+G1 Z-1 F300
+G1 X20 Y5 F800
+G2 X30 Y15 I0 J10
+G1 X30 Y30
+G4 P0.25
+G0 Z5
+"""
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    return TestClient(app)
+
+
+def test_round_trip_matches_segments():
+    ref = simulate_segments(PROGRAM)
+    segs = ref["segments"]
+    out = unpack_segments(pack_segments(segs))
+
+    assert out["segment_count"] == len(segs)
+    np.testing.assert_allclose(out["start"], segs[0]["from_pos"], atol=1e-5)
+    np.testing.assert_allclose(out["x"], [s["to_pos"][0] for s in segs], atol=1e-4)
+    np.testing.assert_allclose(out["z"], [s["to_pos"][2] for s in segs], atol=1e-4)
+    np.testing.assert_allclose(out["feed"], [s["feed"] for s in segs], rtol=1e-6)
+    assert out["line_number"].tolist() == [s["line_number"] for s in segs]
+    assert out["type"].tolist() == [SEGMENT_TYPE_CODES[s["type"]] for s in segs]
+    assert out["total_time_ms"] == pytest.approx(ref["totals"]["time_min"] * 60_000.0)
+    for key, val in ref["bounds"].items():
+        assert out["bounds"][key] == pytest.approx(val, abs=1e-4)
+
+
+def test_packs_directly_from_stream():
+    assert pack_segments(SegmentStream(PROGRAM)) == pack_segments(simulate_segments(PROGRAM)["segments"])
+
+
+def test_empty_program():
+    out = unpack_segments(pack_segments([]))
+    assert out["segment_count"] == 0
+    assert out["bounds"]["x_max"] == 0.0
+
+
+def test_rejects_bad_buffers():
+    data = pack_segments(simulate_segments(PROGRAM)["segments"])
+    with pytest.raises(ValueError):
+        unpack_segments(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        unpack_segments(data[:-5])
+    with pytest.raises(ValueError):
+        unpack_segments(data[:10])
+
+
+def test_packed_endpoint_binary(client):
+    resp = client.post("/api/cam/gcode/simulate/packed", json={"gcode": PROGRAM})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(PACKED_MEDIA_TYPE)
+    out = unpack_segments(resp.content)
+    summary = json.loads(resp.headers["x-cam-sim-summary"])
+    assert out["segment_count"] == summary["totals"]["segment_count"]
+
+
+def test_packed_endpoint_base64_with_decimation(client):
+    resp = client.post(
+        "/api/cam/gcode/simulate/packed",
+        json={"gcode": PROGRAM, "encoding": "base64", "level": 2, "accel_mm_s2": 500},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    out = unpack_segments(base64.b64decode(body["data"]))
+    assert body["format"] == "ltb-packed-v1"
+    assert out["segment_count"] < body["totals"]["segment_count"]
+    assert out["total_time_ms"] == pytest.approx(body["totals"]["time_min"] * 60_000.0)
@@ -0,0 +1,106 @@
+"""
+Tests for the streaming simulator — SegmentStream, decimation and chunking.
+
+Validates:
+- SegmentStream yields exactly what simulate_segments() returns
+- Lazy consumption from a line iterator (file-like input)
+- decimate_segments() preserves type transitions, end point and duration
+- iter_segment_chunks() columnar layout and chunk sizing
+
+Run:
+    pytest services/api/tests/test_gcode_simulate_stream.py -v
+"""
+import io
+
+import pytest
+
+from app.util.gcode import (
+    SEGMENT_TYPE_CODES,
+    SegmentStream,
+    decimate_segments,
+    iter_lines,
+    iter_segment_chunks,
+    parse_lines,
+    simulate_segments,
+)
+
+
+PROGRAM = """G21 G90
+T1 M6
+S12000 M3
+G0 X0 Y0 Z5
+G1 Z-1 F300
+G1 X20 Y0 F800
+G2 X30 Y10 I0 J10
+G1 X30 Y30
+G81 X5 Y5 Z-3 R1 F200
+X10 Y5
+G80
+G4 P0.5
+G0 Z5
+M30
+"""
+
+
+def test_stream_matches_simulate_segments():
+    stream = SegmentStream(PROGRAM)
+    segs = list(stream)
+    ref = simulate_segments(PROGRAM)
+
+    assert segs == ref["segments"]
+    summary = stream.summary()
+    assert summary["bounds"] == ref["bounds"]
+    assert summary["totals"] == ref["totals"]
+    assert summary["tools"] == ref["tools"]
+    assert summary["warnings"] == ref["warnings"]
+
+
+def test_stream_consumes_line_iterator():
+    segs = list(SegmentStream(io.StringIO(PROGRAM)))
+    assert segs == simulate_segments(PROGRAM)["segments"]
+
+
+def test_stream_is_lazy():
+    def lines():
+        yield "G0 X1 Y0\n"
+        yield "G1 X2 Y0 F100\n"
+        raise AssertionError("consumed past the first segments")
+
+    it = iter(SegmentStream(lines()))
+    assert next(it)["type"] == "rapid"
+
+
+def test_stream_max_segments_truncates():
+    stream = SegmentStream(PROGRAM, max_segments=3)
+    assert len(list(stream)) == 3
+    assert stream.summary()["warnings"]["truncated"] is True
+
+
+def test_iter_lines_matches_parse_lines_across_newlines():
+    text = "G0 X1\r\nG1 X2 (c)\r; skip\nG1 X3 ; tail"
+    assert list(iter_lines(text)) == parse_lines(text)
+    assert [b["raw"] for b in parse_lines(text)] == ["G0 X1", "G1 X2 (c)", "G1 X3 ; tail"]
+
+
+def test_decimate_preserves_transitions_and_time():
+    gcode = "G0 X0 Y0\n" + "".join(f"G1 X{i} Y0 F600\n" for i in range(1, 21)) + "G0 X0 Y10\n"
+    segs = simulate_segments(gcode)["segments"]
+    dec = list(decimate_segments(iter(segs), 4))
+
+    assert [s["type"] for s in dec] == ["cut"] * 5 + ["rapid"]
+    assert dec[4]["to_pos"] == [20.0, 0.0, 0.0]
+    assert sum(s["duration_ms"] for s in dec) == pytest.approx(sum(s["duration_ms"] for s in segs))
+    assert list(decimate_segments(segs, 1)) == segs
+
+
+def test_chunks_are_columnar_and_bounded():
+    segs = simulate_segments(PROGRAM)["segments"]
+    chunks = list(iter_segment_chunks(segs, chunk_size=4))
+
+    assert [c["count"] for c in chunks[:-1]] == [4] * (len(chunks) - 1)
+    assert sum(c["count"] for c in chunks) == len(segs)
+    assert chunks[0]["start"] == segs[0]["from_pos"]
+    assert chunks[0]["type"][0] == SEGMENT_TYPE_CODES[segs[0]["type"]]
+    last = chunks[-1]
+    assert [last["x"][-1], last["y"][-1], last["z"][-1]] == segs[-1]["to_pos"]
+    assert list(iter_segment_chunks([], chunk_size=4)) == []
@@ -0,0 +1,182 @@
+"""
+Tests for heightfield stock-removal simulation.
+
+Validates:
+- Removed volume for a flat slot and a plunge against hand calculation
+- Ball / V profiles remove less than a flat cutter of the same diameter
+- Air cutting and rapid gouges are reported per move
+- heightfield_at() from snapshots equals a from-zero replay; snapshot thinning
+- Grid cell floor / cell cap and the snapshot byte budget
+- POST /api/cam/gcode/simulate/stock summary, moves and scrubbing; 422 on
+  oversized grids; the simulation cache stays within its byte budget
+
+Run:
+    pytest services/api/tests/test_gcode_stock.py -v
+"""
+import base64
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.util.gcode import (
+    MAX_GRID_CELLS,
+    SegmentStream,
+    StockGrid,
+    StockSimulator,
+    ToolShape,
+    stock_grid_for_segments,
+)
+
+
+SLOT = """G21 G90
+G0 X10 Y20 Z5
+G1 Z-2 F300
+G1 X60 F1200
+G1 X60 Y20 Z3
+G1 X80
+G0 Z5
+G0 X20 Y20 Z-1
+G0 Z5
+"""
+
+
+def _grid():
+    return StockGrid.from_bounds(0, 100, 0, 40, cell_mm=0.25, z_top=0.0)
+
+
+def _sim(tool=ToolShape("flat", 6.0), **kw):
+    return StockSimulator(_grid(), tool, **kw).run(SegmentStream(SLOT))
+
+
+def test_flat_slot_volume():
+    sim = _sim()
+    # Plunge (disc) + slot (rectangle + end cap), 2 mm deep; the rapid gouge
+    # through the slot floor removes nothing more.
+    r, depth = 3.0, 2.0
+    expected = (50 * 2 * r + math.pi * r * r) * depth
+    assert sim.summary()["removed_mm3"] == pytest.approx(expected, rel=0.02)
+
+
+def test_profiles_remove_less_than_flat():
+    flat = _sim().summary()["removed_mm3"]
+    ball = _sim(ToolShape("ball", 6.0)).summary()["removed_mm3"]
+    vee = _sim(ToolShape("v", 6.0, 90.0)).summary()["removed_mm3"]
+    assert vee < ball < flat
+
+
+def test_air_cutting_and_rapid_gouge():
+    sim = _sim()
+    cols = sim.move_columns()
+    summary = sim.summary()
+    # The feed retract (line 5) and G1 X80 above the stock (line 6) cut air
+    air_lines = [n for n, air in zip(cols["line_number"], cols["air"]) if air]
+    assert air_lines == [5, 6]
+    assert summary["air_cut"]["moves"] == 2
+    assert summary["rapid_gouges"]["moves"] == 0
+
+    sim = StockSimulator(_grid(), ToolShape("flat", 6.0)).run(
+        SegmentStream("G0 X50 Y30 Z5\nG0 Z-1\nG0 Z5\n")
+    )
+    assert sim.summary()["rapid_gouges"] == {"moves": 1, "first_lines": [2]}
+
+
+def test_mrr_uses_move_duration():
+    sim = _sim()
+    cols = sim.move_columns()
+    k = cols["line_number"].index(4)
+    # 50 mm at 1200 mm/min = 2.5 s
+    assert cols["mrr_mm3_min"][k] == pytest.approx(cols["removed_mm3"][k] / (2.5 / 60.0))
+
+
+def test_scrub_matches_replay_and_thinning():
+    segs = list(SegmentStream(SLOT))
+    sim = StockSimulator(_grid(), ToolShape("ball", 6.0), snapshot_every=1, max_snapshots=3)
+    sim.run(segs)
+    assert sim.snapshot_every > 1
+
+    for move in range(len(segs) + 1):
+        ref = StockSimulator(_grid(), ToolShape("ball", 6.0), snapshot_every=10**6)
+        ref.run(segs[:move])
+        assert np.array_equal(sim.heightfield_at(move), ref.heights)
+
+
+def test_grid_fits_feed_moves():
+    grid = stock_grid_for_segments(iter(SegmentStream(SLOT)), margin_mm=3.0, cell_mm=0.5)
+    assert grid.x_min == pytest.approx(7.0)
+    assert grid.z_top == 0.0
+    assert grid.nx == int(math.ceil((80.0 - 10.0 + 6.0) / 0.5))
+
+
+def test_grid_limits():
+    with pytest.raises(ValueError, match="cell_mm"):
+        StockGrid.from_bounds(0, 10, 0, 10, cell_mm=0.001)
+    with pytest.raises(ValueError, match="exceeds"):
+        StockGrid.from_bounds(0, 2000, 0, 2000, cell_mm=0.5)
+    with pytest.raises(ValueError, match="exceeds"):
+        stock_grid_for_segments(SegmentStream(SLOT), margin_mm=3.0, cell_mm=0.1, max_cells=1000)
+    assert StockGrid.from_bounds(0, 1000, 0, 1000, cell_mm=0.5).cells <= MAX_GRID_CELLS
+
+
+def test_snapshot_byte_budget():
+    grid_bytes = _grid().nx * _grid().ny * 4
+    sim = _sim(snapshot_every=1, max_snapshot_bytes=3 * grid_bytes)
+    assert sim.max_snapshots == 3
+    assert len(sim._snaps) <= 3
+    assert sim.nbytes >= grid_bytes * (1 + len(sim._snaps))
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    return TestClient(app)
+
+
+def test_stock_endpoint_and_scrubbing(client):
+    body = {"gcode": SLOT, "tool_kind": "flat", "tool_diameter_mm": 6.0,
+            "cell_mm": 0.5, "snapshot_every": 2}
+    resp = client.post("/api/cam/gcode/simulate/stock", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["removed_mm3"] > 0
+    assert len(data["moves"]["removed_mm3"]) == data["move_count"] == data["at_move"]
+
+    hf = data["heightfield"]
+    final = np.frombuffer(base64.b64decode(hf["data"]), dtype="<f4").reshape(hf["ny"], hf["nx"])
+    assert final.min() == pytest.approx(-2.0)
+
+    resp = client.post("/api/cam/gcode/simulate/stock",
+                       json={**body, "at_move": 1, "include_moves": False})
+    early = resp.json()
+    assert "moves" not in early
+    start = np.frombuffer(base64.b64decode(early["heightfield"]["data"]), dtype="<f4")
+    assert start.min() == 0.0
+
+
+def test_stock_endpoint_rejects_oversized_grids(client):
+    body = {"gcode": SLOT, "cell_mm": 0.5,
+            "stock": {"x_min": 0, "x_max": 5000, "y_min": 0, "y_max": 5000}}
+    resp = client.post("/api/cam/gcode/simulate/stock", json=body)
+    assert resp.status_code == 422
+    assert "exceeds" in resp.json()["detail"]
+
+    resp = client.post("/api/cam/gcode/simulate/stock", json={"gcode": SLOT, "cell_mm": 0.001})
+    assert resp.status_code == 422
+
+
+def test_stock_cache_bounded_by_bytes(client, monkeypatch):
+    import app.routers.gcode_consolidated_router as gcr
+
+    monkeypatch.setattr(gcr, "_stock_sims", gcr.OrderedDict())
+    monkeypatch.setattr(gcr, "_stock_sims_bytes", 0)
+    body = {"gcode": SLOT, "cell_mm": 0.5, "include_moves": False}
+    resp = client.post("/api/cam/gcode/simulate/stock", json=body)
+    size = next(iter(gcr._stock_sims.values())).nbytes
+    monkeypatch.setattr(gcr, "_STOCK_SIM_CACHE_MAX_BYTES", int(2.5 * size))
+
+    for d in (5.0, 6.5, 8.0):
+        resp = client.post("/api/cam/gcode/simulate/stock", json={**body, "tool_diameter_mm": d})
+        assert resp.status_code == 200
+    assert len(gcr._stock_sims) == 2
+    assert gcr._stock_sims_bytes <= gcr._STOCK_SIM_CACHE_MAX_BYTES
@@ -0,0 +1,145 @@
+"""
+Tests for the h-scaling inverse thickness solver and batch grading.
+
+Validates:
+- Cached forward slopes reproduce a direct Rayleigh-Ritz solve at any h
+- solve_for_thickness / InverseDesignProblem hit targets in closed form and
+  report active constraints
+- solve_thickness_batch matches the per-plate solver
+- POST /api/acoustics/plate/inverse-batch grades a 200-top stack
+
+Run:
+  cd services/api
+  pytest tests/test_inverse_thickness_batch.py -v
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.calculators.plate_design import (
+    ForwardModel,
+    FrequencyTarget,
+    InverseDesignProblem,
+    MaterialCandidate,
+    OrthotropicPlate,
+    ThicknessConstraints,
+    frequency_slopes,
+    solve_for_thickness,
+    solve_rayleigh_ritz,
+    solve_thickness_batch,
+)
+
+SPRUCE = dict(E_L=12e9, E_C=0.8e9, rho=420)
+
+
+def test_slopes_match_direct_solve():
+    slopes = frequency_slopes(**SPRUCE, a=0.45, b=0.35)
+    for h in (2.0e-3, 3.7e-3):
+        plate = OrthotropicPlate.from_wood(**SPRUCE, h=h, a=0.45, b=0.35)
+        direct = solve_rayleigh_ritz(plate, n_modes_return=5).frequencies_Hz
+        assert [s * h for s in slopes[:5]] == pytest.approx(direct, rel=1e-9)
+    assert frequency_slopes(**SPRUCE, a=0.45, b=0.35) is slopes
+
+
+def test_single_target_hits_frequency():
+    result = solve_for_thickness(60.0, **SPRUCE, a=0.45, b=0.35,
+                                 forward_model=ForwardModel.RAYLEIGH_RITZ)
+    assert result.achieved_frequencies_Hz[0] == pytest.approx(60.0, rel=1e-9)
+    assert result.converged and not result.constraints_active
+
+
+def test_multi_target_closed_form_is_optimal():
+    problem = InverseDesignProblem(**SPRUCE, a=0.45, b=0.35)
+    problem.add_target(mode=1, frequency_Hz=60.0, weight=1.0)
+    problem.add_target(mode=2, frequency_Hz=100.0, weight=0.5)
+
+    result = problem.solve()
+    best = problem._objective(result.thickness_mm)
+    assert problem._objective(result.thickness_mm - 0.01) > best
+    assert problem._objective(result.thickness_mm + 0.01) > best
+
+    # The same problem by bounded scalar search agrees
+    searched = problem.solve(method="golden")
+    assert result.thickness_mm == pytest.approx(searched.thickness_mm, abs=1e-3)
+
+
+def test_out_of_range_target_clamps_and_flags():
+    problem = InverseDesignProblem(**SPRUCE, a=0.45, b=0.35)
+    problem.add_target(mode=1, frequency_Hz=180.0)
+    result = problem.solve(constraints=ThicknessConstraints(h_min_mm=2.0, h_max_mm=4.0))
+    assert result.thickness_mm == 4.0
+    assert result.constraints_active
+
+
+def test_batch_matches_per_plate_solver():
+    candidates = [
+        MaterialCandidate("a", E_L=12e9, E_C=0.8e9, rho=420),
+        MaterialCandidate("b", E_L=10e9, E_C=0.7e9, rho=380),
+        MaterialCandidate("c", E_L=14e9, E_C=1.0e9, rho=460),
+    ]
+    targets = [FrequencyTarget(mode=1, frequency_Hz=60.0),
+               FrequencyTarget(mode=2, frequency_Hz=100.0, weight=0.5),
+               FrequencyTarget(mode=40, frequency_Hz=900.0)]
+    constraints = ThicknessConstraints(h_min_mm=2.0, h_max_mm=5.0, h_step_mm=0.05)
+
+    batch = solve_thickness_batch(candidates, targets, a=0.45, b=0.35,
+                                  constraints=constraints)
+
+    for cand, got in zip(candidates, batch):
+        problem = InverseDesignProblem(E_L=cand.E_L, E_C=cand.E_C, rho=cand.rho,
+                                       a=0.45, b=0.35)
+        for t in targets:
+            problem.add_target(mode=t.mode, frequency_Hz=t.frequency_Hz, weight=t.weight)
+        expected = problem.solve(constraints=constraints)
+        assert got.thickness_mm == pytest.approx(expected.thickness_mm)
+        assert got.achieved_frequencies_Hz == pytest.approx(expected.achieved_frequencies_Hz)
+        assert got.constraints_active == expected.constraints_active
+        # Mode 40 is beyond the 4x4 trial basis: reported, not fitted
+        assert got.frequency_errors_Hz[2] == float("inf")
+
+
+def test_batch_rejects_unavailable_targets():
+    with pytest.raises(ValueError):
+        solve_thickness_batch(
+            [MaterialCandidate("a", **SPRUCE)],
+            [FrequencyTarget(mode=6, frequency_Hz=300.0)],
+            a=0.45, b=0.35, forward_model=ForwardModel.SIMPLE,
+        )
+
+
+def test_inverse_batch_endpoint_grades_200_tops(client):
+    plates = [
+        {"id": f"top-{i:03d}", "species": "sitka_spruce",
+         "density_kg_m3": 380 + (i % 40) * 2, "E_L_GPa": 10.0 + (i % 25) * 0.1}
+        for i in range(199)
+    ] + [{"id": "top-199", "species": "sitka_spruce"}]
+
+    start = time.perf_counter()
+    resp = client.post("/api/acoustics/plate/inverse-batch", json={
+        "body_style": "om",
+        "targets": [{"mode": 1, "frequency_hz": 60.0}, {"mode": 2, "frequency_hz": 100.0, "weight": 0.5}],
+        "plates": plates,
+        "h_step_mm": 0.05,
+    })
+    elapsed = time.perf_counter() - start
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["count"] == 200
+    assert [r["id"] for r in body["results"]] == [p["id"] for p in plates]
+    assert all(1.5 <= r["thickness_mm"] <= 5.0 for r in body["results"])
+    # Denser tops of the same stiffness need more thickness
+    assert body["results"][25]["thickness_mm"] > body["results"][0]["thickness_mm"]
+    assert elapsed < 10.0
+
+
+def test_inverse_batch_endpoint_unknown_species(client):
+    resp = client.post("/api/acoustics/plate/inverse-batch", json={
+        "body_style": "om",
+        "targets": [{"mode": 1, "frequency_hz": 60.0}],
+        "plates": [{"id": "x", "species": "unobtanium"}],
+    })
+    assert resp.status_code == 400
@@ -0,0 +1,144 @@
+"""
+Tests for grid-indexed BODY gap joining in layer_builder.
+
+Validates:
+- Greedy joins match the original all-pairs endpoint scan
+- Optimal matching joins at least as many gaps as greedy
+- Invalid matching mode is rejected
+
+Run:
+  cd services/api
+  pytest tests/test_layer_builder_gap_join.py -v
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services.layer_builder import (
+    Layer,
+    LayeredEntities,
+    LayeredEntity,
+    _is_contour_open,
+    join_body_gaps,
+)
+from app.services.layer_gap_matching import (
+    _get_endpoint_tangent,
+    _get_local_median_segment_length,
+)
+
+
+def _reference_joins(entities, max_gap_mm=4.0, max_angle_deg=25.0, scale_factor_limit=4.0):
+    """All-pairs endpoint scan (the original implementation)."""
+    max_gap_px = max_gap_mm / entities.mm_per_px
+    max_angle_rad = np.deg2rad(max_angle_deg)
+    open_entities = [e for e in entities.body if _is_contour_open(e.contour)]
+
+    endpoints = []
+    for i, entity in enumerate(open_entities):
+        points = entity.contour.reshape(-1, 2)
+        for side in (0, -1):
+            endpoints.append((
+                i, side, points[side].astype(float),
+                _get_endpoint_tangent(entity.contour, side),
+                _get_local_median_segment_length(entity.contour, side),
+            ))
+
+    used = set()
+    attempted = 0
+    segments = []
+    for i, (ent_i, ep_i, pt_i, tan_i, med_i) in enumerate(endpoints):
+        if (ent_i, ep_i) in used:
+            continue
+        best, best_dist = None, float("inf")
+        for j, (ent_j, ep_j, pt_j, tan_j, med_j) in enumerate(endpoints):
+            if i == j or ent_i == ent_j or (ent_j, ep_j) in used:
+                continue
+            dist = np.linalg.norm(pt_j - pt_i)
+            if dist > max_gap_px:
+                continue
+            attempted += 1
+            angle = np.arccos(np.clip(np.dot(tan_i, -tan_j), -1.0, 1.0))
+            if angle > max_angle_rad:
+                continue
+            local_median_mm = min(med_i, med_j) * entities.mm_per_px
+            if local_median_mm > 0 and dist * entities.mm_per_px > scale_factor_limit * local_median_mm:
+                continue
+            if dist < best_dist:
+                best_dist, best = dist, (ent_j, ep_j, pt_j)
+        if best is not None:
+            used.add((ent_i, ep_i))
+            used.add(best[:2])
+            segments.append((tuple(pt_i), tuple(best[2])))
+    return attempted, segments
+
+
+def _entity(points):
+    contour = np.array(points, dtype=np.int32).reshape(-1, 1, 2)
+    return LayeredEntity(contour=contour, layer=Layer.BODY, bbox=(0, 0, 1, 1), area=0.0)
+
+
+def _broken_outlines(rng, n_shapes, pieces=6, gap=3):
+    """Circles cut into arcs with small gaps, plus random short strokes."""
+    body = []
+    for _ in range(n_shapes):
+        cx, cy = rng.uniform(200, 4000, size=2)
+        r = rng.uniform(30, 80)
+        t = np.linspace(0, 2 * np.pi, pieces * 12, endpoint=False)
+        pts = np.stack([cx + r * np.cos(t), cy + r * np.sin(t)], axis=1).round()
+        for k in range(pieces):
+            arc = pts[k * 12: (k + 1) * 12 - gap // 2]
+            body.append(_entity(arc))
+    for _ in range(n_shapes):
+        x, y = rng.uniform(200, 4000, size=2)
+        dx, dy = rng.uniform(-20, 20, size=2)
+        body.append(_entity([[x, y], [x + dx, y + dy], [x + 2 * dx, y + 2 * dy]]))
+    return LayeredEntities(body=body, image_size=(4200, 4200), mm_per_px=0.25)
+
+
+def test_greedy_matches_all_pairs_reference():
+    rng = np.random.default_rng(12)
+    for n_shapes in (5, 30, 60):
+        entities = _broken_outlines(rng, n_shapes)
+        attempted, segments = _reference_joins(entities)
+        new_entities, result = join_body_gaps(entities)
+        assert result.joins_attempted == attempted
+        assert result.joined_segments == segments
+        assert result.joins_applied == len(segments) > 0
+        assert len(new_entities.body) < len(entities.body)
+
+
+def test_optimal_joins_at_least_greedy():
+    rng = np.random.default_rng(5)
+    entities = _broken_outlines(rng, 30)
+    _, greedy = join_body_gaps(entities)
+    _, optimal = join_body_gaps(entities, matching="optimal")
+    assert optimal.joins_applied >= greedy.joins_applied
+    endpoints = [p for seg in optimal.joined_segments for p in seg]
+    assert len(endpoints) == len(set(endpoints))
+
+
+def test_optimal_recovers_join_greedy_misses():
+    # A's end is nearest B's start, but B's start is D's only partner.
+    # Greedy takes A-B and strands D; optimal pairs A-C and D-B.
+    a = _entity([[0, 0], [5, 0], [10, 0]])
+    b = _entity([[11, 0], [16, 0], [21, 0]])
+    c = _entity([[11, 1], [16, 1], [21, 1]])
+    d = _entity([[1, -1], [6, -1], [11, -1]])
+    entities = LayeredEntities(body=[a, b, c, d], image_size=(100, 100), mm_per_px=1.0)
+
+    _, greedy = join_body_gaps(entities, max_gap_mm=1.5)
+    _, optimal = join_body_gaps(entities, max_gap_mm=1.5, matching="optimal")
+
+    assert greedy.joined_segments == [((10.0, 0.0), (11.0, 0.0))]
+    assert {frozenset(seg) for seg in optimal.joined_segments} == {
+        frozenset({(10.0, 0.0), (11.0, 1.0)}),
+        frozenset({(11.0, -1.0), (11.0, 0.0)}),
+    }
+
+
+def test_invalid_matching_mode():
+    entities = LayeredEntities(body=[], mm_per_px=1.0)
+    with pytest.raises(ValueError):
+        join_body_gaps(entities, matching="hungarian")